@@ -0,0 +1,432 @@
+"""Benchmark suite: per-stage, end-to-end and sweep timings.
+
+:func:`run_bench` times every pipeline stage on its own, ``run_once`` on a
+plain and a fully impaired link, and the four sweep types.  Each stage and
+``run_once`` is timed at several ``(n_fft, n_symbols)`` sizes.  Every entry
+records the best time per call over a few repeats, the throughput in
+samples/s and the peak traced allocation of one call (measured separately
+with :mod:`tracemalloc`, so tracing does not skew the timings).  The report
+also holds the machine, Python, NumPy and package versions.
+
+:func:`compare` checks a report against a stored baseline and returns the
+entries that got slower by more than a relative threshold.  Timings are
+only comparable on the same machine, so compare against a baseline
+recorded there.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import time
+import tracemalloc
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+
+from ntn_linksim import __version__
+from ntn_linksim.channel.awgn import add_awgn
+from ntn_linksim.channel.cfo import apply_cfo
+from ntn_linksim.channel.delay import apply_delay
+from ntn_linksim.channel.fading import fading_process
+from ntn_linksim.channel.rician import apply_rician_fading
+from ntn_linksim.precision import complex_dtype
+from ntn_linksim.rng import seeded_rng
+from ntn_linksim.rx.cfo import estimate_cfo_from_cp
+from ntn_linksim.rx.timing import estimate_timing_offset_cp
+from ntn_linksim.sim import SimConfig, run_once
+from ntn_linksim.waveform.modulation import (
+    bits_per_symbol,
+    qam_llr,
+    qam_mod,
+    qpsk_demod_hard,
+    qpsk_mod,
+)
+from ntn_linksim.waveform.ofdm import (
+    add_cp,
+    fft_symbols,
+    ifft_symbols,
+    serialize_symbols,
+    tx_grid,
+)
+
+# Bump when entry names or the meaning of a measurement change.
+_BENCH_FORMAT = 1
+
+# (n_fft, n_symbols) sizes for stage and run_once timings.
+DEFAULT_SIZES = ((64, 200), (64, 2000), (256, 200), (1024, 100))
+QUICK_SIZES = ((64, 100),)
+
+STAGES = (
+    "qpsk_mod",
+    "tx_grid",
+    "ifft_symbols",
+    "add_cp",
+    "apply_rician_fading",
+    "fading_process",
+    "apply_cfo",
+    "apply_delay",
+    "add_awgn",
+    "estimate_timing_offset_cp",
+    "estimate_cfo_from_cp",
+    "fft_symbols",
+    "qpsk_demod_hard",
+    "qam_llr",
+    "qam_llr_exact",
+)
+
+_IMPAIRED = {
+    "cfo_hz": 15e3,
+    "enable_cfo_comp": True,
+    "delay_samples": 4.5,
+    "enable_timing_comp": True,
+    "enable_rician": True,
+    "rician_k_db": 10.0,
+}
+
+
+@dataclass(frozen=True)
+class Regression:
+    """A benchmark entry that got slower than its baseline."""
+
+    name: str
+    n_fft: int | None
+    n_symbols: int | None
+    baseline_s: float
+    current_s: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_s / self.baseline_s
+
+
+def _sized(config: SimConfig, n_fft: int, n_symbols: int) -> SimConfig:
+    """Scale *config* to a benchmark size (CP and used carriers follow n_fft)."""
+    n_used = 2 * round(n_fft * 52 / 64 / 2)
+    return replace(
+        config, n_fft=n_fft, n_used=n_used, cp_len=n_fft // 4, n_symbols=n_symbols
+    )
+
+
+def _stage_calls(config: SimConfig) -> dict[str, tuple[Callable[[], object], int]]:
+    """Build each stage's zero-argument call and the samples it processes.
+
+    Inputs are computed once up front, so a call times only its own stage.
+    They are built at ``config.precision``, so the sample stages run at the
+    precision the report records.  Stages that accept ``out=`` are called
+    without it and allocate their result, as on the default (workspace-free)
+    path.
+    """
+    params = config.ofdm_params()
+    rng = seeded_rng(config.seed)
+    sym_len = params.n_fft + params.cp_len
+    n_samples = params.n_symbols * sym_len
+    n_bits = params.n_symbols * params.n_used * 2
+    backend = config.resolve_fft()
+    dtype = complex_dtype(config.precision)
+
+    bits = rng.integers(0, 2, size=n_bits, dtype=np.int8)
+    symbols = qpsk_mod(bits, dtype=dtype).reshape(params.n_symbols, params.n_used)
+    grid = tx_grid(symbols, params)
+    time_symbols = ifft_symbols(grid, backend=backend)
+    with_cp = add_cp(time_symbols, params.cp_len)
+    samples = serialize_symbols(with_cp)
+    rx = add_awgn(samples, config.snr_db, rng)
+    frame_bits = rng.integers(0, 2, size=config.bits_per_frame(), dtype=np.int8)
+    data = qam_mod(frame_bits, config.modulation, dtype=dtype)
+    noise_var = 10 ** (-config.snr_db / 10.0)
+    # Exact QPSK LLRs are the max-log ones, so time a denser constellation.
+    exact_modulation = "64qam" if config.modulation == "qpsk" else config.modulation
+    exact_bits = rng.integers(
+        0, 2, size=data.size * bits_per_symbol(exact_modulation), dtype=np.int8
+    )
+    exact_data = qam_mod(exact_bits, exact_modulation, dtype=dtype)
+    n_grid = params.n_symbols * params.n_fft
+    n_used = params.n_symbols * params.n_used
+
+    return {
+        "qpsk_mod": (lambda: qpsk_mod(bits, dtype=dtype), n_used),
+        "tx_grid": (lambda: tx_grid(symbols, params), n_grid),
+        "ifft_symbols": (lambda: ifft_symbols(grid, backend=backend), n_grid),
+        "add_cp": (lambda: add_cp(time_symbols, params.cp_len), n_samples),
+        "apply_rician_fading": (
+            lambda: apply_rician_fading(with_cp, config.rician_k_db, rng),
+            n_samples,
+        ),
+        "fading_process": (
+            lambda: fading_process("sos", 1000.0, config.fs_hz, rng).generate(
+                n_samples
+            ),
+            n_samples,
+        ),
+        "apply_cfo": (
+            lambda: apply_cfo(samples, fs_hz=config.fs_hz, cfo_hz=_IMPAIRED["cfo_hz"]),
+            n_samples,
+        ),
+        "apply_delay": (
+            lambda: apply_delay(
+                samples,
+                _IMPAIRED["delay_samples"],
+                method=config.delay_method,
+                backend=backend,
+            ),
+            n_samples,
+        ),
+        "add_awgn": (lambda: add_awgn(samples, config.snr_db, rng), n_samples),
+        "estimate_timing_offset_cp": (
+            lambda: estimate_timing_offset_cp(
+                rx, n_fft=params.n_fft, cp_len=params.cp_len, n_symbols=params.n_symbols
+            ),
+            n_samples,
+        ),
+        "estimate_cfo_from_cp": (
+            lambda: estimate_cfo_from_cp(
+                rx[:sym_len],
+                n_fft=params.n_fft,
+                cp_len=params.cp_len,
+                fs_hz=config.fs_hz,
+            ),
+            sym_len,
+        ),
+        "fft_symbols": (lambda: fft_symbols(time_symbols, backend=backend), n_grid),
+        "qpsk_demod_hard": (lambda: qpsk_demod_hard(symbols), n_used),
+        "qam_llr": (lambda: qam_llr(data, noise_var, config.modulation), n_used),
+        "qam_llr_exact": (
+            lambda: qam_llr(exact_data, noise_var, exact_modulation, method="exact"),
+            n_used,
+        ),
+    }
+
+
+def _time_call(fn: Callable[[], object], min_time_s: float, repeat: int) -> float:
+    """Return the best seconds per call of *fn* over *repeat* timed loops.
+
+    Each loop runs enough calls to last at least *min_time_s* (at least one
+    call), like :meth:`timeit.Timer.autorange`.
+    """
+    fn()  # warm-up: plan caches, lazy imports, first-touch allocation
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time_s:
+            break
+        scale = int(min_time_s / elapsed) + 1 if elapsed > 0 else 2
+        number *= max(2, scale)
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def _peak_bytes(fn: Callable[[], object]) -> int:
+    """Return the peak traced allocation of one call of *fn*."""
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+
+
+def _entry(
+    name: str,
+    fn: Callable[[], object],
+    n_samples: int,
+    min_time_s: float,
+    repeat: int,
+    n_fft: int | None = None,
+    n_symbols: int | None = None,
+) -> dict:
+    seconds = _time_call(fn, min_time_s, repeat)
+    return {
+        "name": name,
+        "n_fft": n_fft,
+        "n_symbols": n_symbols,
+        "seconds": seconds,
+        "samples_per_s": n_samples / seconds,
+        "peak_bytes": _peak_bytes(fn),
+    }
+
+
+def machine_info() -> dict:
+    """Describe the machine and software versions a benchmark ran on."""
+    return {
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "ntn_linksim": __version__,
+    }
+
+
+def _sweep_calls(config: SimConfig) -> dict[str, tuple[Callable[[], object], int]]:
+    """Build the four sweep types as zero-argument calls on *config*."""
+    # Deferred: the sweep helpers pull in the experiments package.
+    from ntn_linksim.experiments.sweep import (
+        sweep_ber,
+        sweep_ber_vs_cfo,
+        sweep_ber_vs_delay,
+        sweep_ber_vs_rician_k,
+    )
+
+    frame = config.n_symbols * (config.n_fft + config.cp_len)
+    snr_db = [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+    cfo_hz = [0.0, 15e3, 30e3, 45e3, 60e3]
+    delays = [0.0, 4.0, 8.0, 12.0, 16.0]
+    k_db = [-3.0, 0.0, 5.0, 10.0, 20.0]
+    fixed = replace(config, snr_db=20.0)
+    return {
+        "sweep/snr": (lambda: sweep_ber(config, snr_db), frame * len(snr_db)),
+        "sweep/cfo": (
+            lambda: sweep_ber_vs_cfo(fixed, cfo_hz, enable_comp=True),
+            frame * len(cfo_hz),
+        ),
+        "sweep/delay": (
+            lambda: sweep_ber_vs_delay(fixed, delays, enable_comp=True),
+            frame * len(delays),
+        ),
+        "sweep/rician_k": (
+            lambda: sweep_ber_vs_rician_k(fixed, k_db),
+            frame * len(k_db),
+        ),
+    }
+
+
+def run_bench(
+    sizes: Sequence[tuple[int, int]] = DEFAULT_SIZES,
+    min_time_s: float = 0.05,
+    repeat: int = 3,
+    config: SimConfig | None = None,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """Run the benchmark suite and return its report.
+
+    Args:
+        sizes: ``(n_fft, n_symbols)`` sizes for the stage and ``run_once``
+            timings.
+        min_time_s: Minimum duration of each timed loop.
+        repeat: Timed loops per entry; the best is reported.
+        config: Base config for precision/FFT backend and the sweeps
+            (defaults to ``SimConfig()``).
+        progress: Called with each entry as soon as it is measured.
+
+    Returns:
+        A JSON-serializable report with ``machine``, ``config`` and
+        ``entries`` (name, size, seconds, samples_per_s, peak_bytes).
+    """
+    if min_time_s <= 0 or repeat < 1:
+        raise ValueError("min_time_s must be positive and repeat >= 1")
+    base = config if config is not None else SimConfig()
+    base.validate()
+    entries: list[dict] = []
+
+    def add(entry: dict) -> None:
+        entries.append(entry)
+        if progress is not None:
+            progress(entry)
+
+    for n_fft, n_symbols in sizes:
+        sized = _sized(base, n_fft, n_symbols)
+        sized.validate()
+        calls = _stage_calls(sized)
+        for name in STAGES:
+            fn, n_samples = calls[name]
+            add(
+                _entry(
+                    f"stage/{name}", fn, n_samples, min_time_s, repeat, n_fft, n_symbols
+                )
+            )
+        frame = n_symbols * (sized.n_fft + sized.cp_len)
+        for name, cfg in (
+            ("run_once/awgn", sized),
+            ("run_once/impaired", replace(sized, **_IMPAIRED)),
+        ):
+            add(
+                _entry(
+                    name,
+                    lambda cfg=cfg: run_once(cfg),
+                    frame,
+                    min_time_s,
+                    repeat,
+                    n_fft,
+                    n_symbols,
+                )
+            )
+
+    for name, (fn, n_samples) in _sweep_calls(base).items():
+        add(_entry(name, fn, n_samples, min_time_s, 1, base.n_fft, base.n_symbols))
+
+    return {
+        "format": _BENCH_FORMAT,
+        "created": time.time(),
+        "machine": machine_info(),
+        "config": {
+            "precision": base.precision,
+            "fft": base.resolve_fft().describe(),
+            "min_time_s": min_time_s,
+            "repeat": repeat,
+        },
+        "entries": entries,
+    }
+
+
+def save_bench(path: str | Path, report: dict) -> Path:
+    """Write a benchmark report as JSON (creating parent directories)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    return path
+
+
+def load_bench(path: str | Path) -> dict:
+    """Read a benchmark report written by :func:`save_bench`."""
+    with Path(path).open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.10) -> list[Regression]:
+    """Return the entries of *current* slower than *baseline* by > *threshold*.
+
+    Entries are matched on name and size; entries missing from either report
+    are ignored.
+
+    Args:
+        current: Report from :func:`run_bench`.
+        baseline: Earlier report to compare against.
+        threshold: Allowed relative slowdown (0.10 flags anything more than
+            10% slower).
+
+    Returns:
+        The regressions, worst first.
+    """
+    if threshold < 0:
+        raise ValueError("threshold must be non-negative")
+
+    def key(entry: dict) -> tuple:
+        return entry["name"], entry["n_fft"], entry["n_symbols"]
+
+    reference = {key(entry): entry["seconds"] for entry in baseline["entries"]}
+    regressions = [
+        Regression(*key(entry), reference[key(entry)], entry["seconds"])
+        for entry in current["entries"]
+        if key(entry) in reference
+        and entry["seconds"] > reference[key(entry)] * (1.0 + threshold)
+    ]
+    return sorted(regressions, key=lambda r: r.ratio, reverse=True)
@@ -4,22 +4,105 @@ from __future__ import annotations
 
 import numpy as np
 
+from ntn_linksim.precision import as_complex, real_dtype
+from ntn_linksim.workspace import Workspace, check_out
+
+
+def _unit_noise(
+    rng: np.random.Generator, shape: tuple[int, ...], dtype: np.dtype
+) -> np.ndarray:
+    """Draw ``re + 1j*im`` standard normals in the precision of *dtype*."""
+    real = real_dtype(dtype)
+    return rng.standard_normal(shape, dtype=real) + 1j * rng.standard_normal(
+        shape, dtype=real
+    )
+
 
 def add_awgn(
-    samples: np.ndarray, snr_db: float, rng: np.random.Generator
+    samples: np.ndarray,
+    snr_db: float,
+    rng: np.random.Generator,
+    out: np.ndarray | None = None,
+    workspace: Workspace | None = None,
 ) -> np.ndarray:
     """Add complex AWGN to samples for a target SNR in dB.
 
     SNR is defined as signal_power / noise_power with signal_power = mean(|x|^2).
+    The power is measured along the last axis, so each row of a batched
+    ``(..., n_samples)`` input is one realization at the target SNR.
+    Complex64 input gets single-precision noise and stays complex64.
+
+    The real and imaginary noise parts are drawn straight into two real
+    scratch arrays (from *workspace* when given) and added component-wise,
+    so no complex noise temporary is built.  Pass ``out=samples`` to add
+    the noise in place.
     """
-    samples = np.asarray(samples, dtype=np.complex128)
+    samples = as_complex(samples)
     if samples.size == 0:
         raise ValueError("samples must be non-empty")
-    snr_linear = 10 ** (snr_db / 10.0)
-    signal_power = np.mean(np.abs(samples) ** 2)
+    real = real_dtype(samples.dtype)
+    if workspace is None:
+        noise_re = np.empty(samples.shape, dtype=real)
+        noise_im = np.empty(samples.shape, dtype=real)
+    else:
+        noise_re = workspace.get("awgn.re", samples.shape, real)
+        noise_im = workspace.get("awgn.im", samples.shape, real)
+    if out is None:
+        out = np.empty_like(samples)
+    else:
+        check_out(out, samples.shape, samples.dtype)
+
+    snr_linear = 10 ** (float(snr_db) / 10.0)
+    np.abs(samples, out=noise_re)
+    np.square(noise_re, out=noise_re)
+    signal_power = np.mean(noise_re, axis=-1, keepdims=True)
     noise_power = signal_power / snr_linear
     sigma = np.sqrt(noise_power / 2.0)
-    noise = sigma * (
-        rng.standard_normal(samples.shape) + 1j * rng.standard_normal(samples.shape)
-    )
-    return samples + noise.astype(np.complex128)
+    rng.standard_normal(dtype=real, out=noise_re)
+    rng.standard_normal(dtype=real, out=noise_im)
+    np.multiply(noise_re, sigma, out=noise_re)
+    np.multiply(noise_im, sigma, out=noise_im)
+    np.add(samples.real, noise_re, out=out.real)
+    np.add(samples.imag, noise_im, out=out.imag)
+    return out
+
+
+def add_awgn_snr_axis(
+    samples: np.ndarray,
+    snr_db_list: list[float],
+    rng: np.random.Generator,
+    shared_rows: bool = False,
+) -> np.ndarray:
+    """Add AWGN at several SNRs from one shared noise realization.
+
+    One unit-variance noise draw is scaled per SNR point, so the result for
+    each point is exactly what :func:`add_awgn` returns for that SNR from the
+    same generator state.  A new leading axis indexes the SNR points.
+
+    With *shared_rows*, a single ``(n_samples,)`` draw is also reused by
+    every row of a batched input, so each row gets exactly the noise
+    :func:`add_awgn` would add to it alone (scaled to that row's power).
+    This evaluates rows that differ only in their channel, e.g. CFO or
+    K-factor, against the same noise.
+
+    Args:
+        samples: Noiseless samples (..., n_samples).
+        snr_db_list: SNR points in dB.
+        rng: NumPy Generator for reproducibility.
+        shared_rows: Draw one noise row for all leading batch rows.
+
+    Returns:
+        Noisy samples of shape ``(len(snr_db_list), *samples.shape)``.
+    """
+    samples = as_complex(samples)
+    if samples.size == 0:
+        raise ValueError("samples must be non-empty")
+    snr_linear = np.array([10 ** (float(snr_db) / 10.0) for snr_db in snr_db_list])
+    if snr_linear.size == 0:
+        raise ValueError("snr_db_list must be non-empty")
+    signal_power = np.mean(np.abs(samples) ** 2, axis=-1, keepdims=True)
+    noise_power = signal_power / snr_linear.reshape((-1,) + (1,) * samples.ndim)
+    sigma = np.sqrt(noise_power / 2.0).astype(real_dtype(samples.dtype))
+    noise_shape = samples.shape[-1:] if shared_rows else samples.shape
+    unit_noise = _unit_noise(rng, noise_shape, samples.dtype)
+    return samples + (sigma * unit_noise).astype(samples.dtype, copy=False)
@@ -4,24 +4,44 @@ from __future__ import annotations
 
 import numpy as np
 
+from ntn_linksim.phasor import rotate
+from ntn_linksim.precision import as_complex
 
-def apply_cfo(x: np.ndarray, fs_hz: float, cfo_hz: float) -> np.ndarray:
+
+def apply_cfo(
+    x: np.ndarray,
+    fs_hz: float,
+    cfo_hz: float,
+    out: np.ndarray | None = None,
+    start: int = 0,
+) -> np.ndarray:
     """Apply CFO/Doppler as a complex exponential rotation in baseband.
 
     In complex baseband, carrier frequency offset and Doppler shift are
-    equivalent to a sample-wise phase rotation.
+    equivalent to a sample-wise phase rotation.  The rotation runs along the
+    last axis; leading axes are batch dimensions sharing the same CFO.
+    The phasor comes from :mod:`ntn_linksim.phasor`, so repeated calls with
+    the same CFO reuse one phase table.
+
+    Args:
+        x: Complex samples, ``(..., n_samples)``.
+        fs_hz: Sample rate in Hz.
+        cfo_hz: Frequency offset in Hz.
+        out: Optional destination with the dtype of the result (may be *x*
+            for in-place).
+        start: Sample index of ``x[..., 0]`` within the transmission, for
+            block-by-block streaming.
+
+    Returns:
+        Rotated samples, complex64 for complex64 input, else complex128.
     """
     x = np.asarray(x)
-    if x.ndim != 1:
-        raise ValueError("x must be a 1-D complex array")
+    if x.ndim < 1:
+        raise ValueError("x must be a complex array with at least 1 dimension")
     if not np.iscomplexobj(x):
-        raise ValueError("x must be a 1-D complex array")
+        raise ValueError("x must be a complex array with at least 1 dimension")
     if fs_hz <= 0:
         raise ValueError("fs_hz must be positive")
 
-    x = x.astype(np.complex128, copy=False)
-    n = np.arange(x.size, dtype=np.float64)
-    phasor = np.exp(1j * 2.0 * np.pi * cfo_hz * n / fs_hz).astype(
-        np.complex128
-    )
-    return (x * phasor).astype(np.complex128)
+    x = as_complex(x)
+    return rotate(x, fs_hz, cfo_hz, out=out, start=start)
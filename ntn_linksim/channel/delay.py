@@ -3,84 +3,367 @@
 from __future__ import annotations
 
 import math
+from collections.abc import Callable
+from functools import lru_cache
 
 import numpy as np
 
+from ntn_linksim.fft_backend import NUMPY_FFT, FftBackend
+from ntn_linksim.precision import as_complex, real_dtype
+from ntn_linksim.workspace import check_out
 
-def apply_integer_delay(x: np.ndarray, delay: int) -> np.ndarray:
+# Frames longer than this use the streaming FIR delay in ``apply_delay``
+# ("auto" method): the FFT path costs O(N log N) over the whole frame,
+# needs it all in memory and wraps the tail around circularly.
+_FFT_DELAY_MAX_SAMPLES = 1 << 16
+_DELAY_METHODS = ("auto", "fft", "fir")
+# Block size used by ``apply_delay_fir`` to bound its temporaries.
+_FIR_CHUNK_SAMPLES = 1 << 13
+
+DelaySpec = float | Callable[[np.ndarray], np.ndarray]
+
+
+def apply_integer_delay(
+    x: np.ndarray, delay: int, out: np.ndarray | None = None
+) -> np.ndarray:
     """Shift signal right by *delay* samples: zero-pad front, truncate tail.
 
-    Length is preserved.  A delay of 0 returns a copy.
+    Length is preserved.  A delay of 0 returns a copy.  The shift runs along
+    the last axis, so batched ``(..., n_samples)`` input is delayed row-wise.
 
     Args:
-        x: 1-D complex signal.
+        x: Complex signal, samples on the last axis.
         delay: Non-negative integer sample delay.
+        out: Optional destination with the shape and dtype of *x*; must not
+            overlap *x* unless *delay* is 0.
 
     Returns:
-        Delayed signal (same length as *x*), complex128.
+        Delayed signal (same shape and dtype as *x*).
     """
-    x = np.asarray(x, dtype=np.complex128)
-    if x.ndim != 1:
-        raise ValueError("x must be a 1-D array")
+    x = as_complex(x)
+    if x.ndim < 1:
+        raise ValueError("x must be at least a 1-D array")
     if delay < 0:
         raise ValueError("delay must be non-negative")
-    if delay == 0:
-        return x.copy()
-    if delay >= x.size:
-        return np.zeros_like(x)
-    out = np.zeros_like(x)
-    out[delay:] = x[: x.size - delay]
+    if out is None:
+        if delay == 0:
+            return x.copy()
+        out = np.zeros_like(x)
+    else:
+        check_out(out, x.shape, x.dtype)
+        if delay == 0:
+            if out is not x:
+                np.copyto(out, x)
+            return out
+        out[..., :delay] = 0
+    n = x.shape[-1]
+    if delay < n:
+        out[..., delay:] = x[..., : n - delay]
     return out
 
 
-def apply_fractional_delay(x: np.ndarray, frac_delay: float) -> np.ndarray:
+@lru_cache(maxsize=16)
+def _fractional_phase(n: int, frac_delay: float, dtype: str) -> np.ndarray:
+    """Read-only linear phase ``exp(-j*2*pi*f*frac_delay)`` over the signed
+    DFT bin frequencies ``f = np.fft.fftfreq(n)``.
+
+    The ramp must be centred: on the unsigned bins ``k / n`` the
+    negative-frequency half gets the phase of a much larger delay.
+    """
+    freqs = np.fft.fftfreq(n)
+    phase = np.exp(-1j * 2.0 * np.pi * frac_delay * freqs).astype(dtype)
+    phase.flags.writeable = False
+    return phase
+
+
+def apply_fractional_delay(
+    x: np.ndarray,
+    frac_delay: float,
+    out: np.ndarray | None = None,
+    backend: FftBackend = NUMPY_FFT,
+) -> np.ndarray:
     """Apply a fractional sample delay via frequency-domain linear phase.
 
     Multiplies the spectrum by ``exp(-j*2*pi*k*frac_delay/N)`` where *k* is
-    the DFT bin index and *N* is the signal length.
+    the signed DFT bin index (``-N/2 <= k < N/2``) and *N* is the signal
+    length, so the result matches the polyphase FIR path
+    (:func:`apply_delay_fir`) on band-limited signals.  The phase ramp is
+    cached per ``(N, frac_delay)``.
 
     Args:
-        x: 1-D complex signal.
+        x: Complex signal, samples on the last axis.
         frac_delay: Fractional part of the delay in samples (|frac_delay| < 1).
+        out: Optional destination with the shape and dtype of *x* (may be
+            *x* itself); the FFTs then run in place on it.
+        backend: FFT backend for the forward and inverse transforms.
 
     Returns:
-        Delayed signal (same length), complex128.
+        Delayed signal (same shape and dtype as *x*).
     """
-    x = np.asarray(x, dtype=np.complex128)
-    if x.ndim != 1:
-        raise ValueError("x must be a 1-D array")
+    x = as_complex(x)
+    if x.ndim < 1:
+        raise ValueError("x must be at least a 1-D array")
+    if out is not None:
+        check_out(out, x.shape, x.dtype)
     if abs(frac_delay) < 1e-12:
-        return x.copy()
+        if out is None:
+            return x.copy()
+        if out is not x:
+            np.copyto(out, x)
+        return out
+
+    n = x.shape[-1]
+    phase = _fractional_phase(n, float(frac_delay), x.dtype.str)
+    out = backend.fft(x, out=out)
+    np.multiply(out, phase, out=out)
+    return backend.ifft(out, out=out)
+
+
+@lru_cache(maxsize=8)
+def _polyphase_bank(n_taps: int, n_phases: int, beta: float) -> np.ndarray:
+    """Kaiser-windowed sinc interpolators for ``n_phases + 1`` fractional delays.
+
+    Row *p* holds the taps for fractional delay ``mu = p / n_phases``; tap *k*
+    weights input sample ``x[n - (k - (n_taps // 2 - 1))]`` so that row 0 is
+    an exact unit impulse.
+    """
+    mu = np.arange(n_phases + 1, dtype=np.float64)[:, np.newaxis] / n_phases
+    t = np.arange(n_taps, dtype=np.float64) - (n_taps // 2 - 1)
+    u = t[np.newaxis, :] - mu
+    window = np.i0(beta * np.sqrt(np.clip(1.0 - (2.0 * u / n_taps) ** 2, 0, 1)))
+    bank = np.sinc(u) * window / np.i0(beta)
+    bank /= np.sum(bank, axis=1, keepdims=True)
+    # sinc() leaves ~1e-17 residue at integer offsets; make integer delays exact
+    bank[0] = 0.0
+    bank[0, n_taps // 2 - 1] = 1.0
+    bank[n_phases] = 0.0
+    bank[n_phases, n_taps // 2] = 1.0
+    bank.flags.writeable = False
+    return bank
+
+
+class FractionalDelayLine:
+    """Streaming windowed-sinc (polyphase) fractional delay.
+
+    Samples are pushed through :meth:`process` in blocks of any size; the
+    filter history is carried between calls, so the concatenated output is
+    the same as delaying the whole signal at once, with no circular
+    wrap-around and O(n_taps) work per sample.  The delay may vary over
+    time: pass a callable mapping absolute output sample indices to delays.
+
+    The interpolator needs ``n_taps // 2 - 1`` samples of look-ahead, so
+    each call emits fewer samples than it receives until :meth:`flush`
+    drains the remainder.  Output is always time-aligned: output sample *n*
+    is ``x(n - delay(n))`` with ``x`` zero before the first input.
+
+    Args:
+        max_delay: Largest delay in samples that will be requested.
+        n_taps: Interpolator length (even).
+        n_phases: Number of fractional-delay phases in the filter bank.
+        beta: Kaiser window shape parameter.
+    """
+
+    def __init__(
+        self,
+        max_delay: float,
+        n_taps: int = 32,
+        n_phases: int = 512,
+        beta: float = 8.0,
+    ) -> None:
+        if max_delay < 0:
+            raise ValueError("max_delay must be non-negative")
+        if n_taps < 2 or n_taps % 2 != 0:
+            raise ValueError("n_taps must be an even number >= 2")
+        if n_phases <= 0:
+            raise ValueError("n_phases must be positive")
+        self.max_delay = float(max_delay)
+        self.n_taps = n_taps
+        self.n_phases = n_phases
+        self.lookahead = n_taps // 2 - 1
+        self._bank = _polyphase_bank(n_taps, n_phases, float(beta))
+        self._history_len = int(math.ceil(max_delay)) + n_taps + 1
+        self._history: np.ndarray | None = None
+        self._taps = self._bank
+        self._t_in = 0
+        self._t_out = 0
 
-    n = x.size
-    X = np.fft.fft(x)
-    k = np.arange(n, dtype=np.float64)
-    phase = np.exp(-1j * 2.0 * np.pi * frac_delay * k / n).astype(np.complex128)
-    return np.fft.ifft(X * phase).astype(np.complex128)
+    def process(self, block: np.ndarray, delay: DelaySpec) -> np.ndarray:
+        """Push a block of samples and return the outputs now available.
 
+        Args:
+            block: Complex samples ``(..., n)``; leading axes are independent
+                channels sharing the delay.
+            delay: Delay in samples (scalar), or a callable returning the
+                delay for an array of absolute output sample indices.
 
-def apply_delay(x: np.ndarray, delay_samples: float) -> np.ndarray:
+        Returns:
+            Delayed samples ``(..., m)`` continuing the output stream.
+        """
+        block = as_complex(block)
+        if block.ndim < 1:
+            raise ValueError("block must be at least a 1-D array")
+        if self._history is None:
+            # The stream's precision is fixed by its first block.
+            self._history = np.zeros(
+                block.shape[:-1] + (self._history_len,), dtype=block.dtype
+            )
+            self._taps = self._bank.astype(real_dtype(block.dtype), copy=False)
+        elif block.shape[:-1] != self._history.shape[:-1]:
+            raise ValueError("block batch shape changed between calls")
+
+        # ext[..., i] holds input sample x[t_in - history_len + i]
+        block = block.astype(self._history.dtype, copy=False)
+        ext = np.concatenate([self._history, block], axis=-1)
+        origin = self._t_in - self._history_len
+        self._t_in += block.shape[-1]
+        n_out = max(0, self._t_in - self.lookahead - self._t_out)
+        out = self._interpolate(ext, origin, n_out, delay)
+        self._t_out += n_out
+        self._history = ext[..., ext.shape[-1] - self._history_len :]
+        return out
+
+    def flush(self, delay: DelaySpec) -> np.ndarray:
+        """Drain the look-ahead samples held back at the end of the stream."""
+        if self._history is None:
+            return self.process(np.zeros((0,), dtype=np.complex128), delay)
+        zeros = np.zeros(
+            self._history.shape[:-1] + (self.lookahead,), dtype=self._history.dtype
+        )
+        return self.process(zeros, delay)
+
+    def _interpolate(
+        self, ext: np.ndarray, origin: int, n_out: int, delay: DelaySpec
+    ) -> np.ndarray:
+        out = np.zeros(ext.shape[:-1] + (n_out,), dtype=ext.dtype)
+        if n_out == 0:
+            return out
+        n = self._t_out + np.arange(n_out)
+        d = delay(n) if callable(delay) else np.full(n_out, float(delay))
+        d = np.asarray(d, dtype=np.float64)
+        if d.shape != (n_out,):
+            raise ValueError("delay callable must return one value per sample")
+        if np.any(d < 0) or np.any(d > self.max_delay):
+            raise ValueError("delay must be within [0, max_delay]")
+
+        int_part = np.floor(d).astype(np.int64)
+        phase = np.rint((d - int_part) * self.n_phases).astype(np.int64)
+        wrap = phase == self.n_phases
+        int_part[wrap] += 1
+        phase[wrap] = 0
+
+        # Tap k reads x[n - int_part + lookahead - k]
+        base = n - int_part + self.lookahead - origin
+        if np.all(phase == phase[0]) and np.all(int_part == int_part[0]):
+            taps = self._taps[phase[0]]
+            start = int(base[0])
+            for k in range(self.n_taps):
+                s = start - k
+                out += taps[k] * ext[..., s : s + n_out]
+        else:
+            taps = self._taps[phase]
+            for k in range(self.n_taps):
+                out += taps[:, k] * ext[..., base - k]
+        return out
+
+
+def apply_delay_fir(
+    x: np.ndarray,
+    delay_samples: float | np.ndarray,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Delay *x* with the streaming polyphase filter in one call.
+
+    Unlike the FFT path there is no circular wrap-around: samples delayed
+    past the end are dropped and the front is filled from zeros.  The frame
+    is pushed through the filter in fixed-size chunks, so temporaries stay
+    small however long *x* is.
+
+    Args:
+        x: Complex signal, samples on the last axis.
+        delay_samples: Delay in samples (>= 0), scalar or one value per
+            output sample for a time-varying delay.
+        out: Optional destination with the shape and dtype of *x*, not
+            overlapping it.
+
+    Returns:
+        Delayed signal (same shape and dtype as *x*).
+    """
+    x = as_complex(x)
+    if x.ndim < 1:
+        raise ValueError("x must be at least a 1-D array")
+    delay = np.asarray(delay_samples, dtype=np.float64)
+    if delay.ndim > 0 and delay.shape != (x.shape[-1],):
+        raise ValueError("delay_samples must be a scalar or one value per sample")
+    if np.any(delay < 0):
+        raise ValueError("delay_samples must be non-negative")
+    if out is None:
+        out = np.empty_like(x)
+    else:
+        check_out(out, x.shape, x.dtype)
+
+    line = FractionalDelayLine(max_delay=float(np.max(delay)))
+    spec: DelaySpec = float(delay) if delay.ndim == 0 else delay.__getitem__
+    n = x.shape[-1]
+    pos = 0
+    for start in range(0, max(n, 1), _FIR_CHUNK_SAMPLES):
+        y = line.process(x[..., start : start + _FIR_CHUNK_SAMPLES], spec)
+        out[..., pos : pos + y.shape[-1]] = y
+        pos += y.shape[-1]
+    out[..., pos:] = line.flush(spec)
+    return out
+
+
+def apply_delay(
+    x: np.ndarray,
+    delay_samples: float | np.ndarray,
+    method: str = "auto",
+    out: np.ndarray | None = None,
+    backend: FftBackend = NUMPY_FFT,
+) -> np.ndarray:
     """Apply a (possibly fractional) sample delay to *x*.
 
-    Splits into integer + fractional parts and applies both.
+    The ``"fft"`` method splits the delay into integer + fractional parts
+    and applies the fraction as a frequency-domain linear phase over the
+    whole frame.  The ``"fir"`` method uses the streaming polyphase filter
+    (:func:`apply_delay_fir`).  ``"auto"`` keeps the FFT path for frames up
+    to 65536 samples and switches to the FIR path for longer frames or
+    time-varying (array) delays.
 
     Args:
-        x: 1-D complex signal.
-        delay_samples: Total delay in samples (must be >= 0).
+        x: Complex signal, samples on the last axis.
+        delay_samples: Total delay in samples (must be >= 0); an array gives
+            one delay per sample (``"fir"``/``"auto"`` only).
+        method: ``"auto"``, ``"fft"`` or ``"fir"``.
+        out: Optional destination with the shape and dtype of *x*, not
+            overlapping it.  Both paths then write their result straight
+            into *out*.
+        backend: FFT backend used by the ``"fft"`` method.
 
     Returns:
-        Delayed signal (same length), complex128.
+        Delayed signal (same shape and dtype as *x*).
 
     Raises:
-        ValueError: If *delay_samples* < 0.
+        ValueError: If *delay_samples* < 0 or *method* is unknown.
     """
-    if delay_samples < 0:
+    if method not in _DELAY_METHODS:
+        raise ValueError(f"method must be one of {_DELAY_METHODS}")
+    if np.any(np.asarray(delay_samples) < 0):
         raise ValueError("delay_samples must be non-negative")
 
+    x = as_complex(x)
+    time_varying = np.ndim(delay_samples) > 0
+    if method == "auto":
+        long_frame = x.ndim >= 1 and x.shape[-1] > _FFT_DELAY_MAX_SAMPLES
+        method = "fir" if time_varying or long_frame else "fft"
+    if method == "fir":
+        return apply_delay_fir(x, delay_samples, out=out)
+    if time_varying:
+        raise ValueError("time-varying delay requires the 'fir' method")
+
     int_delay = int(math.floor(delay_samples))
     frac_delay = delay_samples - int_delay
 
-    out = apply_integer_delay(x, int_delay)
+    out = apply_integer_delay(x, int_delay, out=out)
     if abs(frac_delay) > 1e-12:
-        out = apply_fractional_delay(out, frac_delay)
+        out = apply_fractional_delay(out, frac_delay, out=out, backend=backend)
     return out
@@ -0,0 +1,226 @@
+"""Time-varying Doppler impairment model.
+
+Over a LEO pass the Doppler shift drifts by hundreds of Hz per second, so a
+long transmission cannot be rotated by one constant CFO.  A Doppler profile
+gives the instantaneous frequency offset ``f(t)``; the channel applies the
+phase ``2*pi * integral_0^t f`` to each sample at ``t = n / fs``.
+
+Two profiles are provided: :class:`PolynomialDoppler` (offset, rate, ...)
+and :class:`SampledDoppler` (a trajectory linearly interpolated between
+knots).  Both integrate the phase in closed form relative to a block start,
+so :class:`DopplerRotator` only carries the accumulated phase (in cycles,
+wrapped to [0, 1)) and the sample index between blocks.  The phase is
+evaluated in double precision one block at a time, so no full-length phasor
+is ever built and the same rotator can be fed a stream chunk by chunk.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+
+import numpy as np
+
+from ntn_linksim.precision import as_complex
+from ntn_linksim.workspace import check_out
+
+# Samples per phase evaluation; bounds the temporaries of one call.
+_BLOCK_SAMPLES = 1 << 16
+
+
+class PolynomialDoppler:
+    """Doppler ``f(t) = c0 + c1*t + c2*t**2 + ...`` in Hz, ``t`` in seconds.
+
+    ``PolynomialDoppler((cfo_hz, rate_hz_s))`` is a constant offset plus a
+    linear Doppler rate.
+
+    Args:
+        coeffs_hz: Coefficients in increasing power (Hz, Hz/s, Hz/s^2, ...).
+    """
+
+    def __init__(self, coeffs_hz: Sequence[float]) -> None:
+        coeffs = np.asarray(coeffs_hz, dtype=np.float64)
+        if coeffs.ndim != 1 or coeffs.size == 0:
+            raise ValueError("coeffs_hz must be a non-empty 1-D sequence")
+        if not np.all(np.isfinite(coeffs)):
+            raise ValueError("coeffs_hz must be finite")
+        self.coeffs_hz = coeffs
+
+    def frequency(self, t: np.ndarray | float) -> np.ndarray:
+        """Instantaneous Doppler in Hz at times *t* (seconds)."""
+        return np.polynomial.polynomial.polyval(t, self.coeffs_hz)
+
+    def cycles(self, t0: float, tau: np.ndarray | float) -> np.ndarray:
+        """Phase in cycles accumulated from *t0* to ``t0 + tau``.
+
+        The polynomial is re-expanded around *t0* first, so the result is
+        as accurate late in a long pass as at its start.
+        """
+        degree = self.coeffs_hz.size - 1
+        # Taylor coefficients of f(t0 + tau) in tau.
+        local = np.array(
+            [
+                sum(
+                    math.comb(j, k) * self.coeffs_hz[j] * t0 ** (j - k)
+                    for j in range(k, degree + 1)
+                )
+                for k in range(degree + 1)
+            ]
+        )
+        acc = local[degree] / (degree + 1)
+        for k in range(degree - 1, -1, -1):
+            acc = acc * tau + local[k] / (k + 1)
+        return acc * tau
+
+
+class SampledDoppler:
+    """Doppler trajectory linearly interpolated between knots.
+
+    Before the first and after the last knot the Doppler is held constant.
+
+    Args:
+        times_s: Knot times in seconds, strictly increasing.
+        doppler_hz: Doppler in Hz at each knot.
+    """
+
+    def __init__(self, times_s: Sequence[float], doppler_hz: Sequence[float]) -> None:
+        times = np.asarray(times_s, dtype=np.float64)
+        values = np.asarray(doppler_hz, dtype=np.float64)
+        if times.ndim != 1 or times.size == 0 or times.shape != values.shape:
+            raise ValueError("times_s and doppler_hz must be equal-length 1-D")
+        if not (np.all(np.isfinite(times)) and np.all(np.isfinite(values))):
+            raise ValueError("times_s and doppler_hz must be finite")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("times_s must be strictly increasing")
+        self.times_s = times
+        self.doppler_hz = values
+        dt = np.diff(times)
+        self._slopes = np.diff(values) / dt
+        # Cycles accumulated from the first knot to each knot (trapezoids).
+        self._knot_cycles = np.concatenate(
+            [[0.0], np.cumsum(0.5 * (values[:-1] + values[1:]) * dt)]
+        )
+
+    def frequency(self, t: np.ndarray | float) -> np.ndarray:
+        """Instantaneous Doppler in Hz at times *t* (seconds)."""
+        return np.interp(t, self.times_s, self.doppler_hz)
+
+    def _antiderivative(self, t: np.ndarray) -> np.ndarray:
+        """Cycles from the first knot to *t* (negative before it)."""
+        seg = np.searchsorted(self.times_s, t, side="right") - 1
+        knot = np.clip(seg, 0, self.times_s.size - 1)
+        inside = (seg >= 0) & (seg < self.times_s.size - 1)
+        slope = np.where(
+            inside, self._slopes[np.clip(seg, 0, self._slopes.size - 1)], 0.0
+        )
+        dt = t - self.times_s[knot]
+        return self._knot_cycles[knot] + dt * (self.doppler_hz[knot] + 0.5 * slope * dt)
+
+    def cycles(self, t0: float, tau: np.ndarray | float) -> np.ndarray:
+        """Phase in cycles accumulated from *t0* to ``t0 + tau``."""
+        if self._slopes.size == 0:
+            return self.doppler_hz[0] * np.asarray(tau, dtype=np.float64)
+        tau = np.asarray(tau, dtype=np.float64)
+        return self._antiderivative(t0 + tau) - self._antiderivative(np.float64(t0))
+
+
+DopplerProfile = PolynomialDoppler | SampledDoppler
+
+
+class DopplerRotator:
+    """Streaming Doppler rotation with a block-carried phase accumulator.
+
+    Samples are pushed through :meth:`process` in blocks of any size; the
+    sample index and the accumulated phase are carried between calls, so
+    the concatenated output equals rotating the whole signal at once (up
+    to rounding).
+
+    Args:
+        profile: Doppler profile (see :data:`DopplerProfile`).
+        fs_hz: Sample rate in Hz.
+        start: Sample index of the first sample that will be pushed.
+        inverse: Apply the conjugate rotation, e.g. to pre-compensate a
+            predicted Doppler at the receiver.
+    """
+
+    def __init__(
+        self,
+        profile: DopplerProfile,
+        fs_hz: float,
+        start: int = 0,
+        inverse: bool = False,
+    ) -> None:
+        if fs_hz <= 0:
+            raise ValueError("fs_hz must be positive")
+        if start < 0:
+            raise ValueError("start must be non-negative")
+        self.profile = profile
+        self.fs_hz = float(fs_hz)
+        self.position = int(start)
+        self._sign = -1.0 if inverse else 1.0
+        self._phase = float(profile.cycles(0.0, start / self.fs_hz)) % 1.0
+
+    def process(self, x: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Rotate the next block of samples.
+
+        Args:
+            x: Complex samples ``(..., n)``; leading axes are batch rows
+                sharing the profile and sample positions.
+            out: Optional destination with the shape of *x* and the dtype of
+                the result (may be *x* for in-place).
+
+        Returns:
+            Rotated samples, complex64 for complex64 input, else complex128.
+        """
+        x = as_complex(x)
+        if x.ndim < 1:
+            raise ValueError("x must be a complex array with at least 1 dimension")
+        if out is None:
+            out = np.empty(x.shape, dtype=x.dtype)
+        else:
+            check_out(out, x.shape, x.dtype)
+        n = x.shape[-1]
+        for lo in range(0, n, _BLOCK_SAMPLES):
+            hi = min(lo + _BLOCK_SAMPLES, n)
+            t0 = self.position / self.fs_hz
+            tau = np.arange(hi - lo, dtype=np.float64) / self.fs_hz
+            cycles = self.profile.cycles(t0, tau)
+            cycles += self._phase
+            ramp = np.exp((self._sign * 2j * np.pi) * cycles)
+            np.multiply(
+                x[..., lo:hi], ramp.astype(x.dtype, copy=False), out=out[..., lo:hi]
+            )
+            end = float(self.profile.cycles(t0, (hi - lo) / self.fs_hz))
+            self._phase = (self._phase + end) % 1.0
+            self.position += hi - lo
+        return out
+
+
+def apply_doppler(
+    x: np.ndarray,
+    fs_hz: float,
+    profile: DopplerProfile,
+    out: np.ndarray | None = None,
+    start: int = 0,
+) -> np.ndarray:
+    """Apply a time-varying Doppler shift along the last axis.
+
+    A constant :class:`PolynomialDoppler` reproduces
+    :func:`ntn_linksim.channel.cfo.apply_cfo` up to rounding.
+
+    Args:
+        x: Complex samples, ``(..., n_samples)``.
+        fs_hz: Sample rate in Hz.
+        profile: Doppler profile (see :data:`DopplerProfile`).
+        out: Optional destination with the dtype of the result (may be *x*
+            for in-place).
+        start: Sample index of ``x[..., 0]`` within the transmission, for
+            block-by-block streaming.
+
+    Returns:
+        Rotated samples, complex64 for complex64 input, else complex128.
+    """
+    x = np.asarray(x)
+    if x.ndim < 1 or not np.iscomplexobj(x):
+        raise ValueError("x must be a complex array with at least 1 dimension")
+    return DopplerRotator(profile, fs_hz, start=start).process(x, out=out)
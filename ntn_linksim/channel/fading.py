@@ -0,0 +1,274 @@
+"""Time-correlated Rayleigh fading processes.
+
+The block fading models (:mod:`ntn_linksim.channel.rician`,
+:mod:`ntn_linksim.channel.tdl`) draw i.i.d. scatter per OFDM symbol.  The
+processes here replace those draws with complex unit-power Gaussian
+processes whose autocorrelation follows a Doppler spectrum of maximum
+Doppler ``max_doppler_hz``.  Consecutive symbols are then correlated over
+the coherence time, and deep fades last long enough to cause error bursts.
+
+Two spectrum shapes are available (:data:`DOPPLER_SPECTRA`): ``"jakes"``
+(Clarke's U-shaped spectrum of uniform scattering, autocorrelation
+``J0(2*pi*fd*tau)``) and ``"flat"`` (uniform in ``[-fd, fd]``,
+autocorrelation ``sinc(2*fd*tau)``).  Two generators produce them
+(:data:`FADING_METHODS`):
+
+* :class:`SosFading` sums ``n_sinusoids`` complex exponentials per process
+  with stratified random Doppler frequencies and phases.  The sum over all
+  time indices ``k = q*B + r`` is the matrix product of a ``(q, n)`` and
+  an ``(n, r)`` exponential table, so a call costs ``O(n_sinusoids *
+  sqrt(n))`` exponentials plus one batched matrix product.
+* :class:`FilteredFading` shapes complex white Gaussian noise in the
+  frequency domain by the square root of the spectrum and takes the
+  inverse DFT over a period spanning many coherence times ``1 / fd``, so
+  the spectrum is resolved by about a hundred bins within ``+-fd``; only
+  those bins are drawn.
+
+Both carry their state (the sample index) between :meth:`generate` calls,
+so a stream cut into blocks gives the same process as one call.  Leading
+``shape`` axes are independent processes, e.g. frames or TDL taps.
+"""
+
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+DOPPLER_SPECTRA = ("jakes", "flat")
+FADING_METHODS = ("sos", "filtered")
+
+# Coherence times (1 / max_doppler_hz) spanned by a FilteredFading period.
+_PERIOD_COHERENCE_TIMES = 64
+
+
+def _check(max_doppler_hz: float, sample_rate_hz: float, spectrum: str) -> None:
+    if not (max_doppler_hz > 0 and math.isfinite(max_doppler_hz)):
+        raise ValueError("max_doppler_hz must be positive and finite")
+    if not sample_rate_hz > 0:
+        raise ValueError("sample_rate_hz must be positive")
+    if max_doppler_hz > sample_rate_hz / 2:
+        raise ValueError("max_doppler_hz must not exceed half the sample rate")
+    if spectrum not in DOPPLER_SPECTRA:
+        raise ValueError(f"spectrum must be one of {DOPPLER_SPECTRA}")
+
+
+class SosFading:
+    """Sum-of-sinusoids fading generator.
+
+    Each process is ``sum_n exp(j*(2*pi*f_n*t + phi_n)) / sqrt(n_sinusoids)``.
+    For ``"jakes"`` the frequencies are ``fd*cos(alpha_n)`` with the arrival
+    angles ``alpha_n`` stratified over the circle; for ``"flat"`` they are
+    stratified over ``[-fd, fd]``.  Frequencies and phases are drawn once,
+    at construction.
+
+    Args:
+        max_doppler_hz: Maximum Doppler frequency ``fd``.
+        sample_rate_hz: Rate of the generated samples (e.g. the OFDM symbol
+            rate for one coefficient per symbol).
+        rng: Generator for the frequencies and phases.
+        shape: Shape of the independent processes.
+        spectrum: Doppler spectrum shape (see :data:`DOPPLER_SPECTRA`).
+        n_sinusoids: Sinusoids per process.
+    """
+
+    def __init__(
+        self,
+        max_doppler_hz: float,
+        sample_rate_hz: float,
+        rng: np.random.Generator,
+        shape: tuple[int, ...] = (),
+        spectrum: str = "jakes",
+        n_sinusoids: int = 16,
+    ) -> None:
+        _check(max_doppler_hz, sample_rate_hz, spectrum)
+        if n_sinusoids <= 0:
+            raise ValueError("n_sinusoids must be positive")
+        self.shape = tuple(shape)
+        self.position = 0
+        strata = (np.arange(n_sinusoids) + rng.random((*self.shape, n_sinusoids))) / (
+            n_sinusoids
+        )
+        if spectrum == "jakes":
+            freqs = max_doppler_hz * np.cos(2.0 * np.pi * strata)
+        else:
+            freqs = max_doppler_hz * (2.0 * strata - 1.0)
+        # Radians per sample, and the initial phases.
+        self._omega = 2.0 * np.pi * freqs / sample_rate_hz
+        self._phase = 2.0 * np.pi * rng.random((*self.shape, n_sinusoids))
+        self._scale = 1.0 / math.sqrt(n_sinusoids)
+
+    def generate(self, n: int) -> np.ndarray:
+        """Return the next *n* samples, ``(*shape, n)`` complex128."""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        amplitudes = self._scale * np.exp(1j * self._phase)
+        samples = _tone_sum(self._omega, amplitudes, self.position, n)
+        self.position += n
+        return samples
+
+
+def _tone_sum(
+    omega: np.ndarray, amplitudes: np.ndarray, start: int, n: int
+) -> np.ndarray:
+    """``sum_t amplitudes[..., t] * exp(1j * omega[..., t] * k)`` for the *n*
+    sample indices ``k`` from *start*.
+
+    With ``k = start + q*B + r`` the sum is the matrix product of a
+    ``(q, tone)`` and a ``(tone, r)`` exponential table.
+    """
+    n_lo = max(1, math.isqrt(max(n - 1, 0)) + 1)
+    n_hi = -(-n // n_lo)
+    starts = start + n_lo * np.arange(n_hi, dtype=np.float64)
+    # (..., n_hi, n_tones) @ (..., n_tones, n_lo)
+    coarse = amplitudes[..., np.newaxis, :] * np.exp(
+        1j * omega[..., np.newaxis, :] * starts[:, np.newaxis]
+    )
+    fine = np.exp(1j * omega[..., np.newaxis] * np.arange(n_lo))
+    samples = coarse @ fine
+    return samples.reshape(*samples.shape[:-2], n_hi * n_lo)[..., :n]
+
+
+def doppler_spectrum_bins(
+    max_doppler_hz: float,
+    sample_rate_hz: float,
+    length: int,
+    spectrum: str = "jakes",
+) -> tuple[np.ndarray, np.ndarray]:
+    """Doppler spectrum integrated over the bins of a *length*-point DFT.
+
+    Integrating over each bin keeps the Jakes spectrum's edge singularities
+    finite.  When ``max_doppler_hz`` is below half a bin, all the power is
+    in bin 0 and the process is constant over the period.
+
+    Args:
+        max_doppler_hz: Maximum Doppler frequency ``fd``.
+        sample_rate_hz: Sample rate of the process.
+        length: DFT length (the process period in samples).
+        spectrum: Doppler spectrum shape (see :data:`DOPPLER_SPECTRA`).
+
+    Returns:
+        ``(bins, power)``: the signed bin indices with non-zero power and
+        their power, normalized to sum to one.
+    """
+    _check(max_doppler_hz, sample_rate_hz, spectrum)
+    if length <= 0:
+        raise ValueError("length must be positive")
+    # Bin width in units of fd; bins beyond +-fd carry no power.
+    step = sample_rate_hz / length / max_doppler_hz
+    reach = math.ceil(1.0 / step + 0.5)
+    bins = np.arange(max(-reach, -(length // 2)), min(reach, (length - 1) // 2) + 1)
+    lo = np.clip((bins - 0.5) * step, -1.0, 1.0)
+    hi = np.clip((bins + 0.5) * step, -1.0, 1.0)
+    power = np.arcsin(hi) - np.arcsin(lo) if spectrum == "jakes" else hi - lo
+    keep = power > 0
+    return bins[keep], power[keep] / np.sum(power[keep])
+
+
+def filtered_period(
+    max_doppler_hz: float, sample_rate_hz: float, min_length: int = 1
+) -> int:
+    """Default :class:`FilteredFading` period: the smallest power of two
+    spanning both *min_length* samples and 64 coherence times ``1 / fd``.
+
+    The DFT bins are then at most ``fd / 64`` apart, so about 128 of them
+    resolve the spectrum whatever the Doppler.
+    """
+    span = _PERIOD_COHERENCE_TIMES * sample_rate_hz / max_doppler_hz
+    return 1 << max(math.ceil(math.log2(max(span, min_length))), 0)
+
+
+class FilteredFading:
+    """Fading generator from frequency-domain shaped Gaussian noise.
+
+    One period of ``length`` samples is the inverse DFT of complex white
+    noise weighted by the square root of :func:`doppler_spectrum_bins`.
+    Only the bins within ``+-fd`` are drawn (at construction, real and
+    imaginary parts interleaved), so the process is a sum of those
+    bin-aligned tones.  :meth:`generate` reads consecutive windows of the
+    period: from the start of the period it takes whichever is cheaper of
+    one inverse FFT over the period and summing the tones directly; later
+    blocks (streaming) always sum the tones.  Beyond ``length`` samples the
+    process repeats.
+
+    Args:
+        max_doppler_hz: Maximum Doppler frequency ``fd``.
+        sample_rate_hz: Rate of the generated samples.
+        rng: Generator for the bin amplitudes.
+        shape: Shape of the independent processes.
+        spectrum: Doppler spectrum shape (see :data:`DOPPLER_SPECTRA`).
+        length: Period in samples; default :func:`filtered_period`.
+
+    Raises:
+        ValueError: If *length* puts ``max_doppler_hz`` below half a DFT
+            bin, where the process would be constant.
+    """
+
+    def __init__(
+        self,
+        max_doppler_hz: float,
+        sample_rate_hz: float,
+        rng: np.random.Generator,
+        shape: tuple[int, ...] = (),
+        spectrum: str = "jakes",
+        length: int | None = None,
+    ) -> None:
+        _check(max_doppler_hz, sample_rate_hz, spectrum)
+        if length is None:
+            length = filtered_period(max_doppler_hz, sample_rate_hz)
+        elif 2 * max_doppler_hz * length < sample_rate_hz:
+            raise ValueError(
+                "max_doppler_hz is below half a DFT bin of the period; "
+                "use a longer length"
+            )
+        bins, power = doppler_spectrum_bins(
+            max_doppler_hz, sample_rate_hz, length, spectrum
+        )
+        self.shape = tuple(shape)
+        self.length = length
+        self.position = 0
+        self._bins = bins
+        draws = rng.standard_normal((*self.shape, bins.size, 2))
+        self._amplitudes = np.sqrt(power / 2.0) * (draws[..., 0] + 1j * draws[..., 1])
+
+    def generate(self, n: int) -> np.ndarray:
+        """Return the next *n* samples, ``(*shape, n)`` complex128."""
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        fft_cost = self.length * math.log2(max(self.length, 2))
+        if self.position == 0 and n <= self.length and fft_cost < n * self._bins.size:
+            spectrum = np.zeros((*self.shape, self.length), dtype=np.complex128)
+            spectrum[..., self._bins % self.length] = self._amplitudes
+            samples = np.fft.ifft(spectrum, norm="forward")[..., :n]
+        else:
+            omega = 2.0 * np.pi * self._bins / self.length
+            samples = _tone_sum(omega, self._amplitudes, self.position, n)
+        self.position += n
+        return samples
+
+
+FadingProcess = SosFading | FilteredFading
+
+
+def fading_process(
+    method: str,
+    max_doppler_hz: float,
+    sample_rate_hz: float,
+    rng: np.random.Generator,
+    shape: tuple[int, ...] = (),
+    spectrum: str = "jakes",
+    length: int | None = None,
+) -> FadingProcess:
+    """Build a :class:`SosFading` (``"sos"``) or :class:`FilteredFading`
+    (``"filtered"``, with period *length*) generator.
+
+    Raises:
+        ValueError: If *method* is not in :data:`FADING_METHODS`.
+    """
+    if method == "sos":
+        return SosFading(max_doppler_hz, sample_rate_hz, rng, shape, spectrum)
+    if method == "filtered":
+        return FilteredFading(
+            max_doppler_hz, sample_rate_hz, rng, shape, spectrum, length
+        )
+    raise ValueError(f"method must be one of {FADING_METHODS}")
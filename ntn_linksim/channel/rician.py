@@ -4,16 +4,22 @@ from __future__ import annotations
 
 import numpy as np
 
+from ntn_linksim.precision import as_complex
+from ntn_linksim.workspace import check_out
+
 
 def apply_rician_fading(
     tx_with_cp: np.ndarray,
     rician_k_db: float,
     rng: np.random.Generator,
+    out: np.ndarray | None = None,
+    scatter: np.ndarray | None = None,
 ) -> np.ndarray:
     """Apply single-tap block Rician fading to OFDM symbols.
 
-    One i.i.d. complex coefficient per OFDM symbol (flat fading).
-    All subcarriers within a symbol see the same gain.
+    One complex coefficient per OFDM symbol (flat fading), i.i.d. unless a
+    time-correlated *scatter* is given.  All subcarriers within a symbol
+    see the same gain.
 
     The channel coefficient for symbol *s* is:
 
@@ -23,34 +29,81 @@ def apply_rician_fading(
     signal power (and therefore SNR meaning) is preserved.
 
     Args:
-        tx_with_cp: 2-D complex array (n_symbols, n_fft + cp_len).
+        tx_with_cp: Complex array (..., n_symbols, n_fft + cp_len).  Leading
+            axes are batch dimensions, each drawing its own coefficients.
         rician_k_db: Rician K-factor in dB.  Typical LEO LoS: 10 dB.
         rng: NumPy Generator for reproducibility.
+        out: Optional destination with the shape and dtype of the input
+            (may be *tx_with_cp* itself).
+        scatter: Optional ``(..., n_symbols)`` complex unit-power scatter
+            (e.g. from :mod:`ntn_linksim.channel.fading`) used instead of
+            drawing from *rng*.
 
     Returns:
         Faded signal, same shape and dtype as input.
 
     Raises:
-        ValueError: If *tx_with_cp* is not 2-D or not complex.
+        ValueError: If *tx_with_cp* is not at least 2-D or not complex.
     """
     tx_with_cp = np.asarray(tx_with_cp)
-    if tx_with_cp.ndim != 2:
-        raise ValueError("tx_with_cp must be a 2-D array")
+    if tx_with_cp.ndim < 2:
+        raise ValueError("tx_with_cp must be at least a 2-D array")
     if not np.iscomplexobj(tx_with_cp):
         raise ValueError("tx_with_cp must be complex")
 
-    tx_with_cp = tx_with_cp.astype(np.complex128, copy=False)
-    n_symbols = tx_with_cp.shape[0]
+    tx_with_cp = as_complex(tx_with_cp)
+    coeff_shape = tx_with_cp.shape[:-1]
+
+    if scatter is not None:
+        if scatter.shape != coeff_shape:
+            raise ValueError(f"scatter must have shape {coeff_shape}")
+        h = rician_scatter_gain(rician_k_db, scatter)
+    else:
+        # CN(0,1) / sqrt(2) has unit total variance split across real/imag
+        h = rician_gain(
+            rician_k_db,
+            rng.standard_normal(coeff_shape),
+            rng.standard_normal(coeff_shape),
+        )
+    h = h[..., np.newaxis].astype(tx_with_cp.dtype, copy=False)
+    if out is not None:
+        check_out(out, tx_with_cp.shape, tx_with_cp.dtype)
+        return np.multiply(tx_with_cp, h, out=out)
+    return tx_with_cp * h
+
+
+def rician_gain(
+    rician_k_db: float, scatter_re: np.ndarray, scatter_im: np.ndarray
+) -> np.ndarray:
+    """Rician coefficients from standard-normal draws of the scatter part.
 
-    k_lin = 10.0 ** (rician_k_db / 10.0)
-    los_amp = np.sqrt(k_lin / (k_lin + 1.0))
-    nlos_amp = np.sqrt(1.0 / (k_lin + 1.0))
+    Computes ``h = sqrt(K/(K+1)) + sqrt(1/(K+1)) * (re + j*im) / sqrt(2)``.
+    :func:`apply_rician_fading` draws *scatter_re* then *scatter_im* from
+    one generator; streaming runs draw them block by block.
 
-    # CN(0,1) / sqrt(2) has unit total variance split across real/imag
-    scatter = (
-        rng.standard_normal(n_symbols) + 1j * rng.standard_normal(n_symbols)
-    ).astype(np.complex128) / np.sqrt(2.0)
+    Args:
+        rician_k_db: Rician K-factor in dB.
+        scatter_re: Standard-normal draws for the real part.
+        scatter_im: Standard-normal draws for the imaginary part.
+
+    Returns:
+        Complex coefficients with the shape of *scatter_re*.
+    """
+    scatter = (scatter_re + 1j * scatter_im).astype(np.complex128) / np.sqrt(2.0)
+    return rician_scatter_gain(rician_k_db, scatter)
 
-    h = los_amp + nlos_amp * scatter  # shape (n_symbols,)
 
-    return tx_with_cp * h[:, np.newaxis]
+def rician_scatter_gain(rician_k_db: float, scatter: np.ndarray) -> np.ndarray:
+    """Rician coefficients ``sqrt(K/(K+1)) + sqrt(1/(K+1)) * scatter``.
+
+    Args:
+        rician_k_db: Rician K-factor in dB.
+        scatter: Complex unit-power scatter component.
+
+    Returns:
+        Complex coefficients with the shape of *scatter*.
+    """
+    k_lin = 10.0 ** (rician_k_db / 10.0)
+    los_amp = np.sqrt(k_lin / (k_lin + 1.0))
+    nlos_amp = np.sqrt(1.0 / (k_lin + 1.0))
+    return los_amp + nlos_amp * scatter
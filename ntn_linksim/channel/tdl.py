@@ -0,0 +1,359 @@
+"""Frequency-selective tapped-delay-line (TDL) fading.
+
+The 3GPP TR 38.811 NTN-TDL-A/B (NLOS) and NTN-TDL-C/D (LOS) profiles give
+each tap a normalized delay, a power and a fading type.  Delays scale with
+the delay spread; powers are normalized to unit total.  Rayleigh taps draw
+one complex gain per OFDM symbol (block fading, as in
+:mod:`ntn_linksim.channel.rician`) and the LOS tap of the C/D profiles is
+constant.  :func:`tdl_tap_gains` draws the gains of every symbol (and batch
+row) in one call.
+
+When the longest tap fits in the cyclic prefix, the channel is a
+per-subcarrier multiplication.  :func:`tdl_frequency_response` evaluates
+``H[s, k] = sum_l g[s, l] * exp(-2j*pi * f_k * tau_l)`` on the FFT bins as
+one matrix product, and :func:`apply_tdl_grid` scales the
+``(..., n_symbols, n_fft)`` grid by it before the IFFT.  No time-domain
+convolution over the serialized frame is needed.  Longer profiles need
+the inter-symbol interference.  :func:`apply_tdl_time` convolves the
+CP-extended symbols with the band-limited (sinc-interpolated) impulse
+response of each symbol by overlap-save.  Every symbol is one output
+block, so all blocks are transformed together.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from ntn_linksim.fft_backend import NUMPY_FFT, FftBackend
+from ntn_linksim.precision import as_complex
+from ntn_linksim.workspace import check_out
+
+# Sinc side lobes kept on each side of the tap delays by the time-domain path.
+_SINC_HALF_WIDTH = 8
+
+
+@dataclass(frozen=True)
+class TdlProfile:
+    """Tapped-delay-line power delay profile.
+
+    Args:
+        name: Profile name.
+        delays: Tap delays normalized by the delay spread.
+        powers_db: Tap powers in dB (normalized to unit total on use).
+        los: Whether each tap is a constant line-of-sight path (else
+            Rayleigh).
+    """
+
+    name: str
+    delays: tuple[float, ...]
+    powers_db: tuple[float, ...]
+    los: tuple[bool, ...]
+
+    def validate(self) -> None:
+        if not self.delays or not (
+            len(self.delays) == len(self.powers_db) == len(self.los)
+        ):
+            raise ValueError("delays, powers_db and los must be equal-length")
+        if min(self.delays) < 0:
+            raise ValueError("tap delays must be non-negative")
+
+    @property
+    def n_fading(self) -> int:
+        """Number of Rayleigh taps (complex gains drawn per symbol)."""
+        return sum(not los for los in self.los)
+
+    def amplitudes(self) -> np.ndarray:
+        """Tap amplitudes ``sqrt(p_l)`` with ``sum(p_l) == 1``."""
+        power = 10.0 ** (np.asarray(self.powers_db, dtype=np.float64) / 10.0)
+        return np.sqrt(power / power.sum())
+
+    def delay_samples(self, delay_spread_s: float, fs_hz: float) -> np.ndarray:
+        """Tap delays in (fractional) samples."""
+        return np.asarray(self.delays, dtype=np.float64) * delay_spread_s * fs_hz
+
+    @property
+    def k_factor_db(self) -> float | None:
+        """Power ratio of the LOS taps to the rest in dB (None for NLOS)."""
+        if not any(self.los):
+            return None
+        power = self.amplitudes() ** 2
+        los = np.asarray(self.los)
+        return float(10.0 * np.log10(power[los].sum() / power[~los].sum()))
+
+
+# 3GPP TR 38.811 Tables 6.9.2-1 to 6.9.2-4.
+NTN_TDL_PROFILES = {
+    profile.name: profile
+    for profile in (
+        TdlProfile(
+            "NTN-TDL-A",
+            (0.0, 1.0811, 2.8416),
+            (0.0, -4.675, -6.482),
+            (False, False, False),
+        ),
+        TdlProfile(
+            "NTN-TDL-B",
+            (0.0, 0.7249, 0.7410, 5.7392),
+            (0.0, -1.973, -4.332, -11.914),
+            (False, False, False, False),
+        ),
+        TdlProfile(
+            "NTN-TDL-C",
+            (0.0, 0.0, 14.8124),
+            (-0.394, -10.618, -23.373),
+            (True, False, False),
+        ),
+        TdlProfile(
+            "NTN-TDL-D",
+            (0.0, 0.0, 0.5596, 7.3340),
+            (-0.284, -11.991, -9.887, -16.771),
+            (True, False, False, False),
+        ),
+    )
+}
+
+
+def get_tdl_profile(name: str) -> TdlProfile:
+    """Look up a profile in :data:`NTN_TDL_PROFILES`.
+
+    Raises:
+        ValueError: If *name* is not a known profile.
+    """
+    try:
+        return NTN_TDL_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"unknown TDL profile {name!r}; valid: {sorted(NTN_TDL_PROFILES)}"
+        ) from None
+
+
+def tdl_gains_from_normals(
+    profile: TdlProfile, scatter_re: np.ndarray, scatter_im: np.ndarray
+) -> np.ndarray:
+    """Tap gains from standard-normal draws of the Rayleigh taps.
+
+    Args:
+        profile: Power delay profile.
+        scatter_re: ``(..., n_fading)`` draws for the real parts.
+        scatter_im: Draws for the imaginary parts, same shape.
+
+    Returns:
+        ``(..., n_taps)`` complex128 gains with ``E[sum |g|^2] == 1``.
+    """
+    scatter = (scatter_re + 1j * scatter_im) / np.sqrt(2.0)
+    return tdl_scatter_gains(profile, scatter)
+
+
+def tdl_scatter_gains(profile: TdlProfile, scatter: np.ndarray) -> np.ndarray:
+    """Tap gains from the complex unit-power scatter of the Rayleigh taps.
+
+    Args:
+        profile: Power delay profile.
+        scatter: ``(..., n_fading)`` complex scatter, e.g. time-correlated
+            along the symbol axis (see :mod:`ntn_linksim.channel.fading`).
+
+    Returns:
+        ``(..., n_taps)`` complex128 gains.
+    """
+    amplitudes = profile.amplitudes()
+    los = np.asarray(profile.los)
+    gains = np.empty(scatter.shape[:-1] + (len(profile.los),), dtype=np.complex128)
+    gains[..., los] = amplitudes[los]
+    gains[..., ~los] = amplitudes[~los] * scatter
+    return gains
+
+
+def tdl_tap_gains(
+    profile: TdlProfile,
+    shape: tuple[int, ...],
+    rng: np.random.Generator,
+    scatter: np.ndarray | None = None,
+) -> np.ndarray:
+    """Draw ``(*shape, n_taps)`` tap gains, e.g. one row per OFDM symbol.
+
+    The real parts of every Rayleigh tap are drawn first, then the
+    imaginary parts, each as one ``(*shape, n_fading)`` array.  A given
+    ``(*shape, n_fading)`` *scatter* is used instead of drawing.
+    """
+    profile.validate()
+    if scatter is not None:
+        if scatter.shape != (*shape, profile.n_fading):
+            raise ValueError(f"scatter must have shape {(*shape, profile.n_fading)}")
+        return tdl_scatter_gains(profile, scatter)
+    draw_shape = (*shape, profile.n_fading)
+    scatter_re = rng.standard_normal(draw_shape)
+    scatter_im = rng.standard_normal(draw_shape)
+    return tdl_gains_from_normals(profile, scatter_re, scatter_im)
+
+
+@lru_cache(maxsize=32)
+def _steering(
+    profile: TdlProfile, delay_spread_s: float, fs_hz: float, n_fft: int
+) -> np.ndarray:
+    """``(n_taps, n_fft)`` phase of each tap delay on the FFT bins."""
+    freqs = np.fft.fftfreq(n_fft)
+    delays = profile.delay_samples(delay_spread_s, fs_hz)
+    steering = np.exp(-2j * np.pi * delays[:, np.newaxis] * freqs)
+    steering.setflags(write=False)
+    return steering
+
+
+def tdl_frequency_response(
+    profile: TdlProfile,
+    gains: np.ndarray,
+    delay_spread_s: float,
+    fs_hz: float,
+    n_fft: int,
+) -> np.ndarray:
+    """Channel frequency response on the FFT bins.
+
+    Args:
+        profile: Power delay profile.
+        gains: ``(..., n_taps)`` tap gains.
+        delay_spread_s: Delay spread scaling the normalized delays.
+        fs_hz: Sample rate in Hz.
+        n_fft: FFT size (bins in FFT order, as in the OFDM grid).
+
+    Returns:
+        ``(..., n_fft)`` complex128 response.
+    """
+    return gains @ _steering(profile, float(delay_spread_s), float(fs_hz), n_fft)
+
+
+def apply_tdl_grid(
+    grid: np.ndarray,
+    profile: TdlProfile,
+    delay_spread_s: float,
+    fs_hz: float,
+    rng: np.random.Generator,
+    out: np.ndarray | None = None,
+    scatter: np.ndarray | None = None,
+) -> np.ndarray:
+    """Apply TDL fading to a ``(..., n_symbols, n_fft)`` frequency grid.
+
+    Exact for the CP-OFDM link when the longest tap (plus the sinc spread
+    of fractional delays) fits in the cyclic prefix.
+
+    Args:
+        grid: Complex subcarrier grid; leading axes are batch rows.
+        profile: Power delay profile.
+        delay_spread_s: Delay spread in seconds.
+        fs_hz: Sample rate in Hz.
+        rng: Generator for the tap gains (see :func:`tdl_tap_gains`).
+        out: Optional destination with the shape and dtype of *grid* (may
+            be *grid* itself).
+        scatter: Optional ``(..., n_symbols, n_fading)`` Rayleigh scatter
+            used instead of drawing from *rng*.
+
+    Returns:
+        Faded grid, same shape and dtype as *grid*.
+    """
+    grid = as_complex(grid)
+    if grid.ndim < 2:
+        raise ValueError("grid must be at least a 2-D array")
+    gains = tdl_tap_gains(profile, grid.shape[:-1], rng, scatter)
+    response = tdl_frequency_response(
+        profile, gains, delay_spread_s, fs_hz, grid.shape[-1]
+    ).astype(grid.dtype, copy=False)
+    if out is not None:
+        check_out(out, grid.shape, grid.dtype)
+    return np.multiply(grid, response, out=out)
+
+
+def tdl_impulse_response(
+    profile: TdlProfile, gains: np.ndarray, delay_spread_s: float, fs_hz: float
+) -> tuple[np.ndarray, int]:
+    """Band-limited impulse response of each gain row.
+
+    Each tap is a sinc centred on its (fractional) delay, truncated to
+    ``_SINC_HALF_WIDTH`` samples either side; integer delays give exact
+    impulses.
+
+    Returns:
+        ``(h, lead)``: ``(..., n_lags)`` taps for lags ``-lead ..
+        n_lags - lead - 1``.
+    """
+    delays = profile.delay_samples(delay_spread_s, fs_hz)
+    integer = np.all(delays == np.round(delays))
+    lead = 0 if integer else _SINC_HALF_WIDTH
+    last = int(math.ceil(delays.max())) + (0 if integer else _SINC_HALF_WIDTH)
+    lags = np.arange(-lead, last + 1, dtype=np.float64)
+    kernel = np.sinc(lags - delays[:, np.newaxis])
+    return gains @ kernel, lead
+
+
+def apply_tdl_time(
+    tx_with_cp: np.ndarray,
+    profile: TdlProfile,
+    delay_spread_s: float,
+    fs_hz: float,
+    rng: np.random.Generator,
+    out: np.ndarray | None = None,
+    backend: FftBackend = NUMPY_FFT,
+    scatter: np.ndarray | None = None,
+) -> np.ndarray:
+    """Apply TDL fading to CP-extended OFDM symbols in the time domain.
+
+    The serialized frame is convolved by overlap-save with one output block
+    per OFDM symbol, each with that symbol's impulse response, so delays
+    beyond the CP leak into the next symbol.  Samples before the frame are
+    zero and the tail past its end is dropped.
+
+    Args:
+        tx_with_cp: ``(..., n_symbols, n_fft + cp_len)`` complex samples.
+        profile: Power delay profile.
+        delay_spread_s: Delay spread in seconds.
+        fs_hz: Sample rate in Hz.
+        rng: Generator for the tap gains (see :func:`tdl_tap_gains`).
+        out: Optional destination with the shape and dtype of *tx_with_cp*
+            (may be *tx_with_cp* itself).
+        backend: FFT backend for the block convolutions.
+        scatter: Optional ``(..., n_symbols, n_fading)`` Rayleigh scatter
+            used instead of drawing from *rng*.
+
+    Returns:
+        Faded symbols, same shape and dtype as *tx_with_cp*.
+    """
+    tx_with_cp = as_complex(tx_with_cp)
+    if tx_with_cp.ndim < 2:
+        raise ValueError("tx_with_cp must be at least a 2-D array")
+    gains = tdl_tap_gains(profile, tx_with_cp.shape[:-1], rng, scatter)
+    h, lead = tdl_impulse_response(profile, gains, delay_spread_s, fs_hz)
+    n_lags = h.shape[-1]
+    sym_len = tx_with_cp.shape[-1]
+    n_symbols = tx_with_cp.shape[-2]
+    batch = tx_with_cp.shape[:-2]
+    n_conv = 1 << (sym_len + n_lags - 2).bit_length()
+
+    # Symbol s needs input from n_lags - 1 - lead samples before it to lead
+    # samples after it.
+    samples = tx_with_cp.reshape(*batch, n_symbols * sym_len)
+    padded = np.zeros((*batch, samples.shape[-1] + n_lags - 1), dtype=np.complex128)
+    padded[..., n_lags - 1 - lead : n_lags - 1 - lead + samples.shape[-1]] = samples
+    windows = np.lib.stride_tricks.sliding_window_view(
+        padded, sym_len + n_lags - 1, axis=-1
+    )[..., ::sym_len, :]
+    segments = np.zeros((*batch, n_symbols, n_conv), dtype=np.complex128)
+    segments[..., : sym_len + n_lags - 1] = windows
+    kernels = np.zeros_like(segments)
+    kernels[..., :n_lags] = h
+    spectrum = backend.fft(segments, out=segments)
+    spectrum *= backend.fft(kernels, out=kernels)
+    conv = backend.ifft(spectrum, out=spectrum)
+    blocks = conv[..., n_lags - 1 : n_lags - 1 + sym_len]
+    if out is None:
+        return blocks.astype(tx_with_cp.dtype)
+    check_out(out, tx_with_cp.shape, tx_with_cp.dtype)
+    out[...] = blocks
+    return out
+
+
+def tdl_fits_cp(
+    profile: TdlProfile, delay_spread_s: float, fs_hz: float, cp_len: int
+) -> bool:
+    """Whether the longest tap delay is within *cp_len* samples."""
+    return float(profile.delay_samples(delay_spread_s, fs_hz).max()) <= cp_len
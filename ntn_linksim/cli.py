@@ -6,6 +6,10 @@ import argparse
 from dataclasses import replace
 from pathlib import Path
 
+from ntn_linksim.experiments.cache import ResultCache, default_cache_dir
+from ntn_linksim.experiments.render import PLOT_MODES, find_artifacts, render_all
+from ntn_linksim.experiments.runner import run_jobs
+from ntn_linksim.experiments.store import EXPORTABLE_SWEEPS, ResultStore
 from ntn_linksim.experiments.sweep import (
     save_sweep,
     save_sweep_cfo,
@@ -16,8 +20,202 @@ from ntn_linksim.experiments.sweep import (
     sweep_ber_vs_delay,
     sweep_ber_vs_rician_k,
 )
+from ntn_linksim.fft_backend import FFT_BACKENDS
+from ntn_linksim.precision import PRECISIONS
 from ntn_linksim.scenarios import load_scenario, reproduce_all, run_scenario
-from ntn_linksim.sim import SimConfig, run_once, save_run
+from ntn_linksim.sim import SimConfig, StopCriteria, save_run
+from ntn_linksim.stream import run_stream
+from ntn_linksim.trace import Tracer, active_tracer, tracing
+
+
+def _add_monte_carlo_args(parser: argparse.ArgumentParser) -> None:
+    """Add the sequential Monte Carlo options shared by simulation commands."""
+    parser.add_argument(
+        "--target-errors",
+        type=int,
+        default=None,
+        help=(
+            "Run frames per point until this many bit errors are observed "
+            "(enables Monte Carlo mode)"
+        ),
+    )
+    parser.add_argument(
+        "--ci-width",
+        type=float,
+        default=None,
+        help=(
+            "Stop a point once the 95%% CI width relative to BER is at most "
+            "this value (enables Monte Carlo mode)"
+        ),
+    )
+    parser.add_argument(
+        "--max-bits",
+        type=int,
+        default=10_000_000,
+        help="Bit budget per point in Monte Carlo mode (default: 1e7)",
+    )
+
+
+def _add_workers_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the process-pool size option shared by sweep commands."""
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Worker processes for sweep points (default: 1). Results are "
+            "identical for any worker count"
+        ),
+    )
+
+
+def _add_precision_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the sample precision option shared by simulation commands."""
+    parser.add_argument(
+        "--precision",
+        choices=PRECISIONS,
+        default="double",
+        help=(
+            "Sample precision carried through the chain: complex128 (double, "
+            "default) or complex64 (single)"
+        ),
+    )
+
+
+def _add_fft_args(parser: argparse.ArgumentParser) -> None:
+    """Add the FFT backend options shared by simulation commands."""
+    parser.add_argument(
+        "--fft-backend",
+        choices=FFT_BACKENDS,
+        default="numpy",
+        help=(
+            "FFT implementation: numpy (default), scipy (needs SciPy) or auto "
+            "(scipy when installed)"
+        ),
+    )
+    parser.add_argument(
+        "--fft-workers",
+        type=int,
+        default=1,
+        help="Threads per FFT call with the scipy backend (default: 1)",
+    )
+
+
+def _add_plot_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the plot rendering options shared by commands that save plots."""
+    parser.add_argument(
+        "--plots",
+        choices=PLOT_MODES,
+        default="inline",
+        help=(
+            "When to render PNGs: with each JSON (inline), after every point "
+            "is computed (deferred; reproduce renders on --workers), or never "
+            "(none). Default: inline"
+        ),
+    )
+    parser.add_argument(
+        "--no-plot",
+        dest="plots",
+        action="store_const",
+        const="none",
+        help="Write JSON artifacts only (same as --plots none; skips matplotlib)",
+    )
+
+
+def _add_trace_args(parser: argparse.ArgumentParser) -> None:
+    """Add the per-stage tracing options shared by simulation commands."""
+    parser.add_argument(
+        "--trace",
+        type=str,
+        default=None,
+        metavar="PATH",
+        help=(
+            "Trace every pipeline stage: write Chrome trace-event JSON to PATH "
+            "and a per-stage summary into the run/sweep JSON. Bypasses the "
+            "result cache so every point is traced"
+        ),
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="With --trace, also record each stage's peak allocation (slower)",
+    )
+
+
+def _trace_summary() -> dict | None:
+    tracer = active_tracer()
+    return None if tracer is None else tracer.summary()
+
+
+def _add_cache_args(parser: argparse.ArgumentParser) -> None:
+    """Add the result cache options shared by simulation commands."""
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Recompute every point instead of using the on-disk result cache",
+    )
+    _add_cache_dir_arg(parser)
+
+
+def _add_cache_dir_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help=f"Result cache directory (default: {default_cache_dir()})",
+    )
+
+
+def _add_store_arg(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--store",
+        type=str,
+        default=None,
+        help="Also append every evaluated point to this SQLite result store",
+    )
+
+
+def _result_store(args: argparse.Namespace) -> ResultStore | None:
+    return None if args.store is None else ResultStore(args.store)
+
+
+def _result_cache(args: argparse.Namespace) -> ResultCache | None:
+    """Return the result cache selected by CLI args, or None if disabled."""
+    if getattr(args, "no_cache", False) or getattr(args, "trace", None):
+        return None
+    return ResultCache(args.cache_dir)
+
+
+def _column_value(text: str) -> bool | int | float | str:
+    """Parse a ``--where`` value: a bool, int or float if it looks like one."""
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for parse in (int, float):
+        try:
+            return parse(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _print_bench_entry(entry: dict) -> None:
+    size = f"{entry['n_fft']}x{entry['n_symbols']}"
+    print(
+        f"{entry['name']:<34} {size:>10} {entry['seconds'] * 1e3:10.3f} ms "
+        f"{entry['samples_per_s'] / 1e6:9.2f} Msamples/s "
+        f"{entry['peak_bytes'] / 2**20:8.2f} MiB"
+    )
+
+
+def _stop_criteria(args: argparse.Namespace) -> StopCriteria | None:
+    """Return stopping rules from CLI args, or None for single-frame mode."""
+    if args.target_errors is None and args.ci_width is None:
+        return None
+    return StopCriteria(
+        target_errors=args.target_errors,
+        rel_ci_width=args.ci_width,
+        max_bits=args.max_bits,
+    )
 
 
 def _parse_args() -> argparse.Namespace:
@@ -39,6 +237,29 @@ def _parse_args() -> argparse.Namespace:
         default="results",
         help="Output directory for artifacts",
     )
+    sim_parser.add_argument(
+        "--n-symbols",
+        type=int,
+        default=200,
+        help="OFDM symbols per frame (default: 200)",
+    )
+    sim_parser.add_argument(
+        "--block-symbols",
+        type=int,
+        default=None,
+        help=(
+            "Stream a single-SNR run in blocks of this many OFDM symbols "
+            "(bounded memory for very long frames)"
+        ),
+    )
+    _add_monte_carlo_args(sim_parser)
+    _add_workers_arg(sim_parser)
+    _add_cache_args(sim_parser)
+    _add_store_arg(sim_parser)
+    _add_plot_arg(sim_parser)
+    _add_trace_args(sim_parser)
+    _add_precision_arg(sim_parser)
+    _add_fft_args(sim_parser)
 
     cfo_parser = subparsers.add_parser(
         "cfo-sweep",
@@ -73,6 +294,14 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip compensation curve (only plot no-compensation BER)",
     )
+    _add_monte_carlo_args(cfo_parser)
+    _add_workers_arg(cfo_parser)
+    _add_cache_args(cfo_parser)
+    _add_store_arg(cfo_parser)
+    _add_plot_arg(cfo_parser)
+    _add_trace_args(cfo_parser)
+    _add_precision_arg(cfo_parser)
+    _add_fft_args(cfo_parser)
 
     delay_parser = subparsers.add_parser(
         "delay-sweep",
@@ -103,6 +332,14 @@ def _parse_args() -> argparse.Namespace:
         action="store_true",
         help="Skip compensation curve (only plot no-compensation BER)",
     )
+    _add_monte_carlo_args(delay_parser)
+    _add_workers_arg(delay_parser)
+    _add_cache_args(delay_parser)
+    _add_store_arg(delay_parser)
+    _add_plot_arg(delay_parser)
+    _add_trace_args(delay_parser)
+    _add_precision_arg(delay_parser)
+    _add_fft_args(delay_parser)
 
     rician_parser = subparsers.add_parser(
         "rician-sweep",
@@ -128,6 +365,14 @@ def _parse_args() -> argparse.Namespace:
         default="results",
         help="Output directory for artifacts",
     )
+    _add_monte_carlo_args(rician_parser)
+    _add_workers_arg(rician_parser)
+    _add_cache_args(rician_parser)
+    _add_store_arg(rician_parser)
+    _add_plot_arg(rician_parser)
+    _add_trace_args(rician_parser)
+    _add_precision_arg(rician_parser)
+    _add_fft_args(rician_parser)
 
     scenario_parser = subparsers.add_parser(
         "run-scenario",
@@ -144,6 +389,11 @@ def _parse_args() -> argparse.Namespace:
         default="results",
         help="Output directory for artifacts",
     )
+    _add_workers_arg(scenario_parser)
+    _add_cache_args(scenario_parser)
+    _add_store_arg(scenario_parser)
+    _add_plot_arg(scenario_parser)
+    _add_trace_args(scenario_parser)
 
     reproduce_parser = subparsers.add_parser(
         "reproduce",
@@ -161,51 +411,232 @@ def _parse_args() -> argparse.Namespace:
         default="docs",
         help="Root output directory for artifacts",
     )
+    _add_workers_arg(reproduce_parser)
+    _add_cache_args(reproduce_parser)
+    _add_store_arg(reproduce_parser)
+    _add_plot_arg(reproduce_parser)
+    _add_trace_args(reproduce_parser)
+
+    render_parser = subparsers.add_parser(
+        "render",
+        help="Render sweep JSON artifacts into PNG plots",
+    )
+    render_parser.add_argument(
+        "path",
+        type=str,
+        help="A sweep JSON file, or a directory searched recursively for them",
+    )
+    render_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes for rendering (default: 1)",
+    )
+
+    store_parser = subparsers.add_parser(
+        "store", help="Inspect or export a SQLite result store"
+    )
+    store_parser.add_argument("path", type=str, help="Result store file")
+    store_parser.add_argument(
+        "action",
+        choices=("info", "export"),
+        help="info: list runs; export: write the sweep JSON for stored points",
+    )
+    store_parser.add_argument(
+        "--sweep",
+        choices=EXPORTABLE_SWEEPS,
+        default="snr",
+        help="Sweep type to export (default: snr; grid, pass and constellation "
+        "points are not exportable)",
+    )
+    store_parser.add_argument(
+        "--where",
+        nargs="+",
+        default=[],
+        metavar="COLUMN=VALUE",
+        help="Only export points with these column values, e.g. seed=1",
+    )
+    store_parser.add_argument(
+        "--out",
+        type=str,
+        default="results",
+        help="Output directory for the exported artifacts",
+    )
+    _add_plot_arg(store_parser)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Time each stage, run_once and the sweeps"
+    )
+    bench_parser.add_argument(
+        "--out",
+        type=str,
+        default="bench.json",
+        help="Benchmark report JSON (default: bench.json)",
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="Earlier report to compare against; exits 1 on regressions",
+    )
+    bench_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="Relative slowdown flagged as a regression (default: 0.10)",
+    )
+    bench_parser.add_argument(
+        "--quick",
+        action="store_true",
+        help="Time a single small size only (for smoke tests)",
+    )
+    bench_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.05,
+        help="Minimum seconds per timed loop (default: 0.05)",
+    )
+    _add_precision_arg(bench_parser)
+    _add_fft_args(bench_parser)
+
+    cache_parser = subparsers.add_parser("cache", help="Manage the result cache")
+    cache_parser.add_argument(
+        "action",
+        choices=("clear", "info"),
+        help="clear: delete all cached results; info: show location and size",
+    )
+    _add_cache_dir_arg(cache_parser)
 
     return parser.parse_args()
 
 
 def main() -> int:
     args = _parse_args()
+    if getattr(args, "trace", None) is None:
+        return _run_command(args)
+    with tracing(Tracer(memory=args.trace_memory)) as tracer:
+        status = _run_command(args)
+    tracer.save_chrome_trace(args.trace)
+    return status
+
 
+def _run_command(args: argparse.Namespace) -> int:
     if args.command == "simulate":
         out_dir = Path(args.out)
-        config = SimConfig(seed=args.seed)
+        config = SimConfig(
+            seed=args.seed,
+            n_symbols=args.n_symbols,
+            precision=args.precision,
+            fft_backend=args.fft_backend,
+            fft_workers=args.fft_workers,
+        )
+        stop = _stop_criteria(args)
+        cache = _result_cache(args)
+        store = _result_store(args)
         if len(args.snr_db) == 1:
             config = replace(config, snr_db=args.snr_db[0])
-            result = run_once(config)
-            save_run(out_dir, config, result)
+            if args.block_symbols is not None:
+                result = run_stream(config, block_symbols=args.block_symbols)
+            else:
+                result = run_jobs([(config, stop)], cache=cache)[0]
+            if store is not None:
+                point_stop = stop if args.block_symbols is None else None
+                store.append("snr", [config], [result], point_stop)
+            save_run(out_dir, config, result, trace=_trace_summary())
         else:
-            ber_list = sweep_ber(config, args.snr_db)
-            save_sweep(out_dir, args.snr_db, ber_list)
+            ber_list = sweep_ber(
+                config,
+                args.snr_db,
+                stop=stop,
+                workers=args.workers,
+                cache=cache,
+                store=store,
+            )
+            save_sweep(
+                out_dir,
+                args.snr_db,
+                ber_list,
+                fft=config.resolve_fft().describe(),
+                trace=_trace_summary(),
+                plot=args.plots != "none",
+            )
         return 0
 
     if args.command == "cfo-sweep":
         out_dir = Path(args.out)
-        config = SimConfig(seed=args.seed, snr_db=args.snr_db)
-        ber_no_comp = sweep_ber_vs_cfo(config, args.cfo_hz, enable_comp=False)
+        config = SimConfig(
+            seed=args.seed,
+            snr_db=args.snr_db,
+            precision=args.precision,
+            fft_backend=args.fft_backend,
+            fft_workers=args.fft_workers,
+        )
+        stop = _stop_criteria(args)
+        cache = _result_cache(args)
+        store = _result_store(args)
+        ber_no_comp = sweep_ber_vs_cfo(
+            config,
+            args.cfo_hz,
+            enable_comp=False,
+            stop=stop,
+            workers=args.workers,
+            cache=cache,
+            store=store,
+        )
         ber_with_comp = None
         if not args.no_comp:
-            ber_with_comp = sweep_ber_vs_cfo(config, args.cfo_hz, enable_comp=True)
+            ber_with_comp = sweep_ber_vs_cfo(
+                config,
+                args.cfo_hz,
+                enable_comp=True,
+                stop=stop,
+                workers=args.workers,
+                cache=cache,
+                store=store,
+            )
         save_sweep_cfo(
             out_dir,
             args.cfo_hz,
             ber_no_comp,
             ber_with_comp,
             snr_db=args.snr_db,
+            fft=config.resolve_fft().describe(),
+            trace=_trace_summary(),
+            plot=args.plots != "none",
         )
         return 0
 
     if args.command == "delay-sweep":
         out_dir = Path(args.out)
-        config = SimConfig(seed=args.seed, snr_db=args.snr_db)
+        config = SimConfig(
+            seed=args.seed,
+            snr_db=args.snr_db,
+            precision=args.precision,
+            fft_backend=args.fft_backend,
+            fft_workers=args.fft_workers,
+        )
+        stop = _stop_criteria(args)
+        cache = _result_cache(args)
+        store = _result_store(args)
         ber_no_comp = sweep_ber_vs_delay(
-            config, args.delay_samples, enable_comp=False
+            config,
+            args.delay_samples,
+            enable_comp=False,
+            stop=stop,
+            workers=args.workers,
+            cache=cache,
+            store=store,
         )
         ber_with_comp = None
         if not args.no_comp:
             ber_with_comp = sweep_ber_vs_delay(
-                config, args.delay_samples, enable_comp=True
+                config,
+                args.delay_samples,
+                enable_comp=True,
+                stop=stop,
+                workers=args.workers,
+                cache=cache,
+                store=store,
             )
         save_sweep_delay(
             out_dir,
@@ -213,23 +644,140 @@ def main() -> int:
             ber_no_comp,
             ber_with_comp,
             snr_db=args.snr_db,
+            fft=config.resolve_fft().describe(),
+            trace=_trace_summary(),
+            plot=args.plots != "none",
         )
         return 0
 
     if args.command == "rician-sweep":
         out_dir = Path(args.out)
-        config = SimConfig(seed=args.seed, snr_db=args.snr_db)
-        ber_list = sweep_ber_vs_rician_k(config, args.k_db)
-        save_sweep_rician(out_dir, args.k_db, ber_list, snr_db=args.snr_db)
+        config = SimConfig(
+            seed=args.seed,
+            snr_db=args.snr_db,
+            precision=args.precision,
+            fft_backend=args.fft_backend,
+            fft_workers=args.fft_workers,
+        )
+        ber_list = sweep_ber_vs_rician_k(
+            config,
+            args.k_db,
+            stop=_stop_criteria(args),
+            workers=args.workers,
+            cache=_result_cache(args),
+            store=_result_store(args),
+        )
+        save_sweep_rician(
+            out_dir,
+            args.k_db,
+            ber_list,
+            snr_db=args.snr_db,
+            fft=config.resolve_fft().describe(),
+            trace=_trace_summary(),
+            plot=args.plots != "none",
+        )
         return 0
 
     if args.command == "run-scenario":
         scenario = load_scenario(args.scenario)
-        run_scenario(scenario, args.out)
+        run_scenario(
+            scenario,
+            args.out,
+            workers=args.workers,
+            cache=_result_cache(args),
+            plots=args.plots,
+            store=_result_store(args),
+        )
         return 0
 
     if args.command == "reproduce":
-        reproduce_all(args.scenario_dir, args.out)
+        reproduce_all(
+            args.scenario_dir,
+            args.out,
+            workers=args.workers,
+            cache=_result_cache(args),
+            plots=args.plots,
+            store=_result_store(args),
+        )
+        return 0
+
+    if args.command == "render":
+        path = Path(args.path)
+        json_paths = [path] if path.is_file() else find_artifacts(path)
+        if not json_paths:
+            print(f"No sweep JSON artifacts found under {path}")
+            return 1
+        for png_path in render_all(json_paths, workers=args.workers):
+            print(png_path)
+        return 0
+
+    if args.command == "store":
+        # Opening a missing path would create an empty store.
+        if not Path(args.path).is_file():
+            raise SystemExit(f"No result store at {args.path}")
+        store = ResultStore(args.path)
+        if args.action == "info":
+            print(f"{store.path}: {len(store)} points")
+            for run in store.runs():
+                elapsed = run["elapsed_s"]
+                timing = "" if elapsed is None else f" in {elapsed:.2f} s"
+                print(f"  run {run['id']}: {run['n_points']} points{timing}")
+            return 0
+        filters = {}
+        for item in args.where:
+            name, sep, value = item.partition("=")
+            if not sep:
+                raise SystemExit(f"--where expects COLUMN=VALUE, got {item!r}")
+            filters[name] = _column_value(value)
+        try:
+            json_path = store.export_json(
+                args.sweep, args.out, plot=args.plots != "none", **filters
+            )
+        except ValueError as exc:
+            raise SystemExit(str(exc)) from None
+        print(json_path)
+        return 0
+
+    if args.command == "bench":
+        # Deferred: the suite imports every stage and the sweep helpers.
+        from ntn_linksim import bench
+
+        config = SimConfig(
+            precision=args.precision,
+            fft_backend=args.fft_backend,
+            fft_workers=args.fft_workers,
+        )
+        report = bench.run_bench(
+            sizes=bench.QUICK_SIZES if args.quick else bench.DEFAULT_SIZES,
+            min_time_s=args.min_time,
+            config=config,
+            progress=_print_bench_entry,
+        )
+        print(bench.save_bench(args.out, report))
+        if args.baseline is None:
+            return 0
+        regressions = bench.compare(
+            report, bench.load_bench(args.baseline), args.threshold
+        )
+        for r in regressions:
+            print(
+                f"REGRESSION {r.name} n_fft={r.n_fft} n_symbols={r.n_symbols}: "
+                f"{r.baseline_s * 1e3:.3f} ms -> {r.current_s * 1e3:.3f} ms "
+                f"({r.ratio:.2f}x)"
+            )
+        return 1 if regressions else 0
+
+    if args.command == "cache":
+        cache = ResultCache(args.cache_dir)
+        if args.action == "clear":
+            print(f"Removed {cache.clear()} cached results from {cache.root}")
+        else:
+            size_mib = cache.nbytes / 2**20
+            cap_mib = cache.max_bytes / 2**20
+            print(
+                f"{cache.root}: {len(cache)} results, "
+                f"{size_mib:.2f} MiB (cap {cap_mib:.0f} MiB)"
+            )
         return 0
 
     return 1
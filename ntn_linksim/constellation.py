@@ -0,0 +1,640 @@
+"""TLE ingestion and vectorized constellation propagation.
+
+:func:`load_tles` reads two- or three-line element sets into :class:`Tle`
+records.  :func:`propagate` evaluates every satellite at every timestamp as
+``(n_sat, n_time)`` arrays with a mean-element propagator of the SGP4
+family: Keplerian motion plus the secular J2 drift of the node, perigee and
+mean anomaly, and the TLE mean-motion derivative.  Short-period terms,
+B* drag and deep-space resonances are not modelled, so positions drift from
+full SGP4 by kilometres per day; delay and Doppler statistics over a
+constellation are insensitive to that.
+
+:func:`constellation_stats` propagates in time chunks of bounded size and
+accumulates, for one ground site, histograms of the elevation, delay and
+Doppler of every visible satellite-time pair (and a joint elevation x
+Doppler histogram), so memory does not grow with the number of steps.
+:func:`sample_channels` draws channel conditions (elevation and Doppler,
+with the SNR and K-factor of the :mod:`ntn_linksim.orbit` link budget)
+from the joint histogram.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import math
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, fields
+from pathlib import Path
+
+import numpy as np
+
+from ntn_linksim.orbit import (
+    DEFAULT_K_DB_TABLE,
+    EARTH_MU_M3_S2,
+    EARTH_RADIUS_M,
+    SPEED_OF_LIGHT_M_S,
+    free_space_path_loss_db,
+)
+
+_EARTH_EQ_RADIUS_M = 6_378_137.0
+_EARTH_FLATTENING = 1.0 / 298.257223563
+_EARTH_ROTATION_RAD_S = 7.2921150e-5
+_J2 = 1.08262668e-3
+_SECONDS_PER_DAY = 86_400.0
+_J2000_JD = 2_451_545.0
+# Newton iterations for Kepler's equation (converges for LEO eccentricities).
+_KEPLER_ITERATIONS = 6
+# Satellite-time pairs evaluated per chunk, and the coarse visibility step.
+_CHUNK_PAIRS = 1 << 18
+_COARSE_STEP_S = 60.0
+
+
+@dataclass(frozen=True)
+class Tle:
+    """Mean orbital elements of one two-line element set."""
+
+    name: str
+    satnum: int
+    epoch_jd: float
+    inclination_deg: float
+    raan_deg: float
+    eccentricity: float
+    arg_perigee_deg: float
+    mean_anomaly_deg: float
+    mean_motion_rev_day: float
+    ndot_rev_day2: float = 0.0
+    bstar: float = 0.0
+
+
+def julian_date(when: dt.datetime) -> float:
+    """Julian date of a datetime (naive datetimes are taken as UTC)."""
+    if when.tzinfo is not None:
+        when = when.astimezone(dt.timezone.utc).replace(tzinfo=None)
+    return _J2000_JD + (when - dt.datetime(2000, 1, 1, 12)).total_seconds() / (
+        _SECONDS_PER_DAY
+    )
+
+
+def calendar_date(jd: float) -> dt.datetime:
+    """Naive UTC datetime of a Julian date (inverse of :func:`julian_date`)."""
+    return dt.datetime(2000, 1, 1, 12) + dt.timedelta(days=jd - _J2000_JD)
+
+
+def _checksum(line: str) -> int:
+    return sum(int(c) if c.isdigit() else c == "-" for c in line[:68]) % 10
+
+
+def _implied_decimal(field: str) -> float:
+    """Parse TLE fields like `` 12345-4`` meaning ``0.12345e-4``."""
+    field = field.strip()
+    if not field or field.strip("0+-") == "":
+        return 0.0
+    sign = -1.0 if field[0] == "-" else 1.0
+    field = field.lstrip("+-")
+    mantissa, exponent = field[:-2], field[-2:]
+    return sign * float(f"0.{mantissa.strip()}e{int(exponent)}")
+
+
+def parse_tle(line1: str, line2: str, name: str = "") -> Tle:
+    """Parse one element set from its two data lines.
+
+    Raises:
+        ValueError: If the lines are malformed or fail their checksums.
+    """
+    line1, line2 = line1.rstrip(), line2.rstrip()
+    if len(line1) < 69 or len(line2) < 69 or line1[0] != "1" or line2[0] != "2":
+        raise ValueError(f"malformed TLE lines for {name or 'satellite'!r}")
+    for line in (line1, line2):
+        if int(line[68]) != _checksum(line):
+            raise ValueError(f"TLE checksum mismatch: {line!r}")
+    year = int(line1[18:20])
+    year += 2000 if year < 57 else 1900
+    day = float(line1[20:32])
+    epoch = dt.datetime(year, 1, 1) + dt.timedelta(days=day - 1.0)
+    return Tle(
+        name=name.strip() or line1[2:7].strip(),
+        satnum=int(line1[2:7]),
+        epoch_jd=julian_date(epoch),
+        inclination_deg=float(line2[8:16]),
+        raan_deg=float(line2[17:25]),
+        eccentricity=float(f"0.{line2[26:33].strip()}"),
+        arg_perigee_deg=float(line2[34:42]),
+        mean_anomaly_deg=float(line2[43:51]),
+        mean_motion_rev_day=float(line2[52:63]),
+        ndot_rev_day2=2.0 * float(line1[33:43]),
+        bstar=_implied_decimal(line1[53:61]),
+    )
+
+
+def parse_tles(lines: Iterable[str]) -> list[Tle]:
+    """Parse two- or three-line element sets (name lines are optional)."""
+    tles = []
+    name = ""
+    pending: str | None = None
+    for raw in lines:
+        line = raw.rstrip()
+        if not line.strip():
+            continue
+        if line.startswith("1 ") and pending is None:
+            pending = line
+        elif line.startswith("2 ") and pending is not None:
+            tles.append(parse_tle(pending, line, name))
+            name, pending = "", None
+        elif pending is None:
+            name = line.removeprefix("0 ")
+        else:
+            raise ValueError(f"expected TLE line 2 after {pending!r}")
+    if pending is not None:
+        raise ValueError(f"TLE line 1 without line 2: {pending!r}")
+    return tles
+
+
+def load_tles(path: str | Path) -> list[Tle]:
+    """Read every element set in a TLE file."""
+    with Path(path).open(encoding="utf-8") as f:
+        return parse_tles(f)
+
+
+def _tle_line(body: str) -> str:
+    return body + str(_checksum(body))
+
+
+def format_tle(tle: Tle) -> tuple[str, str]:
+    """Format *tle* as its two data lines (with checksums).
+
+    ``bstar`` and the mean-motion derivative are written as zero.
+    """
+    epoch = calendar_date(tle.epoch_jd)
+    day = (epoch - dt.datetime(epoch.year, 1, 1)).total_seconds() / _SECONDS_PER_DAY
+    ecc = f"{tle.eccentricity:.7f}"[2:]
+    line1 = (
+        f"1 {tle.satnum:05d}U 00000A   {epoch.year % 100:02d}{day + 1.0:012.8f}"
+        "  .00000000  00000-0  00000-0 0  999"
+    )
+    line2 = (
+        f"2 {tle.satnum:05d} {tle.inclination_deg:8.4f} {tle.raan_deg % 360:8.4f}"
+        f" {ecc} {tle.arg_perigee_deg % 360:8.4f} {tle.mean_anomaly_deg % 360:8.4f}"
+        f" {tle.mean_motion_rev_day:11.8f}    0"
+    )
+    return _tle_line(line1), _tle_line(line2)
+
+
+def walker_delta(
+    n_planes: int,
+    sats_per_plane: int,
+    altitude_km: float,
+    inclination_deg: float,
+    epoch: dt.datetime,
+    phasing: int = 1,
+    first_satnum: int = 1,
+) -> list[Tle]:
+    """Circular Walker-delta constellation ``i: t/p/f`` as element sets."""
+    if n_planes <= 0 or sats_per_plane <= 0:
+        raise ValueError("n_planes and sats_per_plane must be positive")
+    a = EARTH_RADIUS_M + altitude_km * 1e3
+    mean_motion = math.sqrt(EARTH_MU_M3_S2 / a**3) * _SECONDS_PER_DAY / (2 * math.pi)
+    total = n_planes * sats_per_plane
+    tles = []
+    for plane in range(n_planes):
+        for slot in range(sats_per_plane):
+            anomaly = 360.0 * slot / sats_per_plane + 360.0 * phasing * plane / total
+            satnum = first_satnum + plane * sats_per_plane + slot
+            tles.append(
+                Tle(
+                    name=f"WALKER-{satnum}",
+                    satnum=satnum,
+                    epoch_jd=julian_date(epoch),
+                    inclination_deg=inclination_deg,
+                    raan_deg=360.0 * plane / n_planes,
+                    eccentricity=0.0,
+                    arg_perigee_deg=0.0,
+                    mean_anomaly_deg=anomaly % 360.0,
+                    mean_motion_rev_day=mean_motion,
+                )
+            )
+    return tles
+
+
+@dataclass(frozen=True)
+class _Elements:
+    """Per-satellite propagation constants as arrays.
+
+    :meth:`take` indexes every field alike, so the same arrays serve an
+    outer product with the timestamps (``[:, None]``) or a list of
+    satellite-time pairs (an index array).
+    """
+
+    epoch_jd: np.ndarray
+    a: np.ndarray
+    ecc: np.ndarray
+    root: np.ndarray
+    cos_i: np.ndarray
+    sin_i: np.ndarray
+    raan0: np.ndarray
+    raan_dot: np.ndarray
+    argp0: np.ndarray
+    argp_dot: np.ndarray
+    m0: np.ndarray
+    m_dot: np.ndarray
+    half_ndot: np.ndarray
+
+    @classmethod
+    def from_tles(cls, tles: Sequence[Tle]) -> _Elements:
+        if not tles:
+            raise ValueError("no TLEs given")
+
+        def column(name: str) -> np.ndarray:
+            return np.array([getattr(t, name) for t in tles], dtype=np.float64)
+
+        n0 = column("mean_motion_rev_day") * 2.0 * np.pi / _SECONDS_PER_DAY
+        ecc = column("eccentricity")
+        if np.any(n0 <= 0) or np.any((ecc < 0) | (ecc >= 1)):
+            raise ValueError("TLEs need positive mean motion and 0 <= e < 1")
+        inc = np.radians(column("inclination_deg"))
+        a = np.cbrt(EARTH_MU_M3_S2 / n0**2)
+        root = np.sqrt(1.0 - ecc**2)
+        cos_i = np.cos(inc)
+        # Secular J2 rates of the node, perigee and mean anomaly.
+        j2_term = 1.5 * _J2 * (_EARTH_EQ_RADIUS_M / (a * root**2)) ** 2 * n0
+        return cls(
+            epoch_jd=column("epoch_jd"),
+            a=a,
+            ecc=ecc,
+            root=root,
+            cos_i=cos_i,
+            sin_i=np.sin(inc),
+            raan0=np.radians(column("raan_deg")),
+            raan_dot=-j2_term * cos_i,
+            argp0=np.radians(column("arg_perigee_deg")),
+            argp_dot=0.5 * j2_term * (5.0 * cos_i**2 - 1.0),
+            m0=np.radians(column("mean_anomaly_deg")),
+            m_dot=n0 + 0.5 * j2_term * root * (3.0 * cos_i**2 - 1.0),
+            half_ndot=np.pi * column("ndot_rev_day2") / _SECONDS_PER_DAY**2,
+        )
+
+    def take(self, key) -> _Elements:
+        return _Elements(**{f.name: getattr(self, f.name)[key] for f in fields(self)})
+
+
+Vector = tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+def _propagate(el: _Elements, jd: np.ndarray) -> tuple[Vector, Vector]:
+    """Inertial position and velocity components; *el* broadcasts with *jd*."""
+    dt_s = (jd - el.epoch_jd) * _SECONDS_PER_DAY
+    mean_anomaly = el.m0 + (el.m_dot + el.half_ndot * dt_s) * dt_s
+    ecc = el.ecc
+    ecc_anomaly = mean_anomaly
+    for _ in range(_KEPLER_ITERATIONS):
+        step = (ecc_anomaly - ecc * np.sin(ecc_anomaly) - mean_anomaly) / (
+            1.0 - ecc * np.cos(ecc_anomaly)
+        )
+        ecc_anomaly = ecc_anomaly - step
+        if step.size == 0 or np.max(np.abs(step)) < 1e-12:
+            break
+    cos_e, sin_e = np.cos(ecc_anomaly), np.sin(ecc_anomaly)
+    # Perifocal position and velocity.
+    px = el.a * (cos_e - ecc)
+    py = el.a * el.root * sin_e
+    rate = np.sqrt(EARTH_MU_M3_S2 / el.a) / (1.0 - ecc * cos_e)
+    vx = -rate * sin_e
+    vy = rate * el.root * cos_e
+
+    argp = el.argp0 + el.argp_dot * dt_s
+    raan = el.raan0 + el.raan_dot * dt_s
+    cos_w, sin_w = np.cos(argp), np.sin(argp)
+    cos_o, sin_o = np.cos(raan), np.sin(raan)
+    cos_i, sin_i = el.cos_i, el.sin_i
+    # Columns of the perifocal -> inertial rotation R3(-raan) R1(-i) R3(-argp).
+    p_hat = (
+        cos_o * cos_w - sin_o * sin_w * cos_i,
+        sin_o * cos_w + cos_o * sin_w * cos_i,
+        sin_w * sin_i,
+    )
+    q_hat = (
+        -cos_o * sin_w - sin_o * cos_w * cos_i,
+        -sin_o * sin_w + cos_o * cos_w * cos_i,
+        cos_w * sin_i,
+    )
+    position = tuple(pc * px + qc * py for pc, qc in zip(p_hat, q_hat, strict=True))
+    velocity = tuple(pc * vx + qc * vy for pc, qc in zip(p_hat, q_hat, strict=True))
+    return position, velocity
+
+
+def propagate(tles: Sequence[Tle], jd: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Inertial position and velocity of every satellite at every time.
+
+    Args:
+        tles: Element sets.
+        jd: Julian dates of the timestamps.
+
+    Returns:
+        ``(position_m, velocity_m_s)``, each ``(3, n_sat, n_time)`` in the
+        true-equator mean-equinox frame of the TLEs.
+    """
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    position, velocity = _propagate(_Elements.from_tles(tles).take(np.s_[:, None]), jd)
+    return np.stack(np.broadcast_arrays(*position)), np.stack(
+        np.broadcast_arrays(*velocity)
+    )
+
+
+def gmst_rad(jd: np.ndarray) -> np.ndarray:
+    """Greenwich mean sidereal angle (IAU 1982) at Julian dates *jd*."""
+    t = (np.asarray(jd, dtype=np.float64) - _J2000_JD) / 36525.0
+    seconds = (
+        67310.54841
+        + (876600.0 * 3600.0 + 8640184.812866) * t
+        + 0.093104 * t**2
+        - 6.2e-6 * t**3
+    )
+    return np.radians((seconds % _SECONDS_PER_DAY) / 240.0)
+
+
+@dataclass(frozen=True)
+class GroundSite:
+    """Ground terminal location (WGS84 geodetic)."""
+
+    lat_deg: float
+    lon_deg: float
+    alt_m: float = 0.0
+
+    def ecef_m(self) -> np.ndarray:
+        lat, lon = math.radians(self.lat_deg), math.radians(self.lon_deg)
+        e2 = _EARTH_FLATTENING * (2.0 - _EARTH_FLATTENING)
+        n = _EARTH_EQ_RADIUS_M / math.sqrt(1.0 - e2 * math.sin(lat) ** 2)
+        return np.array(
+            [
+                (n + self.alt_m) * math.cos(lat) * math.cos(lon),
+                (n + self.alt_m) * math.cos(lat) * math.sin(lon),
+                (n * (1.0 - e2) + self.alt_m) * math.sin(lat),
+            ]
+        )
+
+    def up(self) -> np.ndarray:
+        lat, lon = math.radians(self.lat_deg), math.radians(self.lon_deg)
+        return np.array(
+            [
+                math.cos(lat) * math.cos(lon),
+                math.cos(lat) * math.sin(lon),
+                math.sin(lat),
+            ]
+        )
+
+
+def _look(
+    el: _Elements, site: GroundSite, jd: np.ndarray, carrier_hz: float
+) -> dict[str, np.ndarray]:
+    position, velocity = _propagate(el, jd)
+    theta = gmst_rad(jd)
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    # Rotate the site into the inertial frame instead of every satellite.
+    sx, sy, sz = site.ecef_m()
+    ux, uy, uz = site.up()
+    site_i = (cos_t * sx - sin_t * sy, sin_t * sx + cos_t * sy, sz)
+    up_i = (cos_t * ux - sin_t * uy, sin_t * ux + cos_t * uy, uz)
+    w = _EARTH_ROTATION_RAD_S
+    site_v = (-w * site_i[1], w * site_i[0], 0.0)
+    rho = [position[k] - site_i[k] for k in range(3)]
+    slant = np.sqrt(rho[0] ** 2 + rho[1] ** 2 + rho[2] ** 2)
+    sin_el = (rho[0] * up_i[0] + rho[1] * up_i[1] + rho[2] * up_i[2]) / slant
+    range_rate = sum(rho[k] * (velocity[k] - site_v[k]) for k in range(3)) / slant
+    return {
+        "elevation_deg": np.degrees(np.arcsin(np.clip(sin_el, -1.0, 1.0))),
+        "slant_range_m": slant,
+        "delay_s": slant / SPEED_OF_LIGHT_M_S,
+        "doppler_hz": -carrier_hz * range_rate / SPEED_OF_LIGHT_M_S,
+    }
+
+
+def look_angles(
+    tles: Sequence[Tle], site: GroundSite, jd: np.ndarray, carrier_hz: float
+) -> dict[str, np.ndarray]:
+    """Elevation, slant range, delay and Doppler of every satellite.
+
+    Returns ``(n_sat, n_time)`` arrays ``elevation_deg``, ``slant_range_m``,
+    ``delay_s`` and ``doppler_hz`` (positive while approaching).  The site
+    rotates with the Earth, so its own velocity enters the Doppler.
+    """
+    jd = np.atleast_1d(np.asarray(jd, dtype=np.float64))
+    el = _Elements.from_tles(tles).take(np.s_[:, None])
+    return _look(el, site, jd, carrier_hz)
+
+
+def _bin_index(values: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Index into uniform *edges* (values on the last edge go to the last bin)."""
+    n = edges.size - 1
+    scaled = (values - edges[0]) * (n / (edges[-1] - edges[0]))
+    return np.clip(scaled.astype(np.int64), 0, n - 1)
+
+
+@dataclass(frozen=True)
+class ConstellationStats:
+    """Histograms of the visible satellite-time pairs seen from one site.
+
+    Edges are uniform; ``joint_counts[i, j]`` counts pairs in elevation bin
+    *i* and Doppler bin *j*.  ``n_pairs`` is the number of satellite-time
+    pairs evaluated and ``n_visible`` those above the elevation mask.
+    """
+
+    elevation_edges_deg: np.ndarray
+    elevation_counts: np.ndarray
+    delay_edges_s: np.ndarray
+    delay_counts: np.ndarray
+    doppler_edges_hz: np.ndarray
+    doppler_counts: np.ndarray
+    joint_counts: np.ndarray
+    n_pairs: int
+    n_visible: int
+    mean_altitude_m: float
+
+    def sample(self, n: int, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+        """Draw *n* ``(elevation_deg, doppler_hz)`` pairs from the joint
+        histogram, uniformly within each cell."""
+        if self.n_visible == 0:
+            raise ValueError("no visible passes to sample from")
+        weights = self.joint_counts.ravel() / self.joint_counts.sum()
+        cells = rng.choice(weights.size, size=n, p=weights)
+        i, j = np.unravel_index(cells, self.joint_counts.shape)
+        el_edges, dop_edges = self.elevation_edges_deg, self.doppler_edges_hz
+        elevation = el_edges[i] + rng.random(n) * (el_edges[i + 1] - el_edges[i])
+        doppler = dop_edges[j] + rng.random(n) * (dop_edges[j + 1] - dop_edges[j])
+        return elevation, doppler
+
+    def as_dict(self) -> dict:
+        """Histograms as plain lists (for JSON)."""
+        return {
+            "elevation_edges_deg": self.elevation_edges_deg.tolist(),
+            "elevation_counts": self.elevation_counts.tolist(),
+            "delay_edges_s": self.delay_edges_s.tolist(),
+            "delay_counts": self.delay_counts.tolist(),
+            "doppler_edges_hz": self.doppler_edges_hz.tolist(),
+            "doppler_counts": self.doppler_counts.tolist(),
+            "joint_counts": self.joint_counts.tolist(),
+            "n_pairs": self.n_pairs,
+            "n_visible": self.n_visible,
+            "mean_altitude_m": self.mean_altitude_m,
+        }
+
+
+def constellation_stats(
+    tles: Sequence[Tle],
+    site: GroundSite,
+    start_jd: float,
+    duration_s: float,
+    step_s: float = 1.0,
+    carrier_hz: float = 2.0e9,
+    min_elevation_deg: float = 10.0,
+    n_bins: int = 64,
+) -> ConstellationStats:
+    """Accumulate visibility histograms over a time window.
+
+    Every satellite is first evaluated on a coarse grid of about
+    ``_COARSE_STEP_S``; a coarse interval is refined at *step_s* only if the
+    slant range at either end is within reach of the elevation mask given
+    the largest possible range rate.  Most satellite-time pairs are below
+    the horizon, so only a few percent are evaluated at full resolution.
+    Both passes run in chunks of bounded size and only the histograms are
+    kept between chunks.
+
+    Args:
+        tles: Element sets of the constellation.
+        site: Ground terminal.
+        start_jd: Julian date of the first timestamp.
+        duration_s: Window length in seconds.
+        step_s: Time step in seconds.
+        carrier_hz: Carrier frequency for the Doppler.
+        min_elevation_deg: Elevation mask for visibility.
+        n_bins: Bins per histogram axis.
+
+    Returns:
+        A :class:`ConstellationStats`.
+    """
+    if duration_s <= 0 or step_s <= 0:
+        raise ValueError("duration_s and step_s must be positive")
+    if n_bins <= 0:
+        raise ValueError("n_bins must be positive")
+    if not 0.0 <= min_elevation_deg < 90.0:
+        raise ValueError("min_elevation_deg must be in [0, 90)")
+    if carrier_hz <= 0:
+        raise ValueError("carrier_hz must be positive")
+    elements = _Elements.from_tles(tles)
+    n_sat = elements.a.size
+
+    # Bounds: the fastest perigee speed plus the site's rotation speed, and
+    # the slant range at the mask from the highest apogee to a site on the
+    # polar radius (the smallest terminal radius gives the longest range).
+    perigee = elements.a * (1.0 - elements.ecc)
+    apogee = elements.a * (1.0 + elements.ecc)
+    v_max = float(
+        np.max(np.sqrt(EARTH_MU_M3_S2 * (2.0 / perigee - 1.0 / elements.a)))
+    ) + (_EARTH_ROTATION_RAD_S * _EARTH_EQ_RADIUS_M)
+    el = math.radians(min_elevation_deg)
+    r_site = _EARTH_EQ_RADIUS_M * (1.0 - _EARTH_FLATTENING)
+    max_range = math.sqrt(
+        float(apogee.max()) ** 2 - (r_site * math.cos(el)) ** 2
+    ) - r_site * math.sin(el)
+    max_doppler = carrier_hz * v_max / SPEED_OF_LIGHT_M_S
+    elevation_edges = np.linspace(min_elevation_deg, 90.0, n_bins + 1)
+    delay_edges = np.linspace(0.0, max_range / SPEED_OF_LIGHT_M_S, n_bins + 1)
+    doppler_edges = np.linspace(-max_doppler, max_doppler, n_bins + 1)
+
+    n_steps = int(math.floor(duration_s / step_s)) + 1
+    ratio = max(1, int(round(_COARSE_STEP_S / step_s)))
+    n_intervals = -(-n_steps // ratio)
+    reach = max_range + 0.5 * v_max * ratio * step_s
+
+    def jd_at(steps: np.ndarray) -> np.ndarray:
+        return start_jd + steps * (step_s / _SECONDS_PER_DAY)
+
+    # Coarse pass: which (satellite, interval) pairs can be visible.
+    outer = elements.take(np.s_[:, None])
+    coarse = np.arange(n_intervals + 1) * ratio
+    near_end = np.empty((n_sat, coarse.size), dtype=bool)
+    chunk = max(1, _CHUNK_PAIRS // n_sat)
+    for lo in range(0, coarse.size, chunk):
+        hi = min(lo + chunk, coarse.size)
+        slant = _look(outer, site, jd_at(coarse[lo:hi]), carrier_hz)["slant_range_m"]
+        near_end[:, lo:hi] = slant <= reach
+    sat_idx, interval_idx = np.nonzero(near_end[:, :-1] | near_end[:, 1:])
+
+    elevation_counts = np.zeros(n_bins, dtype=np.int64)
+    delay_counts = np.zeros(n_bins, dtype=np.int64)
+    doppler_counts = np.zeros(n_bins, dtype=np.int64)
+    joint_counts = np.zeros((n_bins, n_bins), dtype=np.int64)
+    n_visible = 0
+    offsets = np.arange(ratio)
+    chunk = max(1, _CHUNK_PAIRS // ratio)
+    for lo in range(0, sat_idx.size, chunk):
+        steps = interval_idx[lo : lo + chunk, None] * ratio + offsets
+        sats = np.broadcast_to(sat_idx[lo : lo + chunk, None], steps.shape)
+        valid = steps < n_steps
+        steps, sats = steps[valid], sats[valid]
+        look = _look(elements.take(sats), site, jd_at(steps), carrier_hz)
+        visible = look["elevation_deg"] >= min_elevation_deg
+        el_idx = _bin_index(look["elevation_deg"][visible], elevation_edges)
+        dop_idx = _bin_index(look["doppler_hz"][visible], doppler_edges)
+        delay_idx = _bin_index(look["delay_s"][visible], delay_edges)
+        elevation_counts += np.bincount(el_idx, minlength=n_bins)
+        doppler_counts += np.bincount(dop_idx, minlength=n_bins)
+        delay_counts += np.bincount(delay_idx, minlength=n_bins)
+        joint_counts += np.bincount(
+            el_idx * n_bins + dop_idx, minlength=n_bins * n_bins
+        ).reshape(n_bins, n_bins)
+        n_visible += int(el_idx.size)
+
+    return ConstellationStats(
+        elevation_edges_deg=elevation_edges,
+        elevation_counts=elevation_counts,
+        delay_edges_s=delay_edges,
+        delay_counts=delay_counts,
+        doppler_edges_hz=doppler_edges,
+        doppler_counts=doppler_counts,
+        joint_counts=joint_counts,
+        n_pairs=n_steps * n_sat,
+        n_visible=n_visible,
+        mean_altitude_m=float(np.mean(elements.a)) - EARTH_RADIUS_M,
+    )
+
+
+def sample_channels(
+    stats: ConstellationStats,
+    n_points: int,
+    rng: np.random.Generator,
+    carrier_hz: float = 2.0e9,
+    zenith_snr_db: float = 20.0,
+    k_db_table: Sequence[tuple[float, float]] = DEFAULT_K_DB_TABLE,
+) -> dict[str, np.ndarray]:
+    """Draw channel conditions from the joint elevation x Doppler histogram.
+
+    The link budget follows :class:`~ntn_linksim.orbit.CircularPass`: the
+    slant range comes from the elevation at the constellation's mean
+    altitude, the SNR is ``zenith_snr_db`` at a range equal to that altitude
+    and follows the free-space path loss elsewhere, and the K-factor is
+    interpolated from *k_db_table*.
+
+    Returns:
+        Arrays ``elevation_deg``, ``doppler_hz``, ``slant_range_m``,
+        ``delay_s``, ``snr_db`` and ``rician_k_db``, sorted by elevation.
+    """
+    if n_points <= 0:
+        raise ValueError("n_points must be positive")
+    elevation, doppler = stats.sample(n_points, rng)
+    order = np.argsort(elevation, kind="stable")
+    elevation, doppler = elevation[order], doppler[order]
+    altitude = stats.mean_altitude_m
+    el = np.radians(elevation)
+    slant = np.sqrt(
+        (EARTH_RADIUS_M + altitude) ** 2 - (EARTH_RADIUS_M * np.cos(el)) ** 2
+    ) - EARTH_RADIUS_M * np.sin(el)
+    path_loss = free_space_path_loss_db(slant, carrier_hz)
+    zenith_loss = free_space_path_loss_db(altitude, carrier_hz)
+    k_el, k_db = zip(*k_db_table, strict=True)
+    return {
+        "elevation_deg": elevation,
+        "doppler_hz": doppler,
+        "slant_range_m": slant,
+        "delay_s": slant / SPEED_OF_LIGHT_M_S,
+        "snr_db": zenith_snr_db - (path_loss - zenith_loss),
+        "rician_k_db": np.interp(elevation, k_el, k_db),
+    }
@@ -0,0 +1,178 @@
+"""Content-addressed on-disk cache of simulation point results.
+
+A simulation point is fully determined by its :class:`SimConfig`, its
+Monte Carlo stopping rule and the code that evaluates it, so its
+:class:`SimResult` can be stored under a hash of exactly those inputs:
+
+* every ``SimConfig`` field (seed and precision included),
+* the ``StopCriteria`` fields, or ``None`` for a single frame,
+* the package version, a cache format version and the numerics policy:
+  the NumPy version and the resolved FFT backend.
+
+Entries are small JSON files under ``<root>/<aa>/<hash>.json``.  A hit
+refreshes the entry's mtime, and :meth:`ResultCache.prune` evicts the
+least recently used entries once the cache exceeds its size cap.  The
+library never caches unless a :class:`ResultCache` is passed in; the CLI
+uses one by default (``--no-cache`` to disable).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, fields
+from pathlib import Path
+
+import numpy as np
+
+from ntn_linksim import __version__
+from ntn_linksim.sim import SimConfig, SimResult, StopCriteria
+
+# Bump when the entry layout or the meaning of a cached result changes.
+_CACHE_FORMAT = 1
+_DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_FLOAT_FIELDS = {f.name for f in fields(SimConfig) if f.type == "float"}
+
+
+def default_cache_dir() -> Path:
+    """Return ``$NTNLS_CACHE_DIR``, else ``$XDG_CACHE_HOME/ntn-linksim``."""
+    override = os.environ.get("NTNLS_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "ntn-linksim"
+
+
+def cache_key(config: SimConfig, stop: StopCriteria | None = None) -> str:
+    """Return the sha256 hex digest identifying a simulation point.
+
+    Integer values of float fields (e.g. ``snr_db: 10`` from YAML) hash like
+    the equivalent float, so they share an entry.
+    """
+    config_fields = {
+        name: float(value) if name in _FLOAT_FIELDS else value
+        for name, value in asdict(config).items()
+    }
+    payload = {
+        "format": _CACHE_FORMAT,
+        "version": __version__,
+        "numerics": {
+            "numpy": np.__version__,
+            "fft": config.resolve_fft().describe(),
+        },
+        "config": config_fields,
+        "stop": None if stop is None else asdict(stop),
+    }
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    """On-disk ``SimResult`` store keyed by :func:`cache_key`.
+
+    Args:
+        root: Cache directory (created on first write).  Defaults to
+            :func:`default_cache_dir`.
+        max_bytes: Size cap enforced by :meth:`prune`.
+    """
+
+    def __init__(
+        self, root: str | Path | None = None, max_bytes: int = _DEFAULT_MAX_BYTES
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.root = Path(root) if root is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(
+        self, config: SimConfig, stop: StopCriteria | None = None
+    ) -> SimResult | None:
+        """Return the cached result for a point, or None on a miss.
+
+        Unreadable or malformed entries count as misses.
+        """
+        path = self._path(cache_key(config, stop))
+        try:
+            with path.open(encoding="utf-8") as f:
+                result = SimResult(**json.load(f)["result"])
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def put(
+        self, config: SimConfig, stop: StopCriteria | None, result: SimResult
+    ) -> None:
+        """Store *result* for a point, replacing any existing entry."""
+        key = cache_key(config, stop)
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        entry = {
+            "key": key,
+            "config": asdict(config),
+            "stop": None if stop is None else asdict(stop),
+            "result": asdict(result),
+        }
+        # Write-then-rename so concurrent readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, sort_keys=True)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the stored entries."""
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def prune(self) -> int:
+        """Evict least recently used entries until under ``max_bytes``.
+
+        Returns:
+            Number of entries removed.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove every entry and return how many were removed."""
+        entries = self._entries()
+        for _, _, path in entries:
+            path.unlink(missing_ok=True)
+        for sub in self.root.glob("*"):
+            if sub.is_dir() and not any(sub.iterdir()):
+                sub.rmdir()
+        return len(entries)
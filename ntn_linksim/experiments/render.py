@@ -0,0 +1,303 @@
+"""Render sweep JSON artifacts into PNG plots.
+
+Rendering is split from computation: the ``save_sweep*`` helpers write the
+JSON, and this module turns a JSON file into its PNG.  It can run
+inline right after the JSON is saved, afterwards over a whole output tree
+(``ntnls render`` or ``--plots deferred``), or in parallel on a process
+pool.
+
+Plots are drawn on one Agg :class:`~matplotlib.figure.Figure` per process
+that is cleared and reused between renders.  This avoids pyplot's global
+figure manager and the cost of building a new canvas for every plot.
+Matplotlib is imported on first render.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# When artifact PNGs are drawn: right after each JSON, after all points of
+# a run are computed, or never (JSON only).
+PLOT_MODES = ("inline", "deferred", "none")
+
+_FIGSIZE = (6, 4)
+_DPI = 150
+
+_figure: Any = None
+
+
+def _reused_figure() -> Any:
+    """Return this process's cleared Agg figure, creating it on first use."""
+    global _figure
+    if _figure is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        _figure = Figure(figsize=_FIGSIZE)
+        FigureCanvasAgg(_figure)
+    _figure.clear()
+    _figure.set_layout_engine("none")
+    _figure.set_size_inches(_FIGSIZE)
+    return _figure
+
+
+def _titled(base: str, payload: dict) -> str:
+    if payload.get("snr_db") is not None:
+        return f"{base} at SNR = {payload['snr_db']} dB"
+    return base
+
+
+def _draw_comp_curves(ax: Any, x: list[float], payload: dict) -> None:
+    """Draw the without/with compensation curves of a CFO or delay sweep."""
+    ax.plot(
+        x, payload["ber_no_comp"], marker="o", linestyle="-", label="No compensation"
+    )
+    if payload.get("ber_with_comp") is not None:
+        ax.plot(
+            x,
+            payload["ber_with_comp"],
+            marker="s",
+            linestyle="--",
+            label="With compensation",
+        )
+        ax.legend()
+
+
+def _draw_snr(ax: Any, payload: dict) -> None:
+    ax.plot(payload["snr_db"], payload["ber"], marker="o")
+    ax.set_xlabel("SNR (dB)")
+    ax.set_title("BER vs SNR (AWGN)")
+
+
+def _draw_cfo(ax: Any, payload: dict) -> None:
+    _draw_comp_curves(ax, [x / 1000.0 for x in payload["cfo_hz"]], payload)
+    ax.set_xlabel("CFO (kHz)")
+    ax.set_title(_titled("BER vs CFO", payload))
+
+
+def _draw_delay(ax: Any, payload: dict) -> None:
+    _draw_comp_curves(ax, payload["delay_samples"], payload)
+    ax.set_xlabel("Delay (samples)")
+    ax.set_title(_titled("BER vs Timing Offset", payload))
+
+
+def _draw_rician(ax: Any, payload: dict) -> None:
+    ax.plot(payload["rician_k_db"], payload["ber"], marker="o")
+    ax.set_xlabel("Rician K-factor (dB)")
+    ax.set_title(_titled("BER vs Rician K-factor", payload))
+
+
+def _draw_pass(fig: Any, payload: dict) -> None:
+    """Draw BER over a satellite pass with the elevation on a second axis."""
+    ax = _ber_axes(fig)
+    ax.plot(payload["time_s"], payload["ber"], marker="o", label="BER")
+    ax.set_xlabel("Time since acquisition (s)")
+    ax.set_title("BER over the pass")
+    elevation = ax.twinx()
+    elevation.plot(
+        payload["time_s"],
+        payload["elevation_deg"],
+        color="tab:gray",
+        linestyle="--",
+        label="Elevation",
+    )
+    elevation.set_ylabel("Elevation (deg)")
+    fig.tight_layout()
+
+
+def _draw_constellation(fig: Any, payload: dict) -> None:
+    """Draw BER vs elevation of the sampled points next to the Doppler
+    histogram of the visible passes (when recorded)."""
+    histograms = payload.get("histograms")
+    ax = fig.add_subplot(1, 2 if histograms else 1, 1)
+    ax.set_ylabel("BER")
+    ax.grid(True, linestyle="--", alpha=0.5)
+    ax.plot(payload["elevation_deg"], payload["ber"], marker="o", linestyle="none")
+    ax.set_xlabel("Elevation (deg)")
+    ax.set_title("BER of sampled channels")
+    if histograms:
+        fig.set_size_inches(_FIGSIZE[0] * 1.8, _FIGSIZE[1])
+        hist = fig.add_subplot(1, 2, 2)
+        edges = np.asarray(histograms["doppler_edges_hz"]) / 1e3
+        hist.stairs(histograms["doppler_counts"], edges, fill=True)
+        hist.set_xlabel("Doppler (kHz)")
+        hist.set_ylabel("Visible satellite-seconds")
+        hist.set_title("Doppler of visible satellites")
+    fig.tight_layout()
+
+
+def _grid_value(value: Any) -> str:
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def _grid_label(axis: dict, value: Any) -> str:
+    return f"{axis['name']}={_grid_value(value)}"
+
+
+def _grid_heatmap(ax: Any, ber: np.ndarray, axes: list[dict], norm: Any) -> Any:
+    """Draw a 2-D BER grid with the first axis along x."""
+    image = ax.imshow(ber.T, origin="lower", aspect="auto", norm=norm)
+    for axis, set_ticks, set_labels, set_label in (
+        (axes[0], ax.set_xticks, ax.set_xticklabels, ax.set_xlabel),
+        (axes[1], ax.set_yticks, ax.set_yticklabels, ax.set_ylabel),
+    ):
+        set_ticks(range(len(axis["values"])))
+        set_labels([_grid_value(value) for value in axis["values"]])
+        set_label(axis["name"])
+    return image
+
+
+def _draw_grid(fig: Any, payload: dict) -> None:
+    """Draw a grid sweep: a BER curve in 1-D, heatmaps in 2-D and above.
+
+    Grids with more than two axes get one heatmap panel per combination of
+    the trailing axes, sharing one logarithmic colour scale.
+    """
+    from matplotlib.colors import LogNorm, Normalize
+
+    axes = payload["axes"]
+    ber = np.asarray(payload["ber"], dtype=float)
+    if ber.ndim == 1:
+        ax = _ber_axes(fig)
+        if len(axes) == 1:
+            ax.plot(axes[0]["values"], ber, marker="o")
+            ax.set_xlabel(axes[0]["name"])
+        else:
+            ax.plot(range(ber.size), ber, marker="o")
+            ax.set_xticks(range(ber.size))
+            ax.set_xticklabels(
+                [
+                    ", ".join(_grid_label(axis, axis["values"][i]) for axis in axes)
+                    for i in range(ber.size)
+                ],
+                rotation=30,
+                ha="right",
+                fontsize="small",
+            )
+        ax.set_title("BER grid")
+        fig.tight_layout()
+        return
+
+    positive = ber[ber > 0]
+    if positive.size:
+        norm = LogNorm(vmin=positive.min(), vmax=max(positive.max(), positive.min()))
+    else:
+        norm = Normalize(vmin=0.0, vmax=1.0)
+    # Zero-BER cells are left blank rather than clipped onto the scale.
+    ber = np.where(ber > 0, ber, np.nan)
+    # tight_layout cannot place a colorbar shared by several axes.
+    fig.set_layout_engine("constrained")
+    panels = list(np.ndindex(*ber.shape[2:]))
+    n_cols = min(len(panels), 3)
+    n_rows = -(-len(panels) // n_cols)
+    fig.set_size_inches(_FIGSIZE[0] * (0.2 + 0.8 * n_cols), _FIGSIZE[1] * n_rows)
+    subplots = []
+    for i, index in enumerate(panels):
+        ax = fig.add_subplot(n_rows, n_cols, i + 1)
+        image = _grid_heatmap(ax, ber[(slice(None), slice(None), *index)], axes, norm)
+        title = ", ".join(
+            _grid_label(axis, axis["values"][j])
+            for axis, j in zip(axes[2:], index, strict=True)
+        )
+        ax.set_title(title or "BER grid", fontsize="small" if title else None)
+        subplots.append(ax)
+    fig.colorbar(image, ax=subplots, label="BER")
+
+
+def _ber_axes(fig: Any) -> Any:
+    ax = fig.add_subplot()
+    ax.set_ylabel("BER")
+    ax.grid(True, linestyle="--", alpha=0.5)
+    return ax
+
+
+def _on_ber_axes(draw: Callable[[Any, dict], None]) -> Callable[[Any, dict], None]:
+    """Adapt a single-axes BER curve drawer to the figure protocol."""
+
+    def draw_figure(fig: Any, payload: dict) -> None:
+        draw(_ber_axes(fig), payload)
+        fig.tight_layout()
+
+    return draw_figure
+
+
+# Artifact JSON file name -> (draw(figure, payload), PNG file name); each draw
+# function lays out the figure itself.
+_ARTIFACTS: dict[str, tuple[Callable[[Any, dict], None], str]] = {
+    "sweep.json": (_on_ber_axes(_draw_snr), "ber_vs_snr.png"),
+    "sweep_cfo.json": (_on_ber_axes(_draw_cfo), "ber_vs_cfo.png"),
+    "sweep_delay.json": (_on_ber_axes(_draw_delay), "ber_vs_delay.png"),
+    "sweep_rician.json": (_on_ber_axes(_draw_rician), "ber_vs_rician_k.png"),
+    "sweep_grid.json": (_draw_grid, "ber_grid.png"),
+    "sweep_pass.json": (_draw_pass, "ber_vs_time.png"),
+    "sweep_constellation.json": (_draw_constellation, "ber_constellation.png"),
+}
+
+
+def render_file(json_path: str | Path) -> Path:
+    """Render one sweep JSON artifact to the PNG next to it.
+
+    Args:
+        json_path: A ``sweep*.json`` file written by a ``save_sweep*`` helper.
+
+    Returns:
+        Path of the written PNG.
+
+    Raises:
+        ValueError: If the file name is not a known sweep artifact.
+    """
+    json_path = Path(json_path)
+    if json_path.name not in _ARTIFACTS:
+        raise ValueError(
+            f"don't know how to render {json_path.name}; "
+            f"expected one of {sorted(_ARTIFACTS)}"
+        )
+    draw, png_name = _ARTIFACTS[json_path.name]
+    with json_path.open(encoding="utf-8") as f:
+        payload = json.load(f)
+
+    fig = _reused_figure()
+    draw(fig, payload)
+    png_path = json_path.with_name(png_name)
+    fig.savefig(png_path, dpi=_DPI)
+    return png_path
+
+
+def find_artifacts(root: str | Path) -> list[Path]:
+    """Return every renderable sweep JSON under *root* (recursively), sorted."""
+    root = Path(root)
+    return sorted(p for name in _ARTIFACTS for p in root.rglob(name))
+
+
+def render_all(json_paths: Iterable[str | Path], workers: int = 1) -> list[Path]:
+    """Render many artifacts, optionally across a process pool.
+
+    Args:
+        json_paths: Sweep JSON files to render.
+        workers: Number of worker processes (1 renders in-process).  Each
+            worker reuses its own figure.
+
+    Returns:
+        The written PNG paths, in input order.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    json_paths = [Path(p) for p in json_paths]
+    if workers == 1 or len(json_paths) <= 1:
+        return [render_file(p) for p in json_paths]
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from ntn_linksim.experiments.runner import _single_threaded_env
+
+    ctx = multiprocessing.get_context("spawn")
+    with _single_threaded_env(), ProcessPoolExecutor(
+        max_workers=min(workers, len(json_paths)), mp_context=ctx
+    ) as pool:
+        return list(pool.map(render_file, json_paths))
@@ -0,0 +1,255 @@
+"""Point evaluation for sweeps: grid grouping and process-pool execution."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+
+from ntn_linksim.experiments.cache import ResultCache
+from ntn_linksim.sim import (
+    SimConfig,
+    SimResult,
+    StopCriteria,
+    run_channel_grid,
+    run_monte_carlo,
+)
+from ntn_linksim.trace import Span, Tracer, active_tracer, tracing
+
+# Thread-count variables honoured by the BLAS/OpenMP/FFT libraries NumPy
+# may be linked against.  Workers get one thread each so N workers use N
+# cores instead of N * n_threads.
+_THREAD_ENV_VARS = (
+    "OMP_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+)
+
+
+# Per-task cap on channels x SNR points x frame samples, so a large grid
+# is split into batches of bounded memory (~64 MiB per complex128 array).
+_MAX_TASK_SAMPLES = 1 << 22
+
+
+@dataclass(frozen=True)
+class _Task:
+    """A unit of work: one config over a (channel x SNR) grid, or one MC point.
+
+    A channel is a ``(cfo_hz, rician_k_db)`` pair.  Results are ordered
+    channel-major: position ``c * len(snr_db_list) + s``.
+    """
+
+    config: SimConfig
+    channels: tuple[tuple[float, float], ...]
+    snr_db_list: tuple[float, ...]
+    stop: StopCriteria | None
+
+
+def _evaluate(task: _Task) -> list[SimResult]:
+    """Run one task (module-level so it can be pickled to workers)."""
+    if task.stop is None:
+        grid = run_channel_grid(task.config, task.channels, task.snr_db_list)
+        return [result for row in grid for result in row]
+    return [
+        run_monte_carlo(replace(task.config, snr_db=snr_db), task.stop)
+        for snr_db in task.snr_db_list
+    ]
+
+
+def _evaluate_traced(task: _Task, memory: bool) -> tuple[list[SimResult], list[Span]]:
+    """Run one task in a worker under its own tracer; return results and spans."""
+    with tracing(Tracer(memory=memory)) as tracer:
+        return _evaluate(task), tracer.spans
+
+
+def _chunks(n: int, size: int) -> list[range]:
+    return [range(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _plan(
+    jobs: Sequence[tuple[SimConfig, StopCriteria | None]], workers: int
+) -> tuple[list[_Task], list[tuple[int, int]]]:
+    """Split *jobs* into tasks.
+
+    Returns the tasks plus, for each job, ``(task_index, position)`` of its
+    result.  Single-frame jobs whose configs differ only in ``snr_db``,
+    ``cfo_hz`` or ``rician_k_db`` are evaluated together by
+    :func:`~ntn_linksim.sim.run_channel_grid`: channels that share the same
+    SNR points form one (channel x SNR) product.  Products are split into
+    chunks so the pool stays busy and each batch stays under
+    ``_MAX_TASK_SAMPLES``.  Monte Carlo jobs run one task each.
+    """
+    # base config -> channel -> indices of its jobs, in SNR order
+    groups: dict[SimConfig, dict[tuple[float, float], list[int]]] = {}
+    mc_jobs: list[int] = []
+    for i, (cfg, stop) in enumerate(jobs):
+        if stop is None:
+            base = replace(cfg, snr_db=0.0, cfo_hz=0.0, rician_k_db=0.0)
+            channel = (float(cfg.cfo_hz), float(cfg.rician_k_db))
+            groups.setdefault(base, {}).setdefault(channel, []).append(i)
+        else:
+            mc_jobs.append(i)
+
+    # Channels with identical SNR points make one product.
+    products: list[tuple[SimConfig, list[tuple[float, float]], list[list[int]]]] = []
+    for base, channels in groups.items():
+        by_snr: dict[tuple[float, ...], int] = {}
+        for channel, members in channels.items():
+            snrs = tuple(float(jobs[i][0].snr_db) for i in members)
+            if snrs not in by_snr:
+                by_snr[snrs] = len(products)
+                products.append((base, [], []))
+            _, product_channels, product_members = products[by_snr[snrs]]
+            product_channels.append(channel)
+            product_members.append(members)
+
+    n_units = len(products) + len(mc_jobs)
+    n_chunks = max(1, -(-workers // n_units)) if workers > 1 else 1
+    tasks: list[_Task] = []
+    locations: list[tuple[int, int]] = [(0, 0)] * len(jobs)
+    for base, channels, members in products:
+        n_snr = len(members[0])
+        frame = base.n_symbols * (base.n_fft + base.cp_len)
+        per_task = -(-len(channels) * n_snr // n_chunks)
+        per_task = max(1, min(per_task, _MAX_TASK_SAMPLES // frame))
+        if n_snr <= per_task:
+            channel_step, snr_step = per_task // n_snr, n_snr
+        else:
+            channel_step, snr_step = 1, per_task
+        for channel_chunk in _chunks(len(channels), channel_step):
+            for snr_chunk in _chunks(n_snr, snr_step):
+                for c_pos, c in enumerate(channel_chunk):
+                    for s_pos, s in enumerate(snr_chunk):
+                        locations[members[c][s]] = (
+                            len(tasks),
+                            c_pos * len(snr_chunk) + s_pos,
+                        )
+                snr_db_list = tuple(
+                    float(jobs[members[channel_chunk[0]][s]][0].snr_db)
+                    for s in snr_chunk
+                )
+                chunk_channels = tuple(channels[c] for c in channel_chunk)
+                tasks.append(_Task(base, chunk_channels, snr_db_list, None))
+    for i in mc_jobs:
+        cfg, stop = jobs[i]
+        locations[i] = (len(tasks), 0)
+        channel = ((cfg.cfo_hz, cfg.rician_k_db),)
+        tasks.append(_Task(cfg, channel, (cfg.snr_db,), stop))
+    return tasks, locations
+
+
+@contextmanager
+def _single_threaded_env() -> Iterator[None]:
+    """Temporarily pin native thread pools to one thread.
+
+    Spawned workers inherit the environment at start-up, before NumPy and
+    its BLAS/FFT libraries are imported, so the limit takes effect there
+    without touching the parent's already-initialized libraries.
+    """
+    saved = {name: os.environ.get(name) for name in _THREAD_ENV_VARS}
+    os.environ.update({name: "1" for name in _THREAD_ENV_VARS})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def run_jobs(
+    jobs: Sequence[tuple[SimConfig, StopCriteria | None]],
+    workers: int = 1,
+    cache: ResultCache | None = None,
+) -> list[SimResult]:
+    """Evaluate ``(config, stop)`` jobs, optionally across a process pool.
+
+    Each job is fully determined by its config and stopping rule, so results
+    are bit-identical for any worker count and are returned in job order.
+    Jobs with different stopping rules share the same pool.  With a
+    *cache*, jobs found there are not run; the rest are evaluated together
+    (still grouped by SNR) and stored, then the cache is pruned.  While a
+    :func:`~ntn_linksim.trace.tracing` tracer is active, pool workers trace
+    their stages too and the spans are added to it.
+
+    Args:
+        jobs: ``(config, stop)`` pairs; ``stop=None`` runs a single frame.
+        workers: Number of worker processes (1 runs in-process).
+        cache: Optional on-disk result cache.
+
+    Returns:
+        One :class:`SimResult` per job, in input order.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    if cache is not None:
+        return _run_cached(jobs, workers, cache)
+    tasks, locations = _plan(jobs, workers)
+
+    if workers == 1 or len(tasks) == 1:
+        task_results = [_evaluate(task) for task in tasks]
+    else:
+        # Deferred: the pool machinery is only needed for parallel runs.
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        ctx = multiprocessing.get_context("spawn")
+        tracer = active_tracer()
+        with _single_threaded_env(), ProcessPoolExecutor(
+            max_workers=min(workers, len(tasks)), mp_context=ctx
+        ) as pool:
+            if tracer is None:
+                task_results = list(pool.map(_evaluate, tasks))
+            else:
+                # Workers trace into their own tracers; merge their spans.
+                memory = [tracer.memory] * len(tasks)
+                task_results = []
+                for results, spans in pool.map(_evaluate_traced, tasks, memory):
+                    task_results.append(results)
+                    tracer.spans.extend(spans)
+
+    return [task_results[t][p] for t, p in locations]
+
+
+def _run_cached(
+    jobs: list[tuple[SimConfig, StopCriteria | None]],
+    workers: int,
+    cache: ResultCache,
+) -> list[SimResult]:
+    """:func:`run_jobs` with lookups in, and writes to, *cache*."""
+    results = [cache.get(cfg, stop) for cfg, stop in jobs]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        fresh = run_jobs([jobs[i] for i in missing], workers)
+        for i, result in zip(missing, fresh, strict=True):
+            cache.put(*jobs[i], result)
+            results[i] = result
+        cache.prune()
+    return results
+
+
+def run_points(
+    configs: Sequence[SimConfig],
+    stop: StopCriteria | None = None,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+) -> list[SimResult]:
+    """Evaluate sweep points sharing one stopping rule.
+
+    Args:
+        configs: Point configurations.
+        stop: Optional Monte Carlo stopping rule applied per point.
+        workers: Number of worker processes (1 runs in-process).
+        cache: Optional on-disk result cache (see :func:`run_jobs`).
+
+    Returns:
+        One :class:`SimResult` per config, in input order.
+    """
+    return run_jobs([(cfg, stop) for cfg in configs], workers, cache)
@@ -0,0 +1,346 @@
+"""SQLite result store: one row per evaluated simulation point.
+
+Sweep JSON files only hold BER lists.  A :class:`ResultStore` keeps every
+point a sweep evaluates as a row of flat, typed columns instead:
+
+* every :class:`SimConfig` field, under its own name,
+* the :class:`StopCriteria` fields as ``stop_<name>`` (NULL for a single
+  frame),
+* the result counts: ``ber``, ``n_errors``, ``n_bits``, ``n_frames``,
+  ``ci_low``, ``ci_high``,
+* ``sweep`` (``"snr"``, ``"cfo"``, ``"delay"``, ``"rician_k"``, ``"grid"``
+  or ``"pass"``) and the ``run_id`` of the append that wrote it.
+
+Each :meth:`ResultStore.append` is one transaction and one row in the
+``runs`` table, which records when it ran, its wall time, the package
+version and the FFT backend.  Rows are never updated, so runs from many
+campaigns accumulate in one file and can be queried together;
+:meth:`ResultStore.query` streams rows from the database lazily and
+:meth:`ResultStore.columns` loads selected columns as NumPy arrays.  The
+sweep JSON files of the 1-D sweeps can be regenerated from the store with
+:meth:`ResultStore.export_json` (grid and pass points are queryable, but
+their axes and pass times are not recorded, so they are not exported).
+
+Columns for ``SimConfig`` fields added after a store was created are added
+on open (older rows read NULL there).
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+from collections.abc import Iterator, Sequence
+from contextlib import closing
+from dataclasses import asdict, fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ntn_linksim import __version__
+from ntn_linksim.sim import SimConfig, SimResult, StopCriteria
+
+SWEEP_TYPES = ("snr", "cfo", "delay", "rician_k", "grid", "pass", "constellation")
+
+_SQL_TYPES = {"bool": "INTEGER", "int": "INTEGER", "float": "REAL", "str": "TEXT"}
+_RESULT_COLUMNS = {
+    "ber": "REAL",
+    "n_errors": "INTEGER",
+    "n_bits": "INTEGER",
+    "n_frames": "INTEGER",
+    "ci_low": "REAL",
+    "ci_high": "REAL",
+}
+
+
+def _sql_type(annotation: str) -> str:
+    """Map a dataclass field annotation (``"int | None"``...) to a SQL type."""
+    return _SQL_TYPES[annotation.split("|")[0].strip()]
+
+
+_CONFIG_COLUMNS = {f.name: _sql_type(f.type) for f in fields(SimConfig)}
+_STOP_COLUMNS = {f"stop_{f.name}": _sql_type(f.type) for f in fields(StopCriteria)}
+_BOOL_COLUMNS = frozenset(f.name for f in fields(SimConfig) if f.type == "bool")
+_POINT_COLUMNS = {
+    "run_id": "INTEGER NOT NULL REFERENCES runs(id)",
+    "sweep": "TEXT NOT NULL",
+    **_CONFIG_COLUMNS,
+    **_STOP_COLUMNS,
+    **_RESULT_COLUMNS,
+}
+COLUMNS = ("id", *_POINT_COLUMNS)
+
+# The x axis and, for CFO/delay sweeps, the compensation flag that splits
+# the curves of each exported sweep JSON.
+_SWEEP_AXES = {
+    "snr": ("snr_db", None),
+    "cfo": ("cfo_hz", "enable_cfo_comp"),
+    "delay": ("delay_samples", "enable_timing_comp"),
+    "rician_k": ("rician_k_db", None),
+}
+EXPORTABLE_SWEEPS = tuple(_SWEEP_AXES)
+
+
+class ResultStore:
+    """Append-only SQLite store of simulation points.
+
+    Args:
+        path: Database file (created, with its parent directory, on
+            first use).
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "id INTEGER PRIMARY KEY, created REAL NOT NULL, "
+                "elapsed_s REAL, version TEXT NOT NULL, fft TEXT)"
+            )
+            columns = ", ".join(f"{n} {t}" for n, t in _POINT_COLUMNS.items())
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS points (id INTEGER PRIMARY KEY, {columns})"
+            )
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(points)")}
+            for name, sql_type in _POINT_COLUMNS.items():
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE points ADD COLUMN {name} {sql_type}")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS points_sweep ON points (sweep, run_id)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path)
+
+    def append(
+        self,
+        sweep: str,
+        configs: Sequence[SimConfig],
+        results: Sequence[SimResult],
+        stop: StopCriteria | None = None,
+        elapsed_s: float | None = None,
+    ) -> int:
+        """Record one run's evaluated points.
+
+        Args:
+            sweep: Sweep type the points belong to (see ``SWEEP_TYPES``).
+            configs: Point configurations.
+            results: One result per config.
+            stop: Monte Carlo stopping rule the points ran with, if any.
+            elapsed_s: Wall time spent evaluating the points, if measured.
+
+        Returns:
+            The new run's id.
+
+        Raises:
+            ValueError: If *sweep* is unknown or the lengths differ.
+        """
+        if sweep not in SWEEP_TYPES:
+            raise ValueError(f"sweep must be one of {SWEEP_TYPES}")
+        if len(configs) != len(results):
+            raise ValueError("configs and results must have the same length")
+        stop_values = (
+            [None] * len(_STOP_COLUMNS) if stop is None else list(asdict(stop).values())
+        )
+        fft = (
+            json.dumps(configs[0].resolve_fft().describe(), sort_keys=True)
+            if configs
+            else None
+        )
+        placeholders = ", ".join("?" * len(_POINT_COLUMNS))
+        with closing(self._connect()) as conn, conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (created, elapsed_s, version, fft) "
+                "VALUES (?, ?, ?, ?)",
+                (time.time(), elapsed_s, __version__, fft),
+            ).lastrowid
+            conn.executemany(
+                f"INSERT INTO points ({', '.join(_POINT_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                (
+                    (
+                        run_id,
+                        sweep,
+                        *asdict(config).values(),
+                        *stop_values,
+                        *(getattr(result, name) for name in _RESULT_COLUMNS),
+                    )
+                    for config, result in zip(configs, results, strict=True)
+                ),
+            )
+        return run_id
+
+    def _where(self, filters: dict[str, Any]) -> tuple[str, list]:
+        """Build a WHERE clause from column filters (see :meth:`query`)."""
+        clauses, params = [], []
+        for name, value in filters.items():
+            if name not in COLUMNS:
+                raise ValueError(f"unknown column {name!r}")
+            if isinstance(value, tuple):
+                low, high = value
+                clauses.append(f"{name} BETWEEN ? AND ?")
+                params += [low, high]
+            elif isinstance(value, (list, set, frozenset)):
+                clauses.append(f"{name} IN ({', '.join('?' * len(value))})")
+                params += list(value)
+            elif value is None:
+                clauses.append(f"{name} IS NULL")
+            else:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, **filters: Any) -> Iterator[dict[str, Any]]:
+        """Yield matching points as column dicts, oldest first.
+
+        Rows are read from the database as the iterator advances.
+
+        Args:
+            **filters: Column constraints.  A scalar matches equal values,
+                ``None`` matches NULL, a list matches any of its values and
+                a ``(low, high)`` tuple an inclusive range, e.g.
+                ``query(sweep="cfo", snr_db=20.0, cfo_hz=(0, 30e3))``.
+
+        Raises:
+            ValueError: If a filter names an unknown column.
+        """
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(COLUMNS)} FROM points{where} ORDER BY id"
+        with closing(self._connect()) as conn:
+            for row in conn.execute(sql, params):
+                point = dict(zip(COLUMNS, row, strict=True))
+                for name in _BOOL_COLUMNS:
+                    if point[name] is not None:
+                        point[name] = bool(point[name])
+                yield point
+
+    def columns(self, names: Sequence[str], **filters: Any) -> dict[str, np.ndarray]:
+        """Load the named columns of the matching points as arrays.
+
+        Args:
+            names: Columns to load.
+            **filters: Column constraints, as for :meth:`query`.
+
+        Returns:
+            Mapping of column name to a 1-D array, in row order.  Numeric
+            columns are float64 (NULL as NaN); text columns are object
+            arrays.
+        """
+        for name in names:
+            if name not in COLUMNS:
+                raise ValueError(f"unknown column {name!r}")
+        where, params = self._where(filters)
+        sql = f"SELECT {', '.join(names)} FROM points{where} ORDER BY id"
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        out = {}
+        for i, name in enumerate(names):
+            values = [row[i] for row in rows]
+            if _POINT_COLUMNS.get(name, "").startswith("TEXT"):
+                out[name] = np.array(values, dtype=object)
+            else:
+                out[name] = np.array(
+                    [np.nan if v is None else v for v in values], dtype=np.float64
+                )
+        return out
+
+    def runs(self) -> list[dict[str, Any]]:
+        """Return every run's metadata with its point count, oldest first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT runs.id, created, elapsed_s, version, fft, COUNT(points.id) "
+                "FROM runs LEFT JOIN points ON points.run_id = runs.id "
+                "GROUP BY runs.id ORDER BY runs.id"
+            ).fetchall()
+        keys = ("id", "created", "elapsed_s", "version", "fft", "n_points")
+        runs = [dict(zip(keys, row, strict=True)) for row in rows]
+        for run in runs:
+            run["fft"] = None if run["fft"] is None else json.loads(run["fft"])
+        return runs
+
+    def __len__(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM points").fetchone()[0]
+
+    def export_json(
+        self, sweep: str, out_dir: str | Path, plot: bool = False, **filters: Any
+    ) -> Path:
+        """Write the sweep JSON for the matching points of one sweep type.
+
+        Points are ordered by their sweep value.  When several match the
+        same value (and compensation setting), the most recently stored one
+        is used, so filter on e.g. ``seed``/``n_symbols`` to pin down one
+        campaign.
+
+        Args:
+            sweep: Sweep type to export (see ``EXPORTABLE_SWEEPS``).
+            out_dir: Output directory for the JSON (and PNG).
+            plot: Also render the PNG.
+            **filters: Column constraints, as for :meth:`query`.
+
+        Returns:
+            Path of the written JSON.
+
+        Raises:
+            ValueError: If *sweep* is not exportable, or no point matches.
+        """
+        # Deferred: sweep imports this module for its ``store`` arguments.
+        from ntn_linksim.experiments import sweep as sweep_module
+
+        if sweep not in EXPORTABLE_SWEEPS:
+            raise ValueError(f"sweep must be one of {EXPORTABLE_SWEEPS}")
+        x_name, comp_name = _SWEEP_AXES[sweep]
+        latest: dict[tuple[float, bool], dict] = {}
+        for point in self.query(**{**filters, "sweep": sweep}):
+            comp = bool(point[comp_name]) if comp_name else False
+            latest[(point[x_name], comp)] = point
+        if not latest:
+            raise ValueError(f"no stored {sweep!r} points match {filters}")
+
+        def curve(comp: bool) -> tuple[list[float], list[float]]:
+            keys = sorted(key for key in latest if key[1] == comp)
+            return [x for x, _ in keys], [latest[key]["ber"] for key in keys]
+
+        newest = max(latest.values(), key=lambda point: point["id"])
+        fft = self._run_fft(newest["run_id"])
+        snr_values = {point["snr_db"] for point in latest.values()}
+        snr_db = snr_values.pop() if len(snr_values) == 1 else None
+
+        if sweep == "snr":
+            x, ber = curve(False)
+            return sweep_module.save_sweep(out_dir, x, ber, fft=fft, plot=plot)
+        if sweep == "rician_k":
+            x, ber = curve(False)
+            return sweep_module.save_sweep_rician(
+                out_dir, x, ber, snr_db=snr_db, fft=fft, plot=plot
+            )
+        x, ber_no_comp = curve(False)
+        x_comp, ber_with_comp = curve(True)
+        if not x or (x_comp and x_comp != x):
+            raise ValueError(
+                "an exported sweep needs uncompensated points, and compensated "
+                "points (if any) at the same sweep values"
+            )
+        save = (
+            sweep_module.save_sweep_cfo
+            if sweep == "cfo"
+            else sweep_module.save_sweep_delay
+        )
+        return save(
+            out_dir,
+            x,
+            ber_no_comp,
+            ber_with_comp or None,
+            snr_db=snr_db,
+            fft=fft,
+            plot=plot,
+        )
+
+    def _run_fft(self, run_id: int) -> dict | None:
+        with closing(self._connect()) as conn:
+            (fft,) = conn.execute(
+                "SELECT fft FROM runs WHERE id = ?", (run_id,)
+            ).fetchone()
+        return None if fft is None else json.loads(fft)
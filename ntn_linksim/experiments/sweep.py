@@ -1,61 +1,254 @@
-"""SNR, CFO, delay, and Rician K-factor sweep utilities."""
+"""SNR, CFO, delay, Rician K-factor, grid, pass and constellation sweep utilities."""
 
 from __future__ import annotations
 
+import itertools
 import json
-from collections.abc import Iterable
-from dataclasses import replace
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import fields, replace
 from pathlib import Path
 
-import matplotlib
+import numpy as np
 
-matplotlib.use("Agg")
+from ntn_linksim.experiments.cache import ResultCache
+from ntn_linksim.experiments.render import render_file
+from ntn_linksim.experiments.runner import run_points
+from ntn_linksim.experiments.store import ResultStore
+from ntn_linksim.orbit import PassTable
+from ntn_linksim.sim import SimConfig, StopCriteria
 
-import matplotlib.pyplot as plt
 
-from ntn_linksim.sim import SimConfig, run_once
+def snr_sweep_configs(
+    config: SimConfig, snr_db_list: Iterable[float]
+) -> list[SimConfig]:
+    """Expand an SNR sweep into one config per point."""
+    return [replace(config, snr_db=float(snr_db)) for snr_db in snr_db_list]
 
 
-def sweep_ber(config: SimConfig, snr_db_list: Iterable[float]) -> list[float]:
-    """Run a BER sweep across SNR points."""
-    ber_list = []
-    for snr_db in snr_db_list:
-        result = run_once(replace(config, snr_db=float(snr_db)))
-        ber_list.append(result.ber)
-    return ber_list
+def cfo_sweep_configs(
+    config: SimConfig, cfo_hz_list: Iterable[float], enable_comp: bool = False
+) -> list[SimConfig]:
+    """Expand a CFO sweep (one compensation setting) into point configs."""
+    return [
+        replace(config, cfo_hz=float(cfo_hz), enable_cfo_comp=enable_comp)
+        for cfo_hz in cfo_hz_list
+    ]
+
+
+def delay_sweep_configs(
+    config: SimConfig, delay_list: Iterable[float], enable_comp: bool = False
+) -> list[SimConfig]:
+    """Expand a delay sweep (one compensation setting) into point configs."""
+    return [
+        replace(
+            config,
+            delay_samples=float(delay),
+            enable_timing_comp=enable_comp,
+        )
+        for delay in delay_list
+    ]
+
+
+def rician_k_sweep_configs(
+    config: SimConfig, k_db_list: Iterable[float]
+) -> list[SimConfig]:
+    """Expand a Rician K-factor sweep into point configs."""
+    return [
+        replace(config, enable_rician=True, rician_k_db=float(k_db))
+        for k_db in k_db_list
+    ]
+
+
+GRID_MODES = ("product", "zip")
+_CONFIG_TYPES = {f.name: f.type for f in fields(SimConfig)}
+
+
+def _axis_values(name: str, values: Sequence) -> list:
+    """Grid axis values, with float fields given as ints (YAML) as floats."""
+    if _CONFIG_TYPES.get(name) == "float":
+        return [float(v) for v in values]
+    return list(values)
+
+
+def grid_sweep_configs(
+    config: SimConfig,
+    axes: Mapping[str, Sequence],
+    mode: str = "product",
+) -> list[SimConfig]:
+    """Expand a grid sweep over any ``SimConfig`` fields into point configs.
+
+    Args:
+        config: Base simulation config.
+        axes: Field name -> values, in axis order.
+        mode: ``"product"`` for the Cartesian product of the axes (points in
+            C order, last axis fastest) or ``"zip"`` to pair the i-th values
+            of equally long axes.
+
+    Returns:
+        One config per grid point.
+
+    Raises:
+        ValueError: On unknown fields or modes, empty axes, or zipped axes
+            of different lengths.
+    """
+    if mode not in GRID_MODES:
+        raise ValueError(f"mode must be one of {GRID_MODES}")
+    if not axes:
+        raise ValueError("a grid sweep needs at least one axis")
+    for name, values in axes.items():
+        if name not in _CONFIG_TYPES:
+            raise ValueError(f"unknown SimConfig field {name!r} in grid axes")
+        if len(values) == 0:
+            raise ValueError(f"grid axis {name!r} has no values")
+    names = list(axes)
+    columns = [_axis_values(name, axes[name]) for name in names]
+    if mode == "zip":
+        if len({len(values) for values in columns}) != 1:
+            raise ValueError("zipped grid axes must all have the same length")
+        points = zip(*columns, strict=True)
+    else:
+        points = itertools.product(*columns)
+    return [replace(config, **dict(zip(names, point, strict=True))) for point in points]
+
+
+def pass_sweep_configs(config: SimConfig, table: PassTable) -> list[SimConfig]:
+    """Expand a satellite pass into one config per row of *table*.
+
+    Each point takes the row's SNR, Doppler (as ``cfo_hz``), Doppler rate
+    and K-factor, with Rician fading enabled.  The propagation delay is
+    assumed pre-compensated by the terminal (timing advance from GNSS and
+    ephemeris), so ``delay_samples`` keeps the base config's value, e.g. a
+    residual timing error.
+    """
+    return [
+        replace(
+            config,
+            snr_db=float(snr_db),
+            cfo_hz=float(doppler),
+            doppler_rate_hz_s=float(rate),
+            enable_rician=True,
+            rician_k_db=float(k_db),
+        )
+        for snr_db, doppler, rate, k_db in zip(
+            table.snr_db,
+            table.doppler_hz,
+            table.doppler_rate_hz_s,
+            table.rician_k_db,
+            strict=True,
+        )
+    ]
+
+
+def constellation_sweep_configs(
+    config: SimConfig, samples: Mapping[str, np.ndarray]
+) -> list[SimConfig]:
+    """Expand sampled constellation channel conditions into point configs.
+
+    *samples* holds ``snr_db``, ``doppler_hz`` and ``rician_k_db`` arrays
+    (see :func:`ntn_linksim.constellation.sample_channels`).  As for
+    :func:`pass_sweep_configs`, Rician fading is enabled and the delay is
+    assumed pre-compensated.
+    """
+    return [
+        replace(
+            config,
+            snr_db=float(snr_db),
+            cfo_hz=float(doppler),
+            enable_rician=True,
+            rician_k_db=float(k_db),
+        )
+        for snr_db, doppler, k_db in zip(
+            samples["snr_db"],
+            samples["doppler_hz"],
+            samples["rician_k_db"],
+            strict=True,
+        )
+    ]
+
+
+def _sweep(
+    sweep: str,
+    configs: list[SimConfig],
+    stop: StopCriteria | None,
+    workers: int,
+    cache: ResultCache | None,
+    store: ResultStore | None,
+) -> list[float]:
+    """Evaluate sweep points, record them in *store*, return their BERs."""
+    start = time.perf_counter()
+    results = run_points(configs, stop, workers, cache)
+    if store is not None:
+        store.append(
+            sweep, configs, results, stop, elapsed_s=time.perf_counter() - start
+        )
+    return [result.ber for result in results]
+
+
+def sweep_ber(
+    config: SimConfig,
+    snr_db_list: Iterable[float],
+    stop: StopCriteria | None = None,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+    store: ResultStore | None = None,
+) -> list[float]:
+    """Run a BER sweep across SNR points.
+
+    Without *stop*, all points share one TX/channel/noise realization and are
+    evaluated in a single vectorized pass (see
+    :func:`ntn_linksim.sim.run_snr_sweep`).  With *stop* set, each point runs
+    frames until the stopping rule is met instead of a single ``n_symbols``
+    frame.  *workers* > 1 spreads the points over a process pool, points
+    found in *cache* are not rerun, and every point is appended to *store*
+    when one is given.
+    """
+    configs = snr_sweep_configs(config, snr_db_list)
+    return _sweep("snr", configs, stop, workers, cache, store)
 
 
 def save_sweep(
     out_dir: str | Path,
     snr_db_list: Iterable[float],
     ber_list: list[float],
-) -> None:
-    """Save sweep JSON and BER vs SNR plot."""
+    fft: dict | None = None,
+    plot: bool = True,
+    trace: dict | None = None,
+) -> Path:
+    """Save sweep JSON and BER vs SNR plot; return the JSON path.
+
+    *fft* (the backend description, see ``SimConfig.resolve_fft``) and
+    *trace* (a :meth:`ntn_linksim.trace.Tracer.summary`) are recorded in
+    the JSON when given.  ``plot=False`` writes the JSON only;
+    it can be rendered later with
+    :func:`ntn_linksim.experiments.render.render_file`.
+    """
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
 
     snr_values = [float(x) for x in snr_db_list]
-    payload = {"snr_db": snr_values, "ber": ber_list}
+    payload: dict = {"snr_db": snr_values, "ber": ber_list}
+    if fft is not None:
+        payload["fft"] = fft
+    if trace is not None:
+        payload["trace"] = trace
 
     json_path = out_path / "sweep.json"
     with json_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, sort_keys=True)
-
-    plt.figure(figsize=(6, 4))
-    plt.plot(snr_values, ber_list, marker="o")
-    plt.xlabel("SNR (dB)")
-    plt.ylabel("BER")
-    plt.title("BER vs SNR (AWGN)")
-    plt.grid(True, linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    plt.savefig(out_path / "ber_vs_snr.png", dpi=150)
-    plt.close()
+    if plot:
+        render_file(json_path)
+    return json_path
 
 
 def sweep_ber_vs_cfo(
     config: SimConfig,
     cfo_hz_list: Iterable[float],
     enable_comp: bool = False,
+    stop: StopCriteria | None = None,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+    store: ResultStore | None = None,
 ) -> list[float]:
     """Sweep CFO at fixed SNR, return BER list.
 
@@ -63,16 +256,16 @@ def sweep_ber_vs_cfo(
         config: Base simulation config (snr_db used as the fixed SNR point).
         cfo_hz_list: CFO values in Hz to sweep.
         enable_comp: Whether to enable CFO compensation.
+        stop: Optional Monte Carlo stopping rule applied per point.
+        workers: Number of worker processes for the sweep points.
+        cache: Optional on-disk result cache for the points.
+        store: Optional result store the evaluated points are appended to.
 
     Returns:
         List of BER values corresponding to each CFO point.
     """
-    ber_list = []
-    for cfo_hz in cfo_hz_list:
-        cfg = replace(config, cfo_hz=float(cfo_hz), enable_cfo_comp=enable_comp)
-        result = run_once(cfg)
-        ber_list.append(result.ber)
-    return ber_list
+    configs = cfo_sweep_configs(config, cfo_hz_list, enable_comp)
+    return _sweep("cfo", configs, stop, workers, cache, store)
 
 
 def save_sweep_cfo(
@@ -81,8 +274,11 @@ def save_sweep_cfo(
     ber_no_comp: list[float],
     ber_with_comp: list[float] | None = None,
     snr_db: float | None = None,
-) -> None:
-    """Save CFO sweep JSON and BER vs CFO plot.
+    fft: dict | None = None,
+    plot: bool = True,
+    trace: dict | None = None,
+) -> Path:
+    """Save CFO sweep JSON and BER vs CFO plot; return the JSON path.
 
     Args:
         out_dir: Output directory for artifacts.
@@ -90,6 +286,10 @@ def save_sweep_cfo(
         ber_no_comp: BER values without compensation.
         ber_with_comp: BER values with compensation (optional).
         snr_db: Fixed SNR used for the sweep (for labeling).
+        fft: FFT backend description recorded in the JSON (optional).
+        plot: Also draw the PNG plot (False writes the JSON only).
+        trace: Per-stage trace summary recorded in the JSON (optional, see
+            :meth:`ntn_linksim.trace.Tracer.summary`).
     """
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
@@ -103,41 +303,27 @@ def save_sweep_cfo(
         payload["ber_with_comp"] = ber_with_comp
     if snr_db is not None:
         payload["snr_db"] = snr_db
+    if fft is not None:
+        payload["fft"] = fft
+    if trace is not None:
+        payload["trace"] = trace
 
     json_path = out_path / "sweep_cfo.json"
     with json_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, sort_keys=True)
-
-    # Convert Hz to kHz for plotting
-    cfo_khz = [x / 1000.0 for x in cfo_values]
-
-    plt.figure(figsize=(6, 4))
-    plt.plot(cfo_khz, ber_no_comp, marker="o", linestyle="-", label="No compensation")
-    if ber_with_comp is not None:
-        plt.plot(
-            cfo_khz,
-            ber_with_comp,
-            marker="s",
-            linestyle="--",
-            label="With compensation",
-        )
-        plt.legend()
-    plt.xlabel("CFO (kHz)")
-    plt.ylabel("BER")
-    title = "BER vs CFO"
-    if snr_db is not None:
-        title += f" at SNR = {snr_db} dB"
-    plt.title(title)
-    plt.grid(True, linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    plt.savefig(out_path / "ber_vs_cfo.png", dpi=150)
-    plt.close()
+    if plot:
+        render_file(json_path)
+    return json_path
 
 
 def sweep_ber_vs_delay(
     config: SimConfig,
     delay_list: Iterable[float],
     enable_comp: bool = False,
+    stop: StopCriteria | None = None,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+    store: ResultStore | None = None,
 ) -> list[float]:
     """Sweep timing offset at fixed SNR, return BER list.
 
@@ -145,20 +331,16 @@ def sweep_ber_vs_delay(
         config: Base simulation config (snr_db used as the fixed SNR point).
         delay_list: Delay values in samples to sweep.
         enable_comp: Whether to enable timing compensation.
+        stop: Optional Monte Carlo stopping rule applied per point.
+        workers: Number of worker processes for the sweep points.
+        cache: Optional on-disk result cache for the points.
+        store: Optional result store the evaluated points are appended to.
 
     Returns:
         List of BER values corresponding to each delay point.
     """
-    ber_list = []
-    for delay in delay_list:
-        cfg = replace(
-            config,
-            delay_samples=float(delay),
-            enable_timing_comp=enable_comp,
-        )
-        result = run_once(cfg)
-        ber_list.append(result.ber)
-    return ber_list
+    configs = delay_sweep_configs(config, delay_list, enable_comp)
+    return _sweep("delay", configs, stop, workers, cache, store)
 
 
 def save_sweep_delay(
@@ -167,8 +349,11 @@ def save_sweep_delay(
     ber_no_comp: list[float],
     ber_with_comp: list[float] | None = None,
     snr_db: float | None = None,
-) -> None:
-    """Save delay sweep JSON and BER vs delay plot.
+    fft: dict | None = None,
+    plot: bool = True,
+    trace: dict | None = None,
+) -> Path:
+    """Save delay sweep JSON and BER vs delay plot; return the JSON path.
 
     Args:
         out_dir: Output directory for artifacts.
@@ -176,6 +361,10 @@ def save_sweep_delay(
         ber_no_comp: BER values without compensation.
         ber_with_comp: BER values with compensation (optional).
         snr_db: Fixed SNR used for the sweep (for labeling).
+        fft: FFT backend description recorded in the JSON (optional).
+        plot: Also draw the PNG plot (False writes the JSON only).
+        trace: Per-stage trace summary recorded in the JSON (optional, see
+            :meth:`ntn_linksim.trace.Tracer.summary`).
     """
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
@@ -189,55 +378,42 @@ def save_sweep_delay(
         payload["ber_with_comp"] = ber_with_comp
     if snr_db is not None:
         payload["snr_db"] = snr_db
+    if fft is not None:
+        payload["fft"] = fft
+    if trace is not None:
+        payload["trace"] = trace
 
     json_path = out_path / "sweep_delay.json"
     with json_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, sort_keys=True)
-
-    plt.figure(figsize=(6, 4))
-    plt.plot(
-        delay_values, ber_no_comp, marker="o", linestyle="-", label="No compensation"
-    )
-    if ber_with_comp is not None:
-        plt.plot(
-            delay_values,
-            ber_with_comp,
-            marker="s",
-            linestyle="--",
-            label="With compensation",
-        )
-        plt.legend()
-    plt.xlabel("Delay (samples)")
-    plt.ylabel("BER")
-    title = "BER vs Timing Offset"
-    if snr_db is not None:
-        title += f" at SNR = {snr_db} dB"
-    plt.title(title)
-    plt.grid(True, linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    plt.savefig(out_path / "ber_vs_delay.png", dpi=150)
-    plt.close()
+    if plot:
+        render_file(json_path)
+    return json_path
 
 
 def sweep_ber_vs_rician_k(
     config: SimConfig,
     k_db_list: Iterable[float],
+    stop: StopCriteria | None = None,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+    store: ResultStore | None = None,
 ) -> list[float]:
     """Sweep Rician K-factor at fixed SNR, return BER list.
 
     Args:
         config: Base simulation config (snr_db used as the fixed SNR point).
         k_db_list: K-factor values in dB to sweep.
+        stop: Optional Monte Carlo stopping rule applied per point.
+        workers: Number of worker processes for the sweep points.
+        cache: Optional on-disk result cache for the points.
+        store: Optional result store the evaluated points are appended to.
 
     Returns:
         List of BER values corresponding to each K point.
     """
-    ber_list = []
-    for k_db in k_db_list:
-        cfg = replace(config, enable_rician=True, rician_k_db=float(k_db))
-        result = run_once(cfg)
-        ber_list.append(result.ber)
-    return ber_list
+    configs = rician_k_sweep_configs(config, k_db_list)
+    return _sweep("rician_k", configs, stop, workers, cache, store)
 
 
 def save_sweep_rician(
@@ -245,14 +421,21 @@ def save_sweep_rician(
     k_db_list: Iterable[float],
     ber_list: list[float],
     snr_db: float | None = None,
-) -> None:
-    """Save Rician K sweep JSON and BER vs K plot.
+    fft: dict | None = None,
+    plot: bool = True,
+    trace: dict | None = None,
+) -> Path:
+    """Save Rician K sweep JSON and BER vs K plot; return the JSON path.
 
     Args:
         out_dir: Output directory for artifacts.
         k_db_list: K-factor values in dB that were swept.
         ber_list: BER values for each K point.
         snr_db: Fixed SNR used for the sweep (for labeling).
+        fft: FFT backend description recorded in the JSON (optional).
+        plot: Also draw the PNG plot (False writes the JSON only).
+        trace: Per-stage trace summary recorded in the JSON (optional, see
+            :meth:`ntn_linksim.trace.Tracer.summary`).
     """
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
@@ -264,20 +447,166 @@ def save_sweep_rician(
     }
     if snr_db is not None:
         payload["snr_db"] = snr_db
+    if fft is not None:
+        payload["fft"] = fft
+    if trace is not None:
+        payload["trace"] = trace
 
     json_path = out_path / "sweep_rician.json"
     with json_path.open("w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, sort_keys=True)
+    if plot:
+        render_file(json_path)
+    return json_path
 
-    plt.figure(figsize=(6, 4))
-    plt.plot(k_values, ber_list, marker="o")
-    plt.xlabel("Rician K-factor (dB)")
-    plt.ylabel("BER")
-    title = "BER vs Rician K-factor"
-    if snr_db is not None:
-        title += f" at SNR = {snr_db} dB"
-    plt.title(title)
-    plt.grid(True, linestyle="--", alpha=0.5)
-    plt.tight_layout()
-    plt.savefig(out_path / "ber_vs_rician_k.png", dpi=150)
-    plt.close()
+
+def save_sweep_grid(
+    out_dir: str | Path,
+    axes: Mapping[str, Sequence],
+    ber_list: list[float],
+    mode: str = "product",
+    fft: dict | None = None,
+    plot: bool = True,
+    trace: dict | None = None,
+) -> Path:
+    """Save grid sweep JSON and BER heatmap; return the JSON path.
+
+    The JSON holds the axes in order (``[{"name", "values"}, ...]``), the
+    grid ``shape`` and ``ber`` as a nested list of that shape, so
+    ``np.array(payload["ber"])`` is the N-D result array.  Zipped grids
+    have a single dimension.
+
+    Args:
+        out_dir: Output directory for artifacts.
+        axes: Field name -> values, as passed to :func:`grid_sweep_configs`.
+        ber_list: BER per grid point, in :func:`grid_sweep_configs` order.
+        mode: ``"product"`` or ``"zip"``.
+        fft: FFT backend description recorded in the JSON (optional).
+        plot: Also draw the PNG plot (False writes the JSON only).
+        trace: Per-stage trace summary recorded in the JSON (optional, see
+            :meth:`ntn_linksim.trace.Tracer.summary`).
+    """
+    if mode not in GRID_MODES:
+        raise ValueError(f"mode must be one of {GRID_MODES}")
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    axis_list = [
+        {"name": name, "values": _axis_values(name, values)}
+        for name, values in axes.items()
+    ]
+    if mode == "zip":
+        shape = [len(ber_list)]
+    else:
+        shape = [len(axis["values"]) for axis in axis_list]
+    payload: dict = {
+        "axes": axis_list,
+        "mode": mode,
+        "shape": shape,
+        "ber": np.reshape(np.asarray(ber_list, dtype=float), shape).tolist(),
+    }
+    if fft is not None:
+        payload["fft"] = fft
+    if trace is not None:
+        payload["trace"] = trace
+
+    json_path = out_path / "sweep_grid.json"
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    if plot:
+        render_file(json_path)
+    return json_path
+
+
+def save_sweep_pass(
+    out_dir: str | Path,
+    table: PassTable,
+    ber_list: list[float],
+    orbit: dict | None = None,
+    fft: dict | None = None,
+    plot: bool = True,
+    trace: dict | None = None,
+) -> Path:
+    """Save pass sweep JSON and BER vs time plot; return the JSON path.
+
+    The JSON holds every :class:`~ntn_linksim.orbit.PassTable` column
+    (``time_s``, ``elevation_deg``, ``doppler_hz``, ...) next to ``ber``.
+
+    Args:
+        out_dir: Output directory for artifacts.
+        table: Channel parameters of the evaluated points.
+        ber_list: BER per row of *table*.
+        orbit: Pass parameters recorded in the JSON (optional).
+        fft: FFT backend description recorded in the JSON (optional).
+        plot: Also draw the PNG plot (False writes the JSON only).
+        trace: Per-stage trace summary recorded in the JSON (optional, see
+            :meth:`ntn_linksim.trace.Tracer.summary`).
+    """
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    payload: dict = {**table.as_dict(), "ber": ber_list}
+    if orbit is not None:
+        payload["orbit"] = orbit
+    if fft is not None:
+        payload["fft"] = fft
+    if trace is not None:
+        payload["trace"] = trace
+
+    json_path = out_path / "sweep_pass.json"
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    if plot:
+        render_file(json_path)
+    return json_path
+
+
+def save_sweep_constellation(
+    out_dir: str | Path,
+    samples: Mapping[str, np.ndarray],
+    ber_list: list[float],
+    histograms: dict | None = None,
+    constellation: dict | None = None,
+    fft: dict | None = None,
+    plot: bool = True,
+    trace: dict | None = None,
+) -> Path:
+    """Save constellation sweep JSON and histogram/BER plot; return the JSON path.
+
+    The JSON holds every sampled column (``elevation_deg``, ``doppler_hz``,
+    ``snr_db``, ...) next to ``ber``.
+
+    Args:
+        out_dir: Output directory for artifacts.
+        samples: Channel conditions of the evaluated points.
+        ber_list: BER per sample.
+        histograms: Visibility histograms recorded in the JSON (optional, see
+            :meth:`ntn_linksim.constellation.ConstellationStats.as_dict`).
+        constellation: Propagation parameters recorded in the JSON (optional).
+        fft: FFT backend description recorded in the JSON (optional).
+        plot: Also draw the PNG plot (False writes the JSON only).
+        trace: Per-stage trace summary recorded in the JSON (optional, see
+            :meth:`ntn_linksim.trace.Tracer.summary`).
+    """
+    out_path = Path(out_dir)
+    out_path.mkdir(parents=True, exist_ok=True)
+
+    payload: dict = {
+        **{name: np.asarray(values).tolist() for name, values in samples.items()},
+        "ber": ber_list,
+    }
+    if histograms is not None:
+        payload["histograms"] = histograms
+    if constellation is not None:
+        payload["constellation"] = constellation
+    if fft is not None:
+        payload["fft"] = fft
+    if trace is not None:
+        payload["trace"] = trace
+
+    json_path = out_path / "sweep_constellation.json"
+    with json_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+    if plot:
+        render_file(json_path)
+    return json_path
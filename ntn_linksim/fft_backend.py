@@ -0,0 +1,168 @@
+"""Pluggable FFT backends for the OFDM and delay stages.
+
+Two backends transform along the last axis:
+
+* ``"numpy"`` (default) -- NumPy's pocketfft, single-threaded.
+* ``"scipy"`` -- :mod:`scipy.fft`, which splits batched transforms over
+  ``workers`` threads.  SciPy is an optional dependency
+  (``pip install ntn-linksim-leo[fft]``).
+
+``"auto"`` picks SciPy when it is installed and NumPy otherwise.
+
+Both libraries cache twiddle factors internally.  On top of that a plan is
+cached per (backend, workers, length, dtype, direction).  It fixes the
+transform routine and the normalization scalar at the input precision, so a
+complex64 transform is never upcast to complex128 internally.  With ``out=``
+the plan transforms in place in the caller's buffer (e.g. a
+:class:`~ntn_linksim.workspace.Workspace` buffer).  That buffer is the only
+scratch space used.
+"""
+
+from __future__ import annotations
+
+import importlib
+from dataclasses import dataclass
+from functools import lru_cache
+from types import ModuleType
+
+import numpy as np
+
+from ntn_linksim.precision import as_complex, real_dtype
+from ntn_linksim.workspace import check_out
+
+try:  # NumPy's FFT gufuncs, called directly to pick the single-precision loop
+    from numpy.fft import _pocketfft_umath as _np_pocketfft
+except ImportError:  # pragma: no cover - layout of other NumPy versions
+    _np_pocketfft = None
+
+FFT_BACKENDS = ("numpy", "scipy", "auto")
+
+
+@lru_cache(maxsize=1)
+def _scipy_fft() -> ModuleType | None:
+    """Import :mod:`scipy.fft` on first use; None when SciPy is missing."""
+    try:
+        return importlib.import_module("scipy.fft")
+    except ImportError:
+        return None
+
+
+def scipy_available() -> bool:
+    """Return True if the ``"scipy"`` backend can be used."""
+    return _scipy_fft() is not None
+
+
+@dataclass(frozen=True)
+class FftBackend:
+    """A resolved FFT backend; build one with :func:`get_fft_backend`."""
+
+    name: str = "numpy"
+    workers: int = 1
+
+    def fft(self, x: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Forward DFT along the last axis, keeping the dtype of *x*.
+
+        *out* (same shape and dtype as *x*, may be *x* itself) receives the
+        result when given.
+        """
+        return self._transform(x, out, inverse=False)
+
+    def ifft(self, x: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        """Inverse DFT (1/N normalized) along the last axis; see :meth:`fft`."""
+        return self._transform(x, out, inverse=True)
+
+    def describe(self) -> dict:
+        """Return the backend settings for run artifacts."""
+        return {"backend": self.name, "workers": self.workers}
+
+    def _transform(
+        self, x: np.ndarray, out: np.ndarray | None, inverse: bool
+    ) -> np.ndarray:
+        x = as_complex(x)
+        if x.ndim < 1:
+            raise ValueError("x must be at least a 1-D array")
+        if out is not None:
+            check_out(out, x.shape, x.dtype)
+        if x.shape[-1] == 0:
+            raise ValueError("cannot transform an empty last axis")
+        plan = _plan(self.name, self.workers, x.shape[-1], x.dtype.str, inverse)
+        return plan(x, out)
+
+
+NUMPY_FFT = FftBackend()
+
+
+def get_fft_backend(name: str = "numpy", workers: int = 1) -> FftBackend:
+    """Resolve a backend name and worker count.
+
+    Args:
+        name: ``"numpy"``, ``"scipy"`` or ``"auto"``.
+        workers: Threads per transform (``"scipy"`` only; NumPy always uses
+            one, so the resolved NumPy backend reports ``workers=1``).
+
+    Returns:
+        The :class:`FftBackend` to use.
+
+    Raises:
+        ValueError: If *name* is unknown or *workers* < 1.
+        ImportError: If ``"scipy"`` is requested but SciPy is not installed.
+    """
+    if name not in FFT_BACKENDS:
+        raise ValueError(f"fft backend must be one of {FFT_BACKENDS}")
+    if workers < 1:
+        raise ValueError("fft workers must be >= 1")
+    if name == "auto":
+        name = "scipy" if scipy_available() else "numpy"
+    if name == "scipy" and not scipy_available():
+        raise ImportError(
+            "the 'scipy' FFT backend needs SciPy "
+            "(pip install ntn-linksim-leo[fft])"
+        )
+    if name == "numpy":
+        return NUMPY_FFT
+    return FftBackend(name, workers)
+
+
+class _Plan:
+    """Transform of one length, dtype and direction on one backend."""
+
+    def __init__(
+        self, backend: str, workers: int, n: int, dtype: np.dtype, inverse: bool
+    ) -> None:
+        self.backend = backend
+        self.workers = workers
+        self.inverse = inverse
+        self.dtype = dtype
+        # Normalization scalar typed at the input precision: a Python int
+        # here would make NumPy select its complex128 loop for complex64.
+        rdtype = real_dtype(dtype)
+        self.fct = np.reciprocal(rdtype.type(n)) if inverse else rdtype.type(1)
+
+    def __call__(self, x: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+        if self.backend == "scipy":
+            return self._scipy(x, out)
+        if _np_pocketfft is None:  # pragma: no cover
+            func = np.fft.ifft if self.inverse else np.fft.fft
+            return func(x, axis=-1, out=out).astype(self.dtype, copy=False)
+        if out is None:
+            out = np.empty(x.shape, dtype=self.dtype)
+        ufunc = _np_pocketfft.ifft if self.inverse else _np_pocketfft.fft
+        return ufunc(x, self.fct, axes=[(-1,), (), (-1,)], out=out)
+
+    def _scipy(self, x: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+        sp = _scipy_fft()
+        func = sp.ifft if self.inverse else sp.fft
+        if out is None:
+            return func(x, axis=-1, workers=self.workers)
+        # Transform in the caller's buffer rather than a fresh result array.
+        if out is not x:
+            np.copyto(out, x)
+        result = func(out, axis=-1, workers=self.workers, overwrite_x=True)
+        if result is not out and not np.shares_memory(result, out):
+            np.copyto(out, result)
+        return out
+
+
+@lru_cache(maxsize=64)
+def _plan(backend: str, workers: int, n: int, dtype: str, inverse: bool) -> _Plan:
+    return _Plan(backend, workers, n, np.dtype(dtype), inverse)
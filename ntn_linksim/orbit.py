@@ -0,0 +1,200 @@
+"""LEO pass geometry: delay, Doppler, path loss and K-factor over a pass.
+
+A :class:`CircularPass` describes one pass of a satellite on a circular
+orbit over a ground terminal.  The terminal sits off the orbital plane so
+that the pass peaks at ``max_elevation_deg``; Earth rotation and
+atmospheric effects are neglected.  :meth:`CircularPass.table` evaluates
+the geometry on a coarse time grid from acquisition (elevation rising
+through ``min_elevation_deg``) to loss of signal, vectorized over time, and
+returns a :class:`PassTable`.  :meth:`PassTable.at` linearly interpolates
+every column to arbitrary times, so per-block channel parameters come from
+the table instead of re-running the geometry.
+
+The link budget is relative: the SNR is ``zenith_snr_db`` at a slant range
+equal to the altitude and follows the free-space path loss elsewhere.  The
+Rician K-factor is interpolated from an elevation table.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+EARTH_RADIUS_M = 6_371_000.0
+EARTH_MU_M3_S2 = 3.986004418e14
+SPEED_OF_LIGHT_M_S = 299_792_458.0
+
+# Illustrative LoS K-factor vs elevation: low passes see more multipath.
+DEFAULT_K_DB_TABLE = ((10.0, 4.0), (30.0, 8.0), (60.0, 12.0), (90.0, 15.0))
+
+
+def free_space_path_loss_db(range_m: np.ndarray, carrier_hz: float) -> np.ndarray:
+    """Free-space path loss ``20*log10(4*pi*d*f/c)`` in dB."""
+    return 20.0 * np.log10(4.0 * np.pi * range_m * carrier_hz / SPEED_OF_LIGHT_M_S)
+
+
+def _central_angle(orbit_radius_m: float, elevation_deg: float) -> float:
+    """Earth central angle between the sub-satellite point and a terminal
+    seeing the satellite at *elevation_deg*."""
+    el = math.radians(elevation_deg)
+    return math.acos(EARTH_RADIUS_M / orbit_radius_m * math.cos(el)) - el
+
+
+@dataclass(frozen=True)
+class PassTable:
+    """Channel parameters of a pass sampled at ``time_s``.
+
+    Every field is an array with one value per time; ``time_s`` starts at 0
+    at acquisition.  ``doppler_hz`` is the shift of the received carrier
+    (positive while the satellite approaches) and ``doppler_rate_hz_s`` its
+    time derivative.
+    """
+
+    time_s: np.ndarray
+    elevation_deg: np.ndarray
+    slant_range_m: np.ndarray
+    delay_s: np.ndarray
+    doppler_hz: np.ndarray
+    doppler_rate_hz_s: np.ndarray
+    path_loss_db: np.ndarray
+    snr_db: np.ndarray
+    rician_k_db: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.time_s.size)
+
+    def at(self, time_s: np.ndarray | float) -> PassTable:
+        """Linearly interpolate every column to *time_s* (clamped to the pass)."""
+        t = np.atleast_1d(np.asarray(time_s, dtype=np.float64))
+        return PassTable(
+            **{
+                f.name: np.interp(t, self.time_s, getattr(self, f.name))
+                for f in fields(self)
+            }
+        )
+
+    def as_dict(self) -> dict[str, list[float]]:
+        """Columns as plain lists (for JSON)."""
+        return {f.name: getattr(self, f.name).tolist() for f in fields(self)}
+
+
+@dataclass(frozen=True)
+class CircularPass:
+    """One pass over a ground terminal from a circular orbit.
+
+    Args:
+        altitude_km: Orbit altitude above the mean Earth radius.
+        max_elevation_deg: Peak elevation of the pass (90 is overhead).
+        min_elevation_deg: Elevation mask bounding the pass.
+        carrier_hz: Carrier frequency for Doppler and path loss.
+        zenith_snr_db: SNR at a slant range equal to the altitude.
+        k_db_table: ``(elevation_deg, k_db)`` pairs, increasing in
+            elevation, interpolated (and held at the ends) for the K-factor.
+    """
+
+    altitude_km: float = 600.0
+    max_elevation_deg: float = 90.0
+    min_elevation_deg: float = 10.0
+    carrier_hz: float = 2.0e9
+    zenith_snr_db: float = 20.0
+    k_db_table: tuple[tuple[float, float], ...] = DEFAULT_K_DB_TABLE
+
+    def validate(self) -> None:
+        if self.altitude_km <= 0:
+            raise ValueError("altitude_km must be positive")
+        if not 0.0 <= self.min_elevation_deg < self.max_elevation_deg <= 90.0:
+            raise ValueError(
+                "elevations must satisfy 0 <= min_elevation_deg "
+                "< max_elevation_deg <= 90"
+            )
+        if self.carrier_hz <= 0:
+            raise ValueError("carrier_hz must be positive")
+        elevations = [el for el, _ in self.k_db_table]
+        if not elevations or any(
+            b <= a for a, b in zip(elevations[:-1], elevations[1:], strict=True)
+        ):
+            raise ValueError("k_db_table elevations must be non-empty and increasing")
+
+    @property
+    def orbit_radius_m(self) -> float:
+        return EARTH_RADIUS_M + self.altitude_km * 1e3
+
+    @property
+    def angular_rate_rad_s(self) -> float:
+        """Orbital angular rate of the circular orbit."""
+        return math.sqrt(EARTH_MU_M3_S2 / self.orbit_radius_m**3)
+
+    def _half_arc_rad(self) -> float:
+        """Orbit angle from the closest approach to the elevation mask."""
+        cross_track = _central_angle(self.orbit_radius_m, self.max_elevation_deg)
+        edge = _central_angle(self.orbit_radius_m, self.min_elevation_deg)
+        return math.acos(math.cos(edge) / math.cos(cross_track))
+
+    @property
+    def duration_s(self) -> float:
+        """Time above the elevation mask."""
+        self.validate()
+        return 2.0 * self._half_arc_rad() / self.angular_rate_rad_s
+
+    def geometry(self, time_s: np.ndarray) -> PassTable:
+        """Evaluate the pass at arbitrary times since acquisition.
+
+        Args:
+            time_s: Times in seconds (any shape is flattened).
+
+        Returns:
+            A :class:`PassTable` with one row per time.
+        """
+        self.validate()
+        t = np.ravel(np.asarray(time_s, dtype=np.float64))
+        r = self.orbit_radius_m
+        w = self.angular_rate_rad_s
+        beta = _central_angle(r, self.max_elevation_deg)
+        # Orbit in the x-y plane, closest approach on the x axis; the
+        # terminal is rotated out of the plane by the cross-track angle.
+        theta = w * t - self._half_arc_rad()
+        gx = EARTH_RADIUS_M * math.cos(beta)
+        gz = EARTH_RADIUS_M * math.sin(beta)
+        dx = r * np.cos(theta) - gx
+        dy = r * np.sin(theta)
+        dz = -gz
+        slant = np.sqrt(dx * dx + dy * dy + dz * dz)
+        up = (dx * gx + dz * gz) / EARTH_RADIUS_M
+        elevation = np.degrees(np.arcsin(np.clip(up / slant, -1.0, 1.0)))
+        # Range rate and its derivative from the velocity -r*w*(sin, -cos)
+        # and the centripetal acceleration of the orbit.
+        vx = -r * w * np.sin(theta)
+        vy = r * w * np.cos(theta)
+        range_rate = (dx * vx + dy * vy) / slant
+        d_dot_a = -(w * w) * r * (dx * np.cos(theta) + dy * np.sin(theta))
+        range_accel = ((r * w) ** 2 + d_dot_a - range_rate**2) / slant
+        doppler = -self.carrier_hz * range_rate / SPEED_OF_LIGHT_M_S
+        doppler_rate = -self.carrier_hz * range_accel / SPEED_OF_LIGHT_M_S
+
+        path_loss = free_space_path_loss_db(slant, self.carrier_hz)
+        zenith_loss = free_space_path_loss_db(self.altitude_km * 1e3, self.carrier_hz)
+        k_el, k_db = zip(*self.k_db_table, strict=True)
+        return PassTable(
+            time_s=t,
+            elevation_deg=elevation,
+            slant_range_m=slant,
+            delay_s=slant / SPEED_OF_LIGHT_M_S,
+            doppler_hz=doppler,
+            doppler_rate_hz_s=doppler_rate,
+            path_loss_db=path_loss,
+            snr_db=self.zenith_snr_db - (path_loss - zenith_loss),
+            rician_k_db=np.interp(elevation, k_el, k_db),
+        )
+
+    def table(self, step_s: float = 1.0) -> PassTable:
+        """Sample the whole pass every *step_s* seconds (end included)."""
+        if step_s <= 0:
+            raise ValueError("step_s must be positive")
+        duration = self.duration_s
+        n = int(math.floor(duration / step_s)) + 1
+        times = np.arange(n, dtype=np.float64) * step_s
+        if times[-1] < duration:
+            times = np.append(times, duration)
+        return self.geometry(times)
@@ -0,0 +1,177 @@
+"""Complex phasor engine for CFO rotation and derotation.
+
+Frequency offsets are applied as ``x[n] * exp(j*2*pi*cfo*n/fs)`` along the
+last axis.  Short and medium vectors use a phase table cached per
+``(n, cfo_hz, fs_hz)``, so a sweep that applies the same channel CFO at many
+points computes ``np.exp`` once.  Long vectors are rotated block by block
+with a phase recurrence: one ``exp`` table for a block and one phasor per
+block start, so no full-length phasor is ever materialized and memory
+traffic is one read and one write of the signal.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+
+import numpy as np
+
+from ntn_linksim.workspace import Workspace
+
+# Vectors up to this many samples use a (cached) full-length phase table.
+_TABLE_MAX_SAMPLES = 1 << 18
+# Block length of the phase recurrence used for longer vectors.
+_BLOCK_SAMPLES = 4096
+
+
+@lru_cache(maxsize=16)
+def _phase_table(n: int, cfo_hz: float, fs_hz: float, dtype: str) -> np.ndarray:
+    """Return the read-only phasor ``exp(j*2*pi*cfo*k/fs)`` for ``k < n``.
+
+    The phase is always evaluated in double precision, then stored as
+    *dtype*.
+    """
+    k = np.arange(n, dtype=np.float64)
+    table = np.exp(1j * 2.0 * np.pi * cfo_hz * k / fs_hz).astype(dtype)
+    table.flags.writeable = False
+    return table
+
+
+@lru_cache(maxsize=16)
+def _sample_index(n: int) -> np.ndarray:
+    """Read-only ``arange(n)`` as float64."""
+    k = np.arange(n, dtype=np.float64)
+    k.flags.writeable = False
+    return k
+
+
+def _phase_ramp(
+    n: int,
+    start: int,
+    cfo_hz: float,
+    fs_hz: float,
+    dtype: np.dtype,
+    workspace: Workspace | None,
+) -> np.ndarray:
+    """Uncached phasor for samples ``start .. start+n-1``.
+
+    Built with in-place ufuncs, in *workspace* buffers when given, so a
+    per-run offset (e.g. a CFO estimate) needs no fresh allocations.
+    """
+    if start == 0:
+        k = _sample_index(n)
+    else:
+        k = np.arange(start, start + n, dtype=np.float64)
+    if workspace is None:
+        ramp = np.empty(n, dtype=np.complex128)
+    else:
+        ramp = workspace.get("phasor.ramp", (n,), np.complex128)
+    np.multiply(1j * 2.0 * np.pi * cfo_hz, k, out=ramp)
+    np.divide(ramp, fs_hz, out=ramp)
+    np.exp(ramp, out=ramp)
+    if dtype == np.complex128:
+        return ramp
+    if workspace is None:
+        return ramp.astype(dtype)
+    narrow = workspace.get("phasor.ramp_narrow", (n,), dtype)
+    np.copyto(narrow, ramp, casting="same_kind")
+    return narrow
+
+
+def phasor(
+    n: int,
+    fs_hz: float,
+    cfo_hz: float,
+    cache: bool = True,
+    dtype: np.dtype = np.complex128,
+) -> np.ndarray:
+    """Return ``exp(j*2*pi*cfo_hz*k/fs_hz)`` for ``k = 0 .. n-1``.
+
+    Args:
+        n: Number of samples.
+        fs_hz: Sample rate in Hz.
+        cfo_hz: Frequency offset in Hz.
+        cache: Reuse (and store) the table in the LRU cache.  Disable for
+            one-off offsets such as per-run estimates.
+        dtype: complex128 or complex64 output.
+
+    Returns:
+        Phasor of length *n*.  Cached tables are read-only.
+    """
+    if n < 0:
+        raise ValueError("n must be non-negative")
+    if fs_hz <= 0:
+        raise ValueError("fs_hz must be positive")
+    key = (int(n), float(cfo_hz), float(fs_hz), np.dtype(dtype).str)
+    if cache:
+        return _phase_table(*key)
+    return _phase_table.__wrapped__(*key)
+
+
+def rotate(
+    x: np.ndarray,
+    fs_hz: float,
+    cfo_hz: float | np.ndarray,
+    out: np.ndarray | None = None,
+    cache: bool = True,
+    start: int = 0,
+    workspace: Workspace | None = None,
+) -> np.ndarray:
+    """Multiply *x* by ``exp(j*2*pi*cfo_hz*n/fs_hz)`` along the last axis.
+
+    A net rotation (e.g. channel CFO minus an estimate) is applied in a
+    single pass by passing the difference as *cfo_hz*; derotation is a
+    negative *cfo_hz*.
+
+    Args:
+        x: Complex samples ``(..., n_samples)``.
+        fs_hz: Sample rate in Hz.
+        cfo_hz: Scalar offset, or an array matching the leading axes of *x*
+            for per-row offsets.
+        out: Optional destination with the shape of *x* and the dtype of the
+            result (complex64 for complex64 *x*, else complex128); may be *x*
+            itself for an in-place rotation.
+        cache: Reuse cached phase tables (see :func:`phasor`).
+        start: Sample index *n* of ``x[..., 0]``, so consecutive blocks of a
+            stream continue the same phase ramp.
+        workspace: Scratch buffers for uncached phase tables.
+
+    Returns:
+        The rotated samples (*out* when given).
+    """
+    x = np.asarray(x)
+    if x.ndim < 1:
+        raise ValueError("x must be a complex array with at least 1 dimension")
+    if fs_hz <= 0:
+        raise ValueError("fs_hz must be positive")
+    if start < 0:
+        raise ValueError("start must be non-negative")
+    cfo = np.asarray(cfo_hz, dtype=np.float64)
+    if cfo.ndim > 0 and cfo.shape != x.shape[:-1]:
+        raise ValueError("cfo_hz must be a scalar or match the batch shape of x")
+    dtype = np.dtype(np.complex64 if x.dtype == np.complex64 else np.complex128)
+    if out is None:
+        out = np.empty(x.shape, dtype=dtype)
+    elif out.shape != x.shape or out.dtype != dtype:
+        raise ValueError(f"out must be {dtype} with the shape of x")
+
+    n = x.shape[-1]
+    if cfo.ndim == 0 and n <= _TABLE_MAX_SAMPLES:
+        if start == 0 and cache:
+            table = phasor(n, fs_hz, float(cfo), dtype=dtype)
+        else:
+            table = _phase_ramp(n, start, float(cfo), fs_hz, dtype, workspace)
+        return np.multiply(x, table, out=out)
+
+    # Phase recurrence: block b is base * exp(j*2*pi*cfo*b*L/fs).
+    block = min(n, _BLOCK_SAMPLES)
+    cfo_col = cfo[..., np.newaxis]
+    k = np.arange(block, dtype=np.float64)
+    base = np.exp(1j * 2.0 * np.pi * cfo_col * k / fs_hz)
+    starts = np.arange(start, start + n, block, dtype=np.float64)
+    steps = np.exp(1j * 2.0 * np.pi * cfo_col * starts / fs_hz)
+    for b, lo in enumerate(range(0, n, block)):
+        hi = min(lo + block, n)
+        step = steps[..., b : b + 1]
+        ramp = (step * base[..., : hi - lo]).astype(dtype, copy=False)
+        np.multiply(x[..., lo:hi], ramp, out=out[..., lo:hi])
+    return out
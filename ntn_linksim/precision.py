@@ -0,0 +1,38 @@
+"""Numeric precision policy for the simulation chain.
+
+Signals are carried as complex128 (``"double"``, the default) or complex64
+(``"single"``).  Every stage keeps the dtype of its input: complex64 arrays
+stay complex64 and anything else is promoted to complex128, so a
+single-precision run is never silently upcast part-way through the chain.
+Frame-wide reductions that are sensitive to rounding (the timing metric's
+running sums) still accumulate in double precision.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+PRECISIONS = ("double", "single")
+
+
+def complex_dtype(precision: str) -> np.dtype:
+    """Return the complex sample dtype for *precision*."""
+    if precision not in PRECISIONS:
+        raise ValueError(f"precision must be one of {PRECISIONS}")
+    return np.dtype(np.complex64 if precision == "single" else np.complex128)
+
+
+def real_dtype(dtype: np.dtype) -> np.dtype:
+    """Return the real dtype matching a complex sample *dtype*."""
+    return np.dtype(np.float32 if dtype == np.complex64 else np.float64)
+
+
+def as_complex(x: np.ndarray) -> np.ndarray:
+    """View *x* as complex64 if it already is, else as complex128.
+
+    No copy is made when *x* already has one of the two sample dtypes.
+    """
+    x = np.asarray(x)
+    if x.dtype == np.complex64:
+        return x
+    return x.astype(np.complex128, copy=False)
@@ -4,19 +4,25 @@ from __future__ import annotations
 
 import numpy as np
 
+from ntn_linksim.phasor import rotate
+from ntn_linksim.precision import as_complex
+from ntn_linksim.workspace import Workspace
+
 
 def estimate_cfo_from_cp(
     rx: np.ndarray, n_fft: int, cp_len: int, fs_hz: float
-) -> float:
+) -> float | np.ndarray:
     """Estimate CFO using CP correlation on a single OFDM symbol with CP.
 
     Uses tail * conj(cp) so positive CFO matches apply_cfo() convention.
+    A batched ``(..., n_fft + cp_len)`` input returns one estimate per row
+    as an array; a 1-D input returns a float.
     """
     rx = np.asarray(rx)
-    if rx.ndim != 1:
-        raise ValueError("rx must be a 1-D complex array")
+    if rx.ndim < 1:
+        raise ValueError("rx must be a complex array with at least 1 dimension")
     if not np.iscomplexobj(rx):
-        raise ValueError("rx must be a 1-D complex array")
+        raise ValueError("rx must be a complex array with at least 1 dimension")
     if n_fft <= 0:
         raise ValueError("n_fft must be positive")
     if cp_len <= 0:
@@ -24,28 +30,49 @@ def estimate_cfo_from_cp(
     if fs_hz <= 0:
         raise ValueError("fs_hz must be positive")
     expected_len = n_fft + cp_len
-    if rx.size != expected_len:
+    if rx.shape[-1] != expected_len:
         raise ValueError("rx length must be n_fft + cp_len")
 
-    rx = rx.astype(np.complex128, copy=False)
-    p = np.sum(rx[n_fft : n_fft + cp_len] * np.conjugate(rx[0:cp_len]))
+    rx = as_complex(rx)
+    p = np.sum(
+        rx[..., n_fft : n_fft + cp_len] * np.conjugate(rx[..., 0:cp_len]), axis=-1
+    )
     eps_hat = np.angle(p) / n_fft
-    return float(eps_hat * fs_hz / (2.0 * np.pi))
+    cfo_hat = eps_hat * fs_hz / (2.0 * np.pi)
+    if rx.ndim == 1:
+        return float(cfo_hat)
+    return cfo_hat
 
 
-def compensate_cfo(x: np.ndarray, fs_hz: float, cfo_hz: float) -> np.ndarray:
-    """Apply CFO compensation as a complex exponential derotation."""
+def compensate_cfo(
+    x: np.ndarray,
+    fs_hz: float,
+    cfo_hz: float | np.ndarray,
+    out: np.ndarray | None = None,
+    start: int = 0,
+    workspace: Workspace | None = None,
+) -> np.ndarray:
+    """Apply CFO compensation as a complex exponential derotation.
+
+    *cfo_hz* may be a scalar or an array matching the leading (batch) axes
+    of *x*, e.g. the per-row output of :func:`estimate_cfo_from_cp`.  Pass
+    ``out=x`` to derotate in place, and *start* (sample index of
+    ``x[..., 0]``) when derotating a stream block by block.  The
+    per-run phase table is built in *workspace* buffers when given.
+    """
     x = np.asarray(x)
-    if x.ndim != 1:
-        raise ValueError("x must be a 1-D complex array")
+    if x.ndim < 1:
+        raise ValueError("x must be a complex array with at least 1 dimension")
     if not np.iscomplexobj(x):
-        raise ValueError("x must be a 1-D complex array")
+        raise ValueError("x must be a complex array with at least 1 dimension")
     if fs_hz <= 0:
         raise ValueError("fs_hz must be positive")
+    cfo_hz = np.asarray(cfo_hz, dtype=np.float64)
+    if cfo_hz.ndim > 0 and cfo_hz.shape != x.shape[:-1]:
+        raise ValueError("cfo_hz must be a scalar or match the batch shape of x")
 
-    x = x.astype(np.complex128, copy=False)
-    n = np.arange(x.size, dtype=np.float64)
-    phasor = np.exp(-1j * 2.0 * np.pi * cfo_hz * n / fs_hz).astype(
-        np.complex128
+    x = as_complex(x)
+    # Estimates change every run, so their phase tables are not cached.
+    return rotate(
+        x, fs_hz, -cfo_hz, out=out, cache=False, start=start, workspace=workspace
     )
-    return (x * phasor).astype(np.complex128)
@@ -4,84 +4,269 @@ from __future__ import annotations
 
 import numpy as np
 
+from ntn_linksim.precision import as_complex
+from ntn_linksim.workspace import Workspace, check_out
+
 
 def estimate_timing_offset_cp(
     rx: np.ndarray,
     n_fft: int,
     cp_len: int,
     n_symbols: int,
-) -> int:
+    max_delay: int | None = None,
+    workspace: Workspace | None = None,
+) -> int | np.ndarray:
     """Estimate integer timing offset using CP sliding correlation.
 
     For each candidate offset *d*, the metric sums the correlation between
-    each symbol's CP region and the corresponding tail across all symbols.
-    The offset that maximises |metric| is returned.
+    each symbol's CP region and the corresponding tail across all symbols
+    (symbols running past the end of *rx* are skipped).  The offset that
+    maximises |metric| is returned.
+
+    All candidates are scored in one vectorized pass: a cumulative sum of
+    the lag-``n_fft`` products gives every CP-window correlation, and a
+    second cumulative sum across the symbol period adds up ``n_symbols``
+    windows per offset.  The cost is O(len(rx) + max_delay), independent of
+    how many symbols or candidates there are.
 
-    The search range is ``[0, 2*cp_len]`` — enough to cover delays within
-    and slightly beyond the CP length.
+    The default search range is ``[0, 2*cp_len]`` — enough to cover delays
+    within and slightly beyond the CP length.  The CP metric is periodic in
+    the symbol length ``n_fft + cp_len``, so the estimate is the delay
+    modulo one symbol: *max_delay* can widen the window up to
+    ``n_fft + cp_len - 1`` but cannot resolve whole-symbol delays (e.g. the
+    LEO delay uncertainty), which need a preamble or external timing.
 
     Args:
-        rx: 1-D complex received samples.
+        rx: Complex received samples, ``(..., n_samples)``.  Leading axes are
+            batch dimensions estimated independently.
         n_fft: FFT size.
         cp_len: Cyclic prefix length in samples.
         n_symbols: Number of OFDM symbols.
+        max_delay: Largest candidate offset in samples (default ``2*cp_len``),
+            below ``n_fft + cp_len``.
+        workspace: Reusable buffers for the frame-sized intermediates.
 
     Returns:
-        Estimated integer sample delay (>= 0).
+        Estimated integer sample delay (>= 0); an int array with the batch
+        shape for batched input.
+
+    Raises:
+        ValueError: If the sizes are not positive or *max_delay* is outside
+            ``[0, n_fft + cp_len)``.
     """
-    rx = np.asarray(rx, dtype=np.complex128)
-    if rx.ndim != 1:
-        raise ValueError("rx must be a 1-D complex array")
+    rx = as_complex(rx)
+    if rx.ndim < 1:
+        raise ValueError("rx must be a complex array with at least 1 dimension")
     if not np.iscomplexobj(rx):
         raise ValueError("rx must be complex")
     if n_fft <= 0 or cp_len <= 0 or n_symbols <= 0:
         raise ValueError("n_fft, cp_len, n_symbols must be positive")
+    _check_max_delay(max_delay, n_fft + cp_len)
 
     sym_len = n_fft + cp_len
-    max_delay = min(2 * cp_len, rx.size // sym_len - 1) if rx.size > sym_len else 0
+    n = rx.shape[-1]
+    batch_shape = rx.shape[:-1]
+    n_windows = n - sym_len + 1
+    if n_windows <= 0:
+        zeros = np.zeros(batch_shape, dtype=np.int64)
+        return 0 if rx.ndim == 1 else zeros
+    max_delay = _search_range(n, sym_len, cp_len, max_delay)
+
+    # CP-window correlation w[m] = sum_{k<cp_len} rx[m+k+n_fft] * conj(rx[m+k])
+    # Running sums stay in double: their differences lose precision otherwise.
+    # The products are formed at the input precision but stored straight into
+    # the double-precision sum buffer, so the cumsum needs no cast copy.
+    csum = _scratch(
+        workspace, "timing.csum", batch_shape + (n - n_fft + 1,), np.complex128
+    )
+    csum[..., 0] = 0
+    prod = csum[..., 1:]
+    np.conjugate(rx[..., : n - n_fft], out=prod)
+    np.multiply(rx[..., n_fft:], prod, out=prod, dtype=rx.dtype)
+    np.cumsum(prod, axis=-1, out=prod)
+
+    # metric[d] = sum_{s<n_symbols} window[d + s*sym_len], via a running sum
+    # over rows of window laid out as (rows, sym_len).
+    n_rows = max_delay // sym_len + n_symbols + 1
+    folded = _scratch(
+        workspace, "timing.folded", batch_shape + (n_rows * sym_len,), np.complex128
+    )
+    n_keep = min(n_windows, n_rows * sym_len)
+    window = csum[..., cp_len : cp_len + n_keep]
+    np.subtract(window, csum[..., :n_keep], out=folded[..., :n_keep])
+    folded[..., n_keep:] = 0
+    folded = folded.reshape(batch_shape + (n_rows, sym_len))
+    rows = _scratch(
+        workspace, "timing.rows", batch_shape + (n_rows + 1, sym_len), np.complex128
+    )
+    rows[..., 0, :] = 0
+    np.cumsum(folded, axis=-2, out=rows[..., 1:, :])
+    metric = rows[..., n_symbols:, :] - rows[..., :-n_symbols, :]
+    metric = metric.reshape(batch_shape + (-1,))[..., : max_delay + 1]
+
+    best = np.argmax(np.abs(metric), axis=-1)
+    if rx.ndim == 1:
+        return int(best)
+    return best
+
+
+def _scratch(
+    workspace: Workspace | None, name: str, shape: tuple[int, ...], dtype: np.dtype
+) -> np.ndarray:
+    if workspace is None:
+        return np.empty(shape, dtype=dtype)
+    return workspace.get(name, shape, dtype)
+
+
+def _check_max_delay(max_delay: int | None, sym_len: int) -> None:
+    if max_delay is not None and not 0 <= max_delay < sym_len:
+        raise ValueError(
+            f"max_delay must be in [0, {sym_len}): the CP metric is periodic "
+            "in the symbol length"
+        )
+
+
+def _search_range(n: int, sym_len: int, cp_len: int, max_delay: int | None) -> int:
+    """Largest candidate offset for an *n*-sample frame (``n >= sym_len``)."""
+    if max_delay is None:
+        max_delay = min(2 * cp_len, sym_len - 1, n // sym_len - 1) if n > sym_len else 0
+    return min(max_delay, n - sym_len)
 
-    best_d = 0
-    best_metric = -1.0
 
-    for d in range(max_delay + 1):
-        metric = 0.0 + 0.0j
-        for s in range(n_symbols):
-            start = d + s * sym_len
-            if start + sym_len > rx.size:
-                break
-            cp_part = rx[start : start + cp_len]
-            tail_part = rx[start + n_fft : start + sym_len]
-            metric += np.sum(tail_part * np.conjugate(cp_part))
-        mag = abs(metric)
-        if mag > best_metric:
-            best_metric = mag
-            best_d = d
+class CpTimingAccumulator:
+    """Streaming form of :func:`estimate_timing_offset_cp`.
 
-    return best_d
+    Received samples are fed block by block with :meth:`update`; the CP
+    correlation metric for every candidate offset is accumulated with only
+    ``n_fft + cp_len - 1`` samples of carried history, so the estimate over
+    an arbitrarily long frame needs O(max_delay) memory.  After the whole
+    frame has been fed, :meth:`estimate` matches the one-shot estimator,
+    including its result being the delay modulo the symbol length.
 
+    Args:
+        n_fft: FFT size.
+        cp_len: Cyclic prefix length in samples.
+        n_symbols: Number of OFDM symbols in the frame.
+        n_samples: Total frame length in samples (sets the default window).
+        max_delay: Largest candidate offset in samples (default ``2*cp_len``),
+            below ``n_fft + cp_len``.
+    """
+
+    def __init__(
+        self,
+        n_fft: int,
+        cp_len: int,
+        n_symbols: int,
+        n_samples: int,
+        max_delay: int | None = None,
+    ) -> None:
+        if n_fft <= 0 or cp_len <= 0 or n_symbols <= 0:
+            raise ValueError("n_fft, cp_len, n_symbols must be positive")
+        _check_max_delay(max_delay, n_fft + cp_len)
+        self.n_fft = n_fft
+        self.cp_len = cp_len
+        self.n_symbols = n_symbols
+        self.sym_len = n_fft + cp_len
+        self.max_delay = (
+            _search_range(n_samples, self.sym_len, cp_len, max_delay)
+            if n_samples >= self.sym_len
+            else -1
+        )
+        self._metric = np.zeros(max(self.max_delay + 1, 0), dtype=np.complex128)
+        self._tail = np.zeros(0, dtype=np.complex128)
+        self._t = 0
+
+    def update(self, block: np.ndarray) -> None:
+        """Accumulate the CP correlations completed by a 1-D *block*."""
+        block = as_complex(block)
+        if block.ndim != 1:
+            raise ValueError("block must be a 1-D array")
+        ext = np.concatenate([self._tail.astype(block.dtype, copy=False), block])
+        start = self._t - self._tail.size
+        self._t += block.size
+        self._tail = ext[max(0, ext.size - (self.sym_len - 1)) :]
+        n_windows = ext.size - self.sym_len + 1
+        if n_windows <= 0 or self.max_delay < 0:
+            return
 
-def compensate_integer_delay(x: np.ndarray, delay: int) -> np.ndarray:
+        prod = ext[self.n_fft :] * np.conjugate(ext[: ext.size - self.n_fft])
+        csum = np.zeros(prod.size + 1, dtype=np.complex128)
+        np.cumsum(prod, dtype=np.complex128, out=csum[1:])
+        window = csum[self.cp_len : self.cp_len + n_windows] - csum[:n_windows]
+
+        # Window m contributes to offset d = m - s*sym_len for each symbol s.
+        m = start + np.arange(n_windows)
+        n_bins = self.max_delay + 1
+        for q in range(self.max_delay // self.sym_len + 1):
+            d = m % self.sym_len + q * self.sym_len
+            s = m // self.sym_len - q
+            valid = (d < n_bins) & (s >= 0) & (s < self.n_symbols)
+            if not np.any(valid):
+                continue
+            d = d[valid]
+            w = window[valid]
+            self._metric.real += np.bincount(d, weights=w.real, minlength=n_bins)
+            self._metric.imag += np.bincount(d, weights=w.imag, minlength=n_bins)
+
+    def estimate(self) -> int:
+        """Return the offset maximising the accumulated |metric|."""
+        if self._metric.size == 0:
+            return 0
+        return int(np.argmax(np.abs(self._metric)))
+
+
+def compensate_integer_delay(
+    x: np.ndarray, delay: int | np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
     """Shift signal left by *delay* samples to undo a timing offset.
 
     Samples shifted past the beginning are discarded; the tail is zero-padded
     so the output length matches the input.
 
     Args:
-        x: 1-D complex signal.
-        delay: Non-negative integer delay to compensate.
+        x: Complex signal, samples on the last axis.
+        delay: Non-negative integer delay to compensate, or an integer array
+            matching the leading (batch) axes of *x* for per-row delays.
+        out: Optional destination with the shape and dtype of *x*.  It may be
+            *x* itself only when the delay is 0 (nothing is copied then).
 
     Returns:
-        Re-aligned signal (same length), complex128.
+        Re-aligned signal (same shape and dtype as *x*).
     """
-    x = np.asarray(x, dtype=np.complex128)
-    if x.ndim != 1:
-        raise ValueError("x must be a 1-D array")
-    if delay < 0:
+    x = as_complex(x)
+    if x.ndim < 1:
+        raise ValueError("x must be at least a 1-D array")
+    delay = np.asarray(delay)
+    if np.any(delay < 0):
         raise ValueError("delay must be non-negative")
-    if delay == 0:
-        return x.copy()
-    if delay >= x.size:
-        return np.zeros_like(x)
-    out = np.zeros_like(x)
-    out[: x.size - delay] = x[delay:]
+    if out is not None:
+        check_out(out, x.shape, x.dtype)
+    if delay.ndim > 0:
+        if delay.shape != x.shape[:-1]:
+            raise ValueError("delay must be a scalar or match the batch shape of x")
+        if out is None:
+            out = np.empty_like(x)
+        # Row by row, so each shift is written straight into out.
+        for index in np.ndindex(delay.shape):
+            row_delay = int(delay[index])
+            if row_delay or out is not x:
+                _shift_left(x[index], row_delay, out[index])
+        return out
+    delay = int(delay)
+    if out is None:
+        if delay == 0:
+            return x.copy()
+        out = np.empty_like(x)
+    elif delay == 0:
+        if out is not x:
+            np.copyto(out, x)
+        return out
+    _shift_left(x, delay, out)
     return out
+
+
+def _shift_left(x: np.ndarray, delay: int, out: np.ndarray) -> None:
+    n = x.shape[-1]
+    keep = max(n - delay, 0)
+    out[..., :keep] = x[..., delay:]
+    out[..., keep:] = 0
@@ -2,24 +2,58 @@
 
 from __future__ import annotations
 
-from dataclasses import replace
+import datetime as dt
+import functools
+import time
+from dataclasses import asdict, replace
 from pathlib import Path
 
-import yaml
+import numpy as np
 
+from ntn_linksim.constellation import (
+    ConstellationStats,
+    GroundSite,
+    calendar_date,
+    constellation_stats,
+    julian_date,
+    load_tles,
+    sample_channels,
+)
+from ntn_linksim.experiments.cache import ResultCache
+from ntn_linksim.experiments.render import PLOT_MODES, render_all
+from ntn_linksim.experiments.runner import run_jobs, run_points
+from ntn_linksim.experiments.store import ResultStore
 from ntn_linksim.experiments.sweep import (
+    GRID_MODES,
+    cfo_sweep_configs,
+    constellation_sweep_configs,
+    delay_sweep_configs,
+    grid_sweep_configs,
+    pass_sweep_configs,
+    rician_k_sweep_configs,
     save_sweep,
     save_sweep_cfo,
+    save_sweep_constellation,
     save_sweep_delay,
+    save_sweep_grid,
+    save_sweep_pass,
     save_sweep_rician,
-    sweep_ber,
-    sweep_ber_vs_cfo,
-    sweep_ber_vs_delay,
-    sweep_ber_vs_rician_k,
+    snr_sweep_configs,
 )
-from ntn_linksim.sim import SimConfig
+from ntn_linksim.orbit import DEFAULT_K_DB_TABLE, CircularPass, PassTable
+from ntn_linksim.rng import seeded_rng
+from ntn_linksim.sim import SimConfig, StopCriteria
+from ntn_linksim.trace import active_tracer
 
-_VALID_SWEEP_TYPES = {"snr", "cfo", "delay", "rician_k"}
+_VALID_SWEEP_TYPES = {
+    "snr",
+    "cfo",
+    "delay",
+    "rician_k",
+    "grid",
+    "pass",
+    "constellation",
+}
 
 
 def load_scenario(path: str | Path) -> dict:
@@ -34,6 +68,8 @@ def load_scenario(path: str | Path) -> dict:
     Raises:
         ValueError: If required keys are missing or sweep type is unknown.
     """
+    import yaml  # deferred: only scenario commands need it
+
     path = Path(path)
     with path.open(encoding="utf-8") as f:
         data = yaml.safe_load(f)
@@ -48,6 +84,24 @@ def load_scenario(path: str | Path) -> dict:
             f"Unknown sweep type '{sweep['type']}' in {path.name}. "
             f"Valid: {sorted(_VALID_SWEEP_TYPES)}"
         )
+    if sweep["type"] == "grid":
+        if not isinstance(sweep.get("axes"), dict) or not sweep["axes"]:
+            raise ValueError(f"Grid scenario {path.name} needs a 'sweep.axes' mapping")
+        if sweep.get("mode", "product") not in GRID_MODES:
+            raise ValueError(
+                f"Unknown grid mode '{sweep['mode']}' in {path.name}. "
+                f"Valid: {list(GRID_MODES)}"
+            )
+    if sweep["type"] == "pass" and not isinstance(sweep.get("orbit", {}), dict):
+        raise ValueError(f"Pass scenario {path.name} needs 'sweep.orbit' as a mapping")
+    if sweep["type"] == "constellation":
+        if "tle_file" not in sweep or not isinstance(sweep.get("site"), dict):
+            raise ValueError(
+                f"Constellation scenario {path.name} needs 'sweep.tle_file' and "
+                "a 'sweep.site' mapping"
+            )
+        # TLE paths are relative to the scenario file.
+        sweep["tle_file"] = str(path.parent / sweep["tle_file"])
     return data
 
 
@@ -70,69 +124,411 @@ def scenario_to_config(scenario: dict) -> SimConfig:
     return replace(base, **filtered)
 
 
-def run_scenario(scenario: dict, out_dir: str | Path) -> None:
-    """Dispatch a scenario to the appropriate sweep + save function.
+def scenario_to_stop(scenario: dict) -> StopCriteria | None:
+    """Build Monte Carlo stopping rules from the optional ``monte_carlo`` section.
+
+    Unrecognized keys in the section are silently ignored.
+
+    Args:
+        scenario: Parsed scenario dict.
+
+    Returns:
+        A StopCriteria, or ``None`` when the scenario has no ``monte_carlo``
+        section (each point then runs a single ``n_symbols`` frame).
+    """
+    mc_data = scenario.get("monte_carlo")
+    if mc_data is None:
+        return None
+    valid_fields = set(StopCriteria.__dataclass_fields__)
+    filtered = {k: v for k, v in mc_data.items() if k in valid_fields}
+    stop = StopCriteria(**filtered)
+    stop.validate()
+    return stop
+
+
+def scenario_to_pass(scenario: dict) -> tuple[CircularPass, PassTable]:
+    """Build the pass and its sampled table from a ``pass`` sweep section.
+
+    ``sweep.orbit`` holds :class:`~ntn_linksim.orbit.CircularPass` fields
+    (unrecognized keys are silently ignored) and ``sweep.step_s`` the time
+    between points (default 10 s).
+
+    Args:
+        scenario: Parsed scenario dict with ``sweep.type == "pass"``.
+
+    Returns:
+        The pass and its :class:`~ntn_linksim.orbit.PassTable`.
+    """
+    sweep = scenario["sweep"]
+    orbit_data = sweep.get("orbit", {})
+    valid_fields = set(CircularPass.__dataclass_fields__)
+    filtered = {k: v for k, v in orbit_data.items() if k in valid_fields}
+    if "k_db_table" in filtered:
+        filtered["k_db_table"] = tuple(
+            (float(el), float(k_db)) for el, k_db in filtered["k_db_table"]
+        )
+    orbit = CircularPass(**filtered)
+    return orbit, orbit.table(float(sweep.get("step_s", 10.0)))
+
+
+@functools.lru_cache(maxsize=4)
+def _constellation_stats(
+    tle_file: str,
+    stamp: tuple[int, int],
+    site: GroundSite,
+    start_utc: str | None,
+    duration_s: float,
+    step_s: float,
+    carrier_hz: float,
+    min_elevation_deg: float,
+    n_bins: int,
+) -> tuple[int, str, ConstellationStats]:
+    """Propagate a TLE file once per parameter set (curves and artifacts
+    both need the statistics).
+
+    *stamp* is the file's modification time and size: it only keys the
+    cache, so a rewritten file is propagated again.
+    """
+    tles = load_tles(tle_file)
+    if not tles:
+        raise ValueError(f"no TLEs in {tle_file}")
+    if start_utc is None:
+        start_jd = max(tle.epoch_jd for tle in tles)
+        start = calendar_date(start_jd)
+    else:
+        start = dt.datetime.fromisoformat(start_utc)
+        start_jd = julian_date(start)
+    stats = constellation_stats(
+        tles,
+        site,
+        start_jd,
+        duration_s,
+        step_s=step_s,
+        carrier_hz=carrier_hz,
+        min_elevation_deg=min_elevation_deg,
+        n_bins=n_bins,
+    )
+    return len(tles), start.isoformat(timespec="seconds"), stats
+
+
+def scenario_to_constellation(
+    scenario: dict,
+) -> tuple[dict, ConstellationStats, dict[str, np.ndarray]]:
+    """Propagate a ``constellation`` sweep and sample its channel conditions.
+
+    The sweep section names a ``tle_file``, a ``site`` (``lat_deg``,
+    ``lon_deg``, optional ``alt_m``) and optionally ``start_utc`` (default:
+    the latest TLE epoch), ``duration_s`` (default one day), ``step_s``
+    (default 10 s), ``n_bins``, ``n_points`` (default 20), ``seed`` (default
+    the config seed) and a ``link`` mapping with ``carrier_hz``,
+    ``min_elevation_deg``, ``zenith_snr_db`` and ``k_db_table``.
+
+    Args:
+        scenario: Parsed scenario dict with ``sweep.type == "constellation"``.
+
+    Returns:
+        ``(parameters, stats, samples)``: the propagation parameters (for
+        the JSON), the visibility histograms and the sampled channels (see
+        :func:`ntn_linksim.constellation.sample_channels`).
+    """
+    sweep = scenario["sweep"]
+    link = sweep.get("link", {})
+    site = GroundSite(
+        float(sweep["site"]["lat_deg"]),
+        float(sweep["site"]["lon_deg"]),
+        float(sweep["site"].get("alt_m", 0.0)),
+    )
+    start_utc = sweep.get("start_utc")
+    if isinstance(start_utc, dt.datetime):  # YAML parses bare timestamps
+        start_utc = start_utc.isoformat()
+    carrier_hz = float(link.get("carrier_hz", 2.0e9))
+    min_elevation_deg = float(link.get("min_elevation_deg", 10.0))
+    duration_s = float(sweep.get("duration_s", 86_400.0))
+    step_s = float(sweep.get("step_s", 10.0))
+    tle_stat = Path(sweep["tle_file"]).stat()
+    n_sat, start, stats = _constellation_stats(
+        str(sweep["tle_file"]),
+        (tle_stat.st_mtime_ns, tle_stat.st_size),
+        site,
+        None if start_utc is None else str(start_utc),
+        duration_s,
+        step_s,
+        carrier_hz,
+        min_elevation_deg,
+        int(sweep.get("n_bins", 64)),
+    )
+    k_db_table = tuple(
+        (float(el), float(k_db))
+        for el, k_db in link.get("k_db_table", DEFAULT_K_DB_TABLE)
+    )
+    seed = sweep.get("seed", scenario_to_config(scenario).seed)
+    samples = sample_channels(
+        stats,
+        int(sweep.get("n_points", 20)),
+        seeded_rng(seed),
+        carrier_hz=carrier_hz,
+        zenith_snr_db=float(link.get("zenith_snr_db", 20.0)),
+        k_db_table=k_db_table,
+    )
+    parameters = {
+        "tle_file": Path(sweep["tle_file"]).name,
+        "n_satellites": n_sat,
+        "site": asdict(site),
+        "start_utc": start,
+        "duration_s": duration_s,
+        "step_s": step_s,
+        "carrier_hz": carrier_hz,
+        "min_elevation_deg": min_elevation_deg,
+    }
+    return parameters, stats, samples
+
+
+def scenario_curves(scenario: dict) -> dict[str, list[SimConfig]]:
+    """Expand a scenario into named curves of concrete point configs.
+
+    SNR, K-factor, grid, pass and constellation sweeps yield a single
+    ``"ber"`` curve (grid points in C order over the axes, pass points in
+    time order, constellation samples by elevation); CFO and
+    delay sweeps yield ``"no_comp"`` and, when ``enable_comp`` is set,
+    ``"with_comp"``.
 
     Args:
         scenario: Parsed scenario dict (from :func:`load_scenario`).
-        out_dir: Directory for output artifacts.
+
+    Returns:
+        Mapping of curve name to the configs of its points, in sweep order.
     """
     config = scenario_to_config(scenario)
     sweep = scenario["sweep"]
     sweep_type = sweep["type"]
 
     if sweep_type == "snr":
-        snr_db_list = sweep["snr_db"]
-        ber_list = sweep_ber(config, snr_db_list)
-        save_sweep(out_dir, snr_db_list, ber_list)
-
-    elif sweep_type == "cfo":
-        cfo_hz_list = sweep["cfo_hz"]
-        enable_comp = sweep.get("enable_comp", False)
-        ber_no_comp = sweep_ber_vs_cfo(config, cfo_hz_list, enable_comp=False)
-        ber_with_comp = None
-        if enable_comp:
-            ber_with_comp = sweep_ber_vs_cfo(
-                config, cfo_hz_list, enable_comp=True
-            )
-        save_sweep_cfo(
-            out_dir, cfo_hz_list, ber_no_comp, ber_with_comp, snr_db=config.snr_db
-        )
+        return {"ber": snr_sweep_configs(config, sweep["snr_db"])}
+    if sweep_type == "rician_k":
+        return {"ber": rician_k_sweep_configs(config, sweep["k_db"])}
+    if sweep_type == "grid":
+        mode = sweep.get("mode", "product")
+        return {"ber": grid_sweep_configs(config, sweep["axes"], mode)}
+    if sweep_type == "pass":
+        return {"ber": pass_sweep_configs(config, scenario_to_pass(scenario)[1])}
+    if sweep_type == "constellation":
+        samples = scenario_to_constellation(scenario)[2]
+        return {"ber": constellation_sweep_configs(config, samples)}
+    if sweep_type == "cfo":
+        values, build = sweep["cfo_hz"], cfo_sweep_configs
+    else:
+        values, build = sweep["delay_samples"], delay_sweep_configs
+    curves = {"no_comp": build(config, values, enable_comp=False)}
+    if sweep.get("enable_comp", False):
+        curves["with_comp"] = build(config, values, enable_comp=True)
+    return curves
 
-    elif sweep_type == "delay":
-        delay_list = sweep["delay_samples"]
-        enable_comp = sweep.get("enable_comp", False)
-        ber_no_comp = sweep_ber_vs_delay(config, delay_list, enable_comp=False)
-        ber_with_comp = None
-        if enable_comp:
-            ber_with_comp = sweep_ber_vs_delay(
-                config, delay_list, enable_comp=True
-            )
-        save_sweep_delay(
-            out_dir, delay_list, ber_no_comp, ber_with_comp, snr_db=config.snr_db
+
+def _save_scenario(
+    scenario: dict,
+    out_dir: str | Path,
+    curves: dict[str, list[float]],
+    plot: bool = True,
+) -> Path:
+    """Write a scenario's artifacts and return the sweep JSON path.
+
+    While tracing, the JSON records the active tracer's stage summary.
+    """
+    config = scenario_to_config(scenario)
+    sweep = scenario["sweep"]
+    sweep_type = sweep["type"]
+
+    fft = config.resolve_fft().describe()
+    tracer = active_tracer()
+    trace = None if tracer is None else tracer.summary()
+
+    if sweep_type == "snr":
+        return save_sweep(
+            out_dir, sweep["snr_db"], curves["ber"], fft=fft, plot=plot, trace=trace
+        )
+    if sweep_type == "cfo":
+        return save_sweep_cfo(
+            out_dir,
+            sweep["cfo_hz"],
+            curves["no_comp"],
+            curves.get("with_comp"),
+            snr_db=config.snr_db,
+            fft=fft,
+            plot=plot,
+            trace=trace,
+        )
+    if sweep_type == "delay":
+        return save_sweep_delay(
+            out_dir,
+            sweep["delay_samples"],
+            curves["no_comp"],
+            curves.get("with_comp"),
+            snr_db=config.snr_db,
+            fft=fft,
+            plot=plot,
+            trace=trace,
+        )
+    if sweep_type == "grid":
+        return save_sweep_grid(
+            out_dir,
+            sweep["axes"],
+            curves["ber"],
+            mode=sweep.get("mode", "product"),
+            fft=fft,
+            plot=plot,
+            trace=trace,
+        )
+    if sweep_type == "pass":
+        orbit, table = scenario_to_pass(scenario)
+        return save_sweep_pass(
+            out_dir,
+            table,
+            curves["ber"],
+            orbit=asdict(orbit),
+            fft=fft,
+            plot=plot,
+            trace=trace,
+        )
+    if sweep_type == "constellation":
+        parameters, stats, samples = scenario_to_constellation(scenario)
+        return save_sweep_constellation(
+            out_dir,
+            samples,
+            curves["ber"],
+            histograms=stats.as_dict(),
+            constellation=parameters,
+            fft=fft,
+            plot=plot,
+            trace=trace,
         )
+    return save_sweep_rician(
+        out_dir,
+        sweep["k_db"],
+        curves["ber"],
+        snr_db=config.snr_db,
+        fft=fft,
+        plot=plot,
+        trace=trace,
+    )
 
-    elif sweep_type == "rician_k":
-        k_db_list = sweep["k_db"]
-        ber_list = sweep_ber_vs_rician_k(config, k_db_list)
-        save_sweep_rician(out_dir, k_db_list, ber_list, snr_db=config.snr_db)
 
+def run_scenario(
+    scenario: dict,
+    out_dir: str | Path,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+    plots: str = "inline",
+    store: ResultStore | None = None,
+) -> None:
+    """Evaluate a scenario's sweep points and save its artifacts.
 
-def reproduce_all(scenario_dir: str | Path, out_dir: str | Path) -> None:
+    Args:
+        scenario: Parsed scenario dict (from :func:`load_scenario`).
+        out_dir: Directory for output artifacts.
+        workers: Number of worker processes for the sweep points.
+        cache: Optional on-disk result cache for the points.
+        plots: ``"inline"`` or ``"deferred"`` (render after all points are
+            computed; same result for a single scenario) or ``"none"``
+            (JSON only).
+        store: Optional result store the evaluated points are appended to.
+    """
+    _check_plots(plots)
+    stop = scenario_to_stop(scenario)
+    curves = scenario_curves(scenario)
+    configs = [cfg for points in curves.values() for cfg in points]
+    start = time.perf_counter()
+    point_results = run_points(configs, stop, workers, cache)
+    if store is not None:
+        store.append(
+            scenario["sweep"]["type"],
+            configs,
+            point_results,
+            stop,
+            elapsed_s=time.perf_counter() - start,
+        )
+    results = iter(point_results)
+    bers = {
+        name: [next(results).ber for _ in points] for name, points in curves.items()
+    }
+    _save_scenario(scenario, out_dir, bers, plot=plots != "none")
+
+
+def reproduce_all(
+    scenario_dir: str | Path,
+    out_dir: str | Path,
+    workers: int = 1,
+    cache: ResultCache | None = None,
+    plots: str = "inline",
+    store: ResultStore | None = None,
+) -> int:
     """Run all YAML scenarios in a directory and save artifacts.
 
-    Each scenario's output goes to ``out_dir/<scenario_stem>/``.
+    Every scenario is first expanded into ``(config, stop)`` jobs.  Identical
+    jobs across (and within) scenarios are evaluated once, all unique jobs
+    run on one shared worker pool, and each scenario's artifacts are then
+    assembled from the shared results.  Because every point is determined
+    by its config, the artifacts match running the scenarios one by one.
+
+    Each scenario's output goes to ``out_dir/<scenario_stem>/``.  With
+    ``plots="deferred"`` every scenario's JSON is written first and the
+    PNGs are then rendered together, in parallel on *workers* processes.
 
     Args:
         scenario_dir: Directory containing ``.yaml`` scenario files.
         out_dir: Root output directory.
+        workers: Number of worker processes for the sweep points.
+        cache: Optional on-disk result cache; cached points are not rerun.
+        plots: ``"inline"``, ``"deferred"`` or ``"none"`` (JSON only).
+        store: Optional result store; each scenario's points are appended
+            as one run (without a wall time, since points are shared).
+
+    Returns:
+        Number of unique simulation points in the scenarios (cached or not).
     """
+    _check_plots(plots)
     scenario_dir = Path(scenario_dir)
     out_dir = Path(out_dir)
     yaml_files = sorted(scenario_dir.glob("*.yaml"))
     if not yaml_files:
         raise FileNotFoundError(f"No .yaml files found in {scenario_dir}")
+
+    plans = []
+    unique_jobs: dict[tuple[SimConfig, StopCriteria | None], None] = {}
     for yaml_path in yaml_files:
         scenario = load_scenario(yaml_path)
-        dest = out_dir / yaml_path.stem
-        run_scenario(scenario, dest)
+        stop = scenario_to_stop(scenario)
+        curves = scenario_curves(scenario)
+        for points in curves.values():
+            unique_jobs.update(dict.fromkeys((cfg, stop) for cfg in points))
+        plans.append((yaml_path, scenario, stop, curves))
+
+    jobs = list(unique_jobs)
+    results = dict(zip(jobs, run_jobs(jobs, workers, cache), strict=True))
+
+    json_paths = []
+    for yaml_path, scenario, stop, curves in plans:
+        bers = {
+            name: [results[(cfg, stop)].ber for cfg in points]
+            for name, points in curves.items()
+        }
+        if store is not None:
+            configs = [cfg for points in curves.values() for cfg in points]
+            store.append(
+                scenario["sweep"]["type"],
+                configs,
+                [results[(cfg, stop)] for cfg in configs],
+                stop,
+            )
+        json_paths.append(
+            _save_scenario(
+                scenario, out_dir / yaml_path.stem, bers, plot=plots == "inline"
+            )
+        )
+    if plots == "deferred":
+        render_all(json_paths, workers)
+    return len(jobs)
+
+
+def _check_plots(plots: str) -> None:
+    if plots not in PLOT_MODES:
+        raise ValueError(f"plots must be one of {PLOT_MODES}")
@@ -3,19 +3,44 @@
 from __future__ import annotations
 
 import json
-from dataclasses import asdict, dataclass
+import math
+from collections.abc import Callable, Sequence
+from dataclasses import asdict, dataclass, replace
+from functools import partial
 from pathlib import Path
+from statistics import NormalDist
 
 import numpy as np
 
-from ntn_linksim.channel.awgn import add_awgn
+from ntn_linksim.channel.awgn import add_awgn, add_awgn_snr_axis
 from ntn_linksim.channel.cfo import apply_cfo
 from ntn_linksim.channel.delay import apply_delay
-from ntn_linksim.channel.rician import apply_rician_fading
+from ntn_linksim.channel.doppler import PolynomialDoppler, apply_doppler
+from ntn_linksim.channel.fading import (
+    DOPPLER_SPECTRA,
+    FADING_METHODS,
+    FadingProcess,
+    fading_process,
+    filtered_period,
+)
+from ntn_linksim.channel.rician import (
+    apply_rician_fading,
+    rician_gain,
+    rician_scatter_gain,
+)
+from ntn_linksim.channel.tdl import (
+    apply_tdl_grid,
+    apply_tdl_time,
+    get_tdl_profile,
+    tdl_fits_cp,
+)
+from ntn_linksim.fft_backend import FftBackend, get_fft_backend
+from ntn_linksim.precision import complex_dtype
 from ntn_linksim.rng import seeded_rng
 from ntn_linksim.rx.cfo import compensate_cfo, estimate_cfo_from_cp
 from ntn_linksim.rx.timing import compensate_integer_delay, estimate_timing_offset_cp
-from ntn_linksim.waveform.modulation import qpsk_demod_hard, qpsk_mod
+from ntn_linksim.trace import traced
+from ntn_linksim.waveform.modulation import bits_per_symbol, qam_demod_hard, qam_mod
 from ntn_linksim.waveform.ofdm import (
     OfdmParams,
     add_cp,
@@ -27,6 +52,7 @@ from ntn_linksim.waveform.ofdm import (
     serialize_symbols,
     tx_grid,
 )
+from ntn_linksim.workspace import Workspace
 
 
 @dataclass(frozen=True)
@@ -37,15 +63,28 @@ class SimConfig:
     n_used: int = 52
     cp_len: int = 16
     n_symbols: int = 200
+    modulation: str = "qpsk"
     snr_db: float = 10.0
     seed: int = 1
     fs_hz: float = 15.36e6
     cfo_hz: float = 0.0
+    doppler_rate_hz_s: float = 0.0
     enable_cfo_comp: bool = False
     delay_samples: float = 0.0
     enable_timing_comp: bool = False
     enable_rician: bool = False
     rician_k_db: float = 10.0
+    tdl_profile: str = "none"
+    tdl_delay_spread_ns: float = 100.0
+    tdl_method: str = "auto"
+    fading_doppler_hz: float = 0.0
+    fading_spectrum: str = "jakes"
+    fading_method: str = "sos"
+    timing_max_delay: int | None = None
+    delay_method: str = "auto"
+    precision: str = "double"
+    fft_backend: str = "numpy"
+    fft_workers: int = 1
 
     def validate(self) -> None:
         params = OfdmParams(
@@ -55,8 +94,94 @@ class SimConfig:
             n_symbols=self.n_symbols,
         )
         params.validate()
+        bits_per_symbol(self.modulation)
         if self.fs_hz <= 0:
             raise ValueError("fs_hz must be positive")
+        if not math.isfinite(self.doppler_rate_hz_s):
+            raise ValueError("doppler_rate_hz_s must be finite")
+        sym_len = self.n_fft + self.cp_len
+        if self.timing_max_delay is not None and not (
+            0 <= self.timing_max_delay < sym_len
+        ):
+            raise ValueError(
+                f"timing_max_delay must be in [0, {sym_len}): CP timing is "
+                "estimated modulo the symbol length"
+            )
+        if self.delay_method not in ("auto", "fft", "fir"):
+            raise ValueError("delay_method must be 'auto', 'fft' or 'fir'")
+        if self.tdl_profile != "none":
+            get_tdl_profile(self.tdl_profile)
+            if self.enable_rician:
+                raise ValueError("enable_rician and tdl_profile are exclusive")
+        if not self.tdl_delay_spread_ns >= 0:
+            raise ValueError("tdl_delay_spread_ns must be non-negative")
+        if self.tdl_method not in ("auto", "freq", "time"):
+            raise ValueError("tdl_method must be 'auto', 'freq' or 'time'")
+        if not (self.fading_doppler_hz >= 0 and math.isfinite(self.fading_doppler_hz)):
+            raise ValueError("fading_doppler_hz must be non-negative and finite")
+        if self.fading_doppler_hz > self.symbol_rate_hz() / 2:
+            raise ValueError("fading_doppler_hz must not exceed half the symbol rate")
+        if self.fading_spectrum not in DOPPLER_SPECTRA:
+            raise ValueError(f"fading_spectrum must be one of {DOPPLER_SPECTRA}")
+        if self.fading_method not in FADING_METHODS:
+            raise ValueError(f"fading_method must be one of {FADING_METHODS}")
+        complex_dtype(self.precision)
+        self.resolve_fft()
+
+    def resolve_fft(self) -> FftBackend:
+        """Return the FFT backend selected by ``fft_backend``/``fft_workers``."""
+        return get_fft_backend(self.fft_backend, self.fft_workers)
+
+    def doppler_profile(self) -> PolynomialDoppler:
+        """Return the channel Doppler ``cfo_hz + doppler_rate_hz_s * t``."""
+        return PolynomialDoppler((self.cfo_hz, self.doppler_rate_hz_s))
+
+    def tdl_in_grid(self) -> bool:
+        """Whether TDL fading is applied on the subcarrier grid.
+
+        ``tdl_method="auto"`` uses the grid when the longest tap fits in
+        the cyclic prefix and the time-domain path otherwise.
+        """
+        if self.tdl_method != "auto":
+            return self.tdl_method == "freq"
+        return tdl_fits_cp(
+            get_tdl_profile(self.tdl_profile),
+            self.tdl_delay_spread_ns * 1e-9,
+            self.fs_hz,
+            self.cp_len,
+        )
+
+    def bits_per_frame(self) -> int:
+        """Payload bits per frame, ``n_symbols * n_used * bits_per_symbol``."""
+        return self.n_symbols * self.n_used * bits_per_symbol(self.modulation)
+
+    def symbol_rate_hz(self) -> float:
+        """OFDM symbols per second, ``fs_hz / (n_fft + cp_len)``."""
+        return self.fs_hz / (self.n_fft + self.cp_len)
+
+    def fading_process(
+        self, rng: np.random.Generator, shape: tuple[int, ...] = ()
+    ) -> FadingProcess | None:
+        """Return the scatter process sampled once per OFDM symbol.
+
+        ``None`` when ``fading_doppler_hz`` is 0: the fading models then
+        draw i.i.d. scatter per symbol.  The ``"filtered"`` period spans
+        64 coherence times and at least one frame (:func:`filtered_period`);
+        each frame reads the start of its own independent process.
+        """
+        if self.fading_doppler_hz == 0.0:
+            return None
+        return fading_process(
+            self.fading_method,
+            self.fading_doppler_hz,
+            self.symbol_rate_hz(),
+            rng,
+            shape,
+            self.fading_spectrum,
+            filtered_period(
+                self.fading_doppler_hz, self.symbol_rate_hz(), self.n_symbols
+            ),
+        )
 
     def ofdm_params(self) -> OfdmParams:
         return OfdmParams(
@@ -69,76 +194,709 @@ class SimConfig:
 
 @dataclass(frozen=True)
 class SimResult:
-    """Simulation outputs."""
+    """Simulation outputs.
+
+    ``ci_low``/``ci_high`` bound the BER at the confidence level used by the
+    run (Wilson score interval), which stays meaningful when no errors were
+    observed.
+    """
 
     ber: float
     n_bits: int
     snr_db: float
+    n_errors: int = 0
+    n_frames: int = 1
+    ci_low: float | None = None
+    ci_high: float | None = None
 
 
-def run_once(config: SimConfig) -> SimResult:
-    """Run a single OFDM AWGN simulation and return BER results."""
-    config.validate()
-    rng = seeded_rng(config.seed)
-    params = config.ofdm_params()
+@dataclass(frozen=True)
+class StopCriteria:
+    """Early-stopping rules for :func:`run_monte_carlo`.
+
+    Frames are added in batches until *target_errors* errors are observed,
+    or the confidence interval width relative to the BER drops to
+    *rel_ci_width*, whichever comes first.  *max_bits* caps the run when
+    neither is reached (e.g. at high SNR).  A criterion set to ``None`` is
+    disabled.
+    """
+
+    target_errors: int | None = 100
+    rel_ci_width: float | None = None
+    max_bits: int = 10_000_000
+    frames_per_batch: int = 8
+    confidence: float = 0.95
+
+    def validate(self) -> None:
+        if self.target_errors is not None and self.target_errors <= 0:
+            raise ValueError("target_errors must be positive")
+        if self.rel_ci_width is not None and self.rel_ci_width <= 0:
+            raise ValueError("rel_ci_width must be positive")
+        if self.max_bits <= 0:
+            raise ValueError("max_bits must be positive")
+        if self.frames_per_batch <= 0:
+            raise ValueError("frames_per_batch must be positive")
+        if not 0.0 < self.confidence < 1.0:
+            raise ValueError("confidence must be in (0, 1)")
+
+    def is_met(self, n_errors: int, n_bits: int) -> bool:
+        """Return True once the accumulated counts satisfy any criterion."""
+        if n_bits >= self.max_bits:
+            return True
+        if self.target_errors is not None and n_errors >= self.target_errors:
+            return True
+        if self.rel_ci_width is not None and n_errors > 0:
+            low, high = ber_confidence_interval(n_errors, n_bits, self.confidence)
+            if (high - low) / (n_errors / n_bits) <= self.rel_ci_width:
+                return True
+        return False
+
+
+def ber_confidence_interval(
+    n_errors: int, n_bits: int, confidence: float = 0.95
+) -> tuple[float, float]:
+    """Wilson score interval for a BER estimate of *n_errors* / *n_bits*."""
+    if n_bits <= 0:
+        raise ValueError("n_bits must be positive")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+    p = n_errors / n_bits
+    denom = 1.0 + z * z / n_bits
+    center = (p + z * z / (2.0 * n_bits)) / denom
+    half = z * math.sqrt(p * (1.0 - p) / n_bits + z * z / (4.0 * n_bits**2)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """Per-frame outputs of :func:`run_batch`."""
+
+    frame_errors: np.ndarray
+    frame_bits: np.ndarray
+    snr_db: float
+
+    @property
+    def n_frames(self) -> int:
+        return int(self.frame_errors.size)
 
-    n_bits = params.n_symbols * params.n_used * 2
-    bits_tx = rng.integers(0, 2, size=n_bits, dtype=np.int8)
-    symbols = qpsk_mod(bits_tx).reshape(params.n_symbols, params.n_used)
+    @property
+    def n_errors(self) -> int:
+        return int(np.sum(self.frame_errors))
 
-    grid = tx_grid(symbols, params)
-    time_symbols = ifft_symbols(grid)
-    tx_with_cp = add_cp(time_symbols, params.cp_len)
+    @property
+    def n_bits(self) -> int:
+        return int(np.sum(self.frame_bits))
+
+    @property
+    def ber(self) -> float:
+        return self.n_errors / self.n_bits
+
+
+def _tx_build(
+    config: SimConfig,
+    params: OfdmParams,
+    rng: np.random.Generator,
+    batch_shape: tuple[int, ...],
+    workspace: Workspace | None,
+    fade_grid: Callable[[np.ndarray], np.ndarray] | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Draw bits and build the ``(..., n_symbols, n_fft + cp_len)`` TX symbols.
+
+    *fade_grid*, when given, transforms the subcarrier grid in place before
+    the IFFT (frequency-domain fading).
+    """
+    n_bits = config.bits_per_frame()
+    dtype = complex_dtype(config.precision)
+    sym_shape = (*batch_shape, params.n_symbols)
+    sym_len = params.n_fft + params.cp_len
+    bits_tx = rng.integers(0, 2, size=(*batch_shape, n_bits), dtype=np.int8)
+    n_data = params.n_symbols * params.n_used
+    symbols = qam_mod(
+        bits_tx,
+        config.modulation,
+        dtype=dtype,
+        out=_buffer(workspace, "tx.symbols", (*batch_shape, n_data), dtype),
+    ).reshape(*sym_shape, params.n_used)
+
+    grid_shape = (*sym_shape, params.n_fft)
+    grid = tx_grid(
+        symbols, params, out=_buffer(workspace, "tx.grid", grid_shape, dtype)
+    )
+    if fade_grid is not None:
+        grid = fade_grid(grid)
+    time_symbols = ifft_symbols(
+        grid,
+        out=_buffer(workspace, "tx.time", grid_shape, dtype),
+        backend=config.resolve_fft(),
+    )
+    tx_with_cp = add_cp(
+        time_symbols,
+        params.cp_len,
+        out=_buffer(workspace, "tx.samples", (*sym_shape, sym_len), dtype),
+    )
+    return bits_tx, tx_with_cp
+
+
+def _scatter(
+    config: SimConfig,
+    rng: np.random.Generator,
+    coeff_shape: tuple[int, ...],
+    n_fading: int | None = None,
+) -> np.ndarray | None:
+    """Time-correlated scatter for ``(..., n_symbols)`` coefficients.
+
+    With *n_fading*, one process per Rayleigh tap, returned as
+    ``(..., n_symbols, n_fading)``.  ``None`` for i.i.d. block fading.
+    """
+    *batch_shape, n_symbols = coeff_shape
+    if n_fading is not None:
+        batch_shape.append(n_fading)
+    process = config.fading_process(rng, tuple(batch_shape))
+    if process is None:
+        return None
+    scatter = process.generate(n_symbols)
+    return scatter if n_fading is None else np.swapaxes(scatter, -1, -2)
+
+
+def _tdl_grid(
+    config: SimConfig, rng: np.random.Generator, grid: np.ndarray
+) -> np.ndarray:
+    """Fade the subcarrier grid in place with the config's TDL profile."""
+    profile = get_tdl_profile(config.tdl_profile)
+    return apply_tdl_grid(
+        grid,
+        profile,
+        config.tdl_delay_spread_ns * 1e-9,
+        config.fs_hz,
+        rng,
+        out=grid,
+        scatter=_scatter(config, rng, grid.shape[:-1], profile.n_fading),
+    )
+
+
+def _tdl_time(
+    config: SimConfig, rng: np.random.Generator, tx_with_cp: np.ndarray
+) -> np.ndarray:
+    """Fade the CP-extended symbols in place with the config's TDL profile."""
+    profile = get_tdl_profile(config.tdl_profile)
+    return apply_tdl_time(
+        tx_with_cp,
+        profile,
+        config.tdl_delay_spread_ns * 1e-9,
+        config.fs_hz,
+        rng,
+        out=tx_with_cp,
+        backend=config.resolve_fft(),
+        scatter=_scatter(config, rng, tx_with_cp.shape[:-1], profile.n_fading),
+    )
+
+
+def _rician(
+    config: SimConfig,
+    rng: np.random.Generator,
+    tx_with_cp: np.ndarray,
+    out: np.ndarray | None,
+) -> np.ndarray:
+    """Apply the config's Rician fading to the CP-extended symbols."""
+    return apply_rician_fading(
+        tx_with_cp,
+        config.rician_k_db,
+        rng,
+        out=out,
+        scatter=_scatter(config, rng, tx_with_cp.shape[:-1]),
+    )
+
+
+def _tx_faded(
+    config: SimConfig,
+    params: OfdmParams,
+    rng: np.random.Generator,
+    batch_shape: tuple[int, ...],
+    workspace: Workspace | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Build the TX symbols with the config's TDL fading (if any) applied.
+
+    Grid-domain fading runs inside ``tx_build``, between the subcarrier
+    mapping and the IFFT; the time-domain path runs after it.  Both draw
+    the tap gains right after the bits.
+    """
+    tdl = config.tdl_profile != "none"
+    in_grid = tdl and config.tdl_in_grid()
+    fade_grid = partial(traced, "fading", _tdl_grid, config, rng) if in_grid else None
+    bits_tx, tx_with_cp = traced(
+        "tx_build", _tx_build, config, params, rng, batch_shape, workspace, fade_grid
+    )
+    if tdl and not in_grid:
+        tx_with_cp = traced("fading", _tdl_time, config, rng, tx_with_cp)
+    return bits_tx, tx_with_cp
+
+
+def _apply_doppler(config: SimConfig, samples: np.ndarray) -> np.ndarray:
+    """Rotate *samples* in place by the config's CFO and Doppler rate.
+
+    A constant CFO uses the cached phasor tables of :func:`apply_cfo`.
+    """
+    if config.doppler_rate_hz_s == 0.0:
+        return apply_cfo(samples, fs_hz=config.fs_hz, cfo_hz=config.cfo_hz, out=samples)
+    return apply_doppler(samples, config.fs_hz, config.doppler_profile(), out=samples)
+
+
+def _transmit(
+    config: SimConfig,
+    params: OfdmParams,
+    rng: np.random.Generator,
+    batch_shape: tuple[int, ...] = (),
+    workspace: Workspace | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generate bits and the impaired, noiseless TX samples.
+
+    Returns ``(bits_tx, tx_samples)`` with shapes ``(*batch_shape, n_bits)``
+    and ``(*batch_shape, n_symbols * (n_fft + cp_len))``.  With a
+    *workspace*, every stage writes into its reused buffer and the returned
+    samples live in the workspace.
+    """
+    bits_tx, tx_with_cp = _tx_faded(config, params, rng, batch_shape, workspace)
     if config.enable_rician:
-        tx_with_cp = apply_rician_fading(tx_with_cp, config.rician_k_db, rng)
+        tx_with_cp = traced(
+            "fading",
+            _rician,
+            config,
+            rng,
+            tx_with_cp,
+            None if workspace is None else tx_with_cp,
+        )
     tx_samples = serialize_symbols(tx_with_cp)
-    if config.cfo_hz != 0.0:
-        tx_samples = apply_cfo(tx_samples, fs_hz=config.fs_hz, cfo_hz=config.cfo_hz)
+    if config.cfo_hz != 0.0 or config.doppler_rate_hz_s != 0.0:
+        tx_samples = traced("cfo", _apply_doppler, config, tx_samples)
     if config.delay_samples != 0.0:
-        tx_samples = apply_delay(tx_samples, config.delay_samples)
+        tx_samples = traced(
+            "delay",
+            apply_delay,
+            tx_samples,
+            config.delay_samples,
+            method=config.delay_method,
+            out=_buffer(workspace, "tx.delayed", tx_samples.shape, tx_samples.dtype),
+            backend=config.resolve_fft(),
+        )
+    return bits_tx, tx_samples
+
+
+def _timing_sync(
+    config: SimConfig,
+    params: OfdmParams,
+    rx_samples: np.ndarray,
+    workspace: Workspace | None,
+) -> np.ndarray:
+    """Estimate the integer timing offset from the CP and realign the frame."""
+    delay_hat = estimate_timing_offset_cp(
+        rx_samples,
+        n_fft=params.n_fft,
+        cp_len=params.cp_len,
+        n_symbols=params.n_symbols,
+        max_delay=config.timing_max_delay,
+        workspace=workspace,
+    )
+    if not np.any(delay_hat):
+        return rx_samples  # already aligned; _receive may work in place
+    return compensate_integer_delay(
+        rx_samples,
+        delay_hat,
+        out=_buffer(workspace, "rx.aligned", rx_samples.shape, rx_samples.dtype),
+    )
 
-    rx_samples = add_awgn(tx_samples, config.snr_db, rng)
 
+def _cfo_sync(
+    config: SimConfig,
+    params: OfdmParams,
+    rx_samples: np.ndarray,
+    workspace: Workspace | None,
+) -> np.ndarray:
+    """Estimate the CFO from the first symbol's CP and derotate in place."""
+    symbol_len = params.n_fft + params.cp_len
+    rx0 = rx_samples[..., :symbol_len]
+    cfo_hat = estimate_cfo_from_cp(
+        rx0,
+        n_fft=params.n_fft,
+        cp_len=params.cp_len,
+        fs_hz=config.fs_hz,
+    )
+    return compensate_cfo(
+        rx_samples,
+        fs_hz=config.fs_hz,
+        cfo_hz=cfo_hat,
+        out=rx_samples,
+        workspace=workspace,
+    )
+
+
+def _demodulate(
+    config: SimConfig,
+    params: OfdmParams,
+    rx_samples: np.ndarray,
+    workspace: Workspace | None,
+) -> np.ndarray:
+    """Strip the CP, FFT, pick the used carriers and hard-decide the bits."""
+    dtype = rx_samples.dtype
+    rx_with_cp = deserialize_symbols(rx_samples, params)
+    rx_no_cp = remove_cp(rx_with_cp, params.cp_len)
+    rx_grid = fft_symbols(
+        rx_no_cp,
+        out=_buffer(workspace, "rx.grid", rx_no_cp.shape, dtype),
+        backend=config.resolve_fft(),
+    )
+    used_shape = rx_grid.shape[:-1] + (params.n_used,)
+    rx_used = extract_used(
+        rx_grid, params, out=_buffer(workspace, "rx.used", used_shape, dtype)
+    )
+    rx_used = rx_used.reshape(*rx_used.shape[:-2], -1)
+    m = bits_per_symbol(config.modulation)
+    bits_shape = rx_used.shape[:-1] + (m * rx_used.shape[-1],)
+    return qam_demod_hard(
+        rx_used,
+        config.modulation,
+        out=_buffer(workspace, "rx.bits", bits_shape, np.int8),
+    )
+
+
+def _receive(
+    config: SimConfig,
+    params: OfdmParams,
+    rx_samples: np.ndarray,
+    workspace: Workspace | None = None,
+) -> np.ndarray:
+    """Run the receiver on ``(..., n_samples)`` and return hard-decision bits.
+
+    *rx_samples* may be modified in place.
+    """
     # Timing compensation first (must align symbol boundaries before CFO est.)
     if config.enable_timing_comp:
-        delay_hat = estimate_timing_offset_cp(
-            rx_samples,
-            n_fft=params.n_fft,
-            cp_len=params.cp_len,
-            n_symbols=params.n_symbols,
+        rx_samples = traced(
+            "timing_estimate", _timing_sync, config, params, rx_samples, workspace
         )
-        rx_samples = compensate_integer_delay(rx_samples, delay_hat)
-
     if config.enable_cfo_comp:
-        symbol_len = params.n_fft + params.cp_len
-        rx0 = rx_samples[:symbol_len]
-        cfo_hat = estimate_cfo_from_cp(
-            rx0,
-            n_fft=params.n_fft,
-            cp_len=params.cp_len,
-            fs_hz=config.fs_hz,
+        rx_samples = traced(
+            "cfo_estimate", _cfo_sync, config, params, rx_samples, workspace
         )
-        rx_samples = compensate_cfo(rx_samples, fs_hz=config.fs_hz, cfo_hz=cfo_hat)
+    return traced("demod", _demodulate, config, params, rx_samples, workspace)
 
-    rx_with_cp = deserialize_symbols(rx_samples, params)
-    rx_no_cp = remove_cp(rx_with_cp, params.cp_len)
-    rx_grid = fft_symbols(rx_no_cp)
-    rx_used = extract_used(rx_grid, params)
 
-    bits_rx = qpsk_demod_hard(rx_used.reshape(-1))
-    n_errors = int(np.sum(bits_rx != bits_tx))
+def _buffer(
+    workspace: Workspace | None, name: str, shape: tuple[int, ...], dtype: np.dtype
+) -> np.ndarray | None:
+    """Return the workspace buffer for a stage, or None to let it allocate."""
+    if workspace is None:
+        return None
+    return workspace.get(name, shape, dtype)
+
+
+def _count_errors(
+    bits_rx: np.ndarray, bits_tx: np.ndarray, workspace: Workspace | None
+) -> np.ndarray:
+    """Bit errors along the last axis."""
+    diff = _buffer(workspace, "rx.diff", bits_tx.shape, np.bool_)
+    return np.count_nonzero(np.not_equal(bits_rx, bits_tx, out=diff), axis=-1)
+
+
+def run_once(config: SimConfig, workspace: Workspace | None = None) -> SimResult:
+    """Run a single OFDM AWGN simulation and return BER results.
+
+    Pass a :class:`~ntn_linksim.workspace.Workspace` when running many
+    frames of the same shape: every frame-sized intermediate is then
+    written into reused buffers instead of being allocated per run.
+    Results do not depend on whether a workspace is used.
+    """
+    config.validate()
+    rng = seeded_rng(config.seed)
+    params = config.ofdm_params()
+
+    bits_tx, tx_samples = _transmit(config, params, rng, workspace=workspace)
+    rx_samples = traced(
+        "awgn",
+        add_awgn,
+        tx_samples,
+        config.snr_db,
+        rng,
+        out=None if workspace is None else tx_samples,
+        workspace=workspace,
+    )
+    bits_rx = _receive(config, params, rx_samples, workspace=workspace)
+
+    n_bits = bits_tx.size
+    n_errors = int(traced("error_count", _count_errors, bits_rx, bits_tx, workspace))
     ber = n_errors / n_bits
-    return SimResult(ber=ber, n_bits=n_bits, snr_db=config.snr_db)
+    ci_low, ci_high = ber_confidence_interval(n_errors, n_bits)
+    return SimResult(
+        ber=ber,
+        n_bits=n_bits,
+        snr_db=config.snr_db,
+        n_errors=n_errors,
+        ci_low=ci_low,
+        ci_high=ci_high,
+    )
+
+
+def run_snr_sweep(config: SimConfig, snr_db_list: list[float]) -> list[SimResult]:
+    """Evaluate many SNR points sharing one TX, channel and noise realization.
+
+    Bits, fading, CFO and delay do not depend on SNR, so the noiseless
+    received waveform is computed once and a single unit-variance noise
+    draw is scaled per point.  All points then run through the receiver as
+    one extra array axis.  Each point is bit-identical to
+    ``run_once(replace(config, snr_db=snr_db))``.
+
+    Args:
+        config: Simulation configuration (``snr_db`` is ignored).
+        snr_db_list: SNR points in dB.
+
+    Returns:
+        One :class:`SimResult` per SNR point, in input order.
+    """
+    channel = (config.cfo_hz, config.rician_k_db)
+    return run_channel_grid(config, [channel], snr_db_list)[0]
+
+
+def _channel_rows(
+    config: SimConfig,
+    tx_with_cp: np.ndarray,
+    channels: list[tuple[float, float]],
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """Fade and rotate one TX frame per ``(cfo_hz, rician_k_db)`` channel.
+
+    Returns ``(n_channels, n_samples)`` noiseless samples; every row drifts
+    at the config's ``doppler_rate_hz_s``.  The fading draws happen once and
+    are shared, exactly as :func:`_transmit` draws them for a single channel.
+    """
+    n_channels = len(channels)
+    rotated = config.doppler_rate_hz_s != 0.0 or any(
+        cfo_hz != 0.0 for cfo_hz, _ in channels
+    )
+    if config.enable_rician:
+        coeff_shape = tx_with_cp.shape[:-1]
+        scatter = _scatter(config, rng, coeff_shape)
+        if scatter is None:
+            scatter_re = rng.standard_normal(coeff_shape)
+            scatter_im = rng.standard_normal(coeff_shape)
+        rows = np.empty((n_channels, *tx_with_cp.shape), dtype=tx_with_cp.dtype)
+        gains: dict[float, np.ndarray] = {}
+        for row, (_, k_db) in zip(rows, channels, strict=True):
+            if k_db not in gains:
+                h = (
+                    rician_gain(k_db, scatter_re, scatter_im)
+                    if scatter is None
+                    else rician_scatter_gain(k_db, scatter)
+                )
+                gains[k_db] = h[..., np.newaxis].astype(tx_with_cp.dtype, copy=False)
+            np.multiply(tx_with_cp, gains[k_db], out=row)
+    elif rotated:
+        rows = np.repeat(tx_with_cp[np.newaxis], n_channels, axis=0)
+    else:
+        rows = np.broadcast_to(tx_with_cp, (n_channels, *tx_with_cp.shape))
+    samples = serialize_symbols(rows)
+    for row, (cfo_hz, _) in zip(samples, channels, strict=True):
+        if cfo_hz != 0.0 or config.doppler_rate_hz_s != 0.0:
+            _apply_doppler(replace(config, cfo_hz=cfo_hz), row)
+    return samples
+
+
+def run_channel_grid(
+    config: SimConfig,
+    channels: Sequence[tuple[float, float]],
+    snr_db_list: Sequence[float],
+) -> list[list[SimResult]]:
+    """Evaluate every (channel, SNR) combination in one vectorized pass.
+
+    A channel is a ``(cfo_hz, rician_k_db)`` pair.  Fading, CFO and noise
+    level only scale or rotate the TX frame, so bits, fading draws and the
+    unit noise are drawn once; the channels become one batch axis and the
+    SNR points another, and delay injection, the receiver and the error
+    count each run once over the whole ``(n_snr, n_channels, n_samples)``
+    array.  Each result is bit-identical to ``run_once`` with ``cfo_hz``,
+    ``rician_k_db`` and ``snr_db`` replaced by that combination.
+
+    Args:
+        config: Simulation configuration (its ``cfo_hz``, ``rician_k_db``
+            and ``snr_db`` are ignored).
+        channels: ``(cfo_hz, rician_k_db)`` pairs.
+        snr_db_list: SNR points in dB.
+
+    Returns:
+        ``results[c][s]`` for channel *c* and SNR point *s*, in input order.
+    """
+    config.validate()
+    channels = [(float(cfo_hz), float(k_db)) for cfo_hz, k_db in channels]
+    snr_db_list = [float(x) for x in snr_db_list]
+    if not channels or not snr_db_list:
+        return [[] for _ in channels]
+    rng = seeded_rng(config.seed)
+    params = config.ofdm_params()
+
+    bits_tx, tx_with_cp = _tx_faded(config, params, rng, (), None)
+    tx_samples = traced("channel", _channel_rows, config, tx_with_cp, channels, rng)
+    if config.delay_samples != 0.0:
+        tx_samples = traced(
+            "delay",
+            apply_delay,
+            tx_samples,
+            config.delay_samples,
+            method=config.delay_method,
+            backend=config.resolve_fft(),
+        )
+    rx_samples = traced(
+        "awgn", add_awgn_snr_axis, tx_samples, snr_db_list, rng, shared_rows=True
+    )
+    bits_rx = _receive(config, params, rx_samples)
+
+    n_bits = bits_tx.size
+    errors = traced("error_count", _count_errors, bits_rx, bits_tx, None)
+    grid = []
+    for c in range(len(channels)):
+        row = []
+        for s, snr_db in enumerate(snr_db_list):
+            n_errors = int(errors[s, c])
+            ci_low, ci_high = ber_confidence_interval(n_errors, n_bits)
+            row.append(
+                SimResult(
+                    ber=n_errors / n_bits,
+                    n_bits=n_bits,
+                    snr_db=snr_db,
+                    n_errors=n_errors,
+                    ci_low=ci_low,
+                    ci_high=ci_high,
+                )
+            )
+        grid.append(row)
+    return grid
+
+
+def _run_frames(
+    config: SimConfig,
+    params: OfdmParams,
+    rng: np.random.Generator,
+    n_frames: int,
+    workspace: Workspace | None = None,
+) -> np.ndarray:
+    """Simulate *n_frames* frames from *rng* and return per-frame error counts."""
+    bits_tx, tx_samples = _transmit(
+        config, params, rng, batch_shape=(n_frames,), workspace=workspace
+    )
+    rx_samples = traced(
+        "awgn",
+        add_awgn,
+        tx_samples,
+        config.snr_db,
+        rng,
+        out=None if workspace is None else tx_samples,
+        workspace=workspace,
+    )
+    bits_rx = _receive(config, params, rx_samples, workspace=workspace)
+    return traced("error_count", _count_errors, bits_rx, bits_tx, workspace)
+
+
+def run_batch(
+    config: SimConfig, n_frames: int, workspace: Workspace | None = None
+) -> BatchResult:
+    """Simulate *n_frames* independent frames in one vectorized pass.
+
+    Every stage operates on ``(n_frames, n_symbols, n_fft + cp_len)`` arrays
+    (or their serialized ``(n_frames, n_samples)`` form), so the cost per
+    frame is NumPy throughput rather than Python-loop overhead.  Each frame
+    draws its own bits, fading and noise from a single generator seeded with
+    ``config.seed``; ``run_batch(config, 1)`` reproduces :func:`run_once`.
+
+    Args:
+        config: Simulation configuration shared by all frames.
+        n_frames: Number of frames to simulate (must be positive).
+        workspace: Optional reusable stage buffers (see :func:`run_once`).
+
+    Returns:
+        A :class:`BatchResult` with per-frame error and bit counts.
+    """
+    if n_frames <= 0:
+        raise ValueError("n_frames must be positive")
+    config.validate()
+    rng = seeded_rng(config.seed)
+    params = config.ofdm_params()
+
+    frame_errors = _run_frames(config, params, rng, n_frames, workspace=workspace)
+    frame_bits = np.full(n_frames, config.bits_per_frame())
+    return BatchResult(
+        frame_errors=frame_errors, frame_bits=frame_bits, snr_db=config.snr_db
+    )
+
+
+def run_monte_carlo(
+    config: SimConfig, stop: StopCriteria | None = None
+) -> SimResult:
+    """Run frames sequentially until a :class:`StopCriteria` rule is met.
+
+    Frames are simulated in batches of ``stop.frames_per_batch`` through the
+    batched engine, drawing from one generator seeded with ``config.seed``,
+    so the result is deterministic for a given config and stop criteria.
+    The final batch is trimmed so the run never exceeds ``stop.max_bits`` by
+    more than one frame.  All batches share one
+    :class:`~ntn_linksim.workspace.Workspace`, so the loop allocates its
+    stage buffers once.
+
+    Args:
+        config: Simulation configuration for every frame.
+        stop: Stopping rules (default: 100 errors or 10^7 bits).
+
+    Returns:
+        A :class:`SimResult` with accumulated counts, frame count and CI.
+    """
+    stop = StopCriteria() if stop is None else stop
+    stop.validate()
+    config.validate()
+    rng = seeded_rng(config.seed)
+    params = config.ofdm_params()
+    bits_per_frame = config.bits_per_frame()
+    workspace = Workspace()
+
+    n_errors = 0
+    n_bits = 0
+    n_frames = 0
+    while True:
+        frames_left = -(-(stop.max_bits - n_bits) // bits_per_frame)
+        n_new = max(1, min(stop.frames_per_batch, frames_left))
+        frame_errors = _run_frames(config, params, rng, n_new, workspace=workspace)
+        n_errors += int(np.sum(frame_errors))
+        n_bits += n_new * bits_per_frame
+        n_frames += n_new
+        if stop.is_met(n_errors, n_bits):
+            break
+
+    ci_low, ci_high = ber_confidence_interval(n_errors, n_bits, stop.confidence)
+    return SimResult(
+        ber=n_errors / n_bits,
+        n_bits=n_bits,
+        snr_db=config.snr_db,
+        n_errors=n_errors,
+        n_frames=n_frames,
+        ci_low=ci_low,
+        ci_high=ci_high,
+    )
+
 
+def save_run(
+    out_dir: str | Path,
+    config: SimConfig,
+    result: SimResult,
+    trace: dict | None = None,
+) -> Path:
+    """Save a single-run JSON artifact and return its path.
 
-def save_run(out_dir: str | Path, config: SimConfig, result: SimResult) -> Path:
-    """Save a single-run JSON artifact and return its path."""
+    *trace* (a :meth:`ntn_linksim.trace.Tracer.summary`) is recorded when
+    given.
+    """
     out_path = Path(out_dir)
     out_path.mkdir(parents=True, exist_ok=True)
     payload = {
         "config": asdict(config),
         "result": asdict(result),
+        "fft": config.resolve_fft().describe(),
     }
+    if trace is not None:
+        payload["trace"] = trace
     dest = out_path / "run.json"
     with dest.open("w", encoding="utf-8") as f:
         json.dump(payload, f, indent=2, sort_keys=True)
@@ -0,0 +1,189 @@
+"""Optional per-stage tracing of the simulation pipeline.
+
+The engines in :mod:`ntn_linksim.sim` run each pipeline stage through
+:func:`traced`.  With no active tracer that is a plain call, so tracing
+costs one global lookup per stage when it is off.  Inside
+``with tracing(Tracer()):`` every stage call is recorded as a
+:class:`Span` with its wall time, the shape, dtype and size of its output
+and, for ``Tracer(memory=True)``, the peak bytes it allocated (via
+:mod:`tracemalloc`, which slows the run down noticeably).
+
+Stages are ``tx_build``, ``fading``, ``cfo``, ``delay``, ``awgn``,
+``timing_estimate`` and ``cfo_estimate`` (each including its
+compensation), ``demod`` and ``error_count``.  TDL fading on the
+subcarrier grid is traced as ``fading`` inside ``tx_build``, between the
+subcarrier mapping and the IFFT.  The vectorized grid engine
+(:func:`ntn_linksim.sim.run_channel_grid`) traces fading and CFO of all
+its rows together as ``channel``.  Sweeps evaluated on a
+process pool while a tracer is active are traced in the workers and their
+spans merged back (see :func:`ntn_linksim.experiments.runner.run_jobs`).
+
+A tracer exports a per-stage summary (stored in ``run.json`` and sweep
+JSONs by the CLI's ``--trace``) and Chrome trace-event JSON, which can be
+opened in ``chrome://tracing`` or Perfetto.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class Span:
+    """One traced stage call.
+
+    ``start_s`` is wall-clock time (comparable across processes);
+    ``duration_s`` is measured with :func:`time.perf_counter`.
+    ``alloc_bytes`` is None unless the tracer traces memory.
+    """
+
+    name: str
+    start_s: float
+    duration_s: float
+    shape: tuple[int, ...] | None
+    dtype: str | None
+    out_bytes: int
+    alloc_bytes: int | None
+    pid: int
+
+
+@dataclass
+class Tracer:
+    """Collects :class:`Span` records while active (see :func:`tracing`).
+
+    Args:
+        memory: Also record each stage's peak allocation with tracemalloc.
+    """
+
+    memory: bool = False
+    spans: list[Span] = field(default_factory=list)
+
+    def call(self, name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call ``fn(*args, **kwargs)`` and record it as stage *name*."""
+        if self.memory:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start_s = time.time()
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        duration_s = time.perf_counter() - start
+        alloc_bytes = None
+        if self.memory:
+            alloc_bytes = tracemalloc.get_traced_memory()[1] - before
+        arrays = [
+            a
+            for a in (result if isinstance(result, tuple) else (result,))
+            if isinstance(a, np.ndarray)
+        ]
+        main = arrays[-1] if arrays else None
+        self.spans.append(
+            Span(
+                name=name,
+                start_s=start_s,
+                duration_s=duration_s,
+                shape=None if main is None else main.shape,
+                dtype=None if main is None else str(main.dtype),
+                out_bytes=sum(a.nbytes for a in arrays),
+                alloc_bytes=alloc_bytes,
+                pid=os.getpid(),
+            )
+        )
+        return result
+
+    def summary(self) -> dict[str, dict]:
+        """Per-stage totals: calls, total and mean seconds, bytes.
+
+        Stages are listed in order of first appearance.  ``alloc_bytes`` is
+        the largest single-call peak (None without memory tracing).
+        """
+        stages: dict[str, dict] = {}
+        for span in self.spans:
+            stage = stages.setdefault(
+                span.name,
+                {"calls": 0, "total_s": 0.0, "out_bytes": 0, "alloc_bytes": None},
+            )
+            stage["calls"] += 1
+            stage["total_s"] += span.duration_s
+            stage["out_bytes"] = max(stage["out_bytes"], span.out_bytes)
+            if span.alloc_bytes is not None:
+                stage["alloc_bytes"] = max(stage["alloc_bytes"] or 0, span.alloc_bytes)
+        for stage in stages.values():
+            stage["mean_s"] = stage["total_s"] / stage["calls"]
+        return stages
+
+    def chrome_trace(self) -> dict:
+        """Return the spans as Chrome trace-event JSON (complete events)."""
+        origin = min((span.start_s for span in self.spans), default=0.0)
+        events = []
+        for span in self.spans:
+            args: dict[str, Any] = {"out_bytes": span.out_bytes}
+            if span.shape is not None:
+                args["shape"] = list(span.shape)
+                args["dtype"] = span.dtype
+            if span.alloc_bytes is not None:
+                args["alloc_bytes"] = span.alloc_bytes
+            events.append(
+                {
+                    "name": span.name,
+                    "cat": "stage",
+                    "ph": "X",
+                    "ts": (span.start_s - origin) * 1e6,
+                    "dur": span.duration_s * 1e6,
+                    "pid": span.pid,
+                    "tid": span.pid,
+                    "args": args,
+                }
+            )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_chrome_trace(self, path: str | Path) -> Path:
+        """Write :meth:`chrome_trace` to *path* and return it."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("w", encoding="utf-8") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
+
+
+_active: Tracer | None = None
+
+
+def active_tracer() -> Tracer | None:
+    """Return the tracer installed by :func:`tracing`, if any."""
+    return _active
+
+
+@contextmanager
+def tracing(tracer: Tracer) -> Iterator[Tracer]:
+    """Record every traced stage call in this process into *tracer*."""
+    global _active
+    previous = _active
+    started_memory = tracer.memory and not tracemalloc.is_tracing()
+    if started_memory:
+        tracemalloc.start()
+    _active = tracer
+    try:
+        yield tracer
+    finally:
+        _active = previous
+        if started_memory:
+            tracemalloc.stop()
+
+
+def traced(name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Call ``fn(*args, **kwargs)``, recording it as stage *name* if tracing."""
+    if _active is None:
+        return fn(*args, **kwargs)
+    return _active.call(name, fn, *args, **kwargs)
@@ -1,34 +1,392 @@
-"""QPSK modulation and hard-decision demodulation."""
+"""Gray-mapped QPSK/QAM modulation, hard decisions and soft (LLR) demapping.
+
+The square QAM constellations follow 3GPP TS 38.211 section 5.1: bits
+``b0, b2, b4, ...`` of a symbol select the in-phase PAM level and bits
+``b1, b3, b5, ...`` the quadrature level, each axis Gray-coded
+independently, and the average symbol power is one.  QPSK is the 2-bit
+case.  Because the axes are separable, every operation works per real
+component against small per-axis lookup tables (``2**(m/2)`` levels
+instead of ``2**m`` points).
+"""
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
+
 import numpy as np
 
+from ntn_linksim.precision import as_complex, real_dtype
+from ntn_linksim.workspace import check_out
+
+# Constellation indexed by 2*b0 + b1, before normalization.
+_QPSK_POINTS = np.array([1 + 1j, 1 - 1j, -1 + 1j, -1 - 1j])
+
 
-def qpsk_mod(bits: np.ndarray) -> np.ndarray:
+def qpsk_mod(
+    bits: np.ndarray,
+    dtype: np.dtype = np.complex128,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
     """Map bits to unit-power QPSK symbols.
 
     Bits are mapped as (b0, b1) -> (1-2*b0) + j(1-2*b1), normalized by sqrt(2).
+    Leading axes are treated as batch dimensions; pairs are taken along the
+    last axis.  *dtype* (complex128 or complex64) sets the sample precision
+    carried through the rest of the chain.  *out* receives the
+    ``(..., n_bits // 2)`` symbols when given.
     """
     bits = np.asarray(bits, dtype=np.int8)
-    if bits.ndim != 1:
-        raise ValueError("bits must be a 1-D array")
-    if bits.size % 2 != 0:
+    if bits.ndim < 1:
+        raise ValueError("bits must be at least a 1-D array")
+    if bits.shape[-1] % 2 != 0:
         raise ValueError("bits length must be even for QPSK")
-    if np.any((bits != 0) & (bits != 1)):
+    # Viewed as uint8, anything other than 0/1 (including negatives) is > 1.
+    if bits.size and np.max(bits.view(np.uint8)) > 1:
         raise ValueError("bits must be 0 or 1")
 
-    pairs = bits.reshape(-1, 2)
-    re = 1 - 2 * pairs[:, 0]
-    im = 1 - 2 * pairs[:, 1]
-    symbols = (re + 1j * im) / np.sqrt(2.0)
-    return symbols.astype(np.complex128)
+    pairs = bits.reshape(*bits.shape[:-1], -1, 2)
+    constellation = (_QPSK_POINTS / np.sqrt(2.0)).astype(dtype)
+    if out is not None:
+        # Each bit sets one component: b -> c - 2*c*b, exact in floating point.
+        check_out(out, pairs.shape[:-1], dtype)
+        c = constellation.real[:1]
+        for i, part in enumerate((out.real, out.imag)):
+            np.multiply(pairs[..., i], -2 * c, out=part)
+            np.add(part, c, out=part)
+        return out
+    index = 2 * pairs[..., 0] + pairs[..., 1]
+    return constellation[index]
 
 
-def qpsk_demod_hard(symbols: np.ndarray) -> np.ndarray:
-    """Hard-decision QPSK demodulation returning bits."""
-    symbols = np.asarray(symbols, dtype=np.complex128)
+def qpsk_demod_hard(symbols: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+    """Hard-decision QPSK demodulation returning bits.
+
+    Leading axes are preserved; the last axis holds ``2 * n_symbols`` bits.
+    *out* (int8) receives the bits when given.
+    """
+    symbols = as_complex(symbols)
+    if out is not None:
+        shape = symbols.shape[:-1] + (2 * symbols.shape[-1],)
+        pairs = check_out(out, shape, np.int8).reshape(*symbols.shape, 2)
+        np.less(symbols.real, 0, out=pairs[..., 0])
+        np.less(symbols.imag, 0, out=pairs[..., 1])
+        return out
     bits_re = (np.real(symbols) < 0).astype(np.int8)
     bits_im = (np.imag(symbols) < 0).astype(np.int8)
-    bits = np.stack([bits_re, bits_im], axis=1).reshape(-1)
-    return bits
+    bits = np.stack([bits_re, bits_im], axis=-1)
+    return bits.reshape(*symbols.shape[:-1], -1)
+
+
+# Bits per symbol of each supported constellation.
+MODULATIONS = {"qpsk": 2, "16qam": 4, "64qam": 6, "256qam": 8}
+LLR_METHODS = ("maxlog", "exact")
+
+# Symbols demapped per pass of qam_llr(), sized to stay in cache.
+_LLR_CHUNK = 1 << 13
+# Exact LLRs drop levels whose term is below exp(-cutoff) of the nearest.
+_LLR_CUTOFF = 40.0
+
+
+def bits_per_symbol(modulation: str) -> int:
+    """Return the bits per symbol of *modulation* (see :data:`MODULATIONS`).
+
+    Raises:
+        ValueError: If *modulation* is unknown.
+    """
+    try:
+        return MODULATIONS[modulation]
+    except KeyError:
+        raise ValueError(f"modulation must be one of {tuple(MODULATIONS)}") from None
+
+
+@dataclass(frozen=True)
+class _AxisTables:
+    """Per-axis lookup tables of one constellation (all read-only).
+
+    ``levels[i]`` is the normalized PAM amplitude of the axis bit pattern
+    with integer value *i* (first axis bit most significant).  Sorted
+    position ``p`` has amplitude ``(2*p - n_levels + 1) * scale`` and bits
+    ``position_bits[p]``.
+
+    For the LLRs the received axis value is split into ``2 * n_levels``
+    unit segments of the unnormalized axis.  Within a segment the nearest
+    level with each bit value is fixed, so the max-log LLR of axis bit *j*
+    is ``slope[i] * y + intercept[i]`` (times ``1 / N0``) at flat index
+    ``i = j * 2 * n_levels + segment``.  ``window[b, i]`` lists the sorted
+    positions of the levels with bit value *b*, nearest to the segment
+    first.  ``gap[r]`` bounds from below, over all segments, how much
+    farther (in squared distance) the levels from rank *r* on are than the
+    nearest one.
+    """
+
+    k: int
+    scale: float
+    levels: np.ndarray
+    position_bits: np.ndarray
+    window: np.ndarray
+    gap: np.ndarray
+    slope: np.ndarray
+    intercept: np.ndarray
+
+    @property
+    def n_levels(self) -> int:
+        return 1 << self.k
+
+
+def _pam_amplitude(axis_bits: tuple[int, ...]) -> int:
+    """Unnormalized 3GPP level, e.g. ``(1-2*b0)*(4-(1-2*b2)*(2-(1-2*b4)))``."""
+    amplitude = 1
+    for depth, bit in enumerate(reversed(axis_bits)):
+        sign = 1 - 2 * bit
+        amplitude = sign * (amplitude if depth == 0 else (1 << depth) - amplitude)
+    return amplitude
+
+
+@lru_cache(maxsize=8)
+def _axis_tables(modulation: str) -> _AxisTables:
+    k = bits_per_symbol(modulation) // 2
+    n_levels = 1 << k
+    patterns = [
+        tuple((value >> (k - 1 - j)) & 1 for j in range(k)) for value in range(n_levels)
+    ]
+    raw = np.array([_pam_amplitude(bits) for bits in patterns])
+    scale = 1.0 / np.sqrt(2.0 * (n_levels**2 - 1) / 3.0)
+    position_bits = np.empty((n_levels, k), dtype=np.int8)
+    position_bits[(raw + n_levels - 1) // 2] = patterns
+
+    # Sorted positions with each bit value, by distance to each segment centre.
+    edges = np.arange(-n_levels, n_levels + 1)
+    centres = edges[:-1] + 0.5
+    sorted_levels = 2 * np.arange(n_levels) - n_levels + 1
+    dist = (centres - sorted_levels[:, np.newaxis]) ** 2
+    windows = []
+    for value in (0, 1):
+        positions = np.nonzero(position_bits.T == value)[1].reshape(k, -1)
+        order = np.argsort(dist[positions], axis=1, kind="stable")
+        windows.append(np.take_along_axis(positions[..., np.newaxis], order, axis=1))
+    window = np.stack(windows).swapaxes(-1, -2).reshape(2, 2 * k * n_levels, -1)
+    near0, near1 = sorted_levels[window[..., 0]] * scale
+
+    # The extra squared distance of each rank is linear in y, so its minimum
+    # over a segment is at an edge; then take the minimum over ranks >= r.
+    segment = np.tile(np.arange(2 * n_levels), k)
+    lv = sorted_levels[window]
+    rank_gap = np.full(window.shape[-1], np.inf)
+    for edge in (edges[segment], edges[segment + 1]):
+        d = (edge[:, np.newaxis] - lv) ** 2
+        rank_gap = np.minimum(rank_gap, (d - d[..., :1]).min(axis=(0, 1)))
+    gap = np.minimum.accumulate(rank_gap[::-1])[::-1] * scale**2
+    tables = _AxisTables(
+        k=k,
+        scale=float(scale),
+        levels=raw * scale,
+        position_bits=position_bits,
+        window=window,
+        gap=gap,
+        slope=2.0 * (near0 - near1),
+        intercept=near1**2 - near0**2,
+    )
+    for array in (
+        tables.levels,
+        tables.position_bits,
+        tables.window,
+        tables.gap,
+        tables.slope,
+        tables.intercept,
+    ):
+        array.setflags(write=False)
+    return tables
+
+
+def _components(symbols: np.ndarray) -> np.ndarray:
+    """``(..., n_symbols, 2)`` real view of the I/Q components."""
+    symbols = np.ascontiguousarray(as_complex(symbols))
+    return symbols.view(symbols.real.dtype).reshape(*symbols.shape, 2)
+
+
+def qam_mod(
+    bits: np.ndarray,
+    modulation: str = "qpsk",
+    dtype: np.dtype = np.complex128,
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Map bits to unit-power Gray-coded QAM symbols.
+
+    Leading axes are batch dimensions; groups of ``bits_per_symbol`` bits
+    are taken along the last axis.  QPSK is delegated to :func:`qpsk_mod`,
+    which produces the same mapping.
+
+    Args:
+        bits: ``(..., n_bits)`` array of 0/1.
+        modulation: Constellation name (see :data:`MODULATIONS`).
+        dtype: Complex output dtype (complex128 or complex64).
+        out: Optional ``(..., n_bits // bits_per_symbol)`` destination.
+
+    Returns:
+        Complex symbols, one per group of bits.
+
+    Raises:
+        ValueError: If the modulation is unknown, *bits* holds values other
+            than 0/1, or its length is not a multiple of the bits per symbol.
+    """
+    m = bits_per_symbol(modulation)
+    if m == 2:
+        return qpsk_mod(bits, dtype=dtype, out=out)
+    bits = np.asarray(bits, dtype=np.int8)
+    if bits.ndim < 1:
+        raise ValueError("bits must be at least a 1-D array")
+    if bits.shape[-1] % m != 0:
+        raise ValueError(f"bits length must be a multiple of {m} for {modulation}")
+    if bits.size and np.max(bits.view(np.uint8)) > 1:
+        raise ValueError("bits must be 0 or 1")
+
+    tables = _axis_tables(modulation)
+    # (..., n_symbols, k, 2): axis bit j of I at 2*j, of Q at 2*j + 1.
+    groups = bits.reshape(*bits.shape[:-1], -1, tables.k, 2)
+    weights = (1 << np.arange(tables.k - 1, -1, -1)).astype(np.intp)
+    index = np.einsum("...jc,j->...c", groups, weights)
+    levels = tables.levels.astype(real_dtype(np.dtype(dtype)))
+    if out is None:
+        out = np.empty(groups.shape[:-2], dtype=dtype)
+    else:
+        check_out(out, groups.shape[:-2], dtype)
+    out.real = levels[index[..., 0]]
+    out.imag = levels[index[..., 1]]
+    return out
+
+
+def qam_demod_hard(
+    symbols: np.ndarray, modulation: str = "qpsk", out: np.ndarray | None = None
+) -> np.ndarray:
+    """Hard-decision QAM demodulation (nearest point) returning bits.
+
+    Leading axes are preserved; the last axis holds ``bits_per_symbol *
+    n_symbols`` bits.  *out* (int8) receives the bits when given.  QPSK is
+    delegated to :func:`qpsk_demod_hard`.
+    """
+    m = bits_per_symbol(modulation)
+    if m == 2:
+        return qpsk_demod_hard(symbols, out=out)
+    tables = _axis_tables(modulation)
+    comps = _components(symbols)
+    half = (tables.n_levels - 1) / 2.0
+    position = np.rint(comps / (2.0 * tables.scale) + half)
+    np.clip(position, 0, tables.n_levels - 1, out=position)
+    # (..., n_symbols, 2, k) -> bit order (..., n_symbols, k, 2)
+    bits = tables.position_bits[position.astype(np.intp)].swapaxes(-1, -2)
+    shape = comps.shape[:-2] + (m * comps.shape[-2],)
+    if out is None:
+        return bits.reshape(shape)
+    check_out(out, shape, np.int8).reshape(bits.shape)[...] = bits
+    return out
+
+
+def qam_llr(
+    symbols: np.ndarray,
+    noise_var: float | np.ndarray,
+    modulation: str = "qpsk",
+    method: str = "maxlog",
+    out: np.ndarray | None = None,
+) -> np.ndarray:
+    """Bit log-likelihood ratios ``log(P(b=0 | y) / P(b=1 | y))``.
+
+    Each I/Q component is demapped against its axis tables.  ``"maxlog"``
+    keeps the nearest level with each bit value: one table lookup and one
+    multiply-add per LLR.  ``"exact"`` adds, for each bit value, the
+    log-sum-exp of its levels relative to the nearest one.  The levels come
+    from the segment's precomputed window, nearest first, and only as many
+    ranks are used as can contribute more than ``exp(-40)`` at the chunk's
+    smallest ``1 / N0``: all of them at low SNR, the adjacent one or two at
+    high SNR.  For QPSK each bit value has one level per axis, so
+    ``"exact"`` is ``"maxlog"``.  Symbols are processed in cache-sized
+    chunks.
+
+    Args:
+        symbols: ``(..., n_symbols)`` received (equalized) symbols.
+        noise_var: Complex noise variance ``N0`` (``N0 / 2`` per component),
+            a scalar or an array broadcastable to ``symbols.shape``, e.g.
+            per-symbol after dividing by a channel gain.
+        modulation: Constellation name (see :data:`MODULATIONS`).
+        method: ``"maxlog"`` or ``"exact"``.
+        out: Optional ``(..., bits_per_symbol * n_symbols)`` destination with
+            the real dtype of *symbols*.
+
+    Returns:
+        LLRs in the bit order of :func:`qam_mod`; positive favours 0.
+
+    Raises:
+        ValueError: If the modulation or method is unknown, or *noise_var* is
+            not positive.
+    """
+    m = bits_per_symbol(modulation)
+    if method not in LLR_METHODS:
+        raise ValueError(f"method must be one of {LLR_METHODS}")
+    noise_var = np.asarray(noise_var)
+    if np.any(noise_var <= 0):
+        raise ValueError("noise_var must be positive")
+    tables = _axis_tables(modulation)
+    comps = _components(symbols)
+    dtype = comps.dtype
+    shape = comps.shape[:-2] + (m * comps.shape[-2],)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    else:
+        check_out(out, shape, dtype)
+    inv_n0 = 1.0 / noise_var
+    if inv_n0.ndim:
+        inv_n0 = np.broadcast_to(inv_n0, comps.shape[:-1]).reshape(-1, 1, 1)
+
+    n_segments = 2 * tables.n_levels
+    # Flat table index of (bit j, component c) is j * n_segments + segment.
+    offsets = n_segments * np.arange(tables.k)[:, np.newaxis]
+    slope = tables.slope.astype(dtype)
+    intercept = tables.intercept.astype(dtype)
+    exact = method == "exact" and tables.k > 1
+    if exact:
+        # Rank r of the window adds exp((far_slope * y + far_intercept) / N0)
+        # to its subset's sum, relative to the nearest level (rank 0).
+        sorted_levels = tables.scale * (
+            2 * np.arange(tables.n_levels) - tables.n_levels + 1
+        )
+        lv = sorted_levels[tables.window].swapaxes(-1, -2)
+        near, far = lv[:, :1], lv[:, 1:]
+        far_slope = np.ascontiguousarray(2.0 * (far - near), dtype=dtype)
+        far_intercept = np.ascontiguousarray(near**2 - far**2, dtype=dtype)
+
+    flat = comps.reshape(-1, 2)
+    llr = out.reshape(-1, tables.k, 2)
+    for start in range(0, flat.shape[0], _LLR_CHUNK):
+        y = flat[start : start + _LLR_CHUNK]
+        block = llr[start : start + _LLR_CHUNK]
+        inv = inv_n0 if not inv_n0.ndim else inv_n0[start : start + _LLR_CHUNK]
+        segment = y * (1.0 / tables.scale) + tables.n_levels
+        np.clip(segment, 0, n_segments - 1, out=segment)
+        index = segment.astype(np.intp)[:, np.newaxis, :] + offsets
+        np.take(slope, index, out=block, mode="clip")
+        block *= y[:, np.newaxis, :]
+        block += np.take(intercept, index, mode="clip")
+        block *= inv
+        if exact:
+            n_far = np.count_nonzero(tables.gap[1:] * np.min(inv) < _LLR_CUTOFF)
+            flat_index = index.reshape(-1)
+            y_flat = np.broadcast_to(y[:, np.newaxis, :], index.shape).reshape(-1)
+            if inv.ndim:
+                inv_flat = np.broadcast_to(inv, index.shape).reshape(-1)
+            else:
+                inv_flat = inv
+            # Sum of exp((d_nearest - d) / N0) over each bit value's levels.
+            sums = np.ones((2, flat_index.size), dtype=dtype)
+            term = np.empty(flat_index.size, dtype=dtype)
+            for value in (0, 1):
+                for rank in range(n_far):
+                    np.take(far_slope[value, rank], flat_index, out=term)
+                    term *= y_flat
+                    term += np.take(far_intercept[value, rank], flat_index)
+                    term *= inv_flat
+                    # Clamped so that far levels do not underflow (slowly).
+                    np.maximum(term, -_LLR_CUTOFF, out=term)
+                    sums[value] += np.exp(term, out=term)
+            np.log(sums, out=sums)
+            block += (sums[0] - sums[1]).reshape(block.shape)
+    return out
@@ -6,6 +6,10 @@ from dataclasses import dataclass
 
 import numpy as np
 
+from ntn_linksim.fft_backend import NUMPY_FFT, FftBackend
+from ntn_linksim.precision import as_complex
+from ntn_linksim.workspace import check_out
+
 
 @dataclass(frozen=True)
 class OfdmParams:
@@ -41,71 +45,101 @@ def used_subcarrier_indices(n_fft: int, n_used: int) -> np.ndarray:
     return np.concatenate([neg, pos])
 
 
-def tx_grid(symbols: np.ndarray, params: OfdmParams) -> np.ndarray:
-    """Map QPSK symbols into an OFDM frequency grid."""
+def tx_grid(
+    symbols: np.ndarray, params: OfdmParams, out: np.ndarray | None = None
+) -> np.ndarray:
+    """Map QPSK symbols into an OFDM frequency grid.
+
+    Accepts ``(..., n_symbols, n_used)``; leading axes are batch dimensions.
+    *out* receives the ``(..., n_symbols, n_fft)`` grid when given.
+    """
     params.validate()
-    symbols = np.asarray(symbols, dtype=np.complex128)
-    if symbols.shape != (params.n_symbols, params.n_used):
-        raise ValueError("symbols shape must be (n_symbols, n_used)")
-    grid = np.zeros((params.n_symbols, params.n_fft), dtype=np.complex128)
+    symbols = as_complex(symbols)
+    if symbols.shape[-2:] != (params.n_symbols, params.n_used):
+        raise ValueError("symbols shape must be (..., n_symbols, n_used)")
+    shape = symbols.shape[:-1] + (params.n_fft,)
+    if out is None:
+        grid = np.zeros(shape, dtype=symbols.dtype)
+    else:
+        grid = check_out(out, shape, symbols.dtype)
+        grid.fill(0)
     idx = used_subcarrier_indices(params.n_fft, params.n_used)
-    grid[:, idx] = symbols
+    grid[..., idx] = symbols
     return grid
 
 
-def ifft_symbols(grid: np.ndarray) -> np.ndarray:
+def ifft_symbols(
+    grid: np.ndarray,
+    out: np.ndarray | None = None,
+    backend: FftBackend = NUMPY_FFT,
+) -> np.ndarray:
     """IFFT across subcarriers to generate time-domain symbols."""
-    grid = np.asarray(grid, dtype=np.complex128)
-    return np.fft.ifft(grid, axis=1).astype(np.complex128)
+    return backend.ifft(grid, out=out)
 
 
-def add_cp(time_symbols: np.ndarray, cp_len: int) -> np.ndarray:
+def add_cp(
+    time_symbols: np.ndarray, cp_len: int, out: np.ndarray | None = None
+) -> np.ndarray:
     """Add cyclic prefix to each OFDM symbol."""
-    time_symbols = np.asarray(time_symbols, dtype=np.complex128)
-    if cp_len < 0 or cp_len >= time_symbols.shape[1]:
+    time_symbols = as_complex(time_symbols)
+    if cp_len < 0 or cp_len >= time_symbols.shape[-1]:
         raise ValueError("cp_len must be in [0, n_fft)")
+    if out is not None:
+        shape = time_symbols.shape[:-1] + (time_symbols.shape[-1] + cp_len,)
+        check_out(out, shape, time_symbols.dtype)
+        out[..., :cp_len] = time_symbols[..., time_symbols.shape[-1] - cp_len :]
+        out[..., cp_len:] = time_symbols
+        return out
     if cp_len == 0:
         return time_symbols
-    cp = time_symbols[:, -cp_len:]
-    return np.concatenate([cp, time_symbols], axis=1)
+    cp = time_symbols[..., -cp_len:]
+    return np.concatenate([cp, time_symbols], axis=-1)
 
 
 def serialize_symbols(symbols_with_cp: np.ndarray) -> np.ndarray:
-    """Serialize a 2-D symbol array into 1-D samples."""
-    symbols_with_cp = np.asarray(symbols_with_cp, dtype=np.complex128)
-    return symbols_with_cp.reshape(-1)
+    """Serialize ``(..., n_symbols, sym_len)`` symbols into ``(..., n_samples)``."""
+    symbols_with_cp = as_complex(symbols_with_cp)
+    return symbols_with_cp.reshape(*symbols_with_cp.shape[:-2], -1)
 
 
 def deserialize_symbols(samples: np.ndarray, params: OfdmParams) -> np.ndarray:
-    """Reshape 1-D samples into OFDM symbols with CP."""
+    """Reshape ``(..., n_samples)`` into OFDM symbols with CP."""
     params.validate()
-    samples = np.asarray(samples, dtype=np.complex128)
+    samples = as_complex(samples)
     sym_len = params.n_fft + params.cp_len
     expected = params.n_symbols * sym_len
-    if samples.size != expected:
+    if samples.ndim < 1 or samples.shape[-1] != expected:
         raise ValueError("sample length does not match OFDM params")
-    return samples.reshape(params.n_symbols, sym_len)
+    return samples.reshape(*samples.shape[:-1], params.n_symbols, sym_len)
 
 
 def remove_cp(symbols_with_cp: np.ndarray, cp_len: int) -> np.ndarray:
     """Remove cyclic prefix from each OFDM symbol."""
-    symbols_with_cp = np.asarray(symbols_with_cp, dtype=np.complex128)
-    if cp_len < 0 or cp_len >= symbols_with_cp.shape[1]:
+    symbols_with_cp = as_complex(symbols_with_cp)
+    if cp_len < 0 or cp_len >= symbols_with_cp.shape[-1]:
         raise ValueError("cp_len must be in [0, n_fft)")
-    return symbols_with_cp[:, cp_len:]
+    return symbols_with_cp[..., cp_len:]
 
 
-def fft_symbols(time_symbols: np.ndarray) -> np.ndarray:
+def fft_symbols(
+    time_symbols: np.ndarray,
+    out: np.ndarray | None = None,
+    backend: FftBackend = NUMPY_FFT,
+) -> np.ndarray:
     """FFT across time to recover frequency-domain grid."""
-    time_symbols = np.asarray(time_symbols, dtype=np.complex128)
-    return np.fft.fft(time_symbols, axis=1).astype(np.complex128)
+    return backend.fft(time_symbols, out=out)
 
 
-def extract_used(grid: np.ndarray, params: OfdmParams) -> np.ndarray:
+def extract_used(
+    grid: np.ndarray, params: OfdmParams, out: np.ndarray | None = None
+) -> np.ndarray:
     """Extract used subcarriers from the frequency grid."""
     params.validate()
-    grid = np.asarray(grid, dtype=np.complex128)
-    if grid.shape != (params.n_symbols, params.n_fft):
-        raise ValueError("grid shape must be (n_symbols, n_fft)")
+    grid = as_complex(grid)
+    if grid.shape[-2:] != (params.n_symbols, params.n_fft):
+        raise ValueError("grid shape must be (..., n_symbols, n_fft)")
     idx = used_subcarrier_indices(params.n_fft, params.n_used)
-    return grid[:, idx]
+    if out is not None:
+        check_out(out, grid.shape[:-1] + (params.n_used,), grid.dtype)
+        return np.take(grid, idx, axis=-1, out=out, mode="clip")
+    return grid[..., idx]
@@ -0,0 +1,61 @@
+"""Reusable scratch buffers for repeated simulation runs.
+
+A :class:`Workspace` hands out named arrays.  The first request for a name
+allocates it; later requests with the same shape and dtype return the same
+array, so running many frames of one shape (Monte Carlo loops, sweeps)
+reuses every stage buffer instead of allocating and freeing them per run.
+Buffer contents are not preserved between requests unless the caller
+relies on its own previous write.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+class Workspace:
+    """Named, shape-keyed buffer pool for the ``out=`` stage kernels."""
+
+    def __init__(self) -> None:
+        self._buffers: dict[str, np.ndarray] = {}
+
+    def get(self, name: str, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """Return the buffer *name*, (re)allocating it on a shape/dtype change.
+
+        Args:
+            name: Buffer name, unique per stage role (e.g. ``"tx.grid"``).
+            shape: Required shape.
+            dtype: Required dtype.
+
+        Returns:
+            An uninitialized array of the requested shape and dtype.
+        """
+        dtype = np.dtype(dtype)
+        shape = tuple(shape)
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._buffers[name] = buf
+        return buf
+
+    def zeros(self, name: str, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+        """Like :meth:`get`, with the buffer cleared to zero."""
+        buf = self.get(name, shape, dtype)
+        buf.fill(0)
+        return buf
+
+    @property
+    def nbytes(self) -> int:
+        """Total size of the buffers held."""
+        return sum(buf.nbytes for buf in self._buffers.values())
+
+    def clear(self) -> None:
+        """Release all buffers."""
+        self._buffers.clear()
+
+
+def check_out(out: np.ndarray, shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    """Validate a caller-supplied ``out=`` array and return it."""
+    if out.shape != tuple(shape) or out.dtype != np.dtype(dtype):
+        raise ValueError(f"out must have shape {tuple(shape)} and dtype {dtype}")
+    return out
@@ -0,0 +1,69 @@
+"""Tests for the benchmark suite and baseline comparison."""
+
+import numpy as np
+import pytest
+
+from ntn_linksim.bench import (
+    STAGES,
+    _sized,
+    _stage_calls,
+    compare,
+    load_bench,
+    run_bench,
+    save_bench,
+)
+from ntn_linksim.precision import complex_dtype, real_dtype
+from ntn_linksim.sim import SimConfig
+
+
+@pytest.fixture(scope="module")
+def report() -> dict:
+    return run_bench(sizes=((64, 20),), min_time_s=1e-3, repeat=1)
+
+
+def test_report_covers_stages_run_once_and_sweeps(report: dict) -> None:
+    names = [entry["name"] for entry in report["entries"]]
+    assert names[: len(STAGES)] == [f"stage/{stage}" for stage in STAGES]
+    assert {"run_once/awgn", "run_once/impaired", "sweep/snr", "sweep/cfo"} <= set(
+        names
+    )
+    for entry in report["entries"]:
+        assert entry["seconds"] > 0
+        assert entry["samples_per_s"] > 0
+        assert entry["peak_bytes"] >= 0
+    assert report["machine"]["numpy"]
+    assert report["config"]["fft"]["backend"] == "numpy"
+
+
+def test_compare_flags_slowdowns_beyond_threshold(report: dict, tmp_path) -> None:
+    baseline = load_bench(save_bench(tmp_path / "bench.json", report))
+    assert compare(report, baseline) == []
+
+    factors = [1.5, 1.05] + [1.0] * (len(report["entries"]) - 2)
+    slower = {
+        **report,
+        "entries": [
+            {**entry, "seconds": entry["seconds"] * factor}
+            for entry, factor in zip(report["entries"], factors, strict=True)
+        ],
+    }
+    regressions = compare(slower, baseline, threshold=0.10)
+    assert [r.name for r in regressions] == ["stage/qpsk_mod"]
+    assert regressions[0].ratio == pytest.approx(1.5)
+    assert len(compare(slower, baseline, threshold=0.01)) == 2
+    with pytest.raises(ValueError):
+        run_bench(sizes=(), min_time_s=0)
+
+
+@pytest.mark.parametrize("precision", ["single", "double"])
+def test_stages_run_at_configured_precision(precision: str) -> None:
+    config = _sized(SimConfig(precision=precision), 64, 10)
+    dtype = complex_dtype(precision)
+    for name, (fn, _) in _stage_calls(config).items():
+        result = np.asarray(fn())
+        if name == "fading_process":  # generated in double, like in the sim
+            continue
+        if np.iscomplexobj(result):
+            assert result.dtype == dtype, name
+        elif name.startswith("qam_llr"):
+            assert result.dtype == real_dtype(dtype), name
@@ -0,0 +1,165 @@
+"""Tests for TLE ingestion, constellation propagation and the constellation sweep."""
+
+import datetime as dt
+import json
+
+import numpy as np
+import pytest
+import yaml
+
+from ntn_linksim.constellation import (
+    GroundSite,
+    constellation_stats,
+    format_tle,
+    gmst_rad,
+    julian_date,
+    look_angles,
+    parse_tle,
+    parse_tles,
+    propagate,
+    sample_channels,
+    walker_delta,
+)
+from ntn_linksim.experiments.sweep import constellation_sweep_configs
+from ntn_linksim.orbit import EARTH_MU_M3_S2
+from ntn_linksim.scenarios import (
+    load_scenario,
+    run_scenario,
+    scenario_to_config,
+    scenario_to_constellation,
+)
+from ntn_linksim.sim import run_once
+
+ISS = (
+    "ISS (ZARYA)",
+    "1 25544U 98067A   08264.51782528 -.00002182  00000-0 -11606-4 0  2927",
+    "2 25544  51.6416 247.4627 0006703 130.5360 325.0288 15.72125391563537",
+)
+EPOCH = dt.datetime(2024, 1, 1)
+
+
+def test_tle_parsing() -> None:
+    (tle,) = parse_tles(ISS)
+    assert tle.name == "ISS (ZARYA)"
+    assert tle.satnum == 25544
+    assert tle.eccentricity == pytest.approx(0.0006703)
+    assert tle.mean_motion_rev_day == pytest.approx(15.72125391)
+    assert tle.ndot_rev_day2 == pytest.approx(-2 * 0.00002182)
+    assert tle.bstar == pytest.approx(-0.11606e-4)
+    assert tle.epoch_jd == pytest.approx(
+        julian_date(dt.datetime(2008, 9, 20, 12, 25, 40)), abs=1e-5
+    )
+    with pytest.raises(ValueError, match="checksum"):
+        parse_tle(ISS[1][:-1] + "0", ISS[2])
+    with pytest.raises(ValueError):
+        parse_tles(ISS[1:2])
+    for tle in walker_delta(3, 4, 550.0, 53.0, EPOCH):
+        back = parse_tle(*format_tle(tle))
+        assert back.satnum == tle.satnum
+        assert back.epoch_jd == pytest.approx(tle.epoch_jd)
+        assert back.raan_deg == pytest.approx(tle.raan_deg, abs=1e-4)
+        assert back.mean_anomaly_deg == pytest.approx(tle.mean_anomaly_deg, abs=1e-4)
+
+
+def test_propagation_physics() -> None:
+    (iss,) = parse_tles(ISS)
+    circular = walker_delta(1, 1, 550.0, 53.0, EPOCH)[0]
+    jd = iss.epoch_jd + np.linspace(0.0, 1.0, 97)
+    position, velocity = propagate([iss], jd)
+    assert position.shape == velocity.shape == (3, 1, jd.size)
+    # Vis-viva holds along the eccentric orbit.
+    r = np.linalg.norm(position, axis=0)[0]
+    v = np.linalg.norm(velocity, axis=0)[0]
+    a = np.cbrt(EARTH_MU_M3_S2 / (iss.mean_motion_rev_day * 2 * np.pi / 86400) ** 2)
+    np.testing.assert_allclose(v**2, EARTH_MU_M3_S2 * (2 / r - 1 / a), rtol=1e-9)
+    # J2 regresses the ISS node by about 5 degrees per day.
+    h = np.cross(position[:, 0, [0, -1]].T, velocity[:, 0, [0, -1]].T)
+    node = np.degrees(np.arctan2(h[:, 0], -h[:, 1]))
+    assert node[0] % 360.0 == pytest.approx(iss.raan_deg, abs=1e-6)
+    assert node[1] - node[0] == pytest.approx(-5.0, abs=0.2)
+
+    jd = julian_date(EPOCH) + np.arange(10) / 1440
+    position, _ = propagate([circular], jd)
+    np.testing.assert_allclose(np.linalg.norm(position, axis=0), 6_921_000.0)
+    # At epoch the satellite crosses the equator at its node; a site below
+    # it sees it at zenith, 550 km away and with almost no Doppler.
+    lon = circular.raan_deg - np.degrees(gmst_rad(jd[0]))
+    look = look_angles([circular], GroundSite(0.0, lon), jd, 2e9)
+    assert look["elevation_deg"].shape == (1, jd.size)
+    assert look["elevation_deg"][0, 0] == pytest.approx(90.0, abs=1e-3)
+    assert look["slant_range_m"][0, 0] == pytest.approx(550e3 - 7137.0, abs=1.0)
+    assert abs(look["doppler_hz"][0, 0]) < 3e3
+    assert look["doppler_hz"][0, -1] < -40e3
+
+
+def test_stats_match_brute_force() -> None:
+    tles = walker_delta(6, 8, 550.0, 53.0, EPOCH)
+    site = GroundSite(48.14, 11.58)
+    start = julian_date(EPOCH)
+    stats = constellation_stats(tles, site, start, 3 * 3600.0, step_s=5.0, n_bins=16)
+    assert stats.n_pairs == len(tles) * (3 * 720 + 1)
+
+    look = look_angles(tles, site, start + np.arange(3 * 720 + 1) * 5.0 / 86400, 2e9)
+    visible = look["elevation_deg"] >= 10.0
+    assert stats.n_visible == visible.sum() > 0
+    expected, _ = np.histogram(
+        look["elevation_deg"][visible], stats.elevation_edges_deg
+    )
+    np.testing.assert_array_equal(stats.elevation_counts, expected)
+    expected, _ = np.histogram(look["doppler_hz"][visible], stats.doppler_edges_hz)
+    np.testing.assert_array_equal(stats.doppler_counts, expected)
+    assert stats.delay_counts.sum() == stats.joint_counts.sum() == stats.n_visible
+    assert look["delay_s"][visible].max() < stats.delay_edges_s[-1]
+
+    samples = sample_channels(stats, 50, np.random.default_rng(0), zenith_snr_db=25.0)
+    again = sample_channels(stats, 50, np.random.default_rng(0), zenith_snr_db=25.0)
+    np.testing.assert_array_equal(samples["doppler_hz"], again["doppler_hz"])
+    assert np.all(np.diff(samples["elevation_deg"]) >= 0)
+    assert np.all(samples["snr_db"] <= 25.0)
+    assert np.all(np.abs(samples["doppler_hz"]) <= stats.doppler_edges_hz[-1])
+
+
+def test_constellation_scenario(tmp_path) -> None:
+    lines = []
+    for tle in walker_delta(6, 8, 550.0, 53.0, EPOCH):
+        lines.extend([tle.name, *format_tle(tle)])
+    (tmp_path / "shell.tle").write_text("\n".join(lines) + "\n")
+    data = {
+        "name": "Constellation mini",
+        "config": {"seed": 3, "n_symbols": 20, "enable_cfo_comp": True},
+        "sweep": {
+            "type": "constellation",
+            "tle_file": "shell.tle",
+            "site": {"lat_deg": 48.14, "lon_deg": 11.58},
+            "start_utc": "2024-01-01T00:00:00",
+            "duration_s": 7200,
+            "step_s": 20,
+            "n_points": 4,
+            "link": {"zenith_snr_db": 30},
+        },
+    }
+    path = tmp_path / "constellation.yaml"
+    path.write_text(yaml.dump(data, sort_keys=False))
+    scenario = load_scenario(path)
+    run_scenario(scenario, tmp_path / "out", plots="none")
+    payload = json.loads((tmp_path / "out" / "sweep_constellation.json").read_text())
+
+    parameters, stats, samples = scenario_to_constellation(scenario)
+    configs = constellation_sweep_configs(scenario_to_config(scenario), samples)
+    assert payload["constellation"] == parameters
+    assert parameters["n_satellites"] == 48
+    assert payload["histograms"]["n_visible"] == stats.n_visible
+    assert payload["doppler_hz"] == samples["doppler_hz"].tolist()
+    assert payload["ber"] == [run_once(cfg).ber for cfg in configs]
+    assert all(cfg.enable_rician and cfg.delay_samples == 0.0 for cfg in configs)
+
+    # A rewritten TLE file is propagated again, not served from the cache.
+    lines = []
+    for tle in walker_delta(3, 8, 550.0, 53.0, EPOCH):
+        lines.extend([tle.name, *format_tle(tle)])
+    (tmp_path / "shell.tle").write_text("\n".join(lines) + "\n")
+    assert scenario_to_constellation(scenario)[0]["n_satellites"] == 24
+
+    with pytest.raises(ValueError, match="site"):
+        path.write_text(yaml.dump({"sweep": {"type": "constellation"}}))
+        load_scenario(path)
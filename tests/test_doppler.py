@@ -0,0 +1,105 @@
+"""Tests for the time-varying Doppler channel."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim.channel.cfo import apply_cfo
+from ntn_linksim.channel.doppler import (
+    DopplerRotator,
+    PolynomialDoppler,
+    SampledDoppler,
+    apply_doppler,
+)
+from ntn_linksim.sim import SimConfig, run_channel_grid, run_once
+
+FS_HZ = 15.36e6
+
+
+def _direct(n: int, coeffs: tuple[float, ...], start: int = 0) -> np.ndarray:
+    """Phasor from the exact polynomial phase integral."""
+    t = np.arange(start, start + n, dtype=np.float64) / FS_HZ
+    cycles = sum(c * t ** (k + 1) / (k + 1) for k, c in enumerate(coeffs))
+    return np.exp(2j * np.pi * cycles)
+
+
+def test_constant_profile_matches_apply_cfo() -> None:
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((2, 5000)) + 1j * rng.standard_normal((2, 5000))
+    y = apply_doppler(x, FS_HZ, PolynomialDoppler((24000.0,)))
+    np.testing.assert_allclose(y, apply_cfo(x, FS_HZ, 24000.0), rtol=0, atol=1e-9)
+
+
+def test_polynomial_matches_closed_form() -> None:
+    n = 200_000
+    coeffs = (30e3, -700.0, 15.0)
+    y = apply_doppler(np.ones(n, dtype=np.complex128), FS_HZ, PolynomialDoppler(coeffs))
+    np.testing.assert_allclose(y, _direct(n, coeffs), rtol=0, atol=1e-9)
+
+
+def test_rotator_carries_phase_between_blocks() -> None:
+    """Pushing a stream in uneven chunks equals one call, from any start."""
+    n, start = 150_000, 10**8
+    profile = PolynomialDoppler((-20e3, 900.0))
+    x = np.ones(n, dtype=np.complex64)
+    rotator = DopplerRotator(profile, FS_HZ, start=start)
+    cuts = [0, 1, 777, 70_000, 70_001, n]
+    chunks = [
+        rotator.process(x[lo:hi]) for lo, hi in zip(cuts[:-1], cuts[1:], strict=True)
+    ]
+    streamed = np.concatenate(chunks)
+    assert streamed.dtype == np.complex64
+    assert rotator.position == start + n
+    one_shot = apply_doppler(x, FS_HZ, profile, start=start)
+    np.testing.assert_allclose(streamed, one_shot, rtol=0, atol=1e-5)
+    np.testing.assert_allclose(
+        streamed, _direct(n, (-20e3, 900.0), start), rtol=0, atol=1e-5
+    )
+
+
+def test_inverse_rotator_undoes_the_channel() -> None:
+    profile = PolynomialDoppler((5e3, 4e5))
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal(3000) + 1j * rng.standard_normal(3000)
+    y = DopplerRotator(profile, FS_HZ).process(x)
+    np.testing.assert_allclose(
+        DopplerRotator(profile, FS_HZ, inverse=True).process(y), x, atol=1e-9
+    )
+
+
+def test_sampled_trajectory_matches_polynomial() -> None:
+    """Piecewise-linear knots of a linear ramp integrate like the polynomial."""
+    n = 100_000
+    times = np.linspace(0.0, n / FS_HZ, 5)
+    sampled = SampledDoppler(times, 12e3 + 3e5 * times)
+    polynomial = PolynomialDoppler((12e3, 3e5))
+    x = np.ones(n, dtype=np.complex128)
+    np.testing.assert_allclose(
+        apply_doppler(x, FS_HZ, sampled),
+        apply_doppler(x, FS_HZ, polynomial),
+        rtol=0,
+        atol=1e-9,
+    )
+    np.testing.assert_allclose(
+        sampled.frequency([-1.0, 1.0]), [12e3, 12e3 + 3e5 * times[-1]]
+    )
+    with pytest.raises(ValueError):
+        SampledDoppler([0.0, 0.0], [1.0, 2.0])
+
+
+def test_doppler_rate_in_run_once_and_grid() -> None:
+    config = SimConfig(
+        n_symbols=60,
+        snr_db=12.0,
+        cfo_hz=2000.0,
+        doppler_rate_hz_s=5e6,
+        enable_cfo_comp=True,
+    )
+    # A 5 MHz/s rate drifts ~1.6 kHz over the frame; a CP estimate from the
+    # first symbol cannot follow it.
+    assert run_once(config).ber > run_once(replace(config, doppler_rate_hz_s=0.0)).ber
+    channels = [(0.0, 10.0), (2000.0, 10.0)]
+    grid = run_channel_grid(config, channels, [12.0])
+    for (cfo_hz, _), (result,) in zip(channels, grid, strict=True):
+        assert result == run_once(replace(config, cfo_hz=cfo_hz))
@@ -0,0 +1,125 @@
+"""Tests for time-correlated fading processes."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from scipy.special import j0
+
+from ntn_linksim.channel.fading import (
+    DOPPLER_SPECTRA,
+    FADING_METHODS,
+    doppler_spectrum_bins,
+    fading_process,
+    filtered_period,
+)
+from ntn_linksim.channel.tdl import TdlProfile, apply_tdl_grid, apply_tdl_time
+from ntn_linksim.sim import SimConfig, run_batch, run_once, run_snr_sweep
+from ntn_linksim.waveform.ofdm import add_cp
+
+
+def _autocorrelation(x: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    n = x.shape[-1]
+    return np.array(
+        [np.mean(x[..., lag:] * np.conj(x[..., : n - lag])).real for lag in lags]
+    )
+
+
+@pytest.mark.parametrize("method", FADING_METHODS)
+@pytest.mark.parametrize("spectrum", DOPPLER_SPECTRA)
+def test_process_statistics(method: str, spectrum: str) -> None:
+    fd, fs = 100.0, 10_000.0
+    rng = np.random.default_rng(0)
+    process = fading_process(method, fd, fs, rng, (200,), spectrum, 4000)
+    x = process.generate(4000)
+    assert x.shape == (200, 4000)
+    assert np.mean(np.abs(x) ** 2) == pytest.approx(1.0, abs=0.03)
+    lags = np.array([0, 5, 10, 20])
+    tau = lags / fs
+    if spectrum == "jakes":
+        expected = j0(2 * np.pi * fd * tau)
+    else:
+        expected = np.sinc(2 * fd * tau)
+    np.testing.assert_allclose(_autocorrelation(x, lags), expected, atol=0.05)
+
+    # Block by block continues the same process.
+    rng = np.random.default_rng(1)
+    whole = fading_process(method, fd, fs, rng, (3,), spectrum, 1000).generate(1000)
+    rng = np.random.default_rng(1)
+    process = fading_process(method, fd, fs, rng, (3,), spectrum, 1000)
+    blocks = [process.generate(n) for n in (1, 333, 0, 666)]
+    np.testing.assert_allclose(np.concatenate(blocks, axis=-1), whole, atol=1e-12)
+    assert process.position == 1000
+
+
+def test_generator_errors() -> None:
+    rng = np.random.default_rng(0)
+    with pytest.raises(ValueError, match="method"):
+        fading_process("ar1", 10.0, 1e3, rng)
+    with pytest.raises(ValueError, match="spectrum"):
+        fading_process("sos", 10.0, 1e3, rng, spectrum="gauss")
+    with pytest.raises(ValueError, match="half the sample rate"):
+        fading_process("sos", 600.0, 1e3, rng)
+    with pytest.raises(ValueError, match="length"):
+        doppler_spectrum_bins(10.0, 1e3, 0)
+    bins, power = doppler_spectrum_bins(10.0, 1e3, 1000, "flat")
+    np.testing.assert_array_equal(bins, np.arange(-10, 11))
+    assert np.sum(power) == pytest.approx(1.0)
+    assert power[0] == pytest.approx(power[1] / 2)
+    # Below half a bin the process would be constant over the period.
+    with pytest.raises(ValueError, match="half a DFT bin"):
+        fading_process("filtered", 1.0, 1e6, rng, (2,), length=100)
+    assert filtered_period(60.0, 192e3, 100) == 1 << 18
+    assert filtered_period(1e3, 2e3, 5000) == 8192
+
+
+@pytest.mark.parametrize("method", FADING_METHODS)
+def test_default_sizes_follow_jakes(method: str) -> None:
+    """At the default symbol rate both methods show the J0 autocorrelation."""
+    fd = 200.0
+    config = SimConfig(fading_doppler_hz=fd, fading_method=method)
+    process = config.fading_process(np.random.default_rng(6), (2000,))
+    x = process.generate(config.n_symbols)
+    lags = np.array([0, 50, 100, 150])
+    expected = j0(2 * np.pi * fd * lags / config.symbol_rate_hz())
+    np.testing.assert_allclose(_autocorrelation(x, lags), expected, atol=0.05)
+
+
+def test_sim_integration() -> None:
+    config = SimConfig(
+        snr_db=10.0, n_symbols=400, enable_rician=True, rician_k_db=0.0, seed=2
+    )
+    slow = replace(config, fading_doppler_hz=50.0)
+    for cfg in (slow, replace(slow, fading_method="filtered")):
+        result = run_once(cfg)
+        assert result == run_once(cfg)
+        assert run_snr_sweep(cfg, [0.0, cfg.snr_db])[1] == result
+    # Slow fading keeps errors in bursts instead of spreading them.
+    frames = run_batch(slow, 16)
+    iid = run_batch(config, 16)
+    assert frames.n_bits == iid.n_bits
+    assert np.std(frames.frame_errors) > 2 * np.std(iid.frame_errors)
+    # Any Doppler is accepted, including one well below the symbol rate.
+    tdl = SimConfig(
+        tdl_profile="NTN-TDL-A", fading_doppler_hz=5.0, fading_method="filtered"
+    )
+    assert run_batch(tdl, 2).n_bits == 2 * tdl.bits_per_frame()
+
+    # The grid and time-domain TDL paths fade with the same scatter.
+    profile = TdlProfile(
+        "integer", (0.0, 2.0, 5.0), (0.0, -3.0, -6.0), (True, False, False)
+    )
+    scatter = fading_process("sos", 30.0, 1e3, np.random.default_rng(3), (2,))
+    scatter = scatter.generate(6).T
+    grid = np.fft.fft(np.random.default_rng(4).standard_normal((6, 32)) + 0j)
+    tx = add_cp(np.fft.ifft(grid), 8)
+    faded = apply_tdl_grid(grid, profile, 1.0, 1.0, None, scatter=scatter)
+    timed = apply_tdl_time(tx, profile, 1.0, 1.0, None, scatter=scatter)
+    np.testing.assert_allclose(np.fft.fft(timed[..., 8:]), faded, atol=1e-12)
+
+    with pytest.raises(ValueError, match="fading_doppler_hz"):
+        replace(config, fading_doppler_hz=-1.0).validate()
+    with pytest.raises(ValueError, match="half the symbol rate"):
+        replace(config, fading_doppler_hz=1e6).validate()
+    with pytest.raises(ValueError, match="fading_method"):
+        replace(config, fading_method="ar1").validate()
@@ -0,0 +1,90 @@
+"""Tests for the pluggable FFT backends."""
+
+import json
+import tracemalloc
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim import fft_backend
+from ntn_linksim.fft_backend import NUMPY_FFT, get_fft_backend, scipy_available
+from ntn_linksim.sim import SimConfig, run_batch, run_once, save_run
+
+
+def _signal(shape: tuple[int, ...], dtype: np.dtype) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    return (rng.normal(size=shape) + 1j * rng.normal(size=shape)).astype(dtype)
+
+
+def test_numpy_backend_matches_np_fft() -> None:
+    x = _signal((7, 64), np.complex128)
+    assert np.array_equal(NUMPY_FFT.fft(x), np.fft.fft(x))
+    assert np.array_equal(NUMPY_FFT.ifft(x), np.fft.ifft(x))
+    out = x.copy()
+    assert NUMPY_FFT.fft(out, out=out) is out
+    assert np.array_equal(out, np.fft.fft(x))
+
+
+def test_single_precision_is_not_upcast() -> None:
+    x = _signal((2000, 64), np.complex64)
+    out = np.empty_like(x)
+    spectrum = NUMPY_FFT.fft(x, out=out)
+    assert spectrum.dtype == np.complex64
+    np.testing.assert_allclose(spectrum, np.fft.fft(x), rtol=0, atol=1e-4)
+    tracemalloc.start()
+    NUMPY_FFT.fft(x, out=out)
+    NUMPY_FFT.ifft(out, out=out)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < x.nbytes / 4
+    np.testing.assert_allclose(out, x, rtol=0, atol=1e-5)
+
+
+def test_backend_selection() -> None:
+    assert get_fft_backend("numpy", workers=4).describe() == {
+        "backend": "numpy",
+        "workers": 1,
+    }
+    expected = "scipy" if scipy_available() else "numpy"
+    assert get_fft_backend("auto").name == expected
+    with pytest.raises(ValueError):
+        get_fft_backend("fftw")
+    with pytest.raises(ValueError):
+        get_fft_backend("numpy", workers=0)
+    with pytest.raises(ValueError):
+        SimConfig(fft_backend="fftw").validate()
+
+
+def test_scipy_missing_is_reported(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(fft_backend, "_scipy_fft", lambda: None)
+    assert get_fft_backend("auto") is NUMPY_FFT
+    with pytest.raises(ImportError):
+        get_fft_backend("scipy")
+
+
+def test_run_artifact_records_backend(tmp_path) -> None:
+    config = SimConfig(n_symbols=20)
+    path = save_run(tmp_path, config, run_once(config))
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    assert payload["fft"] == {"backend": "numpy", "workers": 1}
+    assert payload["config"]["fft_backend"] == "numpy"
+
+
+def test_scipy_backend_matches_numpy() -> None:
+    pytest.importorskip("scipy")
+    backend = get_fft_backend("scipy", workers=2)
+    x = _signal((9, 128), np.complex128)
+    assert np.array_equal(backend.fft(x), np.fft.fft(x))
+    assert np.array_equal(backend.ifft(x), np.fft.ifft(x))
+    strided = _signal((9, 144), np.complex128)[:, 16:]
+    out = np.empty_like(strided)
+    assert backend.fft(strided, out=out) is out
+    assert np.array_equal(out, np.fft.fft(strided))
+
+    config = SimConfig(n_symbols=200, snr_db=6.0, delay_samples=3.3)
+    scipy_config = replace(config, fft_backend="scipy", fft_workers=2)
+    assert run_once(scipy_config).n_errors == run_once(config).n_errors
+    assert np.array_equal(
+        run_batch(scipy_config, 3).frame_errors, run_batch(config, 3).frame_errors
+    )
@@ -0,0 +1,113 @@
+"""Tests for the streaming polyphase fractional delay."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim.channel.delay import (
+    _FFT_DELAY_MAX_SAMPLES,
+    FractionalDelayLine,
+    apply_delay,
+    apply_delay_fir,
+)
+from ntn_linksim.sim import SimConfig, run_once
+
+
+def _tone(n: int, freq: float, delay: float | np.ndarray = 0.0) -> np.ndarray:
+    t = np.arange(n, dtype=np.float64) - delay
+    return np.exp(1j * 2.0 * np.pi * freq * t)
+
+
+def test_integer_delay_is_exact() -> None:
+    """Integer delays reduce to a pure shift."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=500) + 1j * rng.normal(size=500)
+    y = apply_delay_fir(x, 7.0)
+    np.testing.assert_array_equal(y[7:], x[:-7])
+    np.testing.assert_array_equal(y[:7], 0.0)
+
+
+@pytest.mark.parametrize("delay", [0.37, 2.5, 11.81])
+def test_fractional_delay_matches_ideal_tone(delay: float) -> None:
+    """In-band tones are delayed to interpolator accuracy."""
+    x = _tone(2000, 0.13)
+    y = apply_delay_fir(x, delay)
+    ideal = _tone(2000, 0.13, delay)
+    np.testing.assert_allclose(y[100:-100], ideal[100:-100], atol=1e-3)
+
+
+def test_fir_matches_fft_for_positive_band_signal() -> None:
+    """FIR and FFT delays agree away from the frame edges."""
+    rng = np.random.default_rng(3)
+    spectrum = np.zeros(4096, dtype=np.complex128)
+    spectrum[1:800] = rng.normal(size=799) + 1j * rng.normal(size=799)
+    x = np.fft.ifft(spectrum)
+    fir = apply_delay(x, 4.3, method="fir")
+    fft = apply_delay(x, 4.3, method="fft")
+    err = np.max(np.abs(fir - fft)[200:-200]) / np.max(np.abs(x))
+    assert err < 5e-3
+
+
+@pytest.mark.parametrize("delay", [0.3, 3.4, 10.75])
+def test_auto_paths_agree_across_threshold(delay: float) -> None:
+    """"auto" applies the same delay on either side of its FFT/FIR switch."""
+    rng = np.random.default_rng(4)
+    n = _FFT_DELAY_MAX_SAMPLES + 1024
+    spectrum = rng.normal(size=n) + 1j * rng.normal(size=n)
+    spectrum[np.abs(np.fft.fftfreq(n)) > 0.3] = 0.0  # both band edges
+    x = np.fft.ifft(spectrum)
+    short = apply_delay(x[:_FFT_DELAY_MAX_SAMPLES], delay)  # FFT path
+    long = apply_delay(x, delay)  # FIR path
+    np.testing.assert_allclose(short, apply_delay(x[: len(short)], delay, "fft"))
+    np.testing.assert_allclose(long, apply_delay(x, delay, "fir"))
+    inner = slice(200, _FFT_DELAY_MAX_SAMPLES - 200)
+    err = np.linalg.norm(short[inner] - long[inner]) / np.linalg.norm(long[inner])
+    assert err < 5e-3
+
+
+def test_block_streaming_equals_one_shot() -> None:
+    """Arbitrary block sizes reproduce the one-shot output exactly."""
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(2, 3001)) + 1j * rng.normal(size=(2, 3001))
+    line = FractionalDelayLine(max_delay=20.0)
+    parts = []
+    start = 0
+    for size in [1, 5, 700, 13, 1500, 782]:
+        parts.append(line.process(x[..., start : start + size], 9.62))
+        start += size
+    parts.append(line.flush(9.62))
+    streamed = np.concatenate(parts, axis=-1)
+    assert streamed.shape == x.shape
+    np.testing.assert_allclose(streamed, apply_delay_fir(x, 9.62), atol=1e-12)
+
+
+def test_time_varying_delay_tracks_ideal() -> None:
+    """A linearly drifting delay follows the ideal tone."""
+    n = 4000
+    delay = np.linspace(1.0, 6.0, n)
+    y = apply_delay(_tone(n, 0.05), delay)
+    ideal = _tone(n, 0.05, delay)
+    np.testing.assert_allclose(y[100:-100], ideal[100:-100], atol=1e-3)
+
+
+def test_invalid_inputs() -> None:
+    """Bad delays and methods are rejected."""
+    x = np.ones(64, dtype=np.complex128)
+    with pytest.raises(ValueError):
+        apply_delay(x, -1.0, method="fir")
+    with pytest.raises(ValueError):
+        apply_delay(x, 1.0, method="sinc")
+    with pytest.raises(ValueError):
+        apply_delay(x, np.ones(64), method="fft")
+    with pytest.raises(ValueError):
+        FractionalDelayLine(max_delay=2.0).process(x, 3.0)
+
+
+def test_run_once_with_fir_delay_compensates() -> None:
+    """Timing compensation still helps when the channel uses the FIR path."""
+    base = SimConfig(n_symbols=100, snr_db=20.0, delay_samples=8.0, delay_method="fir")
+    ber_no = run_once(base).ber
+    ber_yes = run_once(replace(base, enable_timing_comp=True)).ber
+    assert ber_yes < ber_no
+    assert ber_yes < 0.05
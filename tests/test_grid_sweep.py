@@ -0,0 +1,120 @@
+"""Tests for multi-dimensional grid sweeps and the vectorized grid engine."""
+
+import json
+from dataclasses import replace
+
+import numpy as np
+import pytest
+import yaml
+
+from ntn_linksim.experiments.runner import _plan, run_points
+from ntn_linksim.experiments.sweep import grid_sweep_configs, save_sweep_grid
+from ntn_linksim.scenarios import load_scenario, run_scenario
+from ntn_linksim.sim import SimConfig, run_channel_grid, run_once
+
+CONFIG = SimConfig(
+    n_symbols=30,
+    enable_cfo_comp=True,
+    delay_samples=2.5,
+    enable_timing_comp=True,
+    enable_rician=True,
+)
+
+
+@pytest.mark.parametrize("precision", ["double", "single"])
+def test_channel_grid_matches_run_once(precision: str) -> None:
+    config = replace(CONFIG, precision=precision)
+    channels = [(0.0, 10.0), (15e3, 10.0), (30e3, 0.0)]
+    snr_db = [0.0, 8.0, 16.0]
+    grid = run_channel_grid(config, channels, snr_db)
+    for (cfo_hz, k_db), results in zip(channels, grid, strict=True):
+        for snr, result in zip(snr_db, results, strict=True):
+            point = replace(config, snr_db=snr, cfo_hz=cfo_hz, rician_k_db=k_db)
+            assert result == run_once(point)
+
+
+def test_grid_configs_product_and_zip() -> None:
+    axes = {"snr_db": [0, 10], "cfo_hz": [0, 5e3, 10e3]}
+    product = grid_sweep_configs(CONFIG, axes)
+    assert [(c.snr_db, c.cfo_hz) for c in product] == [
+        (0.0, 0.0),
+        (0.0, 5e3),
+        (0.0, 10e3),
+        (10.0, 0.0),
+        (10.0, 5e3),
+        (10.0, 10e3),
+    ]
+    assert isinstance(product[0].snr_db, float)
+
+    zipped = grid_sweep_configs(CONFIG, {"snr_db": [0, 10], "seed": [1, 2]}, "zip")
+    assert [(c.snr_db, c.seed) for c in zipped] == [(0.0, 1), (10.0, 2)]
+
+    for axes, mode in [
+        ({"snr": [0]}, "product"),
+        ({"snr_db": []}, "product"),
+        ({}, "product"),
+        ({"snr_db": [0]}, "diagonal"),
+        ({"snr_db": [0, 1], "seed": [1]}, "zip"),
+    ]:
+        with pytest.raises(ValueError):
+            grid_sweep_configs(CONFIG, axes, mode)
+
+
+def test_runner_batches_channel_axes() -> None:
+    configs = grid_sweep_configs(
+        CONFIG,
+        {"snr_db": [0, 10], "cfo_hz": [0, 15e3], "rician_k_db": [0, 10]},
+    )
+    configs += grid_sweep_configs(CONFIG, {"snr_db": [0, 10], "seed": [2]})
+    tasks, where = _plan([(cfg, None) for cfg in configs], workers=1)
+    # One task per seed: the CFO, K and SNR axes are vectorized.
+    assert len(tasks) == 2
+    assert len(where) == len(configs)
+    assert run_points(configs) == [run_once(cfg) for cfg in configs]
+
+
+def test_save_grid_json_and_heatmap(tmp_path) -> None:
+    axes = {"snr_db": [0, 10, 20], "cfo_hz": [0, 15e3]}
+    ber = [0.3, 0.2, 0.1, 0.05, 0.0, 0.01]
+    json_path = save_sweep_grid(tmp_path, axes, ber)
+    payload = json.loads(json_path.read_text())
+    assert payload["shape"] == [3, 2]
+    assert payload["axes"][1] == {"name": "cfo_hz", "values": [0.0, 15e3]}
+    assert np.array(payload["ber"]).ravel().tolist() == ber
+    assert (tmp_path / "ber_grid.png").exists()
+
+    axes["rician_k_db"] = [0, 10]
+    save_sweep_grid(tmp_path / "3d", axes, ber * 2)
+    assert (tmp_path / "3d" / "ber_grid.png").exists()
+    zipped = save_sweep_grid(
+        tmp_path / "zip", {"snr_db": [0, 10], "seed": [1, 2]}, [0.1, 0.01], "zip"
+    )
+    assert json.loads(zipped.read_text())["shape"] == [2]
+
+
+def test_grid_scenario(tmp_path) -> None:
+    path = tmp_path / "grid.yaml"
+    data = {
+        "name": "Grid mini",
+        "config": {"seed": 1, "n_symbols": 30, "enable_cfo_comp": True},
+        "sweep": {
+            "type": "grid",
+            "axes": {"snr_db": [0, 10, 20], "cfo_hz": [0, 30e3]},
+        },
+    }
+    path.write_text(yaml.dump(data, sort_keys=False))
+    run_scenario(load_scenario(path), tmp_path / "out", plots="none")
+    payload = json.loads((tmp_path / "out" / "sweep_grid.json").read_text())
+    expected = [
+        run_once(cfg).ber
+        for cfg in grid_sweep_configs(
+            SimConfig(seed=1, n_symbols=30, enable_cfo_comp=True),
+            data["sweep"]["axes"],
+        )
+    ]
+    assert np.array(payload["ber"]).ravel().tolist() == expected
+
+    data["sweep"]["mode"] = "diagonal"
+    path.write_text(yaml.dump(data, sort_keys=False))
+    with pytest.raises(ValueError):
+        load_scenario(path)
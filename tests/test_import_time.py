@@ -0,0 +1,67 @@
+"""Startup-cost regression tests for the CLI's hot commands."""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules the hot paths must not load: plotting, YAML and the process pool
+# are only needed by plotting, scenario and parallel commands.
+_HEAVY = ("matplotlib", "yaml", "scipy", "multiprocessing", "concurrent.futures")
+
+# Generous wall budget for ntn_linksim's own imports (everything but NumPy);
+# importing pyplot alone costs more than this.
+_OWN_IMPORT_BUDGET_US = 250_000
+
+
+def _importtime(args: list[str], cwd: Path) -> dict[str, int]:
+    """Run Python with ``-X importtime``; map module -> cumulative microseconds."""
+    env = dict(os.environ, PYTHONPATH=str(ROOT), NTNLS_CACHE_DIR=str(cwd / "cache"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        cwd=cwd,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def _heavy(modules: dict[str, int]) -> list[str]:
+    return [m for m in modules if m.split(".")[0] in _HEAVY or m in _HEAVY]
+
+
+def test_cli_import_is_lightweight(tmp_path: Path) -> None:
+    modules = _importtime(["-c", "import ntn_linksim.cli"], tmp_path)
+    assert _heavy(modules) == []
+    own = modules["ntn_linksim.cli"] - modules.get("numpy", 0)
+    assert own < _OWN_IMPORT_BUDGET_US
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        ["simulate", "--snr-db", "10", "--n-symbols", "20"],
+        ["simulate", "--snr-db", "0", "10", "--n-symbols", "20", "--no-plot"],
+        ["cfo-sweep", "--cfo-hz", "0", "1000", "--no-plot", "--no-comp"],
+        ["delay-sweep", "--delay-samples", "0", "4", "--no-plot", "--no-cache"],
+    ],
+)
+def test_hot_commands_skip_heavy_imports(tmp_path: Path, command: list[str]) -> None:
+    args = ["-m", "ntn_linksim.cli", *command, "--out", str(tmp_path / "out")]
+    modules = _importtime(args, tmp_path)
+    assert _heavy(modules) == []
+    assert list((tmp_path / "out").glob("*.json"))
+    assert not list((tmp_path / "out").glob("*.png"))
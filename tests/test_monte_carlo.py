@@ -0,0 +1,98 @@
+"""Tests for sequential Monte Carlo with early stopping."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ntn_linksim.experiments.sweep import sweep_ber
+from ntn_linksim.scenarios import load_scenario, scenario_to_stop
+from ntn_linksim.sim import (
+    SimConfig,
+    StopCriteria,
+    ber_confidence_interval,
+    run_monte_carlo,
+)
+
+BITS_PER_FRAME = 20 * 52 * 2
+
+
+def test_stops_at_target_errors() -> None:
+    """Low-SNR point stops soon after reaching the error target."""
+    cfg = SimConfig(seed=1, snr_db=0.0, n_symbols=20)
+    stop = StopCriteria(target_errors=100, frames_per_batch=1)
+    result = run_monte_carlo(cfg, stop)
+    assert result.n_errors >= 100
+    # One 2080-bit frame at 0 dB already has hundreds of errors
+    assert result.n_frames == 1
+    assert result.n_bits == BITS_PER_FRAME
+
+
+def test_max_bits_caps_error_free_point() -> None:
+    """High-SNR point runs to the bit cap and reports a nonzero upper bound."""
+    cfg = SimConfig(seed=1, snr_db=30.0, n_symbols=20)
+    stop = StopCriteria(target_errors=100, max_bits=10 * BITS_PER_FRAME)
+    result = run_monte_carlo(cfg, stop)
+    assert result.n_errors == 0
+    assert result.ber == 0.0
+    assert result.n_bits == 10 * BITS_PER_FRAME
+    assert result.n_frames == 10
+    assert result.ci_low == 0.0
+    assert 0.0 < result.ci_high < 1e-3
+
+
+def test_relative_ci_width_stop() -> None:
+    """Relative CI width criterion stops once the interval is tight enough."""
+    cfg = SimConfig(seed=2, snr_db=6.0, n_symbols=20)
+    stop = StopCriteria(target_errors=None, rel_ci_width=0.2, frames_per_batch=2)
+    result = run_monte_carlo(cfg, stop)
+    assert (result.ci_high - result.ci_low) / result.ber <= 0.2
+    assert result.n_bits < stop.max_bits
+
+
+def test_monte_carlo_deterministic() -> None:
+    """Same config and stop criteria give identical results."""
+    cfg = SimConfig(seed=4, snr_db=8.0, n_symbols=20, enable_rician=True)
+    stop = StopCriteria(target_errors=50, frames_per_batch=3)
+    assert run_monte_carlo(cfg, stop) == run_monte_carlo(cfg, stop)
+
+
+def test_confidence_interval_contains_estimate() -> None:
+    """Wilson interval brackets the point estimate."""
+    low, high = ber_confidence_interval(37, 10_000)
+    assert low < 37 / 10_000 < high
+    low0, high0 = ber_confidence_interval(0, 10_000)
+    assert low0 == 0.0 and high0 > 0.0
+
+
+def test_invalid_stop_criteria_raises() -> None:
+    """Nonsensical stopping rules are rejected."""
+    with pytest.raises(ValueError, match="max_bits"):
+        run_monte_carlo(SimConfig(), StopCriteria(max_bits=0))
+
+
+def test_sweep_with_stop_criteria() -> None:
+    """sweep_ber accepts stopping rules and keeps the BER trend."""
+    cfg = SimConfig(seed=1, n_symbols=20)
+    stop = StopCriteria(target_errors=50, max_bits=20 * BITS_PER_FRAME)
+    ber_list = sweep_ber(cfg, [0.0, 6.0], stop=stop)
+    assert ber_list[1] < ber_list[0]
+
+
+def test_scenario_monte_carlo_section() -> None:
+    """Optional monte_carlo section builds StopCriteria."""
+    data = {
+        "name": "MC",
+        "config": {"seed": 1},
+        "monte_carlo": {"target_errors": 200, "max_bits": 1_000_000},
+        "sweep": {"type": "snr", "snr_db": [0, 5]},
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "mc.yaml"
+        with path.open("w", encoding="utf-8") as f:
+            yaml.dump(data, f)
+        scenario = load_scenario(path)
+    stop = scenario_to_stop(scenario)
+    assert stop == StopCriteria(target_errors=200, max_bits=1_000_000)
+    assert scenario_to_stop({"sweep": {"type": "snr"}}) is None
@@ -0,0 +1,82 @@
+"""Tests for the LEO pass geometry engine and the pass sweep."""
+
+import json
+
+import numpy as np
+import pytest
+import yaml
+
+from ntn_linksim.experiments.sweep import pass_sweep_configs
+from ntn_linksim.orbit import SPEED_OF_LIGHT_M_S, CircularPass
+from ntn_linksim.scenarios import load_scenario, run_scenario, scenario_to_config
+from ntn_linksim.sim import SimConfig, run_once
+
+
+def test_overhead_pass_geometry() -> None:
+    orbit = CircularPass(altitude_km=600.0, max_elevation_deg=90.0)
+    # A 600 km pass above 10 deg lasts roughly eight and a half minutes.
+    assert 480.0 < orbit.duration_s < 540.0
+    table = orbit.table(step_s=1.0)
+    assert table.time_s[-1] == pytest.approx(orbit.duration_s)
+    np.testing.assert_allclose(table.elevation_deg[[0, -1]], 10.0, atol=1e-6)
+    mid = orbit.geometry([orbit.duration_s / 2])
+    assert mid.elevation_deg[0] == pytest.approx(90.0)
+    assert mid.delay_s[0] == pytest.approx(600e3 / SPEED_OF_LIGHT_M_S)
+    assert mid.doppler_hz[0] == pytest.approx(0.0, abs=1e-6)
+    assert mid.snr_db[0] == pytest.approx(orbit.zenith_snr_db)
+    # The Doppler S-curve is odd about the closest approach.
+    times = np.array([0.0, 60.0, 200.0])
+    mirrored = orbit.geometry(orbit.duration_s - times)
+    np.testing.assert_allclose(
+        orbit.geometry(times).doppler_hz, -mirrored.doppler_hz, rtol=0, atol=1e-6
+    )
+    assert 40e3 < table.doppler_hz[0] < 50e3
+    numeric_rate = np.gradient(table.doppler_hz, table.time_s)
+    np.testing.assert_allclose(
+        table.doppler_rate_hz_s[1:-1], numeric_rate[1:-1], rtol=0, atol=1.0
+    )
+    assert np.all(table.rician_k_db[1:-1] > table.rician_k_db[0])
+
+
+def test_table_interpolation_and_validation() -> None:
+    orbit = CircularPass(max_elevation_deg=40.0)
+    table = orbit.table(step_s=0.5)
+    assert table.elevation_deg.max() == pytest.approx(40.0, abs=1e-3)
+    coarse = orbit.table(step_s=5.0)
+    times = np.array([12.3, 101.7, 250.0])
+    interp = coarse.at(times)
+    exact = orbit.geometry(times)
+    np.testing.assert_allclose(interp.doppler_hz, exact.doppler_hz, rtol=0, atol=5.0)
+    np.testing.assert_allclose(interp.snr_db, exact.snr_db, rtol=0, atol=0.01)
+    with pytest.raises(ValueError):
+        CircularPass(min_elevation_deg=50.0, max_elevation_deg=40.0).table()
+    with pytest.raises(ValueError):
+        orbit.table(step_s=0.0)
+
+
+def test_pass_scenario(tmp_path) -> None:
+    data = {
+        "name": "Pass mini",
+        "config": {"seed": 3, "n_symbols": 20, "enable_cfo_comp": True},
+        "sweep": {
+            "type": "pass",
+            "step_s": 120,
+            "orbit": {"max_elevation_deg": 70, "k_db_table": [[0, 5], [90, 15]]},
+        },
+    }
+    path = tmp_path / "pass.yaml"
+    path.write_text(yaml.dump(data, sort_keys=False))
+    scenario = load_scenario(path)
+    run_scenario(scenario, tmp_path / "out", plots="none")
+    payload = json.loads((tmp_path / "out" / "sweep_pass.json").read_text())
+
+    orbit = CircularPass(max_elevation_deg=70.0, k_db_table=((0.0, 5.0), (90.0, 15.0)))
+    table = orbit.table(step_s=120.0)
+    configs = pass_sweep_configs(scenario_to_config(scenario), table)
+    assert payload["time_s"] == table.time_s.tolist()
+    assert payload["orbit"]["max_elevation_deg"] == 70
+    assert payload["ber"] == [run_once(cfg).ber for cfg in configs]
+    assert configs[0].cfo_hz == table.doppler_hz[0]
+    assert configs[0].doppler_rate_hz_s == table.doppler_rate_hz_s[0]
+    assert all(cfg.enable_rician and cfg.delay_samples == 0.0 for cfg in configs)
+    assert SimConfig() == scenario_to_config({"config": {}})
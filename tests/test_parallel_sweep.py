@@ -0,0 +1,41 @@
+"""Tests for process-pool execution of sweep points."""
+
+from ntn_linksim.experiments.runner import run_points
+from ntn_linksim.experiments.sweep import sweep_ber, sweep_ber_vs_cfo
+from ntn_linksim.sim import SimConfig, StopCriteria, run_once
+
+
+def test_workers_bit_identical_to_serial() -> None:
+    """CFO sweep results are identical for 1 and 3 workers, in sweep order."""
+    config = SimConfig(seed=7, snr_db=20.0, n_symbols=50)
+    cfo_hz_list = [40000.0, 0.0, 20000.0, 10000.0, 30000.0]
+    serial = sweep_ber_vs_cfo(config, cfo_hz_list, enable_comp=True)
+    parallel = sweep_ber_vs_cfo(config, cfo_hz_list, enable_comp=True, workers=3)
+    assert parallel == serial
+
+
+def test_snr_group_split_across_workers() -> None:
+    """An SNR sweep split into chunks matches the single-pass result."""
+    config = SimConfig(seed=1, n_symbols=50, enable_rician=True)
+    snr_db_list = [0.0, 3.0, 6.0, 9.0, 12.0]
+    assert sweep_ber(config, snr_db_list, workers=2) == sweep_ber(
+        config, snr_db_list
+    )
+
+
+def test_run_points_mixed_configs_order() -> None:
+    """Mixed configs come back in input order and match run_once."""
+    configs = [
+        SimConfig(seed=1, snr_db=6.0, n_symbols=20),
+        SimConfig(seed=2, snr_db=0.0, n_symbols=20, enable_rician=True),
+        SimConfig(seed=1, snr_db=0.0, n_symbols=20),
+    ]
+    results = run_points(configs, workers=2)
+    assert [r.ber for r in results] == [run_once(c).ber for c in configs]
+
+
+def test_monte_carlo_points_in_pool() -> None:
+    """Monte Carlo points give identical results with a worker pool."""
+    configs = [SimConfig(seed=3, snr_db=s, n_symbols=20) for s in (2.0, 4.0)]
+    stop = StopCriteria(target_errors=50, max_bits=100_000)
+    assert run_points(configs, stop, workers=2) == run_points(configs, stop)
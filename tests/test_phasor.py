@@ -0,0 +1,67 @@
+"""Tests for the CFO phasor engine."""
+
+import numpy as np
+import pytest
+
+from ntn_linksim.channel.cfo import apply_cfo
+from ntn_linksim.phasor import phasor, rotate
+from ntn_linksim.rx.cfo import compensate_cfo
+
+FS_HZ = 15.36e6
+
+
+def _direct(n: int, cfo_hz: float) -> np.ndarray:
+    k = np.arange(n, dtype=np.float64)
+    return np.exp(1j * 2.0 * np.pi * cfo_hz * k / FS_HZ)
+
+
+def test_cached_table_matches_direct_exp() -> None:
+    """Cached phase table equals the direct exponential and is reused."""
+    table = phasor(1000, FS_HZ, 2400.0)
+    np.testing.assert_array_equal(table, _direct(1000, 2400.0))
+    assert phasor(1000, FS_HZ, 2400.0) is table
+    assert not table.flags.writeable
+
+
+def test_recurrence_matches_direct_exp_on_long_vector() -> None:
+    """Block phase recurrence stays within rounding of the direct phasor."""
+    n = (1 << 18) + 12345
+    x = np.ones(n, dtype=np.complex128)
+    y = rotate(x, FS_HZ, 37000.0)
+    np.testing.assert_allclose(y, _direct(n, 37000.0), rtol=0, atol=1e-9)
+
+
+def test_in_place_rotation() -> None:
+    """Passing out=x rotates in place without a new array."""
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(512) + 1j * rng.standard_normal(512)
+    expected = x * _direct(512, -5000.0)
+    y = apply_cfo(x, fs_hz=FS_HZ, cfo_hz=-5000.0, out=x)
+    assert y is x
+    np.testing.assert_array_equal(x, expected)
+
+
+def test_net_rotation_single_pass() -> None:
+    """Channel CFO minus estimate in one pass equals rotate-then-derotate."""
+    rng = np.random.default_rng(1)
+    x = rng.standard_normal((3, 4096)) + 1j * rng.standard_normal((3, 4096))
+    cfo_hz, cfo_hat = 24000.0, np.array([23900.0, 24000.0, 24150.0])
+    two_pass = compensate_cfo(apply_cfo(x, FS_HZ, cfo_hz), FS_HZ, cfo_hat)
+    one_pass = rotate(x, FS_HZ, cfo_hz - cfo_hat)
+    np.testing.assert_allclose(one_pass, two_pass, rtol=0, atol=1e-9)
+
+
+def test_per_row_offsets_on_recurrence_path() -> None:
+    """Per-row offsets are honoured on long vectors."""
+    n = (1 << 18) + 1
+    x = np.ones((2, n), dtype=np.complex128)
+    y = rotate(x, FS_HZ, np.array([1000.0, -3000.0]))
+    np.testing.assert_allclose(y[0], _direct(n, 1000.0), atol=1e-9)
+    np.testing.assert_allclose(y[1], _direct(n, -3000.0), atol=1e-9)
+
+
+def test_out_dtype_mismatch_raises() -> None:
+    """A destination with the wrong dtype is rejected."""
+    x = np.ones(16, dtype=np.complex128)
+    with pytest.raises(ValueError, match="out"):
+        rotate(x, FS_HZ, 100.0, out=np.empty(16, dtype=np.complex64))
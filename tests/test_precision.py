@@ -0,0 +1,90 @@
+"""Tests for the single/double precision policy."""
+
+import math
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim.channel.awgn import add_awgn, add_awgn_snr_axis
+from ntn_linksim.channel.cfo import apply_cfo
+from ntn_linksim.channel.delay import apply_delay
+from ntn_linksim.channel.rician import apply_rician_fading
+from ntn_linksim.rx.cfo import compensate_cfo
+from ntn_linksim.rx.timing import compensate_integer_delay
+from ntn_linksim.sim import SimConfig, _transmit, run_once
+from ntn_linksim.stream import run_stream
+from ntn_linksim.waveform.modulation import qpsk_mod
+from ntn_linksim.waveform.ofdm import (
+    OfdmParams,
+    add_cp,
+    fft_symbols,
+    ifft_symbols,
+    serialize_symbols,
+    tx_grid,
+)
+
+PARAMS = OfdmParams(n_fft=64, n_used=52, cp_len=16, n_symbols=10)
+
+
+def test_every_stage_keeps_complex64() -> None:
+    """A complex64 signal is never upcast along the chain."""
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, size=PARAMS.n_symbols * PARAMS.n_used * 2)
+    symbols = qpsk_mod(bits, dtype=np.complex64).reshape(10, 52)
+    assert symbols.dtype == np.complex64
+    grid = tx_grid(symbols, PARAMS)
+    time_symbols = ifft_symbols(grid)
+    with_cp = apply_rician_fading(add_cp(time_symbols, 16), 5.0, rng)
+    samples = serialize_symbols(with_cp)
+    stages = [grid, time_symbols, with_cp, samples]
+    stages.append(apply_cfo(samples, 15.36e6, 1200.0, start=80))
+    stages.append(apply_delay(samples, 3.4, method="fft"))
+    stages.append(apply_delay(samples, 3.4, method="fir"))
+    stages.append(add_awgn(samples, 5.0, rng))
+    stages.append(add_awgn_snr_axis(samples, [0.0, 5.0], rng))
+    stages.append(compensate_integer_delay(samples, 3))
+    stages.append(compensate_cfo(samples, 15.36e6, 1200.0))
+    stages.append(fft_symbols(time_symbols))
+    for stage in stages:
+        assert stage.dtype == np.complex64
+
+
+def test_transmit_dtype_follows_config() -> None:
+    config = SimConfig(n_symbols=10, cfo_hz=500.0, delay_samples=2.5)
+    for precision, dtype in (("double", np.complex128), ("single", np.complex64)):
+        _, tx = _transmit(
+            replace(config, precision=precision),
+            config.ofdm_params(),
+            np.random.default_rng(1),
+        )
+        assert tx.dtype == dtype
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"snr_db": 2.0},
+        {"snr_db": 6.0},
+        {"snr_db": 8.0, "enable_rician": True, "rician_k_db": 3.0},
+        {"snr_db": 6.0, "delay_samples": 6.0, "enable_timing_comp": True},
+    ],
+)
+def test_single_precision_ber_within_tolerance(overrides: dict) -> None:
+    """Single- and double-precision BER agree within statistical error."""
+    config = SimConfig(n_symbols=1000, **overrides)
+    double = run_once(config)
+    single = run_once(replace(config, precision="single"))
+    p = double.ber
+    sigma = math.sqrt(2.0 * p * (1.0 - p) / double.n_bits)
+    assert abs(single.ber - p) <= 5.0 * sigma + 1e-4
+
+
+def test_stream_single_precision_matches_run_once() -> None:
+    config = SimConfig(n_symbols=300, snr_db=6.0, precision="single")
+    assert run_stream(config, block_symbols=16).n_errors == run_once(config).n_errors
+
+
+def test_invalid_precision() -> None:
+    with pytest.raises(ValueError):
+        SimConfig(precision="half").validate()
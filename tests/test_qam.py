@@ -0,0 +1,136 @@
+"""Tests for Gray-mapped QAM modulation and LLR demapping."""
+
+import itertools
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim.sim import SimConfig, run_batch, run_once
+from ntn_linksim.waveform.modulation import (
+    MODULATIONS,
+    qam_demod_hard,
+    qam_llr,
+    qam_mod,
+    qpsk_mod,
+)
+
+
+def _brute_force_llr(
+    y: np.ndarray, noise_var: np.ndarray, modulation: str
+) -> tuple[np.ndarray, np.ndarray]:
+    """Exact and max-log LLRs by enumerating every constellation point."""
+    m = MODULATIONS[modulation]
+    labels = np.array(list(itertools.product((0, 1), repeat=m)), dtype=np.int8)
+    points = qam_mod(labels.reshape(-1), modulation)
+    metric = -(np.abs(y[:, np.newaxis] - points) ** 2) / noise_var[:, np.newaxis]
+    exact = np.empty((y.size, m))
+    maxlog = np.empty((y.size, m))
+    for j in range(m):
+        zero = labels[:, j] == 0
+        exact[:, j] = np.logaddexp.reduce(metric[:, zero], axis=1) - (
+            np.logaddexp.reduce(metric[:, ~zero], axis=1)
+        )
+        maxlog[:, j] = metric[:, zero].max(axis=1) - metric[:, ~zero].max(axis=1)
+    return exact.reshape(-1), maxlog.reshape(-1)
+
+
+@pytest.mark.parametrize("modulation", list(MODULATIONS))
+def test_mapping(modulation: str) -> None:
+    m = MODULATIONS[modulation]
+    rng = np.random.default_rng(0)
+    bits = rng.integers(0, 2, size=(2, 3, m * 500), dtype=np.int8)
+    symbols = qam_mod(bits, modulation)
+    assert symbols.shape == (2, 3, 500)
+    np.testing.assert_array_equal(qam_demod_hard(symbols, modulation), bits)
+
+    labels = np.array(list(itertools.product((0, 1), repeat=m)), dtype=np.int8)
+    points = qam_mod(labels.reshape(-1), modulation)
+    assert np.mean(np.abs(points) ** 2) == pytest.approx(1.0)
+    # Gray: nearest neighbours differ in exactly one bit.
+    dist = np.abs(points[:, np.newaxis] - points)
+    np.fill_diagonal(dist, np.inf)
+    for i, row in enumerate(dist):
+        neighbours = np.isclose(row, row.min())
+        assert np.all(np.sum(labels[neighbours] != labels[i], axis=1) == 1)
+
+    out = np.empty((2, 3, 500), dtype=np.complex64)
+    assert qam_mod(bits, modulation, np.complex64, out=out) is out
+    np.testing.assert_allclose(out, symbols, rtol=1e-6)
+
+
+def test_mapping_reference() -> None:
+    bits = np.array([0, 1, 1, 0, 1, 1, 0, 1], dtype=np.int8)
+    np.testing.assert_array_equal(qam_mod(bits, "qpsk"), qpsk_mod(bits))
+    # TS 38.211 5.1.4: (1-2b0)(2-(1-2b2)) + j(1-2b1)(2-(1-2b3)), over sqrt(10).
+    expected = np.array([3 - 1j, -1 - 3j]) / np.sqrt(10)
+    np.testing.assert_allclose(qam_mod(bits, "16qam"), expected)
+    with pytest.raises(ValueError, match="multiple of 6"):
+        qam_mod(bits, "64qam")
+    with pytest.raises(ValueError, match="modulation"):
+        qam_mod(bits, "8psk")
+
+
+@pytest.mark.parametrize("modulation", list(MODULATIONS))
+def test_llr_matches_brute_force(modulation: str) -> None:
+    rng = np.random.default_rng(1)
+    m = MODULATIONS[modulation]
+    n = 300
+    symbols = qam_mod(rng.integers(0, 2, size=m * n, dtype=np.int8), modulation)
+    noise_var = rng.uniform(0.005, 0.5, size=n)
+    noise = rng.standard_normal(n) + 1j * rng.standard_normal(n)
+    y = symbols + 2 * np.sqrt(noise_var / 2) * noise
+    exact, maxlog = _brute_force_llr(y, noise_var, modulation)
+    np.testing.assert_allclose(qam_llr(y, noise_var, modulation), maxlog, atol=1e-9)
+    np.testing.assert_allclose(
+        qam_llr(y, noise_var, modulation, method="exact"), exact, atol=1e-9
+    )
+
+    # Batched, single precision, scalar noise variance and out=.
+    batch = y.reshape(3, 100).astype(np.complex64)
+    out = np.empty((3, 100 * m), dtype=np.float32)
+    result = qam_llr(batch, 0.1, modulation, out=out)
+    assert result is out
+    _, maxlog = _brute_force_llr(y, np.full(n, 0.1), modulation)
+    np.testing.assert_allclose(out.reshape(-1), maxlog, rtol=1e-4, atol=1e-3)
+    # Hard decisions are the LLR signs.
+    np.testing.assert_array_equal(
+        qam_demod_hard(y, modulation), (qam_llr(y, 0.1, modulation) < 0)
+    )
+
+
+def test_llr_errors_and_high_snr() -> None:
+    symbols = qam_mod(np.zeros(8, dtype=np.int8), "256qam")
+    llr = qam_llr(symbols, 1e-9, "256qam", method="exact")
+    assert np.all(np.isfinite(llr)) and np.all(llr > 0)
+    np.testing.assert_allclose(llr, qam_llr(symbols, 1e-9, "256qam"))
+    # At high SNR only the adjacent levels are summed, still to full accuracy.
+    rng = np.random.default_rng(5)
+    y = qam_mod(rng.integers(0, 2, 8 * 500, dtype=np.int8), "256qam")
+    y = y + 0.02 * (rng.standard_normal(500) + 1j * rng.standard_normal(500))
+    exact, _ = _brute_force_llr(y, np.full(500, 2e-3), "256qam")
+    np.testing.assert_allclose(
+        qam_llr(y, 2e-3, "256qam", method="exact"), exact, atol=1e-9
+    )
+    np.testing.assert_array_equal(
+        qam_llr(y, 0.1, "qpsk", method="exact"), qam_llr(y, 0.1, "qpsk")
+    )
+    with pytest.raises(ValueError, match="noise_var"):
+        qam_llr(symbols, 0.0, "256qam")
+    with pytest.raises(ValueError, match="method"):
+        qam_llr(symbols, 1.0, "256qam", method="approx")
+
+
+def test_sim_integration() -> None:
+    config = SimConfig(snr_db=14.0, n_symbols=100, seed=4)
+    bers = []
+    for modulation, m in MODULATIONS.items():
+        cfg = replace(config, modulation=modulation)
+        result = run_once(cfg)
+        assert result.n_bits == cfg.bits_per_frame() == 100 * 52 * m
+        assert run_batch(cfg, 2).frame_bits.tolist() == [result.n_bits] * 2
+        bers.append(result.ber)
+    # Denser constellations need more SNR.
+    assert bers == sorted(bers) and bers[0] < bers[-1]
+    with pytest.raises(ValueError, match="modulation"):
+        replace(config, modulation="1024qam").validate()
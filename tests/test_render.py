@@ -0,0 +1,68 @@
+"""Tests for the deferred JSON -> PNG render stage."""
+
+from pathlib import Path
+
+import pytest
+import yaml
+
+from ntn_linksim.experiments.render import find_artifacts, render_all, render_file
+from ntn_linksim.experiments.sweep import save_sweep, save_sweep_cfo
+from ntn_linksim.scenarios import reproduce_all
+
+_PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
+
+
+def _is_png(path: Path) -> bool:
+    return path.read_bytes()[: len(_PNG_MAGIC)] == _PNG_MAGIC
+
+
+def test_render_file_writes_png_next_to_json(tmp_path: Path) -> None:
+    json_path = save_sweep(tmp_path, [0.0, 5.0], [0.1, 0.01], plot=False)
+    assert not list(tmp_path.glob("*.png"))
+    png_path = render_file(json_path)
+    assert png_path == tmp_path / "ber_vs_snr.png"
+    assert _is_png(png_path)
+
+
+def test_render_rejects_unknown_artifacts(tmp_path: Path) -> None:
+    other = tmp_path / "run.json"
+    other.write_text("{}", encoding="utf-8")
+    with pytest.raises(ValueError):
+        render_file(other)
+    with pytest.raises(ValueError):
+        render_all([], workers=0)
+
+
+def test_render_all_keeps_input_order(tmp_path: Path) -> None:
+    snr = save_sweep(tmp_path / "b", [0.0, 5.0], [0.1, 0.01], plot=False)
+    cfo = save_sweep_cfo(
+        tmp_path / "a", [0.0, 1000.0], [0.0, 0.2], [0.0, 0.0], plot=False
+    )
+    assert find_artifacts(tmp_path) == [cfo, snr]
+    pngs = render_all([snr, cfo], workers=2)
+    assert pngs == [snr.with_name("ber_vs_snr.png"), cfo.with_name("ber_vs_cfo.png")]
+    assert all(_is_png(p) for p in pngs)
+
+
+def test_deferred_reproduce_renders_every_plot(tmp_path: Path) -> None:
+    scenario_dir = tmp_path / "scenarios"
+    scenario_dir.mkdir()
+    for stem, sweep in (
+        ("awgn", {"type": "snr", "snr_db": [0, 10]}),
+        ("rician", {"type": "rician_k", "k_db": [0, 10]}),
+    ):
+        scenario = {"config": {"seed": 1, "n_symbols": 20}, "sweep": sweep}
+        (scenario_dir / f"{stem}.yaml").write_text(
+            yaml.dump(scenario), encoding="utf-8"
+        )
+
+    reproduce_all(scenario_dir, tmp_path / "none", plots="none")
+    assert not list((tmp_path / "none").rglob("*.png"))
+
+    reproduce_all(scenario_dir, tmp_path / "out", plots="deferred")
+    assert sorted(p.relative_to(tmp_path / "out") for p in tmp_path.rglob("*.png")) == [
+        Path("awgn/ber_vs_snr.png"),
+        Path("rician/ber_vs_rician_k.png"),
+    ]
+    with pytest.raises(ValueError):
+        reproduce_all(scenario_dir, tmp_path / "out", plots="later")
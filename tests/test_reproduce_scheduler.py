@@ -0,0 +1,77 @@
+"""Tests for the global reproduce scheduler (dedup + shared pool)."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import yaml
+
+from ntn_linksim.scenarios import (
+    load_scenario,
+    reproduce_all,
+    run_scenario,
+    scenario_curves,
+)
+
+_SCENARIOS = {
+    "awgn": {
+        "name": "AWGN",
+        "config": {"seed": 1, "n_symbols": 30},
+        "sweep": {"type": "snr", "snr_db": [0, 10, 20]},
+    },
+    "cfo": {
+        "name": "CFO",
+        "config": {"seed": 1, "n_symbols": 30, "snr_db": 20.0},
+        "sweep": {"type": "cfo", "cfo_hz": [0, 30000], "enable_comp": True},
+    },
+    "delay": {
+        "name": "Delay",
+        "config": {"seed": 1, "n_symbols": 30, "snr_db": 20.0},
+        "sweep": {"type": "delay", "delay_samples": [0, 8]},
+    },
+}
+
+
+def _write_scenarios(root: Path) -> Path:
+    scenario_dir = root / "scenarios"
+    scenario_dir.mkdir()
+    for stem, data in _SCENARIOS.items():
+        with (scenario_dir / f"{stem}.yaml").open("w", encoding="utf-8") as f:
+            yaml.dump(data, f)
+    return scenario_dir
+
+
+def test_scenario_curves_expansion() -> None:
+    """CFO scenario with compensation expands into two curves."""
+    with tempfile.TemporaryDirectory() as tmp:
+        scenario_dir = _write_scenarios(Path(tmp))
+        curves = scenario_curves(load_scenario(scenario_dir / "cfo.yaml"))
+    assert set(curves) == {"no_comp", "with_comp"}
+    assert [c.cfo_hz for c in curves["with_comp"]] == [0.0, 30000.0]
+    assert all(c.enable_cfo_comp for c in curves["with_comp"])
+
+
+def test_reproduce_deduplicates_points() -> None:
+    """Points shared across scenarios are evaluated once."""
+    with tempfile.TemporaryDirectory() as tmp:
+        scenario_dir = _write_scenarios(Path(tmp))
+        n_unique = reproduce_all(scenario_dir, Path(tmp) / "out")
+    # 3 SNR + 4 CFO + 2 delay points; the AWGN 20 dB point, the CFO=0
+    # no-comp point and the delay=0 point are the same config.
+    assert n_unique == 9 - 2
+
+
+def test_reproduce_matches_individual_runs() -> None:
+    """Shared-pool artifacts equal running each scenario on its own."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        scenario_dir = _write_scenarios(root)
+        reproduce_all(scenario_dir, root / "global", workers=2)
+        for stem in _SCENARIOS:
+            scenario = load_scenario(scenario_dir / f"{stem}.yaml")
+            run_scenario(scenario, root / "single" / stem)
+        for json_path in (root / "single").rglob("*.json"):
+            rel = json_path.relative_to(root / "single")
+            single = json.loads(json_path.read_text(encoding="utf-8"))
+            shared = json.loads((root / "global" / rel).read_text(encoding="utf-8"))
+            assert shared == single
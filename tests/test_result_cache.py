@@ -0,0 +1,87 @@
+"""Tests for the content-addressed result cache."""
+
+import os
+from dataclasses import replace
+
+import pytest
+
+from ntn_linksim.experiments import cache as cache_module
+from ntn_linksim.experiments import runner
+from ntn_linksim.experiments.cache import ResultCache, cache_key
+from ntn_linksim.experiments.runner import run_points
+from ntn_linksim.experiments.sweep import snr_sweep_configs
+from ntn_linksim.sim import SimConfig, StopCriteria, run_once
+
+CONFIG = SimConfig(n_symbols=40, snr_db=4.0)
+
+
+def test_key_covers_config_stop_and_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    key = cache_key(CONFIG)
+    assert key == cache_key(replace(CONFIG))
+    assert key == cache_key(replace(CONFIG, snr_db=4))
+    assert key != cache_key(replace(CONFIG, seed=2))
+    assert key != cache_key(replace(CONFIG, precision="single"))
+    assert key != cache_key(CONFIG, StopCriteria())
+    assert cache_key(CONFIG, StopCriteria()) != cache_key(
+        CONFIG, StopCriteria(target_errors=50)
+    )
+    monkeypatch.setattr(cache_module, "__version__", "999")
+    assert key != cache_key(CONFIG)
+
+
+def test_cached_points_are_not_rerun(tmp_path, monkeypatch) -> None:
+    cache = ResultCache(tmp_path)
+    configs = snr_sweep_configs(CONFIG, [0.0, 4.0, 8.0])
+    first = run_points(configs, cache=cache)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 3, 3)
+    assert first[1] == run_once(configs[1])
+
+    evaluated = []
+    evaluate = runner._evaluate
+    monkeypatch.setattr(
+        runner, "_evaluate", lambda task: evaluated.append(task) or evaluate(task)
+    )
+    extended = snr_sweep_configs(CONFIG, [0.0, 4.0, 8.0, 12.0])
+    second = run_points(extended, cache=cache)
+    assert second[:3] == first
+    assert [task.snr_db_list for task in evaluated] == [(12.0,)]
+    assert cache.hits == 3
+
+
+def test_monte_carlo_results_are_cached(tmp_path) -> None:
+    cache = ResultCache(tmp_path)
+    stop = StopCriteria(target_errors=20, max_bits=50_000)
+    first = run_points([CONFIG], stop, cache=cache)
+    assert run_points([CONFIG], stop, cache=cache) == first
+    assert run_points([CONFIG], cache=cache) != first
+    assert cache.hits == 1
+
+
+def test_corrupt_entry_is_a_miss(tmp_path) -> None:
+    cache = ResultCache(tmp_path)
+    run_points([CONFIG], cache=cache)
+    (entry,) = tmp_path.glob("*/*.json")
+    entry.write_text("{not json", encoding="utf-8")
+    assert cache.get(CONFIG) is None
+    assert run_points([CONFIG], cache=cache)[0] == run_once(CONFIG)
+
+
+def test_prune_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResultCache(tmp_path)
+    configs = snr_sweep_configs(CONFIG, [0.0, 2.0, 4.0])
+    run_points(configs, cache=cache)
+    for age, config in enumerate(configs):
+        path = cache._path(cache_key(config))
+        os.utime(path, (1000.0 + age, 1000.0 + age))
+    assert cache.get(configs[0]) is not None  # refreshes the oldest entry
+
+    cache.max_bytes = cache.nbytes - 1
+    assert cache.prune() == 1
+    assert cache.get(configs[1]) is None
+    assert cache.get(configs[0]) is not None
+    assert cache.get(configs[2]) is not None
+
+    assert cache.clear() == 2
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        ResultCache(tmp_path, max_bytes=0)
@@ -0,0 +1,110 @@
+"""Tests for the SQLite result store."""
+
+import json
+import sqlite3
+
+import numpy as np
+import pytest
+
+from ntn_linksim import cli
+from ntn_linksim.experiments.store import ResultStore
+from ntn_linksim.experiments.sweep import (
+    save_sweep_cfo,
+    sweep_ber,
+    sweep_ber_vs_cfo,
+)
+from ntn_linksim.sim import SimConfig, StopCriteria
+
+CONFIG = SimConfig(n_symbols=30, snr_db=20.0)
+
+
+def test_sweeps_append_flat_rows(tmp_path) -> None:
+    store = ResultStore(tmp_path / "results.db")
+    ber = sweep_ber(CONFIG, [0.0, 5.0, 10.0], store=store)
+    stop = StopCriteria(target_errors=10, max_bits=20_000)
+    sweep_ber_vs_cfo(CONFIG, [0.0, 30e3], enable_comp=True, stop=stop, store=store)
+
+    assert len(store) == 5
+    runs = store.runs()
+    assert [run["n_points"] for run in runs] == [3, 2]
+    assert all(run["elapsed_s"] > 0 for run in runs)
+    assert runs[0]["fft"] == CONFIG.resolve_fft().describe()
+
+    rows = list(store.query(sweep="snr"))
+    assert [row["ber"] for row in rows] == ber
+    assert rows[0]["stop_target_errors"] is None
+    assert rows[0]["enable_cfo_comp"] is False
+    assert rows[0]["n_bits"] > 0
+
+    (row,) = store.query(cfo_hz=30e3)
+    assert row["enable_cfo_comp"] is True
+    assert row["stop_target_errors"] == 10
+    assert row["n_frames"] >= 1
+
+
+def test_query_filters_and_columns(tmp_path) -> None:
+    store = ResultStore(tmp_path / "results.db")
+    sweep_ber(CONFIG, [0.0, 5.0, 10.0, 15.0], store=store)
+    sweep_ber(SimConfig(n_symbols=30, seed=2), [5.0], store=store)
+
+    assert len(list(store.query(snr_db=(4, 12)))) == 3
+    assert len(list(store.query(snr_db=[0, 15], seed=1))) == 2
+    assert list(store.query(seed=3)) == []
+    query = store.query(sweep="snr")
+    assert next(query)["snr_db"] == 0.0  # rows are read lazily
+
+    cols = store.columns(["snr_db", "ber", "delay_method"], seed=1)
+    assert cols["snr_db"].tolist() == [0.0, 5.0, 10.0, 15.0]
+    assert cols["ber"].dtype == np.float64
+    assert cols["delay_method"].tolist() == ["auto"] * 4
+    with pytest.raises(ValueError):
+        list(store.query(snr=1.0))
+    with pytest.raises(ValueError):
+        store.append("bogus", [CONFIG], [])
+
+
+def test_export_regenerates_sweep_json(tmp_path) -> None:
+    store = ResultStore(tmp_path / "results.db")
+    cfo_hz = [0.0, 15e3, 30e3]
+    no_comp = sweep_ber_vs_cfo(CONFIG, cfo_hz, store=store)
+    with_comp = sweep_ber_vs_cfo(CONFIG, cfo_hz, enable_comp=True, store=store)
+    expected = save_sweep_cfo(
+        tmp_path / "direct",
+        cfo_hz,
+        no_comp,
+        with_comp,
+        snr_db=CONFIG.snr_db,
+        fft=CONFIG.resolve_fft().describe(),
+        plot=False,
+    )
+    exported = store.export_json("cfo", tmp_path / "exported", seed=1)
+    assert json.loads(exported.read_text()) == json.loads(expected.read_text())
+    with pytest.raises(ValueError):
+        store.export_json("delay", tmp_path / "none")
+
+
+def test_new_config_fields_are_added_to_old_stores(tmp_path) -> None:
+    path = tmp_path / "results.db"
+    ResultStore(path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("ALTER TABLE points DROP COLUMN fft_workers")
+    store = ResultStore(path)
+    sweep_ber(CONFIG, [5.0], store=store)
+    (row,) = store.query()
+    assert row["fft_workers"] == 1
+
+
+def test_cli_store_errors_exit_cleanly(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "results.db"
+    sweep_ber(CONFIG, [5.0], store=ResultStore(path))
+
+    def run(*argv: str) -> None:
+        monkeypatch.setattr("sys.argv", ["ntnls", "store", *argv])
+        cli.main()
+
+    with pytest.raises(SystemExit, match="No result store"):
+        run(str(tmp_path / "typo.db"), "info")
+    assert not (tmp_path / "typo.db").exists()
+    with pytest.raises(SystemExit, match="no stored 'cfo' points"):
+        run(str(path), "export", "--sweep", "cfo", "--out", str(tmp_path / "out"))
+    run(str(path), "info")
@@ -0,0 +1,107 @@
+"""Tests for the block-streaming simulation pipeline."""
+
+import tracemalloc
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim.rx.timing import CpTimingAccumulator, estimate_timing_offset_cp
+from ntn_linksim.sim import SimConfig, run_once
+from ntn_linksim.stream import run_stream
+
+CONFIGS = [
+    SimConfig(snr_db=4.0),
+    SimConfig(snr_db=12.0, cfo_hz=3000.0, enable_cfo_comp=True),
+    SimConfig(snr_db=5.0, enable_rician=True, rician_k_db=3.0, seed=7),
+    SimConfig(
+        snr_db=12.0, cfo_hz=3000.0, doppler_rate_hz_s=2e6, enable_cfo_comp=True
+    ),
+    SimConfig(
+        snr_db=10.0,
+        delay_samples=9.0,
+        enable_timing_comp=True,
+        cfo_hz=2000.0,
+        enable_cfo_comp=True,
+    ),
+    SimConfig(
+        snr_db=8.0,
+        n_symbols=333,
+        delay_samples=5.4,
+        delay_method="fir",
+        enable_timing_comp=True,
+    ),
+    SimConfig(
+        snr_db=10.0,
+        delay_samples=70.0,
+        timing_max_delay=79,
+        enable_timing_comp=True,
+        enable_rician=True,
+    ),
+    SimConfig(snr_db=15.0, tdl_profile="NTN-TDL-D", seed=5),
+    SimConfig(
+        snr_db=8.0, enable_rician=True, rician_k_db=3.0, fading_doppler_hz=400.0
+    ),
+    SimConfig(
+        snr_db=15.0,
+        tdl_profile="NTN-TDL-C",
+        tdl_delay_spread_ns=30.0,
+        fading_doppler_hz=900.0,
+        fading_method="filtered",
+        fading_spectrum="flat",
+    ),
+    SimConfig(snr_db=16.0, modulation="64qam", cfo_hz=1000.0, seed=2),
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+@pytest.mark.parametrize("block_symbols", [1, 7, 64])
+def test_stream_matches_run_once(config: SimConfig, block_symbols: int) -> None:
+    """Streaming reproduces the one-shot error count for the same seed."""
+    expected = run_once(config)
+    result = run_stream(config, block_symbols=block_symbols)
+    assert result.n_bits == expected.n_bits
+    assert result.n_errors == expected.n_errors
+
+
+@pytest.mark.parametrize("delay", [3.4, 12.3])
+def test_stream_fractional_delay_matches_fft_path(delay: float) -> None:
+    """With "auto", the streamed FIR delay matches run_once's FFT delay."""
+    config = SimConfig(
+        snr_db=10.0, n_symbols=400, delay_samples=delay, enable_timing_comp=True
+    )
+    expected = run_once(config)
+    result = run_stream(config)
+    assert result.n_bits == expected.n_bits
+    assert abs(result.n_errors - expected.n_errors) <= 0.02 * expected.n_errors + 5
+    with pytest.raises(ValueError, match="'fir'"):
+        run_stream(replace(config, delay_method="fft"))
+
+
+def test_timing_accumulator_matches_one_shot() -> None:
+    """Block-wise CP metric accumulation gives the one-shot estimate."""
+    rng = np.random.default_rng(4)
+    n = 80 * 40 + 13
+    rx = rng.normal(size=n) + 1j * rng.normal(size=n)
+    for max_delay in (None, 79):
+        acc = CpTimingAccumulator(64, 16, 40, n, max_delay=max_delay)
+        for start in range(0, n, 111):
+            acc.update(rx[start : start + 111])
+        assert acc.estimate() == estimate_timing_offset_cp(rx, 64, 16, 40, max_delay)
+
+
+def test_stream_peak_memory_is_bounded() -> None:
+    """Peak memory does not grow with the number of symbols."""
+    peaks = []
+    for n_symbols in (500, 5000):
+        config = SimConfig(n_symbols=n_symbols, snr_db=8.0, enable_timing_comp=True)
+        tracemalloc.start()
+        run_stream(config, block_symbols=32)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    assert peaks[1] < 1.5 * peaks[0]
+
+
+def test_invalid_block_size() -> None:
+    with pytest.raises(ValueError):
+        run_stream(SimConfig(), block_symbols=0)
@@ -0,0 +1,91 @@
+"""Tests for NTN-TDL frequency-selective fading."""
+
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim.channel.tdl import (
+    NTN_TDL_PROFILES,
+    TdlProfile,
+    apply_tdl_grid,
+    apply_tdl_time,
+    get_tdl_profile,
+    tdl_frequency_response,
+    tdl_tap_gains,
+)
+from ntn_linksim.sim import SimConfig, run_once, run_snr_sweep
+from ntn_linksim.trace import Tracer, tracing
+from ntn_linksim.waveform.ofdm import add_cp
+
+INTEGER = TdlProfile(
+    "integer", (0.0, 3.0, 7.0), (0.0, -3.0, -6.0), (True, False, False)
+)
+
+
+def test_profiles() -> None:
+    assert sorted(NTN_TDL_PROFILES) == [f"NTN-TDL-{x}" for x in "ABCD"]
+    for profile in NTN_TDL_PROFILES.values():
+        assert np.sum(profile.amplitudes() ** 2) == pytest.approx(1.0)
+    assert get_tdl_profile("NTN-TDL-A").k_factor_db is None
+    # LOS tap over the co-located Rayleigh tap, as in TR 38.811.
+    c = get_tdl_profile("NTN-TDL-C")
+    assert c.powers_db[0] - c.powers_db[1] == pytest.approx(10.224)
+    with pytest.raises(ValueError, match="unknown TDL profile"):
+        get_tdl_profile("TDL-X")
+
+    profile = get_tdl_profile("NTN-TDL-B")
+    gains = tdl_tap_gains(profile, (4000,), np.random.default_rng(0))
+    response = tdl_frequency_response(profile, gains, 300e-9, 15.36e6, 64)
+    assert response.shape == (4000, 64)
+    assert np.mean(np.abs(response) ** 2) == pytest.approx(1.0, rel=0.05)
+    # Frequency selective: the gain varies across subcarriers of a symbol.
+    assert np.std(np.abs(response[0])) > 0.05
+
+
+def test_grid_and_time_paths() -> None:
+    rng = np.random.default_rng(1)
+    shape = (2, 6, 64)
+    grid = rng.standard_normal(shape) + 1j * rng.standard_normal(shape)
+    tx = add_cp(np.fft.ifft(grid), 16)
+    faded = apply_tdl_grid(grid, INTEGER, 1.0, 1.0, np.random.default_rng(2))
+    timed = apply_tdl_time(tx, INTEGER, 1.0, 1.0, np.random.default_rng(2))
+    assert timed.shape == tx.shape
+    # Within the CP, the time-domain convolution is the grid product.
+    np.testing.assert_allclose(np.fft.fft(timed[..., 16:]), faded, atol=1e-12)
+
+    # Beyond the CP, the previous symbol leaks into the FFT window.
+    timed = apply_tdl_time(tx, INTEGER, 3.0, 1.0, np.random.default_rng(2))
+    faded = apply_tdl_grid(grid, INTEGER, 3.0, 1.0, np.random.default_rng(2))
+    assert np.abs(np.fft.fft(timed[..., 16:]) - faded).max() > 0.1
+
+    out = tx.astype(np.complex64)
+    result = apply_tdl_time(out, INTEGER, 1.0, 1.0, np.random.default_rng(2), out=out)
+    assert result is out
+
+
+def test_sim_integration() -> None:
+    config = SimConfig(snr_db=20.0, n_symbols=40, tdl_profile="NTN-TDL-A", seed=3)
+    assert config.tdl_in_grid()
+    # NTN-TDL-C at 100 ns reaches 22.8 samples, beyond the 16-sample CP.
+    long = replace(config, tdl_profile="NTN-TDL-C")
+    assert not long.tdl_in_grid()
+    assert replace(long, tdl_method="freq").tdl_in_grid()
+
+    for cfg in (config, long):
+        result = run_once(cfg)
+        assert result == run_once(cfg)
+        swept = run_snr_sweep(cfg, [10.0, cfg.snr_db])
+        assert swept[1] == result
+        with tracing(Tracer()) as tracer:
+            run_once(cfg)
+        names = [span.name for span in tracer.spans]
+        assert names.count("fading") == 1 and "tx_build" in names
+    assert run_once(replace(config, tdl_profile="none")).ber < run_once(config).ber
+
+    with pytest.raises(ValueError, match="exclusive"):
+        replace(config, enable_rician=True).validate()
+    with pytest.raises(ValueError, match="tdl_method"):
+        replace(config, tdl_method="fir").validate()
+    with pytest.raises(ValueError, match="unknown TDL profile"):
+        replace(config, tdl_profile="TDL-Z").validate()
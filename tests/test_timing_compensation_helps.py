@@ -64,3 +64,19 @@ def test_cfo_plus_delay_both_compensations() -> None:
     )
     result = run_once(base)
     assert result.ber < 0.05, f"expected recoverable BER, got {result.ber}"
+
+
+def test_wide_timing_window_recovers_large_delay() -> None:
+    """A delay of several CP lengths is recovered with a wider search window."""
+    base = SimConfig(
+        seed=7,
+        snr_db=30.0,
+        n_symbols=400,
+        delay_samples=70.0,
+        enable_timing_comp=True,
+    )
+    result_default = run_once(base)
+    result_wide = run_once(replace(base, timing_max_delay=79))
+
+    assert result_default.ber > 0.1
+    assert result_wide.ber < 0.01
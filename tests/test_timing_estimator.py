@@ -1,9 +1,11 @@
 """Tests for CP-based timing offset estimation."""
 
 import numpy as np
+import pytest
 
 from ntn_linksim.channel.delay import apply_integer_delay
-from ntn_linksim.rx.timing import estimate_timing_offset_cp
+from ntn_linksim.rx.timing import CpTimingAccumulator, estimate_timing_offset_cp
+from ntn_linksim.sim import SimConfig
 from ntn_linksim.waveform.modulation import qpsk_mod
 from ntn_linksim.waveform.ofdm import (
     OfdmParams,
@@ -55,3 +57,77 @@ def test_known_delay_4() -> None:
         rx, n_fft=params.n_fft, cp_len=params.cp_len, n_symbols=params.n_symbols
     )
     assert abs(offset - 4) <= 1, f"expected ~4, got {offset}"
+
+
+def _reference_estimate(
+    rx: np.ndarray, n_fft: int, cp_len: int, n_symbols: int, max_delay: int
+) -> int:
+    """Direct double-loop CP correlator the vectorized version must match."""
+    sym_len = n_fft + cp_len
+    best_d, best_metric = 0, -1.0
+    for d in range(max_delay + 1):
+        metric = 0.0 + 0.0j
+        for s in range(n_symbols):
+            start = d + s * sym_len
+            if start + sym_len > rx.size:
+                break
+            cp_part = rx[start : start + cp_len]
+            tail_part = rx[start + n_fft : start + sym_len]
+            metric += np.sum(tail_part * np.conjugate(cp_part))
+        if abs(metric) > best_metric:
+            best_metric, best_d = abs(metric), d
+    return best_d
+
+
+def test_matches_reference_loop_with_noise() -> None:
+    """Vectorized correlator agrees with the direct loop on noisy input."""
+    tx, params = _make_tx_samples(seed=3, n_symbols=12)
+    rng = np.random.default_rng(5)
+    for delay in (0, 3, 17, 29):
+        rx = apply_integer_delay(tx, delay)
+        noise = rng.standard_normal(rx.size) + 1j * rng.standard_normal(rx.size)
+        rx = rx + 0.3 * noise
+        expected = _reference_estimate(rx, params.n_fft, params.cp_len, 12, 32)
+        offset = estimate_timing_offset_cp(
+            rx, n_fft=params.n_fft, cp_len=params.cp_len, n_symbols=12, max_delay=32
+        )
+        assert offset == expected
+
+
+def test_wide_search_window() -> None:
+    """The widest window spans one symbol; delays are found modulo it."""
+    tx, params = _make_tx_samples(seed=4, n_symbols=30)
+    rx = apply_integer_delay(tx, 203)
+    offset = estimate_timing_offset_cp(
+        rx,
+        n_fft=params.n_fft,
+        cp_len=params.cp_len,
+        n_symbols=20,
+        max_delay=79,
+    )
+    # The CP metric is periodic in the symbol length (80 samples)
+    assert offset == 203 % 80
+    assert offset == _reference_estimate(rx, params.n_fft, params.cp_len, 20, 79)
+    for max_delay in (-1, 80):
+        with pytest.raises(ValueError, match="max_delay"):
+            estimate_timing_offset_cp(rx, params.n_fft, params.cp_len, 20, max_delay)
+        with pytest.raises(ValueError, match="max_delay"):
+            CpTimingAccumulator(params.n_fft, params.cp_len, 20, rx.size, max_delay)
+    with pytest.raises(ValueError, match="timing_max_delay"):
+        SimConfig(timing_max_delay=80).validate()
+
+
+def test_batched_frames() -> None:
+    """Batched input returns one estimate per frame."""
+    frames = []
+    for seed, delay in zip((5, 6, 7), (0, 6, 12), strict=True):
+        tx, params = _make_tx_samples(seed=seed, n_symbols=20)
+        frames.append(apply_integer_delay(tx, delay))
+    offsets = estimate_timing_offset_cp(
+        np.stack(frames),
+        n_fft=params.n_fft,
+        cp_len=params.cp_len,
+        n_symbols=params.n_symbols,
+    )
+    assert offsets.shape == (3,)
+    assert np.all(np.abs(offsets - np.array([0, 6, 12])) <= 1)
@@ -0,0 +1,81 @@
+"""Tests for per-stage pipeline tracing."""
+
+import json
+from dataclasses import replace
+
+from ntn_linksim.experiments.runner import run_points
+from ntn_linksim.experiments.sweep import snr_sweep_configs
+from ntn_linksim.sim import SimConfig, run_monte_carlo, run_once, save_run
+from ntn_linksim.trace import Tracer, active_tracer, tracing
+
+CONFIG = SimConfig(
+    n_symbols=40,
+    cfo_hz=15e3,
+    enable_cfo_comp=True,
+    delay_samples=3.0,
+    enable_timing_comp=True,
+    enable_rician=True,
+)
+STAGES = [
+    "tx_build",
+    "fading",
+    "cfo",
+    "delay",
+    "awgn",
+    "timing_estimate",
+    "cfo_estimate",
+    "demod",
+    "error_count",
+]
+
+
+def test_run_once_records_every_stage_without_changing_results() -> None:
+    with tracing(Tracer()) as tracer:
+        traced_result = run_once(CONFIG)
+    assert active_tracer() is None
+    assert traced_result == run_once(CONFIG)
+    assert [span.name for span in tracer.spans] == STAGES
+
+    frame_len = CONFIG.n_symbols * (CONFIG.n_fft + CONFIG.cp_len)
+    spans = {span.name: span for span in tracer.spans}
+    assert spans["awgn"].shape == (frame_len,)
+    assert spans["awgn"].dtype == "complex128"
+    assert spans["demod"].shape == (CONFIG.n_symbols * CONFIG.n_used * 2,)
+    assert all(span.duration_s >= 0 for span in tracer.spans)
+    assert all(span.alloc_bytes is None for span in tracer.spans)
+
+
+def test_disabled_tracer_records_nothing() -> None:
+    tracer = Tracer()
+    run_once(CONFIG)
+    assert tracer.spans == []
+    assert active_tracer() is None
+
+
+def test_summary_memory_and_exports(tmp_path) -> None:
+    with tracing(Tracer(memory=True)) as tracer:
+        result = run_monte_carlo(replace(CONFIG, snr_db=0.0))
+    summary = tracer.summary()
+    assert list(summary) == STAGES
+    assert summary["awgn"]["calls"] == summary["demod"]["calls"] >= 1
+    assert all(stage["alloc_bytes"] > 0 for stage in summary.values())
+
+    chrome = json.loads(tracer.save_chrome_trace(tmp_path / "trace.json").read_text())
+    events = chrome["traceEvents"]
+    assert len(events) == len(tracer.spans)
+    assert {event["ph"] for event in events} == {"X"}
+    assert min(event["ts"] for event in events) == 0.0
+    assert "alloc_bytes" in events[0]["args"]
+
+    run_json = save_run(tmp_path / "run", CONFIG, result, trace=summary)
+    assert json.loads(run_json.read_text())["trace"]["demod"]["calls"] >= 1
+
+
+def test_pool_workers_are_traced() -> None:
+    configs = snr_sweep_configs(replace(CONFIG, n_symbols=20), [0.0, 10.0])
+    configs += [replace(configs[0], seed=2)]
+    with tracing(Tracer()) as tracer:
+        results = run_points(configs, workers=2)
+    assert results == run_points(configs)
+    assert sum(span.name == "tx_build" for span in tracer.spans) == 2
+    assert len({span.pid for span in tracer.spans}) == 2
@@ -0,0 +1,122 @@
+"""Tests for the reusable workspace and the ``out=`` stage kernels."""
+
+import tracemalloc
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from ntn_linksim.channel.delay import apply_delay
+from ntn_linksim.rx.timing import compensate_integer_delay
+from ntn_linksim.sim import SimConfig, run_batch, run_once
+from ntn_linksim.waveform.modulation import qpsk_demod_hard, qpsk_mod
+from ntn_linksim.waveform.ofdm import fft_symbols, ifft_symbols
+from ntn_linksim.workspace import Workspace
+
+CONFIGS = [
+    SimConfig(snr_db=4.0),
+    SimConfig(snr_db=6.0, precision="single"),
+    SimConfig(snr_db=8.0, enable_rician=True, rician_k_db=3.0),
+    SimConfig(
+        snr_db=10.0,
+        delay_samples=6.4,
+        enable_timing_comp=True,
+        cfo_hz=1500.0,
+        enable_cfo_comp=True,
+    ),
+    SimConfig(snr_db=8.0, delay_samples=5.4, delay_method="fir"),
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_workspace_does_not_change_results(config: SimConfig) -> None:
+    """Reusing one workspace across runs and shapes gives the same results."""
+    ws = Workspace()
+    for n_symbols in (100, 100, 37):
+        cfg = replace(config, n_symbols=n_symbols)
+        assert run_once(cfg, ws).n_errors == run_once(cfg).n_errors
+    expected = run_batch(config, 4).frame_errors
+    for _ in range(2):
+        result = run_batch(config, 4, workspace=ws)
+        assert np.array_equal(result.frame_errors, expected)
+
+
+def test_out_kernels_match_allocating_kernels() -> None:
+    rng = np.random.default_rng(3)
+    bits = rng.integers(0, 2, size=(3, 104)).astype(np.int8)
+    for dtype in (np.complex64, np.complex128):
+        symbols = qpsk_mod(bits, dtype=dtype)
+        out = np.empty_like(symbols)
+        assert qpsk_mod(bits, dtype=dtype, out=out) is out
+        assert np.array_equal(out, symbols)
+
+        grid = symbols.reshape(3, 2, 26)
+        for kernel in (ifft_symbols, fft_symbols):
+            out = np.empty_like(grid)
+            assert np.array_equal(kernel(grid, out=out), kernel(grid))
+
+        samples = symbols.reshape(-1)
+        for method in ("fft", "fir"):
+            delayed = apply_delay(samples, 2.6, method=method)
+            out = np.empty_like(samples)
+            assert apply_delay(samples, 2.6, method=method, out=out) is out
+            assert np.array_equal(out, delayed)
+
+        bits_out = np.empty(bits.shape, dtype=np.int8)
+        qpsk_demod_hard(symbols, out=bits_out)
+        assert np.array_equal(bits_out, bits)
+
+
+def test_out_shape_mismatch_rejected() -> None:
+    x = np.zeros(16, dtype=np.complex128)
+    with pytest.raises(ValueError):
+        apply_delay(x, 1.5, out=np.empty(15, dtype=np.complex128))
+    with pytest.raises(ValueError):
+        apply_delay(x, 1.5, out=np.empty(16, dtype=np.complex64))
+
+
+def test_repeated_runs_make_no_large_allocations() -> None:
+    """With a warm workspace, a run allocates far less than one frame."""
+    config = SimConfig(
+        n_symbols=2000, delay_samples=2.0, enable_timing_comp=True, enable_rician=True
+    )
+    frame_bytes = config.n_symbols * (config.n_fft + config.cp_len) * 16
+    ws = Workspace()
+    run_once(config, ws)
+    tracemalloc.start()
+    run_once(config, ws)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < frame_bytes / 2
+
+
+def test_timing_compensation_writes_in_place() -> None:
+    """Batched realignment writes straight into out; zero delay is not copied."""
+    rng = np.random.default_rng(5)
+    x = rng.normal(size=(8, 20_000)) + 1j * rng.normal(size=(8, 20_000))
+    delay = np.array([0, 3, 3, 7, 0, 20_001, 1, 2])
+    expected = np.stack(
+        [compensate_integer_delay(row, d) for row, d in zip(x, delay, strict=True)]
+    )
+    out = np.empty_like(x)
+    tracemalloc.start()
+    assert compensate_integer_delay(x, delay, out=out) is out
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < x.nbytes / 8
+    assert np.array_equal(out, expected)
+
+    ws = Workspace()
+    run_once(SimConfig(n_symbols=50, enable_timing_comp=True), ws)
+    assert "rx.aligned" not in ws._buffers
+
+
+def test_workspace_reuses_and_clears_buffers() -> None:
+    ws = Workspace()
+    a = ws.get("a", (4, 8), np.complex64)
+    assert ws.get("a", (4, 8), np.complex64) is a
+    assert ws.get("a", (4, 9), np.complex64) is not a
+    assert not np.any(ws.zeros("b", (3,), np.float64))
+    assert ws.nbytes == 4 * 9 * 8 + 3 * 8
+    ws.clear()
+    assert ws.nbytes == 0